@@ -1,5 +1,7 @@
 """Application settings using pydantic-settings."""
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -72,17 +74,76 @@ class Settings(BaseSettings):
     mcp_tool_timeout_seconds: float = 30.0
     # Max characters returned from a single tool call into the agent context.
     mcp_tool_max_output_chars: int = 4000
+    # Directory for JSON snapshots of long-lived MCP catalogues (e.g. the BC Parks list),
+    # written after each refresh and loaded at startup so a restarted pod starts warm.
+    # Empty disables snapshots.
+    mcp_catalogue_snapshot_dir: str = ""
+    # Per-upstream circuit breaker: after this many consecutive failures (transport errors
+    # or 5xx) calls to that base URL fail fast until a probe succeeds after the reset time.
+    mcp_circuit_failure_threshold: int = 5
+    mcp_circuit_reset_seconds: float = 30.0
+    # Opt-in hedged GETs: send a second request once the first has been outstanding for the
+    # upstream's recent p95 latency (never sooner than the minimum delay).
+    mcp_hedge_requests_enabled: bool = False
+    mcp_hedge_min_delay_ms: float = 50.0
+    # Max addresses geocoded at once by the geocoder_geocode_batch tool.
+    mcp_geocoder_batch_concurrency: int = 5
 
     # Embedding requests (Azure OpenAI) are non-streaming and should be bounded.
     embedding_request_timeout_seconds: float = 60.0
     embedding_max_retries: int = 2
     embedding_retry_base_seconds: float = 0.5
+    # Truncate text-embedding-3 vectors to this many dimensions (the API's `dimensions`
+    # parameter); None keeps the model's native size. The search index field is sized to
+    # match, so changing it requires a new `azure_search_index_name`.
+    embedding_dimensions: int | None = None
+    # Embedding request scheduling. Requests are packed by estimated tokens (Azure OpenAI accepts
+    # at most 2048 inputs per request). Concurrency starts at `initial` and adapts AIMD-style to
+    # 429s within [1, max]; a 429's Retry-After pauses all senders and starts pacing the token
+    # rate, measured over the deployment's rate-limit window. When the deployment's TPM quota is
+    # set, requests are paced below it from the start.
+    embedding_batch_max_items: int = 2048
+    embedding_batch_max_tokens: int = 64_000
+    embedding_concurrency_initial: int = 4
+    embedding_concurrency_max: int = 16
+    embedding_tokens_per_minute: int = 0
+    embedding_rate_window_seconds: float = 1.0
+    embedding_rate_limit_max_retries: int = 8
+    # Coalescing of single-text embedding misses: identical concurrent texts share one call, and
+    # distinct texts arriving within the window are sent as one batched embeddings.create.
+    embedding_coalesce_enabled: bool = True
+    embedding_coalesce_window_ms: float = 5.0
+    embedding_coalesce_max_batch: int = 256
+
+    # Chunking for EmbeddingService.index_document: "characters" sizes chunks by the caller's
+    # chunk_size/chunk_overlap; "tokens" packs sentences into chunks of at most
+    # `chunk_max_tokens` tokens of the embedding model's tokenizer. "tokens" gives correctly
+    # sized embedding inputs but chunks far slower, as it is bound by token counting. The
+    # streaming upload pipeline chunks incrementally by characters either way.
+    chunking_strategy: Literal["characters", "tokens"] = "characters"
+    chunk_max_tokens: int = 256
+    chunk_overlap_tokens: int = 50
+    embedding_tokenizer_encoding: str = "cl100k_base"
 
     # Upload limits (bytes) to avoid unbounded memory usage.
     max_upload_bytes: int = 20 * 1024 * 1024  # 20 MiB
 
     # Document Intelligence LRO polling timeout (seconds).
     document_intelligence_timeout_seconds: float = 300.0
+    # Seconds between LRO status polls; replaces the service's Retry-After cadence.
+    document_intelligence_polling_interval_seconds: float = 1.0
+    # Split PDFs longer than `pages_per_range` pages into page ranges analyzed concurrently
+    # (at most `max_concurrent_ranges` at a time) and merged with page offsets.
+    document_intelligence_parallel_enabled: bool = False
+    document_intelligence_pages_per_range: int = 50
+    document_intelligence_max_concurrent_ranges: int = 4
+
+    # Streaming ingestion pipeline (parse -> chunk -> embed -> upload). Stages are joined by
+    # queues holding at most `ingest_queue_depth` batches, which bounds peak memory.
+    ingest_read_block_bytes: int = 256 * 1024
+    ingest_embed_batch_size: int = 64
+    ingest_upload_batch_size: int = 256
+    ingest_queue_depth: int = 2
 
     # Dev UI (Agent Framework DevUI) settings
     devui_enabled: bool = True
@@ -103,6 +164,45 @@ class Settings(BaseSettings):
     azure_search_endpoint: str = ""
     azure_search_key: str = ""  # Optional if using managed identity
     azure_search_index_name: str = "documents-index"
+    # Optional in-process tier for document-scoped vector search: recently used documents
+    # are kept as float32 matrices and searched exactly without an Azure round-trip.
+    search_hot_tier_enabled: bool = False
+    search_hot_tier_max_documents: int = 64
+    search_hot_tier_max_chunks_per_document: int = 2000
+    search_hot_tier_ttl_seconds: float = 300.0
+    search_hot_tier_max_bytes: int | None = 256 * 1024 * 1024
+    # Chunk uploads are split into batches capped by document count and estimated JSON bytes
+    # (Azure allows 1000 documents and 16 MB per request) and sent up to
+    # `upload_concurrency` at a time. Documents rejected with a transient status are re-sent
+    # on their own, with jittered exponential backoff, up to `upload_max_retries` times.
+    azure_search_upload_concurrency: int = 4
+    azure_search_upload_max_batch_bytes: int = 8 * 1024 * 1024
+    azure_search_upload_max_retries: int = 3
+    azure_search_upload_retry_base_seconds: float = 0.5
+    # Vector compression for the index's `embedding` field: "none", "scalar" (int8) or
+    # "binary" (1 bit per dimension). With `vector_rescore`, the service keeps the original
+    # vectors and re-ranks `vector_oversampling` x top_k compressed candidates with them.
+    # Compression cannot be added to an existing field; use a new index name.
+    azure_search_vector_compression: str = "none"
+    azure_search_vector_rescore: bool = True
+    azure_search_vector_oversampling: float = 4.0
+    # Document chat retrieval: "vector" ranks chunks by embedding similarity; "hybrid" also
+    # runs a keyword (BM25) query and fuses the two rankings, `retrieval_candidates` deep,
+    # with reciprocal rank fusion (constant `retrieval_rrf_k`). In hybrid mode the fused
+    # candidates can be reranked locally by BM25 over their text, and `adaptive_top_k`
+    # returns fewer than top_k chunks (at least `min_k`) once scores fall below
+    # `relative_floor` x the best. BM25 scores are unbounded, so keyword candidates are
+    # filtered relative to the top keyword hit (`keyword_relative_floor` x its score) rather
+    # than by the absolute `min_similarity` applied to vector candidates.
+    retrieval_mode: Literal["vector", "hybrid"] = "vector"
+    retrieval_candidates: int = 20
+    retrieval_keyword_relative_floor: float = 0.2
+    retrieval_rrf_k: int = 60
+    retrieval_rerank_enabled: bool = False
+    retrieval_rerank_weight: float = 0.5
+    retrieval_adaptive_top_k: bool = False
+    retrieval_min_k: int = 2
+    retrieval_relative_floor: float = 0.5
 
     # Azure Document Intelligence settings
     azure_document_intelligence_endpoint: str = ""
@@ -130,16 +230,58 @@ class Settings(BaseSettings):
     cache_prompt_max_entries: int | None = None
     cache_llm_max_entries: int | None = None
 
+    # Optional byte budgets (sum of key + value sizes) for the in-memory backend, enforced
+    # alongside max_entries. Per-namespace values fall back to cache_max_bytes.
+    cache_max_bytes: int | None = None
+    cache_db_max_bytes: int | None = None
+    cache_http_max_bytes: int | None = None
+    cache_embed_max_bytes: int | None = None
+    cache_prompt_max_bytes: int | None = None
+    cache_llm_max_bytes: int | None = None
+
+    # Optional per-namespace backend ("memory", "redis" or "none"). When unset, falls back to
+    # cache_backend. A shared backend lets all workers/replicas reuse e.g. embeddings.
+    cache_db_backend: str | None = None
+    cache_http_backend: str | None = None
+    cache_embed_backend: str | None = None
+    cache_prompt_backend: str | None = None
+    cache_llm_backend: str | None = None
+
+    # Shared Redis-protocol cache (Redis / Azure Cache for Redis), e.g. rediss://:key@host:6380/0
+    cache_redis_url: str = ""
+    cache_redis_key_prefix: str = "api-ms-agent"
+    cache_redis_socket_timeout_seconds: float = 0.5
+
+    # Optional background sweep (seconds) of expired in-memory entries; 0 disables it.
+    cache_janitor_interval_seconds: float = 0.0
+
     cache_default_ttl_seconds: int = 30
     cache_db_ttl_seconds: int = 30
+    # Freshness for cached GETs whose response has no Cache-Control max-age.
     cache_http_ttl_seconds: int = 900
+    # How long a stale response with an ETag / Last-Modified is kept for conditional
+    # revalidation (If-None-Match / If-Modified-Since). 0 disables revalidation.
+    cache_http_revalidate_ttl_seconds: int = 24 * 60 * 60
     # Optional negative caching (disabled by default). When enabled, caches safe GET errors
     # for a short TTL to reduce repeated downstream calls.
     cache_http_negative_ttl_seconds: int = 0
     cache_embed_ttl_seconds: int = 7 * 24 * 60 * 60
+    # Cached embedding encoding: "float32" (the model's native precision), "float16" (half the
+    # size, ~3 significant digits) or "json" (legacy). All formats remain readable.
+    cache_embed_codec: Literal["float32", "float16", "json"] = "float32"
     cache_prompt_ttl_seconds: int = 600
     # LLM response caching is disabled by default to avoid semantic changes.
     cache_llm_ttl_seconds: int = 0
+    # Optional semantic tier for deterministic LLM calls: a near-duplicate final user prompt
+    # (cosine >= threshold on its embedding, same preceding context) reuses the cached answer.
+    # Scope "user" keeps one vector set per user; "shared" shares answers across all users of
+    # this deployment (single-tenant installs only).
+    cache_llm_semantic_enabled: bool = False
+    cache_llm_semantic_threshold: float = 0.95
+    cache_llm_semantic_ttl_seconds: int = 3600
+    cache_llm_semantic_scope: str = "user"
+    cache_llm_semantic_max_entries_per_scope: int = 256
+    cache_llm_semantic_max_bytes: int = 64 * 1024 * 1024
 
     # Defensive HTTP bounds for cached downstream calls.
     # Applies to app.http_client.cached_get_json unless overridden.
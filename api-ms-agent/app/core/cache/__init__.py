@@ -1,9 +1,10 @@
 from .cache import Cache
 from .keys import canonical_json, canonical_query_string, hash_bytes, hash_text
 from .provider import get_cache
-from .types import CacheBackend, CacheGetOrSet, CacheNamespace, CachePolicy
+from .types import AsyncCacheBackend, CacheBackend, CacheGetOrSet, CacheNamespace, CachePolicy
 
 __all__ = [
+    "AsyncCacheBackend",
     "Cache",
     "CacheBackend",
     "CacheGetOrSet",
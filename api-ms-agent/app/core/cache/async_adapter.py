@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+
+from .types import AsyncCacheBackend, CacheBackend
+
+
+class SyncBackendAdapter(AsyncCacheBackend):
+    """Expose an in-process sync backend through the async protocol.
+
+    Only suitable for backends that never block on I/O (memory / no-op); network backends
+    provide their own async implementation.
+    """
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self._backend = backend
+
+    async def get(self, key: str) -> bytes | None:
+        return self._backend.get(key)
+
+    async def set(self, key: str, value: bytes, *, ttl_seconds: int) -> None:
+        self._backend.set(key, value, ttl_seconds=ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        self._backend.delete(key)
+
+    async def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        return self._backend.get_many(keys)
+
+    async def set_many(self, items: Mapping[str, bytes], *, ttl_seconds: int) -> None:
+        self._backend.set_many(items, ttl_seconds=ttl_seconds)
+
+    async def delete_many(self, keys: Sequence[str]) -> None:
+        self._backend.delete_many(keys)
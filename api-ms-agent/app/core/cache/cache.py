@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
 
+from .async_adapter import SyncBackendAdapter
 from .logging import CacheTimer, log_cache_event
 from .singleflight import SingleFlight
-from .types import CacheBackend, CacheGetOrSet, CachePolicy
+from .types import AsyncCacheBackend, CacheBackend, CacheGetOrSet, CachePolicy
 
 
 @dataclass(frozen=True, slots=True)
@@ -12,6 +14,21 @@ class Cache:
     backend: CacheBackend
     policy: CachePolicy
     _singleflight: SingleFlight
+    # Async view of the same entries. Defaults to wrapping `backend`, which is only
+    # appropriate for in-process backends; network backends supply their own.
+    async_backend: AsyncCacheBackend | None = None
+
+    def __post_init__(self) -> None:
+        if self.async_backend is None:
+            object.__setattr__(self, "async_backend", SyncBackendAdapter(self.backend))
+
+    @property
+    def _async(self) -> AsyncCacheBackend:
+        assert self.async_backend is not None
+        return self.async_backend
+
+    def _ttl(self, ttl_seconds: int | None) -> int:
+        return self.policy.default_ttl_seconds if ttl_seconds is None else ttl_seconds
 
     def get(self, key: str) -> bytes | None:
         timer = CacheTimer()
@@ -24,9 +41,8 @@ class Cache:
         return value
 
     def set(self, key: str, value: bytes, *, ttl_seconds: int | None = None) -> None:
-        ttl = self.policy.default_ttl_seconds if ttl_seconds is None else ttl_seconds
         timer = CacheTimer()
-        self.backend.set(key, value, ttl_seconds=ttl)
+        self.backend.set(key, value, ttl_seconds=self._ttl(ttl_seconds))
         log_cache_event(
             namespace=self.policy.namespace,
             cache_event="set",
@@ -42,6 +58,90 @@ class Cache:
             duration_ms=timer.elapsed_ms(),
         )
 
+    async def aget(self, key: str) -> bytes | None:
+        timer = CacheTimer()
+        value = await self._async.get(key)
+        log_cache_event(
+            namespace=self.policy.namespace,
+            cache_event="hit" if value is not None else "miss",
+            duration_ms=timer.elapsed_ms(),
+        )
+        return value
+
+    async def aset(self, key: str, value: bytes, *, ttl_seconds: int | None = None) -> None:
+        timer = CacheTimer()
+        await self._async.set(key, value, ttl_seconds=self._ttl(ttl_seconds))
+        log_cache_event(
+            namespace=self.policy.namespace,
+            cache_event="set",
+            duration_ms=timer.elapsed_ms(),
+        )
+
+    async def adelete(self, key: str) -> None:
+        timer = CacheTimer()
+        await self._async.delete(key)
+        log_cache_event(
+            namespace=self.policy.namespace,
+            cache_event="delete",
+            duration_ms=timer.elapsed_ms(),
+        )
+
+    async def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        """Fetch many keys in one backend call. Misses are omitted from the result."""
+        unique_keys = list(dict.fromkeys(keys))
+        if not unique_keys:
+            return {}
+
+        timer = CacheTimer()
+        found = await self._async.get_many(unique_keys)
+        duration_ms = timer.elapsed_ms()
+        hits = len(found)
+        misses = len(unique_keys) - hits
+        if hits:
+            log_cache_event(
+                namespace=self.policy.namespace,
+                cache_event="hit",
+                duration_ms=duration_ms,
+                count=hits,
+            )
+        if misses:
+            log_cache_event(
+                namespace=self.policy.namespace,
+                cache_event="miss",
+                duration_ms=duration_ms,
+                count=misses,
+            )
+        return found
+
+    async def set_many(
+        self,
+        items: Mapping[str, bytes],
+        *,
+        ttl_seconds: int | None = None,
+    ) -> None:
+        if not items:
+            return
+        timer = CacheTimer()
+        await self._async.set_many(items, ttl_seconds=self._ttl(ttl_seconds))
+        log_cache_event(
+            namespace=self.policy.namespace,
+            cache_event="set",
+            duration_ms=timer.elapsed_ms(),
+            count=len(items),
+        )
+
+    async def delete_many(self, keys: Sequence[str]) -> None:
+        if not keys:
+            return
+        timer = CacheTimer()
+        await self._async.delete_many(keys)
+        log_cache_event(
+            namespace=self.policy.namespace,
+            cache_event="delete",
+            duration_ms=timer.elapsed_ms(),
+            count=len(keys),
+        )
+
     async def get_or_set(
         self,
         key: str,
@@ -49,7 +149,7 @@ class Cache:
         *,
         ttl_seconds: int | None = None,
     ) -> bytes:
-        existing = self.backend.get(key)
+        existing = await self._async.get(key)
         if existing is not None:
             log_cache_event(namespace=self.policy.namespace, cache_event="hit")
             return existing
@@ -58,15 +158,14 @@ class Cache:
         async with lock:
             try:
                 # Double-check after waiting.
-                existing2 = self.backend.get(key)
+                existing2 = await self._async.get(key)
                 if existing2 is not None:
                     log_cache_event(namespace=self.policy.namespace, cache_event="hit")
                     return existing2
 
                 timer = CacheTimer()
                 value = await factory()
-                ttl = self.policy.default_ttl_seconds if ttl_seconds is None else ttl_seconds
-                self.backend.set(key, value, ttl_seconds=ttl)
+                await self._async.set(key, value, ttl_seconds=self._ttl(ttl_seconds))
                 log_cache_event(
                     namespace=self.policy.namespace,
                     cache_event="set",
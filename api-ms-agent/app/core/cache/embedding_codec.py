@@ -0,0 +1,93 @@
+"""Compact binary encoding for cached embedding vectors.
+
+Layout (little-endian):
+
+    magic "EMBV" | version u8 | dtype u8 ('f' float32, 'e' float16) | deployment_len u16
+    | dims u32 | deployment utf-8 | packed floats
+
+A 3072-dim float32 vector is ~12 KB instead of ~60 KB of canonical JSON, and decoding is a
+zero-copy `memoryview` over the cached bytes instead of a JSON parse. Legacy JSON entries
+(written before this codec existed) are still decoded so caches can migrate in place.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+
+_MAGIC = b"EMBV"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBHI")
+
+_DTYPE_CODES = {"float32": "f", "float16": "e"}
+_ITEM_SIZES = {"f": 4, "e": 2}
+
+
+def encode_embedding(
+    embedding: Sequence[float],
+    *,
+    deployment: str,
+    dtype: str = "float32",
+) -> bytes:
+    """Pack an embedding into the binary cache format."""
+    code = _DTYPE_CODES.get(dtype)
+    if code is None:
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+
+    deployment_bytes = deployment.encode("utf-8")
+    header = _HEADER.pack(_MAGIC, _VERSION, ord(code), len(deployment_bytes), len(embedding))
+    payload = struct.pack(f"<{len(embedding)}{code}", *embedding)
+    return header + deployment_bytes + payload
+
+
+def decode_embedding(
+    raw: bytes,
+    *,
+    deployment: str | None = None,
+) -> memoryview | array | list[float] | None:
+    """Decode a cached embedding without copying the vector data where possible.
+
+    Returns a float `memoryview` over `raw` for binary entries, a list for legacy JSON
+    entries, or None when the entry is corrupt or was produced by another deployment.
+    """
+    if not raw.startswith(_MAGIC):
+        return _decode_legacy_json(raw)
+
+    if len(raw) < _HEADER.size:
+        return None
+    _, version, code_byte, deployment_len, dims = _HEADER.unpack_from(raw)
+    code = chr(code_byte)
+    item_size = _ITEM_SIZES.get(code)
+    if version != _VERSION or item_size is None:
+        return None
+
+    offset = _HEADER.size + deployment_len
+    if len(raw) != offset + dims * item_size:
+        return None
+    if deployment is not None:
+        stored = bytes(raw[_HEADER.size : offset]).decode("utf-8", errors="replace")
+        if stored != deployment:
+            return None
+
+    view = memoryview(raw)[offset:]
+    if sys.byteorder == "little":
+        return view.cast(code)
+
+    # Big-endian hosts need a byte swap, which means one copy.
+    if code == "e":
+        return list(struct.unpack(f"<{dims}e", view))
+    values = array("f")
+    values.frombytes(view)
+    values.byteswap()
+    return values
+
+
+def _decode_legacy_json(raw: bytes) -> list[float] | None:
+    try:
+        value = json.loads(raw.decode("utf-8"))
+    except Exception:
+        return None
+    return value if isinstance(value, list) else None
@@ -21,12 +21,13 @@ def log_cache_event(
     cache_event: str,
     duration_ms: float | None = None,
     detail: str | None = None,
+    count: int = 1,
 ) -> None:
     # Lightweight in-memory stats for per-namespace hit/miss visibility.
     # Import locally to avoid any import-order coupling.
     from app.core.cache import stats as cache_stats
 
-    cache_stats.increment(namespace=namespace, cache_event=cache_event)
+    cache_stats.increment(namespace=namespace, cache_event=cache_event, count=count)
 
     # Never log keys or user content here.
     # NOTE: structlog uses `event` as the message positional arg.
@@ -36,4 +37,7 @@ def log_cache_event(
         payload["duration_ms"] = round(duration_ms, 3)
     if detail is not None:
         payload["detail"] = detail
+    if count != 1:
+        # Batch operations log once per call instead of once per key.
+        payload["count"] = count
     logger.info("cache", **payload)
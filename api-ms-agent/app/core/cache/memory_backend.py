@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import heapq
 import time
 from collections import OrderedDict
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
 from threading import Lock
 
@@ -12,76 +14,197 @@ from .types import CacheBackend
 class _Entry:
     value: bytes
     expires_at_monotonic: float | None
+    size: int
+
+
+# Rebuild the expiry heap once stale items (overwritten/deleted/evicted keys) outnumber live
+# entries by this factor, keeping its size O(entries) while amortising rebuild cost.
+_HEAP_COMPACT_FACTOR = 2
+_HEAP_COMPACT_MIN = 64
+
+
+def _entry_size(key: str, value: bytes) -> int:
+    # Payload bytes only; per-entry Python object overhead is roughly constant and is
+    # already bounded by max_entries.
+    return len(key) + len(value)
 
 
 class MemoryCacheBackend(CacheBackend):
-    def __init__(self, *, max_entries: int, namespace: str | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        namespace: str | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
         if max_entries <= 0:
             raise ValueError("max_entries must be > 0")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
         self._max_entries = max_entries
+        self._max_bytes = max_bytes
         self._namespace = namespace
         self._lock = Lock()
         self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        # Min-heap of (expires_at_monotonic, key). Items are validated lazily against
+        # `_entries` when popped, so overwrites and deletes never need a heap search.
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._publish_usage_locked()
+
+    @property
+    def current_bytes(self) -> int:
+        with self._lock:
+            return self._bytes
 
     def get(self, key: str) -> bytes | None:
         now = time.monotonic()
         with self._lock:
-            entry = self._entries.get(key)
-            if entry is None:
-                return None
-            if entry.expires_at_monotonic is not None and entry.expires_at_monotonic <= now:
-                self._entries.pop(key, None)
-                return None
-            self._entries.move_to_end(key, last=True)
-            return entry.value
+            return self._get_locked(key, now=now)
 
     def set(self, key: str, value: bytes, *, ttl_seconds: int) -> None:
+        self.set_many({key: value}, ttl_seconds=ttl_seconds)
+
+    def delete(self, key: str) -> None:
+        self.delete_many([key])
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        now = time.monotonic()
+        found: dict[str, bytes] = {}
+        with self._lock:
+            for key in keys:
+                value = self._get_locked(key, now=now)
+                if value is not None:
+                    found[key] = value
+        return found
+
+    def set_many(self, items: Mapping[str, bytes], *, ttl_seconds: int) -> None:
         if ttl_seconds <= 0:
             # Treat non-positive TTL as immediate expiry / no-op
-            self.delete(key)
+            self.delete_many(list(items.keys()))
             return
 
         expires_at = time.monotonic() + float(ttl_seconds)
         with self._lock:
-            self._entries[key] = _Entry(value=value, expires_at_monotonic=expires_at)
-            self._entries.move_to_end(key, last=True)
+            oversized = 0
+            for key, value in items.items():
+                self._remove_locked(key)
+                size = _entry_size(key, value)
+                if self._max_bytes is not None and size > self._max_bytes:
+                    # Storing it would flush the whole namespace; skip instead.
+                    oversized += 1
+                    continue
+                self._entries[key] = _Entry(value=value, expires_at_monotonic=expires_at, size=size)
+                self._bytes += size
+                heapq.heappush(self._expiry_heap, (expires_at, key))
             self._evict_expired_locked(now=time.monotonic())
             self._evict_lru_locked()
+            self._compact_expiry_heap_locked()
+            self._publish_usage_locked()
 
-    def delete(self, key: str) -> None:
+        if oversized:
+            self._log_evict(reason="oversize", count=oversized)
+
+    def delete_many(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._remove_locked(key)
+            self._publish_usage_locked()
+
+    def _get_locked(self, key: str, *, now: float) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at_monotonic is not None and entry.expires_at_monotonic <= now:
+            self._remove_locked(key)
+            self._publish_usage_locked()
+            return None
+        self._entries.move_to_end(key, last=True)
+        return entry.value
+
+    def _remove_locked(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def purge_expired(self) -> int:
+        """Drop all expired entries now; returns how many were removed.
+
+        Writes already purge as they go, so this is only needed to release memory in
+        namespaces that stop receiving writes (see the provider's cache janitor).
+        """
         with self._lock:
-            self._entries.pop(key, None)
-
-    def _evict_expired_locked(self, *, now: float) -> None:
-        # OrderedDict is LRU ordered; expired entries can be anywhere, but we keep this O(n)
-        # and rely on max_entries to be bounded.
-        expired_keys: list[str] = []
-        for k, entry in self._entries.items():
-            if entry.expires_at_monotonic is not None and entry.expires_at_monotonic <= now:
-                expired_keys.append(k)
-        for k in expired_keys:
-            self._entries.pop(k, None)
-
-        if expired_keys and self._namespace:
-            from app.core.cache.logging import log_cache_event
-
-            log_cache_event(
-                namespace=self._namespace,
-                cache_event="evict",
-                detail=f"reason=expired count={len(expired_keys)}",
-            )
+            removed = self._evict_expired_locked(now=time.monotonic())
+            self._compact_expiry_heap_locked()
+            self._publish_usage_locked()
+            return removed
+
+    def _evict_expired_locked(self, *, now: float) -> int:
+        # Pop only heap items that are due: amortised O(log n) per expired entry instead of
+        # scanning every entry. Stale items (key overwritten or already gone) are skipped.
+        heap = self._expiry_heap
+        expired = 0
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at_monotonic == expires_at:
+                self._remove_locked(key)
+                expired += 1
+
+        if expired:
+            self._log_evict(reason="expired", count=expired)
+        return expired
+
+    def _compact_expiry_heap_locked(self) -> None:
+        limit = _HEAP_COMPACT_FACTOR * len(self._entries) + _HEAP_COMPACT_MIN
+        if len(self._expiry_heap) <= limit:
+            return
+        self._expiry_heap = [
+            (entry.expires_at_monotonic, key)
+            for key, entry in self._entries.items()
+            if entry.expires_at_monotonic is not None
+        ]
+        heapq.heapify(self._expiry_heap)
 
     def _evict_lru_locked(self) -> None:
         evicted = 0
         while len(self._entries) > self._max_entries:
-            self._entries.popitem(last=False)
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
             evicted += 1
+        if evicted:
+            self._log_evict(reason="lru", count=evicted)
 
-        if evicted and self._namespace:
-            from app.core.cache.logging import log_cache_event
+        # Size-aware: keep dropping least-recently-used entries until the namespace fits
+        # its byte budget, so a few large values (e.g. embeddings) displace many small ones.
+        evicted = 0
+        while self._max_bytes is not None and self._bytes > self._max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            evicted += 1
+        if evicted:
+            self._log_evict(reason="bytes", count=evicted)
+
+    def _log_evict(self, *, reason: str, count: int) -> None:
+        if not self._namespace:
+            return
+        from app.core.cache.logging import log_cache_event
+
+        log_cache_event(
+            namespace=self._namespace,
+            cache_event="evict",
+            detail=f"reason={reason} count={count}",
+        )
 
-            log_cache_event(
-                namespace=self._namespace,
-                cache_event="evict",
-                detail=f"reason=lru count={evicted}",
-            )
+    def _publish_usage_locked(self) -> None:
+        if not self._namespace:
+            return
+        from app.core.cache import stats as cache_stats
+
+        cache_stats.set_usage(
+            namespace=self._namespace,
+            entries=len(self._entries),
+            bytes_used=self._bytes,
+            max_entries=self._max_entries,
+            max_bytes=self._max_bytes,
+        )
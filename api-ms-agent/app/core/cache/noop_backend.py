@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
+
 from .types import CacheBackend
 
 
@@ -12,3 +14,12 @@ class NoOpCacheBackend(CacheBackend):
 
     def delete(self, key: str) -> None:
         pass
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        return {}
+
+    def set_many(self, items: Mapping[str, bytes], *, ttl_seconds: int) -> None:
+        pass
+
+    def delete_many(self, keys: Sequence[str]) -> None:
+        pass
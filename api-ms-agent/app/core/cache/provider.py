@@ -1,14 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 from threading import Lock
+from typing import Any
 
 from app.config import settings
+from app.logger import get_logger
 
 from .cache import Cache
 from .memory_backend import MemoryCacheBackend
 from .noop_backend import NoOpCacheBackend
+from .redis_backend import AsyncRedisCacheBackend, RedisCacheBackend
 from .singleflight import SingleFlight
-from .types import CachePolicy
+from .types import AsyncCacheBackend, CacheBackend, CachePolicy
+
+logger = get_logger(__name__)
 
 _singleflight = SingleFlight()
 _provider_lock = Lock()
@@ -22,16 +28,79 @@ def get_cache(namespace: str) -> Cache:
             return existing
 
         policy = _policy_for_namespace(namespace)
-        backend = (
-            MemoryCacheBackend(max_entries=policy.max_entries, namespace=policy.namespace)
-            if settings.cache_enabled
-            else NoOpCacheBackend()
+        backend, async_backend = _build_backends(policy)
+        cache = Cache(
+            backend=backend,
+            policy=policy,
+            _singleflight=_singleflight,
+            async_backend=async_backend,
         )
-        cache = Cache(backend=backend, policy=policy, _singleflight=_singleflight)
         _caches[namespace] = cache
         return cache
 
 
+async def close_caches() -> None:
+    """Release backend connections (e.g. Redis pools) and forget all namespace caches."""
+    with _provider_lock:
+        caches = list(_caches.values())
+        _caches.clear()
+
+    for cache in caches:
+        close = getattr(cache.backend, "close", None)
+        if callable(close):
+            close()
+        aclose = getattr(cache.async_backend, "close", None)
+        if callable(aclose):
+            await aclose()
+
+
+async def run_cache_janitor(*, interval_seconds: float) -> None:
+    """Periodically purge expired entries from in-process backends until cancelled.
+
+    Writes purge expired entries as they go; the janitor covers namespaces that go idle.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        with _provider_lock:
+            caches = list(_caches.values())
+        for cache in caches:
+            purge = getattr(cache.backend, "purge_expired", None)
+            if callable(purge):
+                purge()
+
+
+def _build_backends(policy: CachePolicy) -> tuple[CacheBackend, AsyncCacheBackend | None]:
+    """Return the sync backend and, for network backends, its async twin.
+
+    In-process backends return `None` for the async side; `Cache` adapts them directly.
+    """
+    if not settings.cache_enabled:
+        return NoOpCacheBackend(), None
+
+    kind = policy.backend.strip().lower()
+    if kind in ("none", "noop"):
+        return NoOpCacheBackend(), None
+    if kind == "redis":
+        if settings.cache_redis_url:
+            redis_options: dict[str, Any] = {
+                "url": settings.cache_redis_url,
+                "namespace": policy.namespace,
+                "key_prefix": settings.cache_redis_key_prefix,
+                "socket_timeout_seconds": settings.cache_redis_socket_timeout_seconds,
+            }
+            return RedisCacheBackend(**redis_options), AsyncRedisCacheBackend(**redis_options)
+        logger.warning("cache_redis_url_missing", namespace=policy.namespace)
+    elif kind != "memory":
+        logger.warning("cache_backend_unknown", namespace=policy.namespace, backend=kind)
+
+    memory = MemoryCacheBackend(
+        max_entries=policy.max_entries,
+        namespace=policy.namespace,
+        max_bytes=policy.max_bytes,
+    )
+    return memory, None
+
+
 def _policy_for_namespace(namespace: str) -> CachePolicy:
     max_entries = settings.cache_max_entries
     if namespace == "db" and settings.cache_db_max_entries is not None:
@@ -58,4 +127,28 @@ def _policy_for_namespace(namespace: str) -> CachePolicy:
     else:
         ttl = settings.cache_default_ttl_seconds
 
-    return CachePolicy(namespace=namespace, default_ttl_seconds=ttl, max_entries=max_entries)
+    backend_overrides = {
+        "db": settings.cache_db_backend,
+        "http": settings.cache_http_backend,
+        "embed": settings.cache_embed_backend,
+        "prompt": settings.cache_prompt_backend,
+        "llm": settings.cache_llm_backend,
+    }
+    backend = backend_overrides.get(namespace) or settings.cache_backend
+
+    max_bytes_overrides = {
+        "db": settings.cache_db_max_bytes,
+        "http": settings.cache_http_max_bytes,
+        "embed": settings.cache_embed_max_bytes,
+        "prompt": settings.cache_prompt_max_bytes,
+        "llm": settings.cache_llm_max_bytes,
+    }
+    max_bytes = max_bytes_overrides.get(namespace) or settings.cache_max_bytes
+
+    return CachePolicy(
+        namespace=namespace,
+        default_ttl_seconds=ttl,
+        max_entries=max_entries,
+        backend=backend,
+        max_bytes=max_bytes,
+    )
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from .logging import log_cache_event
+from .types import AsyncCacheBackend, CacheBackend
+
+
+class _RedisKeyspace:
+    def __init__(self, *, namespace: str, key_prefix: str) -> None:
+        self._namespace = namespace
+        self._prefix = f"{key_prefix}:{namespace}:" if key_prefix else f"{namespace}:"
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}{key}"
+
+    def _log_error(self, op: str, exc: Exception) -> None:
+        log_cache_event(
+            namespace=self._namespace,
+            cache_event="error",
+            detail=f"backend=redis op={op} error={type(exc).__name__}",
+        )
+
+
+class RedisCacheBackend(_RedisKeyspace, CacheBackend):
+    """Shared cache backend speaking the Redis protocol (Redis, Azure Cache for Redis, Valkey).
+
+    Unlike the in-memory backend, entries are visible to every uvicorn worker and replica.
+    Capacity is bounded by the server's `maxmemory` eviction policy, not by `max_entries`.
+
+    The backend is best-effort: connection or protocol errors are logged as `error` cache
+    events and treated as misses, so an unavailable cache never fails a request.
+    """
+
+    def __init__(
+        self,
+        *,
+        url: str,
+        namespace: str,
+        key_prefix: str = "",
+        socket_timeout_seconds: float = 0.5,
+        client: Any | None = None,
+    ) -> None:
+        super().__init__(namespace=namespace, key_prefix=key_prefix)
+        if client is None:
+            # Imported lazily so memory-only deployments never load the Redis client.
+            import redis
+
+            client = redis.Redis.from_url(
+                url,
+                socket_timeout=socket_timeout_seconds,
+                socket_connect_timeout=socket_timeout_seconds,
+                health_check_interval=30,
+            )
+        self._client = client
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            value = self._client.get(self._key(key))
+        except Exception as exc:
+            self._log_error("get", exc)
+            return None
+        return bytes(value) if value is not None else None
+
+    def set(self, key: str, value: bytes, *, ttl_seconds: int) -> None:
+        if ttl_seconds <= 0:
+            # Treat non-positive TTL as immediate expiry / no-op
+            self.delete(key)
+            return
+        try:
+            self._client.set(self._key(key), value, ex=int(ttl_seconds))
+        except Exception as exc:
+            self._log_error("set", exc)
+
+    def delete(self, key: str) -> None:
+        self.delete_many([key])
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        """Fetch many keys in a single MGET round-trip. Misses are omitted."""
+        key_list = list(dict.fromkeys(keys))
+        if not key_list:
+            return {}
+        try:
+            values = self._client.mget([self._key(k) for k in key_list])
+        except Exception as exc:
+            self._log_error("get_many", exc)
+            return {}
+        return {k: bytes(v) for k, v in zip(key_list, values, strict=True) if v is not None}
+
+    def set_many(self, items: Mapping[str, bytes], *, ttl_seconds: int) -> None:
+        """Store many keys with a shared TTL in a single pipelined round-trip."""
+        if not items:
+            return
+        if ttl_seconds <= 0:
+            self.delete_many(list(items.keys()))
+            return
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(self._key(key), value, ex=int(ttl_seconds))
+            pipe.execute()
+        except Exception as exc:
+            self._log_error("set_many", exc)
+
+    def delete_many(self, keys: Sequence[str]) -> None:
+        if not keys:
+            return
+        try:
+            self._client.delete(*[self._key(k) for k in keys])
+        except Exception as exc:
+            self._log_error("delete", exc)
+
+    def close(self) -> None:
+        try:
+            self._client.close()
+        except Exception as exc:
+            self._log_error("close", exc)
+
+
+class AsyncRedisCacheBackend(_RedisKeyspace, AsyncCacheBackend):
+    """Async twin of `RedisCacheBackend` built on `redis.asyncio`.
+
+    Used by the async cache API so cache round-trips never block the event loop. Shares the
+    key layout with the sync backend, so both views of a namespace see the same entries.
+    """
+
+    def __init__(
+        self,
+        *,
+        url: str,
+        namespace: str,
+        key_prefix: str = "",
+        socket_timeout_seconds: float = 0.5,
+        client: Any | None = None,
+    ) -> None:
+        super().__init__(namespace=namespace, key_prefix=key_prefix)
+        if client is None:
+            import redis.asyncio
+
+            client = redis.asyncio.Redis.from_url(
+                url,
+                socket_timeout=socket_timeout_seconds,
+                socket_connect_timeout=socket_timeout_seconds,
+                health_check_interval=30,
+            )
+        self._client = client
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            value = await self._client.get(self._key(key))
+        except Exception as exc:
+            self._log_error("get", exc)
+            return None
+        return bytes(value) if value is not None else None
+
+    async def set(self, key: str, value: bytes, *, ttl_seconds: int) -> None:
+        if ttl_seconds <= 0:
+            await self.delete(key)
+            return
+        try:
+            await self._client.set(self._key(key), value, ex=int(ttl_seconds))
+        except Exception as exc:
+            self._log_error("set", exc)
+
+    async def delete(self, key: str) -> None:
+        await self.delete_many([key])
+
+    async def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        key_list = list(dict.fromkeys(keys))
+        if not key_list:
+            return {}
+        try:
+            values = await self._client.mget([self._key(k) for k in key_list])
+        except Exception as exc:
+            self._log_error("get_many", exc)
+            return {}
+        return {k: bytes(v) for k, v in zip(key_list, values, strict=True) if v is not None}
+
+    async def set_many(self, items: Mapping[str, bytes], *, ttl_seconds: int) -> None:
+        if not items:
+            return
+        if ttl_seconds <= 0:
+            await self.delete_many(list(items.keys()))
+            return
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(self._key(key), value, ex=int(ttl_seconds))
+            await pipe.execute()
+        except Exception as exc:
+            self._log_error("set_many", exc)
+
+    async def delete_many(self, keys: Sequence[str]) -> None:
+        if not keys:
+            return
+        try:
+            await self._client.delete(*[self._key(k) for k in keys])
+        except Exception as exc:
+            self._log_error("delete", exc)
+
+    async def close(self) -> None:
+        try:
+            await self._client.aclose()
+        except Exception as exc:
+            self._log_error("close", exc)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from threading import Lock
+
+import numpy as np
+
+from .logging import log_cache_event
+
+
+@dataclass(slots=True)
+class _ScopeSet:
+    """Embeddings and cached values for one scope, stored row-aligned."""
+
+    matrix: np.ndarray  # (capacity, dims) float32, rows L2-normalized; first `size` rows live
+    values: list[bytes] = field(default_factory=list)
+    expires_at: list[float] = field(default_factory=list)
+    last_used: list[float] = field(default_factory=list)
+    value_bytes: int = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.values)
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes + self.value_bytes
+
+
+def _normalize(embedding: Sequence[float]) -> np.ndarray | None:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    if vector.ndim != 1 or norm == 0.0:
+        return None
+    return vector / norm
+
+
+class SemanticCache:
+    """In-process nearest-neighbour cache keyed by embedding similarity.
+
+    Values are grouped into scopes (e.g. one per user and conversation context). A lookup
+    returns the value of the most similar live entry in the scope when its cosine similarity
+    is at least `threshold`. Each scope holds at most `max_entries_per_scope` entries
+    (least-recently-used replaced first); whole scopes are evicted LRU-first while the total
+    size of matrices and values exceeds `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        *,
+        namespace: str,
+        threshold: float,
+        ttl_seconds: float,
+        max_entries_per_scope: int,
+        max_bytes: int,
+    ) -> None:
+        if max_entries_per_scope <= 0:
+            raise ValueError("max_entries_per_scope must be > 0")
+        self._namespace = namespace
+        self._threshold = threshold
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries_per_scope
+        self._max_bytes = max_bytes
+        self._lock = Lock()
+        self._scopes: OrderedDict[str, _ScopeSet] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "scopes": len(self._scopes),
+                "entries": sum(s.size for s in self._scopes.values()),
+                "bytes": self._bytes,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scopes.clear()
+            self._bytes = 0
+            self._publish_usage_locked()
+
+    def get(self, scope: str, embedding: Sequence[float]) -> tuple[bytes, float] | None:
+        """Return `(value, similarity)` of the closest live entry, or None below threshold."""
+        query = _normalize(embedding)
+        now = time.monotonic()
+        with self._lock:
+            entries = self._scopes.get(scope)
+            best: tuple[int, float] | None = None
+            if query is not None and entries is not None and entries.size:
+                if entries.matrix.shape[1] == query.shape[0]:
+                    scores = entries.matrix[: entries.size] @ query
+                    scores[np.asarray(entries.expires_at) <= now] = -np.inf
+                    index = int(np.argmax(scores))
+                    best = (index, float(scores[index]))
+
+            if best is None or best[1] < self._threshold:
+                self._misses += 1
+                hit = None
+            else:
+                index, similarity = best
+                entries.last_used[index] = now
+                self._scopes.move_to_end(scope)
+                self._hits += 1
+                hit = (entries.values[index], similarity)
+
+        log_cache_event(namespace=self._namespace, cache_event="hit" if hit else "miss")
+        return hit
+
+    def set(self, scope: str, embedding: Sequence[float], value: bytes) -> None:
+        vector = _normalize(embedding)
+        if vector is None:
+            return
+        now = time.monotonic()
+        evicted = 0
+        with self._lock:
+            entries = self._scopes.get(scope)
+            if entries is not None and entries.matrix.shape[1] != vector.shape[0]:
+                self._remove_locked(scope)
+                entries = None
+            if entries is None:
+                entries = _ScopeSet(matrix=np.empty((1, vector.shape[0]), dtype=np.float32))
+                self._scopes[scope] = entries
+                self._bytes += entries.nbytes
+            self._scopes.move_to_end(scope)
+
+            before = entries.nbytes
+            self._insert(entries, vector, value, now)
+            self._bytes += entries.nbytes - before
+
+            while self._bytes > self._max_bytes and len(self._scopes) > 1:
+                oldest = next(iter(self._scopes))
+                if oldest == scope:
+                    break
+                self._remove_locked(oldest)
+                evicted += 1
+            if self._bytes > self._max_bytes:
+                # A single scope larger than the whole budget is not kept.
+                self._remove_locked(scope)
+                evicted += 1
+            self._publish_usage_locked()
+
+        log_cache_event(namespace=self._namespace, cache_event="set")
+        if evicted:
+            log_cache_event(
+                namespace=self._namespace,
+                cache_event="evict",
+                detail=f"reason=bytes count={evicted}",
+            )
+
+    def _insert(self, entries: _ScopeSet, vector: np.ndarray, value: bytes, now: float) -> None:
+        expires_at = now + self._ttl_seconds
+        if entries.size < self._max_entries:
+            if entries.size == entries.matrix.shape[0]:
+                # Grow geometrically up to the per-scope cap.
+                capacity = min(self._max_entries, max(1, entries.size * 2))
+                grown = np.empty((capacity, vector.shape[0]), dtype=np.float32)
+                grown[: entries.size] = entries.matrix[: entries.size]
+                entries.matrix = grown
+            index = entries.size
+            entries.values.append(value)
+            entries.expires_at.append(expires_at)
+            entries.last_used.append(now)
+        else:
+            # Replace an expired entry if there is one, otherwise the least recently used.
+            expired = [i for i, t in enumerate(entries.expires_at) if t <= now]
+            index = expired[0] if expired else int(np.argmin(entries.last_used))
+            entries.value_bytes -= len(entries.values[index])
+            entries.values[index] = value
+            entries.expires_at[index] = expires_at
+            entries.last_used[index] = now
+        entries.matrix[index] = vector
+        entries.value_bytes += len(value)
+
+    def _remove_locked(self, scope: str) -> None:
+        entries = self._scopes.pop(scope, None)
+        if entries is not None:
+            self._bytes -= entries.nbytes
+
+    def _publish_usage_locked(self) -> None:
+        from app.core.cache import stats as cache_stats
+
+        cache_stats.set_usage(
+            namespace=self._namespace,
+            entries=sum(s.size for s in self._scopes.values()),
+            bytes_used=self._bytes,
+            max_entries=self._max_entries,
+            max_bytes=self._max_bytes,
+        )
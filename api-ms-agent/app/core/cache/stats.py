@@ -6,14 +6,41 @@ from threading import Lock
 # Global, in-memory counters. This is intentionally simple and bounded in shape.
 # Structure: {namespace: {event: count}}
 _COUNTS: dict[str, dict[str, int]] = {}
+# Point-in-time usage gauges published by in-process backends.
+# Structure: {namespace: {"entries": n, "bytes": n, "max_entries": n, "max_bytes": n | None}}
+_USAGE: dict[str, dict[str, int | None]] = {}
 _LOCK = Lock()
 
 
-def increment(*, namespace: str, cache_event: str) -> None:
+def increment(*, namespace: str, cache_event: str, count: int = 1) -> None:
     """Increment a cache event counter."""
     with _LOCK:
         ns = _COUNTS.setdefault(namespace, {})
-        ns[cache_event] = ns.get(cache_event, 0) + 1
+        ns[cache_event] = ns.get(cache_event, 0) + count
+
+
+def set_usage(
+    *,
+    namespace: str,
+    entries: int,
+    bytes_used: int,
+    max_entries: int,
+    max_bytes: int | None,
+) -> None:
+    """Record the current size of an in-process cache namespace."""
+    with _LOCK:
+        _USAGE[namespace] = {
+            "entries": entries,
+            "bytes": bytes_used,
+            "max_entries": max_entries,
+            "max_bytes": max_bytes,
+        }
+
+
+def usage_snapshot() -> dict[str, dict[str, int | None]]:
+    """Return a copy of current per-namespace entry/byte usage."""
+    with _LOCK:
+        return deepcopy(_USAGE)
 
 
 def snapshot() -> dict[str, dict[str, int]]:
@@ -23,9 +50,10 @@ def snapshot() -> dict[str, dict[str, int]]:
 
 
 def reset() -> None:
-    """Reset all counters (test helper)."""
+    """Reset all counters and usage gauges (test helper)."""
     with _LOCK:
         _COUNTS.clear()
+        _USAGE.clear()
 
 
 def diff(
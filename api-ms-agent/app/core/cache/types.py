@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Mapping, Sequence
 from dataclasses import dataclass
 from typing import Protocol
 
@@ -14,6 +14,28 @@ class CacheBackend(Protocol):
 
     def delete(self, key: str) -> None: ...
 
+    def get_many(self, keys: Sequence[str]) -> dict[str, bytes]: ...
+
+    def set_many(self, items: Mapping[str, bytes], *, ttl_seconds: int) -> None: ...
+
+    def delete_many(self, keys: Sequence[str]) -> None: ...
+
+
+class AsyncCacheBackend(Protocol):
+    """Async-native backend; batch operations should cost one round-trip per call."""
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, *, ttl_seconds: int) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+    async def get_many(self, keys: Sequence[str]) -> dict[str, bytes]: ...
+
+    async def set_many(self, items: Mapping[str, bytes], *, ttl_seconds: int) -> None: ...
+
+    async def delete_many(self, keys: Sequence[str]) -> None: ...
+
 
 type CacheGetOrSet = Callable[[], Awaitable[bytes]]
 
@@ -23,3 +45,5 @@ class CachePolicy:
     namespace: CacheNamespace
     default_ttl_seconds: int
     max_entries: int
+    backend: str = "memory"
+    max_bytes: int | None = None
@@ -8,12 +8,18 @@ for efficient HTTP connection reuse across the application.
 from __future__ import annotations
 
 import json
+import time
+from collections.abc import Awaitable, Callable
 
 import httpx
 
 from app.config import settings
+from app.core.cache import stats as cache_stats
+from app.core.cache.cache import Cache
 from app.core.cache.keys import canonical_json, hash_text
+from app.core.cache.logging import log_cache_event
 from app.core.cache.provider import get_cache
+from app.core.cache.singleflight import SingleFlight
 from app.logger import get_logger
 
 logger = get_logger(__name__)
@@ -114,33 +120,182 @@ def _is_request_cacheable(client: httpx.AsyncClient) -> bool:
     return True
 
 
+# Sends one GET: (url, *, params=..., headers=..., timeout=...) -> response
+SendGet = Callable[..., Awaitable[httpx.Response]]
+
+_UPSTREAM_NAMESPACE_PREFIX = "http_upstream:"
+
+# One full or conditional fetch per cache key at a time.
+_fetches = SingleFlight()
+
+
+def _response_json(response: httpx.Response) -> dict[str, object]:
+    content_type = response.headers.get("Content-Type", "")
+    if "application/json" in content_type or "json" in content_type:
+        try:
+            return response.json()
+        except Exception:
+            return {"raw_text": response.text}
+    return {"raw_text": response.text}
+
+
+def _response_entry(response: httpx.Response) -> dict[str, object]:
+    """Cache entry body for a response: parsed JSON under `data`, else `raw_text`."""
+    content_type = response.headers.get("Content-Type", "")
+    if "application/json" in content_type or "json" in content_type:
+        try:
+            return {"data": response.json()}
+        except Exception:
+            pass
+    return {"raw_text": response.text}
+
+
+def _full_url(client: httpx.AsyncClient, url: str) -> str:
+    base_url = str(getattr(client, "base_url", "") or "")
+    return str(httpx.URL(base_url).join(url)) if base_url else url
+
+
+def _record_upstream(host: str, cache_event: str) -> None:
+    log_cache_event(namespace=f"{_UPSTREAM_NAMESPACE_PREFIX}{host}", cache_event=cache_event)
+
+
+def upstream_cache_stats() -> dict[str, dict[str, int]]:
+    """Return cached_get_json hit / revalidated / miss counts per upstream host."""
+    return {
+        namespace.removeprefix(_UPSTREAM_NAMESPACE_PREFIX): counts
+        for namespace, counts in cache_stats.snapshot().items()
+        if namespace.startswith(_UPSTREAM_NAMESPACE_PREFIX)
+    }
+
+
+def _freshness_seconds(response: httpx.Response) -> int | None:
+    """How long a response may be served without revalidation; None if it must not be stored.
+
+    Honours `Cache-Control` (`no-store`, `private`, `no-cache`, `s-maxage`, `max-age`) minus
+    the `Age` header; otherwise falls back to `cache_http_ttl_seconds`.
+    """
+    directives: dict[str, str] = {}
+    for part in response.headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip().strip('"')
+
+    if "no-store" in directives or "private" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0
+    for directive in ("s-maxage", "max-age"):
+        try:
+            max_age = int(directives[directive])
+        except (KeyError, ValueError):
+            continue
+        try:
+            age = int(response.headers.get("Age", "0"))
+        except ValueError:
+            age = 0
+        return max(0, max_age - age)
+    return int(settings.cache_http_ttl_seconds)
+
+
+def _copy_validators(response: httpx.Response, entry: dict[str, object]) -> None:
+    if response.headers.get("ETag"):
+        entry["etag"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        entry["last_modified"] = response.headers["Last-Modified"]
+
+
+def _entry_validators(entry: dict[str, object]) -> dict[str, str]:
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = str(entry["etag"])
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = str(entry["last_modified"])
+    return headers
+
+
+async def _store_entry(
+    cache: Cache,
+    cache_key: str,
+    entry: dict[str, object],
+    freshness: int | None,
+) -> dict[str, object]:
+    """Store a successful response entry for `freshness` seconds, plus the revalidation
+    window when it carries validators. Returns the entry."""
+    if freshness is None:
+        return entry
+    entry["fresh_until"] = time.time() + freshness
+    storage_ttl = freshness
+    if entry.get("etag") or entry.get("last_modified"):
+        storage_ttl += max(0, int(settings.cache_http_revalidate_ttl_seconds))
+    if storage_ttl > 0:
+        await cache.aset(cache_key, canonical_json(entry).encode("utf-8"), ttl_seconds=storage_ttl)
+    return entry
+
+
+def _decode_entry(
+    entry: dict[str, object],
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict[str, object] | None,
+) -> dict[str, object]:
+    """Return the response body of a cache entry, re-raising cached error responses."""
+    err = entry.get("error")
+    if isinstance(err, dict):
+        status = int(err.get("status", 500))
+        text = str(err.get("text", ""))
+        request = httpx.Request("GET", _full_url(client, url), params=params)
+        response = httpx.Response(status_code=status, request=request, text=text)
+        raise httpx.HTTPStatusError(
+            f"Cached HTTP error response: {status}",
+            request=request,
+            response=response,
+        )
+
+    if "data" in entry:
+        data = entry["data"]
+        return data if isinstance(data, dict) else {"data": data}
+    if "raw_text" in entry:
+        return {"raw_text": entry["raw_text"]}
+    return entry
+
+
+def _is_fresh(entry: dict[str, object] | None) -> bool:
+    if entry is None:
+        return False
+    # Entries without a freshness deadline (errors, older entries) live for their storage TTL.
+    fresh_until = entry.get("fresh_until")
+    return fresh_until is None or time.time() < float(fresh_until)
+
+
 async def cached_get_json(
     client: httpx.AsyncClient,
     url: str,
     *,
     params: dict[str, object] | None = None,
     timeout_seconds: float | None = None,
+    send: SendGet | None = None,
 ) -> dict[str, object]:
     """GET request with unified caching.
 
+    `send` replaces `client.get` for the requests that reach the upstream (e.g. to add
+    circuit breaking or hedging); it takes the same arguments.
+
     - GET-only (idempotent)
     - Best-effort caching (never raises due to cache issues)
     - Skips caching for authenticated requests
+    - Honours `Cache-Control` freshness; stale entries with an ETag or Last-Modified are
+      revalidated with a conditional GET, and a 304 renews them without a body transfer
     """
     effective_timeout = (
         settings.http_request_timeout_seconds if timeout_seconds is None else timeout_seconds
     )
 
+    send = send or client.get
+
     if not _is_request_cacheable(client):
-        response = await client.get(url, params=params, timeout=effective_timeout)
+        response = await send(url, params=params, timeout=effective_timeout)
         response.raise_for_status()
-        content_type = response.headers.get("Content-Type", "")
-        if "application/json" in content_type or "json" in content_type:
-            try:
-                return response.json()
-            except Exception:
-                return {"raw_text": response.text}
-        return {"raw_text": response.text}
+        return _response_json(response)
 
     cache = get_cache("http")
     payload = {
@@ -149,72 +304,63 @@ async def cached_get_json(
         "params": params or {},
     }
     cache_key = f"http_get:{hash_text(canonical_json(payload))}"
+    host = httpx.URL(_full_url(client, url)).host or "unknown"
 
     negative_ttl = int(settings.cache_http_negative_ttl_seconds)
 
-    async def factory() -> bytes:
-        response = await client.get(url, params=params, timeout=effective_timeout)
+    async def fetch(stale: dict[str, object] | None) -> dict[str, object]:
+        headers = _entry_validators(stale) if stale is not None else {}
+        response = await send(
+            url, params=params, headers=headers or None, timeout=effective_timeout
+        )
+
+        if response.status_code == 304 and stale is not None:
+            _record_upstream(host, "revalidated")
+            entry = {key: value for key, value in stale.items() if key != "fresh_until"}
+            # A 304 may carry updated validators and freshness.
+            _copy_validators(response, entry)
+            return await _store_entry(cache, cache_key, entry, _freshness_seconds(response))
 
+        _record_upstream(host, "miss")
         if negative_ttl > 0 and response.status_code in (404, 410):
             # Cache a sentinel that will re-raise an equivalent HTTPStatusError.
             # Do not cache other error classes (429/5xx) since they may be transient.
-            return canonical_json(
-                {
-                    "error": {
-                        "status": response.status_code,
-                        "text": (response.text or "")[:512],
-                    }
+            entry = {
+                "error": {
+                    "status": response.status_code,
+                    "text": (response.text or "")[:512],
                 }
-            ).encode("utf-8")
+            }
+            await cache.aset(
+                cache_key, canonical_json(entry).encode("utf-8"), ttl_seconds=negative_ttl
+            )
+            return entry
 
         response.raise_for_status()
-        content_type = response.headers.get("Content-Type", "")
-        if "application/json" in content_type or "json" in content_type:
-            try:
-                data: object = response.json()
-                return canonical_json({"data": data}).encode("utf-8")
-            except Exception:
-                return canonical_json({"raw_text": response.text}).encode("utf-8")
-        return canonical_json({"raw_text": response.text}).encode("utf-8")
+        entry = _response_entry(response)
+        _copy_validators(response, entry)
+        return await _store_entry(cache, cache_key, entry, _freshness_seconds(response))
 
     try:
-        raw = await cache.get_or_set(cache_key, factory)
-        decoded = json.loads(raw.decode("utf-8"))
-
-        if isinstance(decoded, dict) and "error" in decoded:
-            err = decoded.get("error")
-            if isinstance(err, dict):
-                status = int(err.get("status", 500))
-                text = str(err.get("text", ""))
-
-                # Ensure a short TTL for negative cache entries.
-                if negative_ttl > 0:
-                    cache.set(cache_key, raw, ttl_seconds=negative_ttl)
-
-                base_url = str(getattr(client, "base_url", "") or "")
-                full_url = str(httpx.URL(base_url).join(url)) if base_url else url
-                request = httpx.Request("GET", full_url, params=params)
-                response = httpx.Response(status_code=status, request=request, text=text)
-                raise httpx.HTTPStatusError(
-                    f"Cached HTTP error response: {status}",
-                    request=request,
-                    response=response,
-                )
-
-        if isinstance(decoded, dict) and "data" in decoded:
-            data = decoded["data"]
-            return data if isinstance(data, dict) else {"data": data}
-        return decoded if isinstance(decoded, dict) else {"data": decoded}
-    except (httpx.HTTPStatusError, httpx.RequestError, TimeoutError):
+        raw = await cache.aget(cache_key)
+        entry = json.loads(raw.decode("utf-8")) if raw is not None else None
+        if not _is_fresh(entry):
+            lock = await _fetches.acquire(cache_key)
+            try:
+                async with lock:
+                    # Re-check: another request may have refreshed the entry meanwhile.
+                    raw = await cache.aget(cache_key)
+                    entry = json.loads(raw.decode("utf-8")) if raw is not None else None
+                    if not _is_fresh(entry):
+                        return _decode_entry(await fetch(entry), client, url, params)
+            finally:
+                await _fetches.release(cache_key)
+        _record_upstream(host, "hit")
+        return _decode_entry(entry, client, url, params)
+    except (httpx.HTTPError, TimeoutError):
         raise
     except Exception:
         # Cache is best-effort; fall back to uncached.
-        response = await client.get(url, params=params, timeout=effective_timeout)
+        response = await send(url, params=params, timeout=effective_timeout)
         response.raise_for_status()
-        content_type = response.headers.get("Content-Type", "")
-        if "application/json" in content_type or "json" in content_type:
-            try:
-                return response.json()
-            except Exception:
-                return {"raw_text": response.text}
-        return {"raw_text": response.text}
+        return _response_json(response)
@@ -4,6 +4,8 @@ FastAPI application for MS Agent API.
 A simple chat agent API using Microsoft Agent Framework and Azure OpenAI.
 """
 
+import asyncio
+import contextlib
 import inspect
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
@@ -12,8 +14,10 @@ import psutil
 from fastapi import FastAPI
 
 from app.config import settings
+from app.core.cache import stats as cache_stats
+from app.core.cache.provider import close_caches, run_cache_janitor
 from app.devui import DevUIServer, start_devui_async
-from app.http_client import close_http_client
+from app.http_client import close_http_client, upstream_cache_stats
 from app.logger import get_logger, setup_logging
 from app.middleware.access_log_middleware import AccessLogMiddleware
 from app.middleware.auth_middleware import AuthMiddleware
@@ -26,9 +30,16 @@ from app.services import (
     get_cosmos_db_service,
     get_embedding_service,
 )
+from app.services.embedding_service import embedding_stats
+from app.services.mcp.resilience import circuit_breaker_states
 from app.services.openai_clients import get_embedding_client, shutdown_clients
-from app.services.orchestrator_agent import get_orchestrator_agent, shutdown_orchestrator
+from app.services.orchestrator_agent import (
+    get_orchestrator_agent,
+    shutdown_orchestrator,
+    warm_mcp_wrappers,
+)
 from app.services.research_agent import get_deep_research_service
+from app.services.token_chunker import load_tokenizer
 from app.services.workflow_research_agent import get_workflow_research_service
 
 
@@ -125,18 +136,36 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Warm up centralized OpenAI clients (singleton pattern - initializes once)
     await _safe_init("embedding_client", get_embedding_client)
 
+    # Load the chunking tokenizer in the background (tiktoken may download the encoding);
+    # indexing waits for it, off the event loop, if it has not loaded yet.
+    tokenizer_warmup: asyncio.Task | None = None
+    if settings.chunking_strategy == "tokens":
+        tokenizer_warmup = asyncio.create_task(
+            load_tokenizer(settings.embedding_tokenizer_encoding)
+        )
+
     # Initialize agent services (they use centralized clients internally)
     chat_service = get_chat_agent_service()
     orchestrator_service = get_orchestrator_agent()
 
     await _safe_init("chat_agent", chat_service._get_agent)
     await _safe_init("orchestrator_agent", orchestrator_service._get_agent)
+    # Load MCP catalogues (from snapshot when configured) and start their background refresh.
+    # A cold fetch of e.g. the full BC Parks list can be slow, so startup does not wait for it;
+    # tool calls made before it finishes join the fetch in flight.
+    mcp_warmup = asyncio.create_task(_safe_init("mcp_catalogues", warm_mcp_wrappers))
 
     # Initialize research services (they share centralized OpenAI clients)
     research_service = get_deep_research_service()
     workflow_research_service = get_workflow_research_service()
     embedding_service = get_embedding_service()
 
+    cache_janitor: asyncio.Task | None = None
+    if settings.cache_janitor_interval_seconds > 0:
+        cache_janitor = asyncio.create_task(
+            run_cache_janitor(interval_seconds=settings.cache_janitor_interval_seconds)
+        )
+
     logger.info("All services initialized successfully")
 
     if settings.devui_enabled:
@@ -157,9 +186,16 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     await chat_service.close()
     await research_service.close()
     await workflow_research_service.close()
+    mcp_warmup.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await mcp_warmup
     await shutdown_orchestrator()
 
     # Close embedding service
+    if tokenizer_warmup is not None:
+        tokenizer_warmup.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await tokenizer_warmup
     await embedding_service.close()
 
     # Close Document Intelligence service
@@ -172,6 +208,13 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Close shared HTTP client
     await close_http_client()
 
+    # Stop the cache janitor and release shared cache backend connections
+    if cache_janitor is not None:
+        cache_janitor.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await cache_janitor
+    await close_caches()
+
     # Close all centralized Azure OpenAI clients
     await shutdown_clients()
 
@@ -215,17 +258,28 @@ def create_app() -> FastAPI:
             "service": settings.app_name,
             "version": "0.1.0",
             "process": _collect_process_metrics(),
+            "cache": cache_stats.usage_snapshot(),
+            "http_upstreams": upstream_cache_stats(),
+            "embeddings": embedding_stats(),
         }
 
     @app.get("/health")
     async def health():
         """Health check endpoint."""
-        return {"status": "healthy", "process": _collect_process_metrics(sample_cpu=False)}
+        return {
+            "status": "healthy",
+            "process": _collect_process_metrics(sample_cpu=False),
+            "upstreams": circuit_breaker_states(),
+        }
 
     @app.get("/api/health")
     async def api_health():
         """Health check endpoint."""
-        return {"status": "healthy", "process": _collect_process_metrics(sample_cpu=False)}
+        return {
+            "status": "healthy",
+            "process": _collect_process_metrics(sample_cpu=False),
+            "upstreams": circuit_breaker_states(),
+        }
 
     # Include all routers with API prefix and versioning
     app.include_router(api_router, prefix="/api/v1")
@@ -9,6 +9,7 @@ from pydantic import BaseModel, Field
 
 from app.auth.dependencies import get_current_user_from_request
 from app.auth.models import KeycloakUser
+from app.config import settings
 from app.logger import get_logger
 from app.services.azure_search_service import (
     AzureSearchService,
@@ -154,7 +155,12 @@ async def chat(
                     top_k=5,  # Fewer chunks to reduce prompt size/cost
                     min_similarity=0.4,  # Slightly stricter to avoid weak matches
                 )
-                search_results = await search.vector_search(embedding, search_options)
+                if settings.retrieval_mode == "hybrid":
+                    search_results = await search.hybrid_search(
+                        request.message, embedding, search_options
+                    )
+                else:
+                    search_results = await search.vector_search(embedding, search_options)
 
                 if search_results:
                     # Build document context from search results
@@ -172,7 +178,8 @@ async def chat(
                         similarity = result.get("similarity", 0)
                         if similarity > 0.6:
                             confidence = "high"
-                        elif similarity > 0.4:
+                        elif similarity > 0.4 or result.get("keyword_score"):
+                            # Hybrid search: an exact keyword match is at least medium.
                             confidence = "medium"
                         else:
                             confidence = "low"
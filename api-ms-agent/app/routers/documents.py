@@ -3,7 +3,7 @@
 from datetime import UTC, datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, Form, HTTPException, UploadFile, status
 from pydantic import BaseModel, Field
 
 from app.auth.dependencies import get_current_user_from_request
@@ -18,32 +18,35 @@ from app.services.document_intelligence_service import (
     get_document_intelligence_service,
 )
 from app.services.embedding_service import EmbeddingService, get_embedding_service
+from app.services.ingestion_pipeline import DocumentIngestionPipeline, EmptyDocumentError
 
 router = APIRouter()
 
 logger = get_logger(__name__)
 
 
-async def _read_upload_file_limited(file: UploadFile, *, max_bytes: int) -> bytes:
-    """Read an UploadFile into memory with a hard maximum size."""
-    if max_bytes <= 0:
-        return await file.read()
+async def _upload_file_size_limited(file: UploadFile, *, max_bytes: int) -> int:
+    """Return the upload size, enforcing a hard maximum without reading it into memory.
 
-    buf = bytearray()
-    chunk_size = 1024 * 1024  # 1 MiB
-
-    while True:
-        chunk = await file.read(chunk_size)
-        if not chunk:
-            break
-        buf.extend(chunk)
-        if len(buf) > max_bytes:
-            raise HTTPException(
-                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
-                detail=f"File too large. Max allowed size is {max_bytes} bytes.",
-            )
-
-    return bytes(buf)
+    Starlette spools multipart uploads to a temporary file, so the document can be streamed
+    from `file.file` afterwards.
+    """
+    size = file.size
+    if size is None:
+        size = 0
+        chunk_size = 1024 * 1024  # 1 MiB
+        while chunk := await file.read(chunk_size):
+            size += len(chunk)
+            if 0 < max_bytes < size:
+                break
+        await file.seek(0)
+
+    if 0 < max_bytes < size:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"File too large. Max allowed size is {max_bytes} bytes.",
+        )
+    return size
 
 
 class IndexDocumentRequest(BaseModel):
@@ -133,6 +136,9 @@ async def upload_document(
         DocumentIntelligenceService, Depends(get_document_intelligence_service)
     ],
     current_user: Annotated[KeycloakUser, Depends(get_current_user_from_request)],
+    document_id: Annotated[
+        str | None, Form(description="ID of an existing document to replace")
+    ] = None,
 ) -> UploadDocumentResponse:
     """
     Upload and process a document for indexing.
@@ -143,6 +149,10 @@ async def upload_document(
     - Web: HTML
     - Text: Markdown, plain text
     - Images: JPEG, PNG, BMP, TIFF
+
+    Each upload creates a new document unless `document_id` names one of the user's
+    documents; that document is then replaced in place, embedding only the chunks whose
+    content changed, and an identical file only has its metadata updated.
     """
     if not file:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No file uploaded")
@@ -162,65 +172,67 @@ async def upload_document(
         content_type=file.content_type,
     )
 
+    if document_id is not None and (
+        await embedding_service.cosmos.get_document_metadata(document_id, user_id) is None
+    ):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+
     try:
-        content_bytes = await _read_upload_file_limited(
+        content_length = await _upload_file_size_limited(
             file,
             max_bytes=int(getattr(settings, "max_upload_bytes", 0)),
         )
 
-        # Use Azure Document Intelligence to analyze the document
-        result = await doc_intelligence.analyze_document(
-            content=content_bytes,
+        # Stream the spooled upload through parse -> chunk -> embed -> upload so peak memory
+        # stays bounded by the pipeline batch sizes rather than the document size.
+        analysis = await doc_intelligence.analyze_document_stream(
+            file.file,
             filename=file.filename or "unknown",
             content_type=file.content_type,
+            content_length=content_length,
+            block_size=settings.ingest_read_block_bytes,
         )
+        total_pages = analysis.pages
 
-        content = result.content
-        total_pages = result.pages
-
-        if not content.strip():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Could not extract text from document. "
-                "The document may be empty or corrupted.",
-            )
-
-        # Index the document with embeddings
-        document = await embedding_service.index_document(
-            content=content,
+        result = await DocumentIngestionPipeline(embedding_service).ingest(
+            analysis,
             user_id=user_id,
-            document_id=None,  # Auto-generate
+            document_id=document_id,
             metadata={
                 "title": file.filename,
                 "filename": file.filename,
                 "content_type": file.content_type,
                 "pages": total_pages,
-                "tables_count": len(result.tables),
-                "source": result.metadata.get("source", "unknown"),
+                "tables_count": analysis.tables_count,
+                "source": analysis.metadata.get("source", "unknown"),
             },
             chunk_size=1000,
             chunk_overlap=200,
-            paragraphs_with_pages=result.paragraphs_with_pages,
         )
 
         logger.info(
             "document_upload_completed",
-            document_id=document.id,
+            document_id=result.document_id,
             filename=file.filename,
             user_id=user_id,
-            total_chunks=len(document.chunks),
+            total_chunks=result.chunks,
             total_pages=total_pages,
         )
 
         return UploadDocumentResponse(
-            id=document.id,
+            id=result.document_id,
             filename=file.filename or "unknown",
             user_id=user_id,
-            total_chunks=len(document.chunks),
+            total_chunks=result.chunks,
             total_pages=total_pages,
             uploaded_at=datetime.now(UTC).isoformat(),
         )
 
+    except EmptyDocumentError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Could not extract text from document. The document may be empty or corrupted.",
+        ) from e
     except HTTPException:
         raise
     except ValueError as e:
@@ -8,10 +8,18 @@ Safety / invariants:
 - Caching is only attempted for deterministic calls (`temperature == 0`).
 - Responses are cached per-user (`user` must be provided) to avoid cross-user leakage.
 - Only non-streaming calls are supported (this code assumes `create(...)` returns a response).
+
+Semantic tier (opt-in via `settings.cache_llm_semantic_enabled`):
+- On an exact-cache miss, the normalized final user prompt is embedded and compared with
+  earlier prompts that had the same preceding messages and call options.
+- A prior answer is reused when cosine similarity >= `cache_llm_semantic_threshold`.
+- Vector sets are per-user unless `cache_llm_semantic_scope == "shared"`.
 """
 
 from __future__ import annotations
 
+import re
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from openai import AsyncAzureOpenAI
@@ -19,6 +27,15 @@ from openai import AsyncAzureOpenAI
 from app.config import settings
 from app.core.cache.keys import canonical_json, hash_text
 from app.core.cache.provider import get_cache
+from app.core.cache.semantic import SemanticCache
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+Embedder = Callable[[str, str | None], Awaitable[list[float]]]
+
+_semantic_cache: SemanticCache | None = None
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
 
 
 def _llm_cache_key(payload: dict[str, Any]) -> str:
@@ -40,9 +57,35 @@ def _messages_fingerprint(messages: list[dict[str, Any]]) -> list[dict[str, Any]
     return fp
 
 
+def get_semantic_llm_cache() -> SemanticCache:
+    """Return the process-wide semantic LLM cache (created on first use)."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache(
+            namespace="llm_semantic",
+            threshold=settings.cache_llm_semantic_threshold,
+            ttl_seconds=settings.cache_llm_semantic_ttl_seconds,
+            max_entries_per_scope=settings.cache_llm_semantic_max_entries_per_scope,
+            max_bytes=settings.cache_llm_semantic_max_bytes,
+        )
+    return _semantic_cache
+
+
+def normalize_prompt(text: str) -> str:
+    """Case-fold, drop punctuation and collapse whitespace before embedding a prompt."""
+    return " ".join(_PUNCTUATION_RE.sub(" ", text.casefold()).split())
+
+
+async def _default_embedder(text: str, user: str | None) -> list[float]:
+    from app.services.embedding_service import get_embedding_service
+
+    return await get_embedding_service().generate_embedding(text, user_id=user)
+
+
 class AzureOpenAIChatService:
-    def __init__(self, client: AsyncAzureOpenAI):
+    def __init__(self, client: AsyncAzureOpenAI, *, embedder: Embedder | None = None):
         self._client = client
+        self._embedder = embedder or _default_embedder
 
     async def create_chat_completion_content(
         self,
@@ -57,8 +100,7 @@ class AzureOpenAIChatService:
     ) -> str:
         """Create a chat completion and return the assistant message content."""
 
-        # Opt-in only
-        if settings.cache_llm_ttl_seconds <= 0:
+        async def _create() -> str:
             response = await self._client.chat.completions.create(
                 model=deployment,
                 messages=messages,
@@ -72,29 +114,27 @@ class AzureOpenAIChatService:
 
         # Deterministic-only (conservative)
         if temperature != 0:
-            response = await self._client.chat.completions.create(
-                model=deployment,
-                messages=messages,
-                response_format=response_format,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                additional_chat_options=additional_chat_options,
-                user=user,
+            return await _create()
+
+        semantic_scope = self._semantic_scope(
+            deployment=deployment,
+            messages=messages,
+            user=user,
+            max_tokens=max_tokens,
+            response_format=response_format,
+            additional_chat_options=additional_chat_options,
+        )
+
+        async def _generate() -> str:
+            if semantic_scope is None:
+                return await _create()
+            return await self._semantic_get_or_create(
+                semantic_scope, messages[-1]["content"], user, _create
             )
-            return response.choices[0].message.content or ""
 
-        # Per-user only to avoid cross-user leakage
-        if not user:
-            response = await self._client.chat.completions.create(
-                model=deployment,
-                messages=messages,
-                response_format=response_format,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                additional_chat_options=additional_chat_options,
-                user=user,
-            )
-            return response.choices[0].message.content or ""
+        # Exact cache is opt-in, and per-user only to avoid cross-user leakage
+        if settings.cache_llm_ttl_seconds <= 0 or not user:
+            return await _generate()
 
         cache = get_cache("llm")
 
@@ -112,16 +152,71 @@ class AzureOpenAIChatService:
         cache_key = _llm_cache_key(payload)
 
         async def _factory() -> bytes:
-            response = await self._client.chat.completions.create(
-                model=deployment,
-                messages=messages,
-                response_format=response_format,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                additional_chat_options=additional_chat_options,
-                user=user,
-            )
-            content = response.choices[0].message.content or ""
-            return content.encode("utf-8")
+            return (await _generate()).encode("utf-8")
 
         return (await cache.get_or_set(cache_key, _factory)).decode("utf-8")
+
+    @staticmethod
+    def _semantic_scope(
+        *,
+        deployment: str,
+        messages: list[dict[str, Any]],
+        user: str | None,
+        max_tokens: int | None,
+        response_format: dict[str, Any] | None,
+        additional_chat_options: dict[str, Any] | None,
+    ) -> str | None:
+        """Vector-set key for the semantic tier, or None when the call is not eligible.
+
+        Only the final user message may differ between calls sharing a scope; everything that
+        precedes it (system prompt, history) and the call options are part of the key.
+        """
+        if not settings.cache_llm_semantic_enabled or not messages:
+            return None
+        last = messages[-1]
+        if last.get("role") != "user" or not isinstance(last.get("content"), str):
+            return None
+        shared = settings.cache_llm_semantic_scope == "shared"
+        if not shared and not user:
+            return None
+
+        context = {
+            "v": 1,
+            "deployment": deployment,
+            "messages": _messages_fingerprint(messages[:-1]),
+            "max_tokens": max_tokens,
+            "response_format": response_format,
+            "additional_chat_options": additional_chat_options,
+        }
+        owner = "*" if shared else hash_text(user or "")
+        return f"{owner}:{hash_text(canonical_json(context))}"
+
+    async def _semantic_get_or_create(
+        self,
+        scope: str,
+        prompt: str,
+        user: str | None,
+        create: Callable[[], Awaitable[str]],
+    ) -> str:
+        normalized = normalize_prompt(prompt)
+        if not normalized:
+            return await create()
+
+        shared = settings.cache_llm_semantic_scope == "shared"
+        try:
+            embedding = await self._embedder(normalized, None if shared else user)
+        except Exception as error:
+            # The semantic tier is an optimization; fall back to the model.
+            logger.warning("llm_semantic_cache_embed_failed", error=str(error))
+            return await create()
+
+        cache = get_semantic_llm_cache()
+        hit = cache.get(scope, embedding)
+        if hit is not None:
+            value, similarity = hit
+            logger.debug("llm_semantic_cache_hit", similarity=round(similarity, 4))
+            return value.decode("utf-8")
+
+        content = await create()
+        cache.set(scope, embedding, content.encode("utf-8"))
+        return content
@@ -12,9 +12,12 @@ Uses the async Azure Search SDK (azure.search.documents.aio) for non-blocking I/
 
 from __future__ import annotations
 
+import asyncio
+import random
 import time
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
 from contextlib import asynccontextmanager
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import UTC, datetime
 from typing import Any
 
@@ -23,22 +26,45 @@ from azure.identity.aio import DefaultAzureCredential
 from azure.search.documents.aio import SearchClient
 from azure.search.documents.indexes.aio import SearchIndexClient
 from azure.search.documents.indexes.models import (
+    BinaryQuantizationCompression,
     HnswAlgorithmConfiguration,
+    ScalarQuantizationCompression,
+    ScalarQuantizationParameters,
     SearchableField,
     SearchField,
     SearchFieldDataType,
     SearchIndex,
     SimpleField,
     VectorSearch,
+    VectorSearchCompression,
     VectorSearchProfile,
 )
 from azure.search.documents.models import VectorizedQuery
 
 from app.config import settings
+from app.core.cache.singleflight import SingleFlight
 from app.logger import get_logger
+from app.services.hybrid_retrieval import (
+    above_relative_floor,
+    adaptive_cutoff,
+    min_max_scaled,
+    reciprocal_rank_fusion,
+    rerank,
+)
+from app.services.search_hot_tier import SearchHotTier
 
 logger = get_logger(__name__)
 
+# Azure AI Search accepts at most 1000 documents per indexing request.
+_MAX_BATCH_DOCUMENTS = 1000
+# Per-document statuses worth re-sending: version conflict, index temporarily unavailable,
+# throttled and service unavailable.
+_RETRYABLE_STATUS_CODES = frozenset({409, 422, 429, 503})
+# An embedding value serializes to at most ~20 JSON characters plus a ", " separator; ids,
+# metadata and field names add a roughly constant overhead.
+_JSON_BYTES_PER_FLOAT = 22
+_JSON_BYTES_OVERHEAD = 512
+
 
 @dataclass
 class DocumentChunk:
@@ -65,13 +91,105 @@ class VectorSearchOptions:
     min_similarity: float = 0.0
 
 
+def _chunk_document(chunk: DocumentChunk) -> dict[str, Any]:
+    """Build the Azure Search document for a chunk."""
+    metadata = chunk.metadata or {}
+    return {
+        "id": chunk.id,
+        "document_id": chunk.document_id,
+        "user_id": chunk.user_id,
+        "content": chunk.content,
+        "embedding": chunk.embedding,
+        "chunk_index": chunk.chunk_index,
+        "page_number": chunk.page_number or 0,
+        "title": metadata.get("title", ""),
+        "filename": metadata.get("filename", ""),
+        "content_type": metadata.get("content_type", ""),
+        "total_chunks": metadata.get("total_chunks", 0),
+        "created_at": chunk.created_at.isoformat(),
+    }
+
+
+_RESULT_FIELDS = (
+    "id",
+    "document_id",
+    "user_id",
+    "content",
+    "chunk_index",
+    "page_number",
+    "title",
+    "filename",
+)
+
+
+def _search_filter(options: VectorSearchOptions) -> str | None:
+    """OData filter scoping a search to the options' user and document."""
+    filters = []
+    if options.user_id:
+        filters.append(f"user_id eq '{options.user_id}'")
+    if options.document_id:
+        filters.append(f"document_id eq '{options.document_id}'")
+    return " and ".join(filters) if filters else None
+
+
+def _result_item(result: dict[str, Any], **scores: float) -> dict[str, Any]:
+    """Shape a search result like the items returned by `vector_search`."""
+    return {
+        "id": result["id"],
+        "document_id": result["document_id"],
+        "user_id": result.get("user_id", ""),
+        "content": result["content"],
+        "chunk_index": result.get("chunk_index", 0),
+        "page_number": result.get("page_number", 0),
+        **scores,
+        "metadata": {
+            "title": result.get("title", ""),
+            "filename": result.get("filename", ""),
+        },
+    }
+
+
+def _vector_compression() -> VectorSearchCompression | None:
+    """Build the index's vector compression from settings (None when disabled)."""
+    kind = settings.azure_search_vector_compression.lower()
+    options = {
+        "compression_name": "vector-compression",
+        "rerank_with_original_vectors": settings.azure_search_vector_rescore,
+        "default_oversampling": (
+            settings.azure_search_vector_oversampling
+            if settings.azure_search_vector_rescore
+            else None
+        ),
+    }
+    if kind == "none":
+        return None
+    if kind == "scalar":
+        return ScalarQuantizationCompression(
+            parameters=ScalarQuantizationParameters(quantized_data_type="int8"), **options
+        )
+    if kind == "binary":
+        return BinaryQuantizationCompression(**options)
+    raise ValueError(f"Unknown vector compression {kind!r}; expected none, scalar or binary")
+
+
+async def _iterate(
+    items: Iterable[DocumentChunk] | AsyncIterable[DocumentChunk],
+) -> AsyncIterator[DocumentChunk]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
 class AzureSearchService:
     """Service for Azure AI Search vector operations.
 
     Uses the async Azure Search SDK for non-blocking I/O operations.
     """
 
-    # Embedding dimensions for text-embedding-3-large
+    # Native embedding dimensions of text-embedding-3-large
     EMBEDDING_DIMENSIONS = 3072
 
     def __init__(self) -> None:
@@ -81,6 +199,18 @@ class AzureSearchService:
         self._credential: DefaultAzureCredential | None = None
         self._initialized = False
         self._index_name = settings.azure_search_index_name
+        # Must match the vectors EmbeddingService produces (settings.embedding_dimensions).
+        self._dimensions = settings.embedding_dimensions or self.EMBEDDING_DIMENSIONS
+        # Optional in-process tier answering document-scoped searches without a round-trip.
+        self._hot_tier: SearchHotTier | None = None
+        if settings.search_hot_tier_enabled:
+            self._hot_tier = SearchHotTier(
+                max_documents=settings.search_hot_tier_max_documents,
+                max_chunks_per_document=settings.search_hot_tier_max_chunks_per_document,
+                ttl_seconds=settings.search_hot_tier_ttl_seconds,
+                max_bytes=settings.search_hot_tier_max_bytes,
+            )
+        self._hot_tier_loads = SingleFlight()
 
     async def _initialize_client(self) -> None:
         """Initialize the Azure Search clients with managed identity or key authentication."""
@@ -207,12 +337,13 @@ class AzureSearchService:
                     name="embedding",
                     type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
                     searchable=True,
-                    vector_search_dimensions=self.EMBEDDING_DIMENSIONS,
+                    vector_search_dimensions=self._dimensions,
                     vector_search_profile_name="vector-profile",
                 ),
             ]
 
-            # Configure vector search
+            # Configure vector search, compressing the HNSW graph's vectors if configured
+            compression = _vector_compression()
             vector_search = VectorSearch(
                 algorithms=[
                     HnswAlgorithmConfiguration(
@@ -223,8 +354,10 @@ class AzureSearchService:
                     VectorSearchProfile(
                         name="vector-profile",
                         algorithm_configuration_name="hnsw-config",
+                        compression_name=compression.compression_name if compression else None,
                     ),
                 ],
+                compressions=[compression] if compression else None,
             )
 
             # Create the index
@@ -250,79 +383,263 @@ class AzureSearchService:
 
     async def bulk_store_chunks(
         self,
-        chunks: list[DocumentChunk],
+        chunks: Iterable[DocumentChunk] | AsyncIterable[DocumentChunk],
         batch_size: int = 1000,
     ) -> int:
         """
-        Bulk store document chunks in Azure Search with batching.
+        Bulk store document chunks in Azure Search with parallel, size-bounded batches.
 
-        Azure Search supports up to 1000 documents per upload batch.
-        This is significantly faster than individual uploads.
+        Batches close at `batch_size` documents or `azure_search_upload_max_batch_bytes` of
+        estimated JSON, whichever comes first; with 3072-dimension embeddings the byte limit
+        is usually the one reached. Up to `azure_search_upload_concurrency` batches are in
+        flight at once, and an async iterator is consumed only as fast as batches can be
+        sent, so chunks can be uploaded while later ones are still being embedded.
+
+        Documents the service rejects with a transient status are retried on their own;
+        other failures are logged and counted.
 
         Args:
-            chunks: List of DocumentChunk objects to store
-            batch_size: Number of documents per upload batch (max 1000)
+            chunks: DocumentChunk objects to store, as an iterable or async iterable
+            batch_size: Maximum number of documents per upload batch (max 1000)
 
         Returns:
             Number of successfully stored chunks
         """
-        if not chunks:
+        if isinstance(chunks, list) and not chunks:
             return 0
 
         if not await self._ensure_initialized():
             return 0
 
-        # Prepare all documents
-        documents = []
-        for chunk in chunks:
-            documents.append(
-                {
-                    "id": chunk.id,
-                    "document_id": chunk.document_id,
-                    "user_id": chunk.user_id,
-                    "content": chunk.content,
-                    "embedding": chunk.embedding,
-                    "chunk_index": chunk.chunk_index,
-                    "page_number": chunk.page_number or 0,
-                    "title": (chunk.metadata or {}).get("title", ""),
-                    "filename": (chunk.metadata or {}).get("filename", ""),
-                    "content_type": (chunk.metadata or {}).get("content_type", ""),
-                    "total_chunks": (chunk.metadata or {}).get("total_chunks", 0),
-                    "created_at": chunk.created_at.isoformat(),
-                }
-            )
-
+        batch_size = max(1, min(batch_size, _MAX_BATCH_DOCUMENTS))
+        max_batch_bytes = settings.azure_search_upload_max_batch_bytes
+        semaphore = asyncio.Semaphore(max(1, settings.azure_search_upload_concurrency))
         success_count = 0
-        total_batches = (len(documents) + batch_size - 1) // batch_size
+        total_chunks = 0
+        total_batches = 0
+
+        async def upload(batch: list[dict[str, Any]], batch_num: int) -> None:
+            nonlocal success_count
+            try:
+                batch_success = await self._upload_batch(batch)
+            finally:
+                semaphore.release()
+            success_count += batch_success
+            logger.debug(
+                "bulk_upload_batch_complete",
+                batch=batch_num,
+                succeeded=batch_success,
+                failed=len(batch) - batch_success,
+            )
 
         try:
-            for i in range(0, len(documents), batch_size):
-                batch = documents[i : i + batch_size]
-                batch_num = (i // batch_size) + 1
+            async with asyncio.TaskGroup() as tg:
+                batch: list[dict[str, Any]] = []
+                batch_bytes = 0
+                async for chunk in _iterate(chunks):
+                    document = _chunk_document(chunk)
+                    document_bytes = (
+                        len(chunk.content.encode("utf-8"))
+                        + _JSON_BYTES_PER_FLOAT * len(chunk.embedding)
+                        + _JSON_BYTES_OVERHEAD
+                    )
+                    if batch and (
+                        len(batch) >= batch_size or batch_bytes + document_bytes > max_batch_bytes
+                    ):
+                        # Waiting for a free upload slot also stops pulling from the source.
+                        await semaphore.acquire()
+                        total_batches += 1
+                        tg.create_task(upload(batch, total_batches))
+                        batch, batch_bytes = [], 0
+                    batch.append(document)
+                    batch_bytes += document_bytes
+                    total_chunks += 1
+                if batch:
+                    await semaphore.acquire()
+                    total_batches += 1
+                    tg.create_task(upload(batch, total_batches))
+        except* Exception as group:
+            error = group.exceptions[0]
+            logger.error("bulk_store_failed", error=str(error), stored=success_count)
+            raise error from None
 
-                result = await self._search_client.upload_documents(batch)
-                batch_success = sum(1 for r in result if r.succeeded)
-                success_count += batch_success
+        logger.info(
+            "bulk_chunks_stored",
+            total_chunks=total_chunks,
+            succeeded=success_count,
+            batches=total_batches,
+        )
+        return success_count
 
-                logger.debug(
-                    "bulk_upload_batch_complete",
-                    batch=batch_num,
-                    total_batches=total_batches,
-                    succeeded=batch_success,
-                    failed=len(batch) - batch_success,
-                )
+    async def _upload_batch(self, documents: list[dict[str, Any]]) -> int:
+        """Upload one batch, re-sending documents that failed with a transient status.
 
+        Returns:
+            Number of documents stored
+        """
+        max_retries = settings.azure_search_upload_max_retries
+        succeeded = 0
+        pending = documents
+        for attempt in range(max_retries + 1):
+            results = await self._search_client.upload_documents(documents=pending)
+            self._add_to_hot_tier(pending, results)
+            succeeded += sum(1 for r in results if r.succeeded)
+            failed = [r for r in results if not r.succeeded]
+            retry_keys = {
+                r.key
+                for r in failed
+                if attempt < max_retries and r.status_code in _RETRYABLE_STATUS_CODES
+            }
+            given_up = [r for r in failed if r.key not in retry_keys]
+            if given_up:
+                logger.warning(
+                    "bulk_upload_documents_failed",
+                    failed=len(given_up),
+                    status_code=given_up[0].status_code,
+                    error=given_up[0].error_message,
+                )
+            if not retry_keys:
+                break
+            delay = (
+                settings.azure_search_upload_retry_base_seconds
+                * (2**attempt)
+                * (0.5 + random.random())
+            )
             logger.info(
-                "bulk_chunks_stored",
-                total_chunks=len(chunks),
-                succeeded=success_count,
-                batches=total_batches,
+                "bulk_upload_retrying_documents",
+                documents=len(retry_keys),
+                attempt=attempt + 1,
+                delay_seconds=round(delay, 3),
             )
-            return success_count
+            await asyncio.sleep(delay)
+            pending = [d for d in pending if d["id"] in retry_keys]
+        return succeeded
 
-        except Exception as error:
-            logger.error("bulk_store_failed", error=str(error), stored=success_count)
-            raise
+    async def set_total_chunks(
+        self,
+        chunk_ids: list[str],
+        total_chunks: int,
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        Set `total_chunks` on chunks that were uploaded before the final count was known.
+
+        Uses merge requests carrying only the id and count, so embeddings are not re-sent.
+
+        Args:
+            chunk_ids: IDs of the chunks to update
+            total_chunks: The document's final chunk count
+            batch_size: Number of documents per merge batch (max 1000)
+
+        Returns:
+            Number of successfully updated chunks
+        """
+        if not chunk_ids or not await self._ensure_initialized():
+            return 0
+
+        updated = 0
+        for i in range(0, len(chunk_ids), batch_size):
+            batch = [
+                {"id": chunk_id, "total_chunks": total_chunks}
+                for chunk_id in chunk_ids[i : i + batch_size]
+            ]
+            result = await self._search_client.merge_documents(documents=batch)
+            updated += sum(1 for r in result if r.succeeded)
+        logger.debug("total_chunks_set", chunks=len(chunk_ids), updated=updated)
+        return updated
+
+    async def update_chunk_fields(
+        self,
+        document_id: str,
+        user_id: str,
+        updates: list[dict[str, Any]],
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        Update fields of existing chunks without re-sending their embeddings.
+
+        Args:
+            document_id: The document the chunks belong to
+            user_id: The user identifier
+            updates: Merge documents, each with the chunk `id` and the fields to set
+            batch_size: Number of documents per merge batch (max 1000)
+
+        Returns:
+            Number of successfully updated chunks
+        """
+        if not updates or not await self._ensure_initialized():
+            return 0
+
+        if self._hot_tier is not None:
+            self._hot_tier.invalidate(user_id, document_id)
+        updated = 0
+        for i in range(0, len(updates), batch_size):
+            result = await self._search_client.merge_documents(
+                documents=updates[i : i + batch_size]
+            )
+            updated += sum(1 for r in result if r.succeeded)
+        logger.debug("chunk_fields_updated", document_id=document_id, updated=updated)
+        return updated
+
+    async def delete_chunks(
+        self,
+        document_id: str,
+        user_id: str,
+        chunk_ids: list[str],
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        Delete specific chunks of a document by id.
+
+        Args:
+            document_id: The document the chunks belong to
+            user_id: The user identifier
+            chunk_ids: IDs of the chunks to delete
+            batch_size: Number of documents per delete batch (max 1000)
+
+        Returns:
+            Number of chunks deleted
+        """
+        if not chunk_ids or not await self._ensure_initialized():
+            return 0
+
+        if self._hot_tier is not None:
+            self._hot_tier.invalidate(user_id, document_id)
+        deleted = 0
+        for i in range(0, len(chunk_ids), batch_size):
+            result = await self._search_client.delete_documents(
+                documents=[{"id": chunk_id} for chunk_id in chunk_ids[i : i + batch_size]]
+            )
+            deleted += sum(1 for r in result if r.succeeded)
+        logger.info("chunks_deleted", document_id=document_id, count=deleted)
+        return deleted
+
+    async def iter_chunk_positions(
+        self, document_id: str, user_id: str
+    ) -> AsyncIterator[tuple[str, int, int]]:
+        """
+        Yield the id, index and page of every indexed chunk of a document.
+
+        Chunk ids are derived from the chunks' content hashes, so this is all a re-index
+        needs to match new chunks against the indexed ones; text and vectors are not fetched.
+
+        Args:
+            document_id: The document identifier
+            user_id: The user identifier
+
+        Yields:
+            (chunk id, chunk_index, page_number) tuples, page_number 0 when unknown
+        """
+        if not await self._ensure_initialized():
+            return
+
+        results = await self._search_client.search(
+            search_text="*",
+            filter=f"document_id eq '{document_id}' and user_id eq '{user_id}'",
+            select=["id", "chunk_index", "page_number"],
+        )
+        async for result in results:
+            yield result["id"], result.get("chunk_index") or 0, result.get("page_number") or 0
 
     async def store_document_chunk(
         self,
@@ -386,6 +703,7 @@ class AzureSearchService:
         try:
             result = await self._search_client.upload_documents(documents=[document])
             if result[0].succeeded:
+                self._add_to_hot_tier([document], result)
                 logger.debug(
                     "chunk_stored",
                     chunk_id=chunk_id,
@@ -404,6 +722,113 @@ class AzureSearchService:
             raise
             raise
 
+    @staticmethod
+    def _query_oversampling() -> float | None:
+        """Oversampling for vector queries; applies only to compressed, rescored fields.
+
+        Sent with every query so a changed setting takes effect without rebuilding the index.
+        """
+        if (
+            settings.azure_search_vector_compression.lower() == "none"
+            or not settings.azure_search_vector_rescore
+        ):
+            return None
+        return settings.azure_search_vector_oversampling
+
+    def _add_to_hot_tier(self, documents: list[dict[str, Any]], results: list[Any]) -> None:
+        """Keep successfully uploaded chunks resident for local document-scoped search."""
+        if self._hot_tier is None:
+            return
+        by_document: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        for document, result in zip(documents, results, strict=False):
+            if result.succeeded:
+                key = (document["user_id"], document["document_id"])
+                by_document.setdefault(key, []).append(document)
+        for (user_id, document_id), records in by_document.items():
+            self._hot_tier.add_records(user_id, document_id, records)
+
+    async def _hot_tier_search(
+        self, embedding: list[float], options: VectorSearchOptions
+    ) -> list[dict[str, Any]] | None:
+        """Answer a single-document search in-process, loading the document on first use.
+
+        Returns None when the hot tier is disabled, the search is not scoped to one document,
+        or the document is too large to keep resident or has no chunks; the caller then queries
+        Azure.
+        """
+        if self._hot_tier is None or not options.user_id or not options.document_id:
+            return None
+        if self._hot_tier.is_skipped(options.user_id, options.document_id):
+            return None
+
+        search_kwargs = {
+            "user_id": options.user_id,
+            "document_id": options.document_id,
+            "top_k": options.top_k,
+            "min_similarity": options.min_similarity,
+        }
+        items = self._hot_tier.search(embedding, **search_kwargs)
+        if items is None:
+            await self._load_hot_document(options.user_id, options.document_id)
+            items = self._hot_tier.search(embedding, **search_kwargs)
+        if items is not None:
+            logger.debug(
+                "vector_search_hot_tier_hit",
+                results=len(items),
+                top_k=options.top_k,
+                document_id=options.document_id,
+            )
+        return items
+
+    async def _load_hot_document(self, user_id: str, document_id: str) -> None:
+        assert self._hot_tier is not None
+        key = f"{user_id}:{document_id}"
+        lock = await self._hot_tier_loads.acquire(key)
+        try:
+            async with lock:
+                if (user_id, document_id) in self._hot_tier or self._hot_tier.is_skipped(
+                    user_id, document_id
+                ):
+                    return
+                limit = self._hot_tier.max_chunks_per_document
+                results = await self._search_client.search(
+                    search_text="*",
+                    filter=f"document_id eq '{document_id}' and user_id eq '{user_id}'",
+                    select=[
+                        "id",
+                        "document_id",
+                        "user_id",
+                        "content",
+                        "chunk_index",
+                        "page_number",
+                        "title",
+                        "filename",
+                        "embedding",
+                    ],
+                    top=limit + 1,
+                )
+                records = [result async for result in results]
+                if not records or len(records) > limit:
+                    # Remember it so later queries skip the download until the TTL passes.
+                    self._hot_tier.skip(user_id, document_id, too_large=bool(records))
+                    logger.info(
+                        "vector_search_hot_tier_skipped",
+                        document_id=document_id,
+                        chunks=len(records),
+                    )
+                    return
+                self._hot_tier.add_records(user_id, document_id, records)
+                logger.info(
+                    "vector_search_hot_tier_loaded",
+                    document_id=document_id,
+                    chunks=len(records),
+                )
+        except Exception as error:
+            # The remote search below still answers the request.
+            logger.warning("vector_search_hot_tier_load_failed", error=str(error))
+        finally:
+            await self._hot_tier_loads.release(key)
+
     async def vector_search(
         self,
         embedding: list[float],
@@ -426,21 +851,17 @@ class AzureSearchService:
         if options is None:
             options = VectorSearchOptions()
 
-        try:
-            # Build filter expression
-            filters = []
-            if options.user_id:
-                filters.append(f"user_id eq '{options.user_id}'")
-            if options.document_id:
-                filters.append(f"document_id eq '{options.document_id}'")
-
-            filter_expression = " and ".join(filters) if filters else None
+        local = await self._hot_tier_search(embedding, options)
+        if local is not None:
+            return local
 
+        try:
             # Create vector query
             vector_query = VectorizedQuery(
                 vector=embedding,
                 k_nearest_neighbors=options.top_k,
                 fields="embedding",
+                oversampling=self._query_oversampling(),
             )
 
             start_time = time.time()
@@ -449,18 +870,9 @@ class AzureSearchService:
             results = await self._search_client.search(
                 search_text=None,
                 vector_queries=[vector_query],
-                filter=filter_expression,
+                filter=_search_filter(options),
                 top=options.top_k,
-                select=[
-                    "id",
-                    "document_id",
-                    "user_id",
-                    "content",
-                    "chunk_index",
-                    "page_number",
-                    "title",
-                    "filename",
-                ],
+                select=list(_RESULT_FIELDS),
             )
 
             # Process results (async iteration)
@@ -473,21 +885,7 @@ class AzureSearchService:
                 if options.min_similarity > 0 and similarity < options.min_similarity:
                     continue
 
-                items.append(
-                    {
-                        "id": result["id"],
-                        "document_id": result["document_id"],
-                        "user_id": result.get("user_id", ""),
-                        "content": result["content"],
-                        "chunk_index": result.get("chunk_index", 0),
-                        "page_number": result.get("page_number", 0),
-                        "similarity": similarity,
-                        "metadata": {
-                            "title": result.get("title", ""),
-                            "filename": result.get("filename", ""),
-                        },
-                    }
-                )
+                items.append(_result_item(result, similarity=similarity))
 
             query_time = (time.time() - start_time) * 1000
             logger.info(
@@ -504,6 +902,127 @@ class AzureSearchService:
             logger.error("vector_search_failed", error=str(error))
             raise
 
+    async def keyword_search(
+        self,
+        query: str,
+        options: VectorSearchOptions | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Perform full-text (BM25) search over chunk content.
+
+        Args:
+            query: The search text
+            options: Search options (`min_similarity` does not apply to keyword scores)
+
+        Returns:
+            List of matching document chunks with `keyword_score` set
+        """
+        if not await self._ensure_initialized():
+            logger.warning("azure_search_not_initialized")
+            return []
+
+        if options is None:
+            options = VectorSearchOptions()
+
+        try:
+            start_time = time.time()
+            results = await self._search_client.search(
+                search_text=query,
+                search_fields=["content"],
+                filter=_search_filter(options),
+                top=options.top_k,
+                select=list(_RESULT_FIELDS),
+            )
+            items = [
+                _result_item(result, keyword_score=result.get("@search.score", 0.0))
+                async for result in results
+            ]
+
+            query_time = (time.time() - start_time) * 1000
+            logger.info(
+                "keyword_search_completed",
+                results=len(items),
+                query_time_ms=f"{query_time:.2f}",
+                top_k=options.top_k,
+                document_id=options.document_id,
+            )
+            return items
+
+        except Exception as error:
+            logger.error("keyword_search_failed", error=str(error))
+            raise
+
+    async def hybrid_search(
+        self,
+        query: str,
+        embedding: list[float],
+        options: VectorSearchOptions | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Run keyword and vector searches concurrently and fuse them with reciprocal rank fusion.
+
+        Each search returns up to `retrieval_candidates` chunks. `min_similarity` filters the
+        vector results, so exact keyword matches are kept even when their embedding is a weak
+        match; keyword results scoring below `retrieval_keyword_relative_floor` x the top
+        keyword score are dropped instead. The fused list is optionally reranked locally
+        (`retrieval_rerank_enabled`) and cut adaptively (`retrieval_adaptive_top_k`), on
+        `rerank_score` or, without reranking, on the RRF scores rescaled to [0, 1].
+
+        Azure's built-in hybrid query fuses server-side in one request, but returns only the
+        fused score; fusing here keeps the cosine similarity (used for source confidence) and
+        lets the vector side be answered by the hot tier.
+
+        Args:
+            query: The user's query text
+            embedding: The query embedding vector
+            options: Search options; `top_k` is the maximum number of results
+
+        Returns:
+            Fused chunks, best first, with `rrf_score` and `rerank_score` (when reranked) or
+            `fused_score` (the rescaled RRF score)
+        """
+        if options is None:
+            options = VectorSearchOptions()
+
+        candidates = replace(options, top_k=max(options.top_k, settings.retrieval_candidates))
+        start_time = time.perf_counter()
+        vector_items, keyword_items = await asyncio.gather(
+            self.vector_search(embedding, candidates),
+            self.keyword_search(query, candidates),
+        )
+        keyword_items = above_relative_floor(
+            keyword_items, "keyword_score", settings.retrieval_keyword_relative_floor
+        )
+        items = reciprocal_rank_fusion([vector_items, keyword_items], k=settings.retrieval_rrf_k)
+        if settings.retrieval_rerank_enabled:
+            items = rerank(query, items, weight=settings.retrieval_rerank_weight)
+            score_key = "rerank_score"
+        else:
+            scaled = min_max_scaled([item["rrf_score"] for item in items])
+            for item, score in zip(items, scaled, strict=True):
+                item["fused_score"] = score
+            score_key = "fused_score"
+        if settings.retrieval_adaptive_top_k:
+            items = adaptive_cutoff(
+                items,
+                score_key=score_key,
+                max_k=options.top_k,
+                min_k=settings.retrieval_min_k,
+                relative_floor=settings.retrieval_relative_floor,
+            )
+        else:
+            items = items[: options.top_k]
+
+        logger.info(
+            "hybrid_search_completed",
+            vector_results=len(vector_items),
+            keyword_results=len(keyword_items),
+            results=len(items),
+            query_time_ms=f"{(time.perf_counter() - start_time) * 1000:.2f}",
+            document_id=options.document_id,
+        )
+        return items
+
     async def list_user_documents(self, user_id: str, limit: int = 50) -> list[dict]:
         """
         List documents for a user by aggregating unique document IDs.
@@ -582,6 +1101,8 @@ class AzureSearchService:
 
             # Collect chunk IDs to delete (async iteration)
             chunk_ids = [{"id": result["id"]} async for result in results]
+            if self._hot_tier is not None:
+                self._hot_tier.invalidate(user_id, document_id)
 
             if not chunk_ids:
                 return 0
@@ -663,6 +1184,8 @@ class AzureSearchService:
         self._search_client = None
         self._credential = None
         self._initialized = False
+        if self._hot_tier is not None:
+            self._hot_tier.clear()
         logger.info("azure_search_disposed")
 
 
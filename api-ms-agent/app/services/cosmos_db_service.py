@@ -92,6 +92,25 @@ class DocumentMetadata:
     pages: int | None = None
     created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
     metadata: dict[str, Any] = field(default_factory=dict)
+    # Hash of the indexed text. Chunk hashes are part of the chunks' search keys, so a
+    # re-index matches chunks against the index rather than against this item.
+    content_hash: str | None = None
+
+
+def _document_metadata_from_item(item: dict[str, Any]) -> DocumentMetadata:
+    return DocumentMetadata(
+        id=item["id"],
+        document_id=item["document_id"],
+        user_id=item["user_id"],
+        title=item.get("title") or "",
+        filename=item.get("filename"),
+        content_type=item.get("content_type"),
+        chunk_count=item.get("chunk_count", 0),
+        pages=item.get("pages"),
+        created_at=datetime.fromisoformat(item["created_at"]),
+        metadata=item.get("metadata") or {},
+        content_hash=item.get("content_hash"),
+    )
 
 
 @dataclass
@@ -352,7 +371,7 @@ class CosmosDbService:
             logger.info("session_created", session_id=session_id, user_id=user_id)
 
             # Invalidate session listing cache (unfiltered) for this user.
-            self._invalidate_user_sessions_cache(user_id)
+            await self._invalidate_user_sessions_cache(user_id)
             return session
         except Exception as error:
             logger.error("session_create_failed", error=str(error), user_id=user_id)
@@ -412,8 +431,8 @@ class CosmosDbService:
             logger.debug("message_saved", message_id=message_id, session_id=session_id)
 
             # Invalidate cache so next read gets fresh data
-            self._invalidate_chat_history_cache(session_id, user_id)
-            self._invalidate_user_sessions_cache(user_id)
+            await self._invalidate_chat_history_cache(session_id, user_id)
+            await self._invalidate_user_sessions_cache(user_id)
 
             # Update session metadata - pass content for title if user message
             first_msg = content if role == "user" else None
@@ -427,21 +446,21 @@ class CosmosDbService:
             )
             return message
 
-    def _invalidate_chat_history_cache(self, session_id: str, user_id: str) -> None:
+    async def _invalidate_chat_history_cache(self, session_id: str, user_id: str) -> None:
         key = _cache_key("chat_history", {"session_id": session_id, "user_id": user_id})
-        _get_db_cache().delete(key)
+        await _get_db_cache().adelete(key)
 
-    def _invalidate_user_sessions_cache(self, user_id: str) -> None:
+    async def _invalidate_user_sessions_cache(self, user_id: str) -> None:
         key = _cache_key("user_sessions", {"user_id": user_id})
-        _get_db_cache().delete(key)
+        await _get_db_cache().adelete(key)
 
-    def _invalidate_user_documents_cache(self, user_id: str) -> None:
+    async def _invalidate_user_documents_cache(self, user_id: str) -> None:
         key = _cache_key("user_documents", {"user_id": user_id})
-        _get_db_cache().delete(key)
+        await _get_db_cache().adelete(key)
 
-    def _invalidate_workflow_state_cache(self, workflow_id: str, user_id: str) -> None:
+    async def _invalidate_workflow_state_cache(self, workflow_id: str, user_id: str) -> None:
         key = _cache_key("workflow_state", {"workflow_id": workflow_id, "user_id": user_id})
-        _get_db_cache().delete(key)
+        await _get_db_cache().adelete(key)
 
     async def get_chat_history(
         self,
@@ -467,7 +486,7 @@ class CosmosDbService:
             return []
 
         cache_key = _cache_key("chat_history", {"session_id": session_id, "user_id": user_id})
-        cached = _get_db_cache().get(cache_key)
+        cached = await _get_db_cache().aget(cache_key)
         if cached is not None:
             try:
                 payload = json.loads(cached.decode("utf-8"))
@@ -546,7 +565,7 @@ class CosmosDbService:
                         for m in messages
                     ]
                 }
-                _get_db_cache().set(cache_key, canonical_json(serialized).encode("utf-8"))
+                await _get_db_cache().aset(cache_key, canonical_json(serialized).encode("utf-8"))
             except Exception:
                 pass
 
@@ -590,7 +609,7 @@ class CosmosDbService:
         # Cache only the unfiltered listing to avoid incorrect prefix-filtered caching.
         if session_id_prefix is None:
             cache_key = _cache_key("user_sessions", {"user_id": user_id})
-            cached = _get_db_cache().get(cache_key)
+            cached = await _get_db_cache().aget(cache_key)
             if cached is not None:
                 try:
                     payload = json.loads(cached.decode("utf-8"))
@@ -673,7 +692,9 @@ class CosmosDbService:
                         ]
                     }
                     cache_key = _cache_key("user_sessions", {"user_id": user_id})
-                    _get_db_cache().set(cache_key, canonical_json(serialized).encode("utf-8"))
+                    await _get_db_cache().aset(
+                        cache_key, canonical_json(serialized).encode("utf-8")
+                    )
                 except Exception:
                     pass
 
@@ -752,8 +773,8 @@ class CosmosDbService:
 
             if deleted:
                 logger.info("session_deleted", session_id=session_id, user_id=user_id)
-                self._invalidate_chat_history_cache(session_id, user_id)
-                self._invalidate_user_sessions_cache(user_id)
+                await self._invalidate_chat_history_cache(session_id, user_id)
+                await self._invalidate_user_sessions_cache(user_id)
                 return True
             else:
                 logger.warning("session_not_found", session_id=session_id)
@@ -782,7 +803,7 @@ class CosmosDbService:
             existing["message_count"] = existing.get("message_count", 0) + 1
             existing["last_updated"] = datetime.now(UTC).isoformat()
             await self.chat_container.replace_item(item=item_id, body=existing)
-            self._invalidate_user_sessions_cache(user_id)
+            await self._invalidate_user_sessions_cache(user_id)
         except CosmosResourceNotFoundError:
             # Session doesn't exist yet - create it
             now = datetime.now(UTC)
@@ -805,7 +826,7 @@ class CosmosDbService:
             try:
                 await self.chat_container.create_item(body=new_session)
                 logger.info("session_auto_created", session_id=session_id, user_id=user_id)
-                self._invalidate_user_sessions_cache(user_id)
+                await self._invalidate_user_sessions_cache(user_id)
             except Exception as create_error:
                 logger.debug(
                     "session_auto_create_failed",
@@ -841,6 +862,7 @@ class CosmosDbService:
         chunk_count: int = 0,
         pages: int | None = None,
         metadata: dict[str, Any] | None = None,
+        content_hash: str | None = None,
     ) -> DocumentMetadata:
         """
         Save document metadata to Cosmos DB.
@@ -856,6 +878,7 @@ class CosmosDbService:
             chunk_count: Number of chunks in Azure AI Search
             pages: Number of pages (for PDFs)
             metadata: Additional metadata
+            content_hash: Hash of the indexed text
 
         Returns:
             The saved document metadata
@@ -870,6 +893,7 @@ class CosmosDbService:
             chunk_count=chunk_count,
             pages=pages,
             metadata=metadata or {},
+            content_hash=content_hash,
         )
 
         if not await self._ensure_initialized():
@@ -888,16 +912,46 @@ class CosmosDbService:
             "created_at": doc_meta.created_at.isoformat(),
             "metadata": metadata or {},
         }
+        if content_hash is not None:
+            item["content_hash"] = content_hash
 
         try:
             await self.documents_container.upsert_item(body=item)
             logger.info("document_metadata_saved", document_id=document_id, user_id=user_id)
-            self._invalidate_user_documents_cache(user_id)
+            await self._invalidate_user_documents_cache(user_id)
             return doc_meta
         except Exception as error:
             logger.error("document_metadata_save_failed", error=str(error), document_id=document_id)
             return doc_meta
 
+    async def get_document_metadata(
+        self, document_id: str, user_id: str
+    ) -> DocumentMetadata | None:
+        """
+        Get document metadata by ID.
+
+        Args:
+            document_id: The document identifier
+            user_id: The user identifier
+
+        Returns:
+            The document metadata or None if not found
+        """
+        if not await self._ensure_initialized():
+            return None
+
+        try:
+            item = await self.documents_container.read_item(
+                item=f"doc_{document_id}",
+                partition_key=user_id,
+            )
+            return _document_metadata_from_item(item)
+        except CosmosResourceNotFoundError:
+            return None
+        except Exception as error:
+            logger.error("document_metadata_get_failed", error=str(error), document_id=document_id)
+            return None
+
     async def list_user_documents(self, user_id: str, limit: int = 50) -> list[dict]:
         """
         List document metadata for a user.
@@ -913,7 +967,7 @@ class CosmosDbService:
             return []
 
         cache_key = _cache_key("user_documents", {"user_id": user_id})
-        cached = _get_db_cache().get(cache_key)
+        cached = await _get_db_cache().aget(cache_key)
         if cached is not None:
             try:
                 payload = json.loads(cached.decode("utf-8"))
@@ -958,7 +1012,7 @@ class CosmosDbService:
 
             try:
                 serialized = {"documents": result}
-                _get_db_cache().set(cache_key, canonical_json(serialized).encode("utf-8"))
+                await _get_db_cache().aset(cache_key, canonical_json(serialized).encode("utf-8"))
             except Exception:
                 pass
 
@@ -994,7 +1048,7 @@ class CosmosDbService:
                 partition_key=user_id,
             )
             logger.info("document_metadata_deleted", document_id=document_id)
-            self._invalidate_user_documents_cache(user_id)
+            await self._invalidate_user_documents_cache(user_id)
             return True
         except CosmosResourceNotFoundError:
             logger.warning("document_metadata_not_found", document_id=document_id)
@@ -1092,7 +1146,7 @@ class CosmosDbService:
                     "created_at": workflow_state.created_at.isoformat(),
                     "updated_at": workflow_state.updated_at.isoformat(),
                 }
-                _get_db_cache().set(cache_key, canonical_json(serialized).encode("utf-8"))
+                await _get_db_cache().aset(cache_key, canonical_json(serialized).encode("utf-8"))
             except Exception:
                 pass
 
@@ -1116,7 +1170,7 @@ class CosmosDbService:
             return None
 
         cache_key = _cache_key("workflow_state", {"workflow_id": workflow_id, "user_id": user_id})
-        cached = _get_db_cache().get(cache_key)
+        cached = await _get_db_cache().aget(cache_key)
         if cached is not None:
             try:
                 item = json.loads(cached.decode("utf-8"))
@@ -1170,7 +1224,7 @@ class CosmosDbService:
                     "created_at": state.created_at.isoformat(),
                     "updated_at": state.updated_at.isoformat(),
                 }
-                _get_db_cache().set(cache_key, canonical_json(serialized).encode("utf-8"))
+                await _get_db_cache().aset(cache_key, canonical_json(serialized).encode("utf-8"))
             except Exception:
                 pass
 
@@ -1275,7 +1329,7 @@ class CosmosDbService:
                 partition_key=user_id,
             )
             logger.info("workflow_deleted", workflow_id=workflow_id)
-            self._invalidate_workflow_state_cache(workflow_id, user_id)
+            await self._invalidate_workflow_state_cache(workflow_id, user_id)
             return True
         except CosmosResourceNotFoundError:
             logger.warning("workflow_not_found", workflow_id=workflow_id)
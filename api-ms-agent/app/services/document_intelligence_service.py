@@ -14,10 +14,12 @@ Falls back to pypdf for PDF files when Document Intelligence is not configured.
 """
 
 import asyncio
+import codecs
 import re
+from collections.abc import AsyncIterator, Iterator
 from dataclasses import dataclass, field
 from io import BytesIO
-from typing import Any
+from typing import IO, Any
 from urllib.parse import urlparse
 
 from app.config import settings
@@ -68,7 +70,46 @@ class DocumentAnalysisResult:
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
-def _create_proxy_polling_method(proxy_base_url: str):
+@dataclass
+class StreamingAnalysisResult:
+    """Result from streaming document analysis.
+
+    Exactly one of `text_blocks` (plain-text formats, decoded lazily from the source) or
+    `paragraphs` (Document Intelligence layout output) is set. Neither materializes the
+    full document text.
+    """
+
+    pages: int
+    tables_count: int = 0
+    text_blocks: AsyncIterator[str] | None = None
+    paragraphs: Iterator[ParagraphWithPage] | None = None
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+def _fixed_interval_polling_class():
+    """AsyncLROBasePolling that polls every `timeout` seconds instead of the SDK cadence.
+
+    The SDK otherwise sleeps for the service's Retry-After between polls; a configured
+    interval lets short analyses return sooner and long ones poll less often.
+    """
+    from azure.core.polling.async_base_polling import AsyncLROBasePolling
+
+    class FixedIntervalPolling(AsyncLROBasePolling):
+        def _extract_delay(self) -> float:
+            return self._timeout
+
+    return FixedIntervalPolling
+
+
+def _create_polling_method(polling_interval: float):
+    """Create a polling method for a direct Azure endpoint with a fixed polling interval."""
+    endpoint = settings.azure_document_intelligence_endpoint.rstrip("/")
+    return _fixed_interval_polling_class()(
+        timeout=polling_interval, path_format_arguments={"endpoint": endpoint}
+    )
+
+
+def _create_proxy_polling_method(proxy_base_url: str, polling_interval: float = 30):
     """
     Create an async polling method that rewrites Operation-Location URLs through the proxy.
 
@@ -81,11 +122,11 @@ def _create_proxy_polling_method(proxy_base_url: str):
 
     Args:
         proxy_base_url: The base URL of the proxy (e.g., https://proxy.example.com/document-intelligence)
+        polling_interval: Seconds between status polls
 
     Returns:
         A custom AsyncLROBasePolling instance that rewrites URLs
     """
-    from azure.core.polling.async_base_polling import AsyncLROBasePolling
     from azure.core.polling.base_polling import OperationResourcePolling
 
     class ProxyOperationResourcePolling(OperationResourcePolling):
@@ -137,17 +178,83 @@ def _create_proxy_polling_method(proxy_base_url: str):
                     if parsed.query:
                         self._location_url += f"?{parsed.query}"
 
-    class ProxyAsyncLROBasePolling(AsyncLROBasePolling):
+    class ProxyAsyncLROBasePolling(_fixed_interval_polling_class()):
         """Async LRO polling that uses the proxy for all polling requests."""
 
-        def __init__(self, proxy_url: str, timeout: int = 30, **kwargs):
+        def __init__(self, proxy_url: str, timeout: float = 30, **kwargs):
             # Create custom lro_algorithms with our proxy-aware polling
             lro_algorithms = [
                 ProxyOperationResourcePolling(proxy_url),
             ]
             super().__init__(timeout=timeout, lro_algorithms=lro_algorithms, **kwargs)
 
-    return ProxyAsyncLROBasePolling(proxy_base_url)
+    return ProxyAsyncLROBasePolling(proxy_base_url, timeout=polling_interval)
+
+
+def _iter_layout_paragraphs(result: Any, page_offset: int = 0) -> Iterator[ParagraphWithPage]:
+    """Yield non-empty layout paragraphs with their 1-based page number.
+
+    `page_offset` is added to page numbers of results for a page range of a larger document.
+    """
+    for p in result.paragraphs or ():
+        if p.content:
+            # Get page number from bounding_regions (1-based)
+            page_num = 1  # Default to page 1
+            if p.bounding_regions and len(p.bounding_regions) > 0:
+                page_num = p.bounding_regions[0].page_number
+            yield ParagraphWithPage(content=p.content, page_number=page_num + page_offset)
+
+
+def _iter_parts_paragraphs(parts: list[tuple[int, Any]]) -> Iterator[ParagraphWithPage]:
+    for page_offset, result in parts:
+        yield from _iter_layout_paragraphs(result, page_offset)
+
+
+def _open_splittable_pdf(source: IO[bytes], pages_per_range: int) -> Any | None:
+    """Return a PdfReader for `source` if it has more than `pages_per_range` pages (blocking).
+
+    The source position is restored, so an unsplittable file can still be sent as a whole.
+    """
+    from pypdf import PdfReader
+
+    position = source.tell()
+    try:
+        reader = PdfReader(source)
+        if reader.is_encrypted or len(reader.pages) <= pages_per_range:
+            return None
+        return reader
+    except Exception as exc:
+        logger.debug("pdf_split_unavailable", error=str(exc))
+        return None
+    finally:
+        source.seek(position)
+
+
+def _write_pdf_pages(reader: Any, start: int, end: int) -> bytes:
+    """Write pages [start, end) of `reader` as a standalone PDF (blocking)."""
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for index in range(start, end):
+        writer.add_page(reader.pages[index])
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+async def _iter_text_blocks(source: IO[bytes], block_size: int) -> AsyncIterator[str]:
+    """Decode a binary file as UTF-8 one block at a time, off the event loop."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    while True:
+        raw = await asyncio.to_thread(source.read, block_size)
+        if not raw:
+            break
+        text = decoder.decode(raw)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
 
 
 class DocumentIntelligenceService:
@@ -304,40 +411,244 @@ class DocumentIntelligenceService:
             endpoint=settings.azure_document_intelligence_endpoint,
         )
 
+        parts = await self._analyze_layout_parts(
+            BytesIO(content),
+            filename=filename,
+            content_type=resolved_content_type,
+            content_length=len(content),
+        )
+        results = [result for _, result in parts]
+
+        # Extract full text content
+        full_content = "\n".join(result.content for result in results if result.content)
+
+        # Extract paragraphs with page numbers for citations
+        paragraphs_with_pages = list(_iter_parts_paragraphs(parts))
+        # Paragraphs for structured access (legacy: just content)
+        paragraphs = [p.content for p in paragraphs_with_pages]
+
+        # Extract tables as structured data
+        tables = []
+        for result in results:
+            for table in result.tables or ():
+                table_data = {
+                    "row_count": table.row_count,
+                    "column_count": table.column_count,
+                    "cells": [],
+                }
+                if table.cells:
+                    for cell in table.cells:
+                        table_data["cells"].append(
+                            {
+                                "row": cell.row_index,
+                                "column": cell.column_index,
+                                "content": cell.content,
+                            }
+                        )
+                tables.append(table_data)
+
+        # Count pages
+        page_count = sum(len(result.pages) for result in results if result.pages) or 1
+
+        logger.info(
+            "document_analyzed",
+            filename=filename,
+            pages=page_count,
+            content_length=len(full_content),
+            tables=len(tables),
+            paragraphs=len(paragraphs),
+        )
+
+        return DocumentAnalysisResult(
+            content=full_content,
+            pages=page_count,
+            tables=tables,
+            paragraphs=paragraphs,
+            paragraphs_with_pages=paragraphs_with_pages,
+            metadata={
+                "source": "azure_document_intelligence",
+                "model": "prebuilt-layout",
+                "filename": filename,
+            },
+        )
+
+    async def analyze_document_stream(
+        self,
+        source: IO[bytes],
+        filename: str,
+        content_type: str | None = None,
+        *,
+        content_length: int | None = None,
+        block_size: int = 256 * 1024,
+    ) -> StreamingAnalysisResult:
+        """
+        Analyze a document from a file object without reading it into memory first.
+
+        Text-based formats are decoded lazily in `block_size` pieces as the caller iterates
+        `text_blocks`. Other formats stream `source` to Document Intelligence as the request
+        body and yield layout paragraphs from the service response.
+
+        Args:
+            source: Seekable binary file positioned at the start of the document
+            filename: The original filename (used for format detection)
+            content_type: Optional MIME type
+            content_length: Optional size in bytes, for logging
+            block_size: Bytes decoded per text block
+
+        Returns:
+            StreamingAnalysisResult whose iterator must be consumed by the caller
+        """
+        if self.is_text_based(filename):
+            logger.debug(
+                "processing_text_file_stream",
+                filename=filename,
+                content_length=content_length,
+            )
+            return StreamingAnalysisResult(
+                pages=1,
+                text_blocks=_iter_text_blocks(source, block_size),
+                metadata={"source": "text_decode", "filename": filename},
+            )
+
+        extension = f".{filename.lower().split('.')[-1]}" if filename else ""
+        resolved_content_type = content_type or SUPPORTED_EXTENSIONS.get(
+            extension, "application/octet-stream"
+        )
+
+        logger.info(
+            "starting_document_analysis",
+            filename=filename,
+            content_length=content_length,
+            content_type=resolved_content_type,
+            extension=extension,
+            endpoint=settings.azure_document_intelligence_endpoint,
+        )
+
+        parts = await self._analyze_layout_parts(
+            source,
+            filename=filename,
+            content_type=resolved_content_type,
+            content_length=content_length or 0,
+        )
+        results = [result for _, result in parts]
+        page_count = sum(len(result.pages) for result in results if result.pages) or 1
+        tables_count = sum(len(result.tables) for result in results if result.tables)
+
+        logger.info(
+            "document_analyzed",
+            filename=filename,
+            pages=page_count,
+            tables=tables_count,
+            paragraphs=sum(len(result.paragraphs) for result in results if result.paragraphs),
+        )
+
+        return StreamingAnalysisResult(
+            pages=page_count,
+            tables_count=tables_count,
+            paragraphs=_iter_parts_paragraphs(parts),
+            metadata={
+                "source": "azure_document_intelligence",
+                "model": "prebuilt-layout",
+                "filename": filename,
+            },
+        )
+
+    async def _analyze_layout_parts(
+        self,
+        body: IO[bytes],
+        *,
+        filename: str,
+        content_type: str,
+        content_length: int,
+    ) -> list[tuple[int, Any]]:
+        """Analyze `body`, fanning large PDFs out as concurrent page-range analyses.
+
+        Returns (page offset, AnalyzeResult) pairs in page order. Documents that are not split
+        (feature disabled, not a PDF, short, encrypted or unreadable) are a single (0, result).
+        """
+        pages_per_range = max(1, settings.document_intelligence_pages_per_range)
+        reader = None
+        if settings.document_intelligence_parallel_enabled and content_type == "application/pdf":
+            reader = await asyncio.to_thread(_open_splittable_pdf, body, pages_per_range)
+        if reader is None:
+            result = await self._analyze_layout(
+                body,
+                filename=filename,
+                content_type=content_type,
+                content_length=content_length,
+            )
+            return [(0, result)]
+
+        total_pages = len(reader.pages)
+        offsets = list(range(0, total_pages, pages_per_range))
+        max_concurrent = max(1, settings.document_intelligence_max_concurrent_ranges)
+        logger.info(
+            "document_analysis_fan_out",
+            filename=filename,
+            pages=total_pages,
+            ranges=len(offsets),
+            max_concurrent=max_concurrent,
+        )
+
+        semaphore = asyncio.Semaphore(max_concurrent)
+        # PdfReader reads from the shared source lazily, so page ranges are written one at a time.
+        split_lock = asyncio.Lock()
+
+        async def analyze_range(start: int) -> Any:
+            end = min(start + pages_per_range, total_pages)
+            async with semaphore:
+                async with split_lock:
+                    part = await asyncio.to_thread(_write_pdf_pages, reader, start, end)
+                return await self._analyze_layout(
+                    BytesIO(part),
+                    filename=f"{filename}[pages {start + 1}-{end}]",
+                    content_type=content_type,
+                    content_length=len(part),
+                )
+
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(analyze_range(start)) for start in offsets]
+        return [(start, task.result()) for start, task in zip(offsets, tasks, strict=True)]
+
+    async def _analyze_layout(
+        self,
+        body: IO[bytes],
+        *,
+        filename: str,
+        content_type: str,
+        content_length: int,
+    ) -> Any:
+        """Run the prebuilt-layout model on `body` and return the SDK AnalyzeResult."""
         client = await self._get_client()
 
         try:
             logger.debug(
                 "calling_document_intelligence_api",
                 model_id="prebuilt-layout",
-                content_type=resolved_content_type,
-                content_size_bytes=len(content),
+                content_type=content_type,
+                content_size_bytes=content_length,
             )
 
             # Check if we're using a proxy (endpoint doesn't end with cognitiveservices.azure.com)
             endpoint = settings.azure_document_intelligence_endpoint
             is_proxy = not endpoint.rstrip("/").endswith(".cognitiveservices.azure.com")
 
+            polling_interval = settings.document_intelligence_polling_interval_seconds
             if is_proxy:
                 # Use custom polling that rewrites URLs to go through the proxy
                 logger.debug(
                     "using_proxy_polling",
                     proxy_endpoint=endpoint,
                 )
-                polling_method = _create_proxy_polling_method(endpoint)
-                poller = await client.begin_analyze_document(
-                    model_id="prebuilt-layout",
-                    body=BytesIO(content),
-                    content_type=resolved_content_type,
-                    polling=polling_method,
-                )
+                polling_method = _create_proxy_polling_method(endpoint, polling_interval)
             else:
-                # Use default polling for direct Azure endpoint
-                poller = await client.begin_analyze_document(
-                    model_id="prebuilt-layout",
-                    body=BytesIO(content),
-                    content_type=resolved_content_type,
-                )
+                polling_method = _create_polling_method(polling_interval)
+            poller = await client.begin_analyze_document(
+                model_id="prebuilt-layout",
+                body=body,
+                content_type=content_type,
+                polling=polling_method,
+            )
 
             logger.debug(
                 "document_intelligence_polling",
@@ -362,70 +673,7 @@ class DocumentIntelligenceService:
                 has_paragraphs=bool(result.paragraphs),
                 has_tables=bool(result.tables),
             )
-
-            # Extract full text content
-            full_content = result.content or ""
-
-            # Extract paragraphs for structured access (legacy: just content)
-            paragraphs = []
-            # Extract paragraphs with page numbers for citations
-            paragraphs_with_pages = []
-            if result.paragraphs:
-                for p in result.paragraphs:
-                    if p.content:
-                        paragraphs.append(p.content)
-                        # Get page number from bounding_regions (1-based)
-                        page_num = 1  # Default to page 1
-                        if p.bounding_regions and len(p.bounding_regions) > 0:
-                            page_num = p.bounding_regions[0].page_number
-                        paragraphs_with_pages.append(
-                            ParagraphWithPage(content=p.content, page_number=page_num)
-                        )
-
-            # Extract tables as structured data
-            tables = []
-            if result.tables:
-                for table in result.tables:
-                    table_data = {
-                        "row_count": table.row_count,
-                        "column_count": table.column_count,
-                        "cells": [],
-                    }
-                    if table.cells:
-                        for cell in table.cells:
-                            table_data["cells"].append(
-                                {
-                                    "row": cell.row_index,
-                                    "column": cell.column_index,
-                                    "content": cell.content,
-                                }
-                            )
-                    tables.append(table_data)
-
-            # Count pages
-            page_count = len(result.pages) if result.pages else 1
-
-            logger.info(
-                "document_analyzed",
-                filename=filename,
-                pages=page_count,
-                content_length=len(full_content),
-                tables=len(tables),
-                paragraphs=len(paragraphs),
-            )
-
-            return DocumentAnalysisResult(
-                content=full_content,
-                pages=page_count,
-                tables=tables,
-                paragraphs=paragraphs,
-                paragraphs_with_pages=paragraphs_with_pages,
-                metadata={
-                    "source": "azure_document_intelligence",
-                    "model": "prebuilt-layout",
-                    "filename": filename,
-                },
-            )
+            return result
 
         except Exception as e:
             # Enhanced error logging to diagnose issues
@@ -457,8 +705,8 @@ class DocumentIntelligenceService:
                 error=error_message,
                 error_type=error_type,
                 filename=filename,
-                content_length=len(content),
-                content_type=resolved_content_type,
+                content_length=content_length,
+                content_type=content_type,
                 endpoint=settings.azure_document_intelligence_endpoint,
                 **extra_info,
             )
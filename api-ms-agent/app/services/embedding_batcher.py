@@ -0,0 +1,193 @@
+"""Coalesce concurrent single-text embedding requests into batched calls.
+
+Texts requested within a short window are sent as one `embeddings.create` call, and a text
+that is already queued or in flight is not sent again: every caller awaits the same future.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+from app.core.cache.logging import log_cache_event
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+CreateBatch = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+_NAMESPACE = "embed_batch"
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class EmbeddingBatcher:
+    """Micro-batching coalescer for embedding requests.
+
+    The first text queued opens a window of `window_seconds`; the window is flushed when it
+    elapses or when `max_batch_size` distinct texts are queued. If a batch fails with an error
+    for which `split_on_error` returns True (e.g. one input rejected by the API), its texts are
+    retried one by one so a bad input only fails its own callers.
+    """
+
+    def __init__(
+        self,
+        create_batch: CreateBatch,
+        *,
+        window_seconds: float,
+        max_batch_size: int,
+        split_on_error: Callable[[Exception], bool] | None = None,
+        history: int = 1024,
+    ) -> None:
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be > 0")
+        self._create_batch = create_batch
+        self._window_seconds = max(0.0, window_seconds)
+        self._max_batch_size = max_batch_size
+        self._split_on_error = split_on_error
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._futures: dict[str, asyncio.Future[list[float]]] = {}
+        self._pending: list[str] = []
+        self._window_opened = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+        self._requests = 0
+        self._coalesced = 0
+        self._windows = 0
+        self._texts = 0
+        self._failed_windows = 0
+        # Recent per-window samples: (batch size, window wait ms, call latency ms).
+        self._recent: deque[tuple[int, float, float]] = deque(maxlen=history)
+
+    def stats(self) -> dict[str, object]:
+        sizes = [float(s[0]) for s in self._recent]
+        waits = [s[1] for s in self._recent]
+        latencies = [s[2] for s in self._recent]
+        return {
+            "requests": self._requests,
+            "coalesced": self._coalesced,
+            "windows": self._windows,
+            "texts": self._texts,
+            "failed_windows": self._failed_windows,
+            "pending": len(self._pending),
+            "in_flight": len(self._futures) - len(self._pending),
+            "batch_size": {
+                "mean": round(sum(sizes) / len(sizes), 2) if sizes else 0.0,
+                "p50": _percentile(sizes, 50),
+                "max": max(sizes, default=0.0),
+            },
+            "window_wait_ms": {
+                "p50": round(_percentile(waits, 50), 3),
+                "p95": round(_percentile(waits, 95), 3),
+            },
+            "latency_ms": {
+                "p50": round(_percentile(latencies, 50), 3),
+                "p95": round(_percentile(latencies, 95), 3),
+                "max": round(max(latencies, default=0.0), 3),
+            },
+        }
+
+    async def embed(self, text: str) -> list[float]:
+        """Return the embedding for `text`, sharing the call with concurrent requests."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Futures and timers belong to one loop; start afresh if the loop changed.
+            self._reset(loop)
+
+        self._requests += 1
+        future = self._futures.get(text)
+        if future is not None:
+            self._coalesced += 1
+            log_cache_event(namespace=_NAMESPACE, cache_event="coalesced")
+        else:
+            future = loop.create_future()
+            # Mark failures as retrieved even if every waiter was cancelled.
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._futures[text] = future
+            if not self._pending:
+                self._window_opened = time.perf_counter()
+            self._pending.append(text)
+            if len(self._pending) >= self._max_batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self._window_seconds, self._flush)
+
+        # A cancelled caller must not cancel the call other callers are waiting on.
+        return await asyncio.shield(future)
+
+    def _reset(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._futures = {}
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        texts, self._pending = self._pending, []
+        if not texts:
+            return
+        wait_ms = (time.perf_counter() - self._window_opened) * 1000.0
+        task = asyncio.get_running_loop().create_task(self._run(texts, wait_ms))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, texts: list[str], wait_ms: float) -> None:
+        start = time.perf_counter()
+        failed = False
+        try:
+            results = await self._call(texts)
+        except BaseException as exc:
+            failed = True
+            results = [exc] * len(texts)
+
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        for text, result in zip(texts, results, strict=True):
+            future = self._futures.pop(text, None)
+            if future is None or future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+        self._windows += 1
+        self._texts += len(texts)
+        self._failed_windows += failed
+        self._recent.append((len(texts), wait_ms, latency_ms))
+        log_cache_event(
+            namespace=_NAMESPACE,
+            cache_event="error" if failed else "window",
+            duration_ms=latency_ms,
+            detail=f"size={len(texts)} wait_ms={wait_ms:.3f}",
+        )
+        log_cache_event(namespace=_NAMESPACE, cache_event="texts", count=len(texts))
+
+    async def _call(self, texts: list[str]) -> list[list[float] | BaseException]:
+        try:
+            embeddings = await self._create_batch(texts)
+        except Exception as exc:
+            if len(texts) == 1 or self._split_on_error is None or not self._split_on_error(exc):
+                raise
+            logger.warning("embedding_batch_split", size=len(texts), error=str(exc))
+            return await asyncio.gather(
+                *(self._call_one(text) for text in texts), return_exceptions=True
+            )
+        if len(embeddings) != len(texts):
+            raise RuntimeError("Embedding batch result missing entry")
+        return list(embeddings)
+
+    async def _call_one(self, text: str) -> list[float]:
+        (embedding,) = await self._create_batch([text])
+        return embedding
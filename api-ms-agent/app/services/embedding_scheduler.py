@@ -0,0 +1,394 @@
+"""Token-aware, rate-limit-adaptive scheduling of embedding requests.
+
+All embedding calls of a process share one `EmbeddingScheduler`, so concurrent ingestions
+and query embeddings compete for the deployment's quota through a single controller:
+
+- Texts are packed into requests by estimated token count as well as item count.
+- Concurrency and send rate follow AIMD. Concurrency grows by one slot per `limit` successful
+  requests and the token rate by a tenth of each request's tokens per second; a 429 halves
+  concurrency and cuts the rate to 70% of the recent send rate (once per rate-limit episode).
+  Until the first 429, requests are not paced unless the quota is configured.
+- A 429 pauses *all* senders until its `Retry-After` has elapsed, so throttled requests are
+  not retried into the same exhausted window.
+- A configured tokens-per-minute quota caps the rate, pacing requests before 429s happen.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Sends one request; returns the vectors in input order and the billed prompt tokens if known.
+SendBatch = Callable[[list[str]], Awaitable[tuple[list[list[float]], int | None]]]
+
+_MAX_BACKOFF_SECONDS = 30.0
+_RATE_DECREASE = 0.7
+_RATE_INCREASE = 0.1  # tokens/s gained per token successfully sent
+_SEND_WINDOW_SECONDS = 10.0
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Return True for HTTP 429 responses."""
+    if getattr(exc, "status_code", None) == 429:
+        return True
+    try:
+        from openai import RateLimitError
+
+        return isinstance(exc, RateLimitError)
+    except Exception:
+        return False
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Read `retry-after-ms` / `retry-after` from the error's HTTP response, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if (value := headers.get("retry-after-ms")) is not None:
+            return max(0.0, float(value) / 1000.0)
+        if (value := headers.get("retry-after")) is not None:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                retry_at = parsedate_to_datetime(value).timestamp()
+                return max(0.0, retry_at - time.time())
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+@dataclass(slots=True)
+class _Batch:
+    texts: list[str]
+    chars: int
+    tokens: int
+
+
+class EmbeddingScheduler:
+    """Packs texts into token-bounded requests and sends them under AIMD rate control.
+
+    `is_retryable` classifies non-429 errors; those are retried up to `max_retries` times
+    with jittered exponential backoff. 429s are retried up to `max_rate_limit_retries` times.
+    """
+
+    def __init__(
+        self,
+        send: SendBatch,
+        *,
+        is_retryable: Callable[[Exception], bool],
+        max_batch_items: int = 2048,
+        max_batch_tokens: int = 64_000,
+        initial_concurrency: int = 4,
+        max_concurrency: int = 16,
+        tokens_per_minute: int = 0,
+        burst_seconds: float = 1.0,
+        max_retries: int = 2,
+        max_rate_limit_retries: int = 8,
+        retry_base_seconds: float = 0.5,
+        chars_per_token: float = 4.0,
+    ) -> None:
+        if max_batch_items <= 0 or max_batch_tokens <= 0:
+            raise ValueError("batch limits must be > 0")
+        if not 1 <= initial_concurrency <= max_concurrency:
+            raise ValueError("expected 1 <= initial_concurrency <= max_concurrency")
+        self._send = send
+        self._is_retryable = is_retryable
+        self._max_batch_items = max_batch_items
+        self._max_batch_tokens = max_batch_tokens
+        self._max_concurrency = max_concurrency
+        self._max_retries = max(0, max_retries)
+        self._max_rate_limit_retries = max(0, max_rate_limit_retries)
+        self._retry_base_seconds = retry_base_seconds
+        # Calibrated from billed usage as responses arrive.
+        self._chars_per_token = chars_per_token
+
+        self._limit = float(initial_concurrency)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._decrease_holdoff_until = 0.0
+
+        # Pacing rate in tokens/s (None: unpaced), enforced by a token bucket holding
+        # `burst_seconds` of it. Azure enforces TPM over short windows; offered load is also
+        # measured over at least one such window.
+        self._quota_rate = tokens_per_minute / 60.0 if tokens_per_minute > 0 else None
+        self._rate = self._quota_rate
+        self._burst_seconds = burst_seconds
+        self._bucket = self._rate * burst_seconds if self._rate else 0.0
+        self._bucket_updated = time.monotonic()
+        self._started = time.monotonic()
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Replaced on every state change; waiters re-check their condition when it is set.
+        self._changed: asyncio.Event | None = None
+
+        self._waiting_batches = 0
+        self._waiting_texts = 0
+        self._requests = 0
+        self._rate_limited = 0
+        self._retries = 0
+        self._failures = 0
+        self._last_retry_after: float | None = None
+        # Completed requests over the last minute: (monotonic time, tokens, texts).
+        self._completed: deque[tuple[float, int, int]] = deque()
+        # Requests sent (including throttled ones) over the last few seconds: (time, tokens).
+        self._sent: deque[tuple[float, int]] = deque()
+
+    @property
+    def concurrency_limit(self) -> int:
+        return int(self._limit)
+
+    def estimate_tokens(self, text: str) -> int:
+        return max(1, math.ceil(len(text) / self._chars_per_token))
+
+    def pack(self, texts: list[str], *, max_batch_items: int | None = None) -> list[_Batch]:
+        """Split `texts` into in-order batches within the item and token limits."""
+        max_items = min(max_batch_items or self._max_batch_items, self._max_batch_items)
+        batches: list[_Batch] = []
+        current = _Batch(texts=[], chars=0, tokens=0)
+        for text in texts:
+            tokens = self.estimate_tokens(text)
+            if current.texts and (
+                len(current.texts) >= max_items or current.tokens + tokens > self._max_batch_tokens
+            ):
+                batches.append(current)
+                current = _Batch(texts=[], chars=0, tokens=0)
+            current.texts.append(text)
+            current.chars += len(text)
+            current.tokens += tokens
+        if current.texts:
+            batches.append(current)
+        return batches
+
+    def stats(self) -> dict[str, object]:
+        now = time.monotonic()
+        self._trim_completed(now)
+        return {
+            "concurrency_limit": self.concurrency_limit,
+            "in_flight": self._in_flight,
+            "rate_tokens_per_minute": round(self._rate * 60.0) if self._rate else None,
+            "queue_batches": self._waiting_batches,
+            "queue_texts": self._waiting_texts,
+            "tokens_per_minute": sum(c[1] for c in self._completed),
+            "texts_per_minute": sum(c[2] for c in self._completed),
+            "requests": self._requests,
+            "rate_limited": self._rate_limited,
+            "retries": self._retries,
+            "failures": self._failures,
+            "paused_seconds": round(max(0.0, self._paused_until - now), 3),
+            "last_retry_after_seconds": self._last_retry_after,
+            "chars_per_token": round(self._chars_per_token, 3),
+        }
+
+    async def embed(
+        self,
+        texts: list[str],
+        *,
+        max_batch_items: int | None = None,
+        max_concurrent: int | None = None,
+    ) -> list[list[float]]:
+        """Embed `texts`, returning vectors in input order.
+
+        `max_concurrent` optionally bounds this call's own requests in flight, below the
+        shared adaptive limit.
+        """
+        if not texts:
+            return []
+        batches = self.pack(texts, max_batch_items=max_batch_items)
+        run = self._run_batch
+        if max_concurrent is not None and max_concurrent < len(batches):
+            semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+            async def run(batch: _Batch) -> list[list[float]]:
+                async with semaphore:
+                    return await self._run_batch(batch)
+
+        results = await asyncio.gather(*(run(b) for b in batches))
+        return [embedding for batch in results for embedding in batch]
+
+    async def _run_batch(self, batch: _Batch) -> list[list[float]]:
+        failures = rate_limits = 0
+        while True:
+            await self._acquire(batch)
+            start = time.monotonic()
+            try:
+                embeddings, billed = await self._send(batch.texts)
+            except BaseException as exc:
+                self._release()
+                if not isinstance(exc, Exception):
+                    raise
+                if is_rate_limit_error(exc) and rate_limits < self._max_rate_limit_retries:
+                    rate_limits += 1
+                    self._on_rate_limited(exc, rate_limits)
+                    continue
+                if (
+                    not is_rate_limit_error(exc)
+                    and failures < self._max_retries
+                    and self._is_retryable(exc)
+                ):
+                    failures += 1
+                    self._retries += 1
+                    delay = self._backoff(failures)
+                    logger.warning(
+                        "embedding_request_retry",
+                        attempt=failures,
+                        max_retries=self._max_retries,
+                        delay_seconds=f"{delay:.2f}",
+                        error=str(exc),
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                self._failures += 1
+                logger.error(
+                    "embedding_request_failed",
+                    attempts=failures + rate_limits + 1,
+                    size=len(batch.texts),
+                    error=str(exc),
+                )
+                raise
+
+            self._release(success=True)
+            if len(embeddings) != len(batch.texts):
+                raise RuntimeError("Embedding batch result missing entry")
+            self._on_success(batch, billed, time.monotonic() - start)
+            return embeddings
+
+    def _ensure_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop or self._changed is None:
+            # Events belong to one loop; requests of a previous loop are gone.
+            self._loop = loop
+            self._changed = asyncio.Event()
+            self._in_flight = 0
+            self._waiting_batches = self._waiting_texts = 0
+
+    async def _acquire(self, batch: _Batch) -> None:
+        self._ensure_loop()
+        self._waiting_batches += 1
+        self._waiting_texts += len(batch.texts)
+        try:
+            while True:
+                changed = self._changed
+                now = time.monotonic()
+                wait: float | None = self._paused_until - now
+                if wait <= 0:
+                    wait = None if self._in_flight >= int(self._limit) else 0.0
+                if wait == 0.0:
+                    wait = self._bucket_delay(batch.tokens, now)
+                if wait == 0.0:
+                    if self._rate:
+                        self._bucket -= batch.tokens
+                    self._in_flight += 1
+                    self._requests += 1
+                    self._sent.append((now, batch.tokens))
+                    while self._sent[0][0] <= now - _SEND_WINDOW_SECONDS:
+                        self._sent.popleft()
+                    return
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=wait)
+                except TimeoutError:
+                    pass
+        finally:
+            self._waiting_batches -= 1
+            self._waiting_texts -= len(batch.texts)
+
+    def _release(self, *, success: bool = False) -> None:
+        self._in_flight = max(0, self._in_flight - 1)
+        if success:
+            # Additive increase: one more slot per `limit` successful requests.
+            self._limit = min(float(self._max_concurrency), self._limit + 1.0 / self._limit)
+        self._notify()
+
+    def _notify(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = asyncio.Event()
+
+    def _bucket_delay(self, tokens: int, now: float) -> float:
+        if not self._rate:
+            return 0.0
+        capacity = self._rate * self._burst_seconds
+        elapsed = now - self._bucket_updated
+        self._bucket = min(capacity, self._bucket + elapsed * self._rate)
+        self._bucket_updated = now
+        # A request larger than the bucket may go once the bucket is full.
+        needed = min(tokens, capacity)
+        if self._bucket >= needed:
+            return 0.0
+        return (needed - self._bucket) / self._rate
+
+    def _send_rate(self, now: float) -> float:
+        """Tokens/s offered to the deployment over the last few seconds."""
+        window = min(_SEND_WINDOW_SECONDS, max(self._burst_seconds, now - self._started))
+        return sum(t for sent_at, t in self._sent if sent_at > now - window) / window
+
+    def _backoff(self, attempt: int) -> float:
+        delay = self._retry_base_seconds * (2 ** (attempt - 1)) * (0.5 + random.random())
+        return min(delay, _MAX_BACKOFF_SECONDS)
+
+    def _on_rate_limited(self, exc: Exception, attempt: int) -> None:
+        now = time.monotonic()
+        retry_after = retry_after_seconds(exc)
+        delay = retry_after if retry_after is not None else self._backoff(attempt)
+        self._rate_limited += 1
+        self._last_retry_after = retry_after
+        self._paused_until = max(self._paused_until, now + delay)
+        if now >= self._decrease_holdoff_until:
+            # Multiplicative decrease, once per episode: requests already in flight when the
+            # quota ran out will 429 too and must not cut the limits again.
+            self._limit = max(1.0, self._limit / 2)
+            rate = self._send_rate(now)
+            if self._rate:
+                rate = min(rate, self._rate)
+            if self._rate is None:
+                self._bucket = 0.0
+                self._bucket_updated = now
+            self._rate = max(1.0, rate * _RATE_DECREASE)
+            self._decrease_holdoff_until = self._paused_until
+        logger.warning(
+            "embedding_rate_limited",
+            retry_after_seconds=retry_after,
+            delay_seconds=f"{delay:.2f}",
+            concurrency_limit=self.concurrency_limit,
+            rate_tokens_per_minute=round(self._rate * 60.0),
+        )
+        self._notify()
+
+    def _on_success(self, batch: _Batch, billed: int | None, elapsed: float) -> None:
+        now = time.monotonic()
+        tokens = batch.tokens
+        if billed:
+            tokens = billed
+            if self._rate:
+                # Settle the bucket with the billed count instead of the estimate.
+                self._bucket -= billed - batch.tokens
+            observed = batch.chars / billed
+            self._chars_per_token = min(8.0, max(1.0, 0.8 * self._chars_per_token + 0.2 * observed))
+        if self._rate:
+            # Additive increase, up to the configured quota.
+            self._rate += tokens * _RATE_INCREASE
+            if self._quota_rate:
+                self._rate = min(self._rate, self._quota_rate)
+        self._completed.append((now, tokens, len(batch.texts)))
+        self._trim_completed(now)
+        logger.debug(
+            "embedding_batch_sent",
+            size=len(batch.texts),
+            tokens=tokens,
+            duration_ms=round(elapsed * 1000.0, 3),
+            concurrency_limit=self.concurrency_limit,
+        )
+
+    def _trim_completed(self, now: float) -> None:
+        while self._completed and self._completed[0][0] <= now - 60.0:
+            self._completed.popleft()
@@ -11,14 +11,15 @@ Storage Architecture:
 from __future__ import annotations
 
 import asyncio
-import json
-import random
+import contextlib
 import uuid
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any
 
 from app.config import settings
+from app.core.cache.embedding_codec import decode_embedding, encode_embedding
 from app.core.cache.keys import canonical_json, hash_text
 from app.core.cache.provider import get_cache
 from app.logger import get_logger
@@ -33,7 +34,10 @@ from app.services.cosmos_db_service import (
     get_cosmos_db_service,
 )
 from app.services.document_intelligence_service import ParagraphWithPage
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_scheduler import EmbeddingScheduler
 from app.services.openai_clients import get_embedding_client
+from app.services.token_chunker import TokenChunker, get_tokenizer, load_tokenizer
 
 logger = get_logger(__name__)
 
@@ -44,9 +48,72 @@ def _embedding_cache_key(*, deployment: str, user_id: str | None, text: str) ->
         "user_id": user_id or "",
         "text_hash": hash_text(text),
     }
+    if settings.embedding_dimensions:
+        # Truncated vectors must not be served from, or to, full-size entries.
+        payload["dimensions"] = settings.embedding_dimensions
     return f"embed:{hash_text(canonical_json(payload))}"
 
 
+def _encode_cached_embedding(embedding: list[float], *, deployment: str) -> bytes:
+    codec = settings.cache_embed_codec
+    if codec == "json":
+        return canonical_json(embedding).encode("utf-8")
+    return encode_embedding(embedding, deployment=deployment, dtype=codec)
+
+
+def _decode_cached_embedding(raw: bytes, *, deployment: str) -> list[float] | None:
+    """Decode binary or legacy JSON cache entries; None means treat as a miss."""
+    try:
+        decoded = decode_embedding(raw, deployment=deployment)
+    except Exception:
+        return None
+    if decoded is None or isinstance(decoded, list):
+        return decoded
+    # Callers (and the Azure SDKs they feed) expect plain lists; tolist() on the zero-copy
+    # view is a single C-level conversion, far cheaper than parsing JSON.
+    return decoded.tolist()
+
+
+def _token_chunker() -> TokenChunker:
+    return TokenChunker(
+        settings.chunk_max_tokens,
+        settings.chunk_overlap_tokens,
+        tokenizer=get_tokenizer(settings.embedding_tokenizer_encoding),
+    )
+
+
+def chunk_hash(content: str) -> str:
+    return hash_text(content)[:32]
+
+
+def chunk_keys(
+    document_id: str, chunk_hashes: list[str], seen: dict[str, int] | None = None
+) -> list[str]:
+    """Search keys for a document's chunks, derived from their content hashes.
+
+    Keys stay stable when chunks move, so a re-index can match them; repeated chunks get an
+    occurrence suffix. Pass the same `seen` dict to key a document's chunks batch by batch.
+    """
+    seen = {} if seen is None else seen
+    ids = []
+    for chunk_hash in chunk_hashes:
+        occurrence = seen.get(chunk_hash, 0)
+        seen[chunk_hash] = occurrence + 1
+        suffix = f"_{occurrence}" if occurrence else ""
+        ids.append(f"{document_id}_chunk_{chunk_hash}{suffix}")
+    return ids
+
+
+def chunk_shared_fields(metadata: dict[str, Any], total_chunks: int) -> dict[str, Any]:
+    """Document-level fields stored on every chunk in the search index."""
+    return {
+        "title": metadata.get("title", ""),
+        "filename": metadata.get("filename", ""),
+        "content_type": metadata.get("content_type", ""),
+        "total_chunks": total_chunks,
+    }
+
+
 @dataclass
 class ChunkWithPage:
     """A text chunk with its associated page number."""
@@ -55,6 +122,112 @@ class ChunkWithPage:
     page_number: int
 
 
+class TextChunker:
+    """Incremental sentence-aware character chunker.
+
+    Text can be fed in arbitrary blocks; the emitted chunks are identical to chunking the
+    concatenated text in one pass, while only about one chunk of text is held at a time.
+    """
+
+    _SEPARATORS = (". ", ".\n", "! ", "? ", "\n\n")
+
+    def __init__(self, chunk_size: int, overlap: int) -> None:
+        self._chunk_size = chunk_size
+        self._overlap = overlap
+        self._buffer = ""
+        self._start = 0
+        self._split = False
+
+    def feed(self, text: str) -> list[str]:
+        """Add text and return the chunks that can no longer change."""
+        self._buffer = self._buffer[self._start :] + text
+        self._start = 0
+        chunks: list[str] = []
+        # A chunk is final once more than chunk_size characters follow its start.
+        while len(self._buffer) - self._start > self._chunk_size:
+            self._split = True
+            self._emit(chunks)
+        return chunks
+
+    def finish(self) -> list[str]:
+        """Return the remaining chunks once the input is exhausted."""
+        if not self._split:
+            # Texts that never exceeded chunk_size are returned as-is (unstripped).
+            chunks = [self._buffer]
+            self._buffer = ""
+            return chunks
+
+        chunks: list[str] = []
+        while self._start < len(self._buffer):
+            self._emit(chunks)
+        self._buffer, self._start = "", 0
+        return chunks
+
+    def _emit(self, chunks: list[str]) -> None:
+        start = self._start
+        end = start + self._chunk_size
+
+        # Try to break at a sentence boundary
+        if end < len(self._buffer):
+            window = self._buffer[start:end]
+            for sep in self._SEPARATORS:
+                last_sep = window.rfind(sep)
+                if last_sep > self._chunk_size // 2:
+                    end = start + last_sep + len(sep)
+                    break
+
+        chunk = self._buffer[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        self._start = end - self._overlap
+
+
+class ParagraphChunker:
+    """Incremental page-aware paragraph chunker.
+
+    Combines paragraphs into chunks up to chunk_size, tracking the page number of the first
+    paragraph in each chunk for citation purposes.
+    """
+
+    def __init__(self, chunk_size: int, overlap: int) -> None:
+        self._chunk_size = chunk_size
+        self._overlap = overlap
+        self._current = ""
+        self._page: int | None = None
+
+    def add(self, para: ParagraphWithPage) -> ChunkWithPage | None:
+        """Add a paragraph; returns the previous chunk when this paragraph starts a new one."""
+        if self._page is None:
+            self._page = para.page_number
+
+        # If adding this paragraph exceeds chunk_size, finalize current chunk
+        if self._current and len(self._current) + len(para.content) + 2 > self._chunk_size:
+            finished = None
+            if self._current.strip():
+                finished = ChunkWithPage(content=self._current.strip(), page_number=self._page)
+            # Start new chunk with overlap from the end of the current chunk
+            if self._overlap > 0 and len(self._current) > self._overlap:
+                self._current = self._current[-self._overlap :] + "\n\n" + para.content
+            else:
+                self._current = para.content
+            self._page = para.page_number
+            return finished
+
+        # Append paragraph to current chunk
+        if not self._current:
+            self._page = para.page_number
+        self._current = (self._current + "\n\n" + para.content).strip()
+        return None
+
+    def finish(self) -> list[ChunkWithPage]:
+        """Return the last chunk, if any."""
+        chunk = self._current.strip()
+        self._current = ""
+        if not chunk or self._page is None:
+            return []
+        return [ChunkWithPage(content=chunk, page_number=self._page)]
+
+
 @dataclass
 class Document:
     """A document with optional embeddings."""
@@ -101,6 +274,29 @@ class EmbeddingService:
         # name collisions.
         self.search_service = search_service or get_azure_search_service()
         self.cosmos = cosmos_service or get_cosmos_db_service()
+        # Every embeddings request goes through one token-aware, 429-adaptive scheduler.
+        self.scheduler = EmbeddingScheduler(
+            self._send_embeddings,
+            is_retryable=self._is_retryable_embedding_error,
+            max_batch_items=settings.embedding_batch_max_items,
+            max_batch_tokens=settings.embedding_batch_max_tokens,
+            initial_concurrency=settings.embedding_concurrency_initial,
+            max_concurrency=settings.embedding_concurrency_max,
+            tokens_per_minute=settings.embedding_tokens_per_minute,
+            burst_seconds=settings.embedding_rate_window_seconds,
+            max_retries=settings.embedding_max_retries,
+            max_rate_limit_retries=settings.embedding_rate_limit_max_retries,
+            retry_base_seconds=settings.embedding_retry_base_seconds,
+        )
+        # Single-text misses (e.g. query embeddings) from concurrent requests share calls.
+        self.batcher: EmbeddingBatcher | None = None
+        if settings.embedding_coalesce_enabled:
+            self.batcher = EmbeddingBatcher(
+                self._create_embeddings,
+                window_seconds=settings.embedding_coalesce_window_ms / 1000.0,
+                max_batch_size=settings.embedding_coalesce_max_batch,
+                split_on_error=lambda exc: not self._is_retryable_embedding_error(exc),
+            )
         logger.info("EmbeddingService initialized with Azure AI Search backend")
 
     @staticmethod
@@ -149,50 +345,27 @@ class EmbeddingService:
             ]
         )
 
-    async def _embeddings_create_with_retry(self, client, *, input_text) -> Any:
-        """Call Azure OpenAI embeddings with bounded retries + timeout."""
-        max_retries = max(0, int(getattr(settings, "embedding_max_retries", 3)))
-        timeout_s = float(
-            getattr(
-                settings,
-                "embedding_request_timeout_seconds",
-                settings.llm_request_timeout_seconds,
-            )
+    async def _send_embeddings(self, texts: list[str]) -> tuple[list[list[float]], int | None]:
+        """Send one embeddings request (retries are owned by the scheduler)."""
+        client = await get_embedding_client()
+        options: dict[str, Any] = {}
+        if settings.embedding_dimensions:
+            options["dimensions"] = settings.embedding_dimensions
+        response = await asyncio.wait_for(
+            client.embeddings.create(
+                model=settings.azure_openai_embedding_deployment,
+                input=texts,
+                **options,
+            ),
+            timeout=settings.embedding_request_timeout_seconds,
         )
-        base_delay = float(getattr(settings, "embedding_retry_base_seconds", 0.5))
+        usage = getattr(response, "usage", None)
+        embeddings = [item.embedding for item in sorted(response.data, key=lambda x: x.index)]
+        return embeddings, getattr(usage, "prompt_tokens", None)
 
-        for attempt in range(max_retries + 1):
-            try:
-                return await asyncio.wait_for(
-                    client.embeddings.create(
-                        model=settings.azure_openai_embedding_deployment,
-                        input=input_text,
-                    ),
-                    timeout=timeout_s,
-                )
-            except Exception as exc:
-                if attempt >= max_retries or not self._is_retryable_embedding_error(exc):
-                    logger.error(
-                        "embedding_request_failed",
-                        attempt=attempt,
-                        max_retries=max_retries,
-                        error=str(exc),
-                    )
-                    raise
-
-                # Exponential backoff with jitter
-                delay = base_delay * (2**attempt)
-                delay = delay * (0.5 + random.random())
-                delay = min(delay, 10.0)
-
-                logger.warning(
-                    "embedding_request_retry",
-                    attempt=attempt + 1,
-                    max_retries=max_retries,
-                    delay_seconds=f"{delay:.2f}",
-                    error=str(exc),
-                )
-                await asyncio.sleep(delay)
+    async def _create_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Embed `texts` through the shared scheduler, returning vectors in input order."""
+        return await self.scheduler.embed(texts)
 
     async def generate_embedding(self, text: str, *, user_id: str | None = None) -> list[float]:
         """
@@ -205,26 +378,24 @@ class EmbeddingService:
             The embedding vector
         """
         cache = get_cache("embed")
+        deployment = settings.azure_openai_embedding_deployment
         cache_key = _embedding_cache_key(
-            deployment=settings.azure_openai_embedding_deployment,
+            deployment=deployment,
             user_id=user_id,
             text=text,
         )
 
-        cached = cache.get(cache_key)
+        cached = await cache.aget(cache_key)
         if cached is not None:
-            try:
-                embedding = json.loads(cached.decode("utf-8"))
-                if isinstance(embedding, list):
-                    return embedding
-            except Exception:
-                pass
-
-        client = await get_embedding_client()
+            embedding = _decode_cached_embedding(cached, deployment=deployment)
+            if embedding is not None:
+                return embedding
 
         try:
-            response = await self._embeddings_create_with_retry(client, input_text=text)
-            embedding = response.data[0].embedding
+            if self.batcher is not None:
+                embedding = await self.batcher.embed(text)
+            else:
+                (embedding,) = await self._create_embeddings([text])
             logger.debug(
                 "embedding_generated",
                 text_length=len(text),
@@ -232,7 +403,9 @@ class EmbeddingService:
             )
 
             try:
-                cache.set(cache_key, canonical_json(embedding).encode("utf-8"))
+                await cache.aset(
+                    cache_key, _encode_cached_embedding(embedding, deployment=deployment)
+                )
             except Exception:
                 pass
 
@@ -245,7 +418,7 @@ class EmbeddingService:
         self,
         texts: list[str],
         batch_size: int = 2048,
-        max_concurrent: int = 4,
+        max_concurrent: int | None = None,
         *,
         user_id: str | None = None,
     ) -> list[list[float]]:
@@ -254,12 +427,15 @@ class EmbeddingService:
 
         This is more efficient than calling generate_embedding repeatedly
         as it reduces API round-trips and processes batches concurrently.
+        Batches are packed by estimated tokens and sent by the shared
+        EmbeddingScheduler, whose concurrency adapts to 429 responses.
 
         Args:
             texts: List of texts to embed
-            batch_size: Number of texts per API call
+            batch_size: Maximum number of texts per API call
                 (Azure OpenAI supports up to 2048 for text-embedding-3-large)
-            max_concurrent: Maximum number of concurrent API calls
+            max_concurrent: Optional cap on this call's concurrent API calls,
+                below the scheduler's adaptive limit
 
         Returns:
             List of embedding vectors in the same order as input texts
@@ -270,71 +446,53 @@ class EmbeddingService:
         cache = get_cache("embed")
         deployment = settings.azure_openai_embedding_deployment
 
+        cache_keys = [
+            _embedding_cache_key(deployment=deployment, user_id=user_id, text=text)
+            for text in texts
+        ]
+        # One backend round-trip for the whole batch instead of one per text.
+        try:
+            cached_by_key = await cache.get_many(cache_keys)
+        except Exception:
+            cached_by_key = {}
+
         results: list[list[float] | None] = [None] * len(texts)
         missing: list[tuple[int, str]] = []
         for i, text in enumerate(texts):
-            cache_key = _embedding_cache_key(deployment=deployment, user_id=user_id, text=text)
-            cached = cache.get(cache_key)
+            cached = cached_by_key.get(cache_keys[i])
             if cached is not None:
-                try:
-                    embedding = json.loads(cached.decode("utf-8"))
-                    if isinstance(embedding, list):
-                        results[i] = embedding
-                        continue
-                except Exception:
-                    pass
+                embedding = _decode_cached_embedding(cached, deployment=deployment)
+                if embedding is not None:
+                    results[i] = embedding
+                    continue
             missing.append((i, text))
 
         if not missing:
             # All hits.
             return [r for r in results if r is not None]
 
-        client = await get_embedding_client()
-
-        async def process_batch(batch: list[str]) -> list[list[float]]:
-            """Process a single batch of texts."""
-            response = await self._embeddings_create_with_retry(client, input_text=batch)
-            # Sort by index to maintain order
-            sorted_data = sorted(response.data, key=lambda x: x.index)
-            return [item.embedding for item in sorted_data]
-
         try:
             missing_texts = [t for _, t in missing]
-            batches = [
-                missing_texts[i : i + batch_size] for i in range(0, len(missing_texts), batch_size)
-            ]
-
-            # Process batches concurrently with semaphore to limit parallel requests
-            semaphore = asyncio.Semaphore(max_concurrent)
-
-            async def limited_process(batch: list[str]) -> list[list[float]]:
-                async with semaphore:
-                    return await process_batch(batch)
-
-            # Run all batches concurrently
-            batch_results = await asyncio.gather(*[limited_process(b) for b in batches])
-
-            # Flatten results maintaining order
-            all_embeddings = [emb for batch_embs in batch_results for emb in batch_embs]
+            all_embeddings = await self.scheduler.embed(
+                missing_texts, max_batch_items=batch_size, max_concurrent=max_concurrent
+            )
 
-            # Write back into original order + populate cache.
-            for (index, text), embedding in zip(missing, all_embeddings, strict=True):
+            # Write back into original order + populate cache in a single batch.
+            to_cache: dict[str, bytes] = {}
+            for (index, _text), embedding in zip(missing, all_embeddings, strict=True):
                 results[index] = embedding
-                try:
-                    cache_key = _embedding_cache_key(
-                        deployment=deployment,
-                        user_id=user_id,
-                        text=text,
-                    )
-                    cache.set(cache_key, canonical_json(embedding).encode("utf-8"))
-                except Exception:
-                    pass
+                to_cache[cache_keys[index]] = _encode_cached_embedding(
+                    embedding, deployment=deployment
+                )
+            try:
+                await cache.set_many(to_cache)
+            except Exception:
+                pass
 
             logger.debug(
                 "batch_embeddings_generated",
                 total_texts=len(texts),
-                batches=len(batches),
-                concurrent=min(max_concurrent, len(batches)),
+                embedded_texts=len(missing_texts),
             )
             final: list[list[float]] = []
             for r in results:
@@ -364,30 +522,11 @@ class EmbeddingService:
         Returns:
             List of text chunks
         """
-        if len(text) <= chunk_size:
-            return [text]
-
-        chunks = []
-        start = 0
-
-        while start < len(text):
-            end = start + chunk_size
-
-            # Try to break at a sentence boundary
-            if end < len(text):
-                # Look for sentence endings
-                for sep in [". ", ".\n", "! ", "? ", "\n\n"]:
-                    last_sep = text[start:end].rfind(sep)
-                    if last_sep > chunk_size // 2:
-                        end = start + last_sep + len(sep)
-                        break
-
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-
-            start = end - overlap
-
+        if settings.chunking_strategy == "tokens":
+            chunks = _token_chunker().chunk_text(text)
+        else:
+            chunker = TextChunker(chunk_size, overlap)
+            chunks = chunker.feed(text) + chunker.finish()
         logger.debug("text_chunked", original_length=len(text), num_chunks=len(chunks))
         return chunks
 
@@ -411,37 +550,19 @@ class EmbeddingService:
         Returns:
             List of chunks with page numbers
         """
-        if not paragraphs:
-            return []
-
         chunks_with_pages: list[ChunkWithPage] = []
-        current_chunk = ""
-        current_page = paragraphs[0].page_number if paragraphs else 1
-
-        for para in paragraphs:
-            # If adding this paragraph exceeds chunk_size, finalize current chunk
-            if current_chunk and len(current_chunk) + len(para.content) + 2 > chunk_size:
-                if current_chunk.strip():
-                    chunks_with_pages.append(
-                        ChunkWithPage(content=current_chunk.strip(), page_number=current_page)
-                    )
-                # Start new chunk with overlap from the end of the current chunk
-                if overlap > 0 and len(current_chunk) > overlap:
-                    current_chunk = current_chunk[-overlap:] + "\n\n" + para.content
-                else:
-                    current_chunk = para.content
-                current_page = para.page_number
-            else:
-                # Append paragraph to current chunk
-                if not current_chunk:
-                    current_page = para.page_number
-                current_chunk = (current_chunk + "\n\n" + para.content).strip()
-
-        # Don't forget the last chunk
-        if current_chunk.strip():
-            chunks_with_pages.append(
-                ChunkWithPage(content=current_chunk.strip(), page_number=current_page)
-            )
+        if settings.chunking_strategy == "tokens":
+            chunks_with_pages = [
+                ChunkWithPage(content=chunk, page_number=page)
+                for chunk, page in _token_chunker().chunk_paragraphs(paragraphs)
+            ]
+        else:
+            chunker = ParagraphChunker(chunk_size, overlap)
+            for para in paragraphs:
+                chunk = chunker.add(para)
+                if chunk is not None:
+                    chunks_with_pages.append(chunk)
+            chunks_with_pages.extend(chunker.finish())
 
         logger.debug(
             "paragraphs_chunked_with_pages",
@@ -464,7 +585,10 @@ class EmbeddingService:
         Index a document by chunking it and storing embeddings in Azure AI Search.
 
         Uses batch embedding generation and bulk chunk storage for performance.
-        Also stores document metadata in Cosmos DB for listing.
+        Also stores document metadata in Cosmos DB for listing, including a hash of the
+        content; chunks are keyed by the hash of their content. Re-indexing an existing
+        `document_id` only embeds and uploads chunks with new content and deletes chunks that
+        are gone; an unchanged document only has its metadata saved.
 
         Args:
             content: The document content
@@ -479,87 +603,142 @@ class EmbeddingService:
             The indexed document
         """
         doc_id = document_id or str(uuid.uuid4())
+        metadata = metadata or {}
+        if settings.chunking_strategy == "tokens":
+            # Loads the encoding off the event loop if startup could not.
+            await load_tokenizer(settings.embedding_tokenizer_encoding)
+
+        def chunk_document() -> tuple[list[str], list[int | None]]:
+            # Use page-aware chunking if paragraphs with pages are provided
+            if paragraphs_with_pages:
+                chunks_with_pages = self._chunk_paragraphs_with_pages(
+                    paragraphs_with_pages, chunk_size, chunk_overlap
+                )
+                return (
+                    [c.content for c in chunks_with_pages],
+                    [c.page_number for c in chunks_with_pages],
+                )
+            # No page info available
+            chunks = self._chunk_text(content, chunk_size, chunk_overlap)
+            return chunks, [None] * len(chunks)
 
-        # Use page-aware chunking if paragraphs with pages are provided
-        chunks_with_pages: list[ChunkWithPage] | None = None
-        if paragraphs_with_pages:
-            chunks_with_pages = self._chunk_paragraphs_with_pages(
-                paragraphs_with_pages, chunk_size, chunk_overlap
-            )
-            chunks = [c.content for c in chunks_with_pages]
+        if settings.chunking_strategy == "tokens":
+            # Tokenizing runs at roughly 13 MB/s; keep large documents off the event loop.
+            chunks, pages = await asyncio.to_thread(chunk_document)
         else:
-            chunks = self._chunk_text(content, chunk_size, chunk_overlap)
+            chunks, pages = chunk_document()
+        content_hash = hash_text(content)
+        chunk_hashes = [chunk_hash(chunk) for chunk in chunks]
+        chunk_ids = chunk_keys(doc_id, chunk_hashes)
 
         logger.info(
             "indexing_document",
             document_id=doc_id,
             content_length=len(content),
             num_chunks=len(chunks),
-            has_page_info=chunks_with_pages is not None,
+            has_page_info=bool(paragraphs_with_pages),
         )
 
-        # Generate all embeddings in batches (batch_size=2048 for Azure OpenAI)
-        embeddings = await self.generate_embeddings_batch(chunks, user_id=user_id)
+        # A re-index of a known document only embeds chunks whose content is new, updates the
+        # fields of chunks that moved, and deletes chunks that disappeared. Chunks indexed
+        # before keys were hash-based are keyed by position, never match, and are replaced.
+        previous = None
+        indexed: dict[str, tuple[int, int]] = {}
+        if document_id is not None:
+            previous = await self.cosmos.get_document_metadata(doc_id, user_id)
+            async for chunk_id, index, page in self.search_service.iter_chunk_positions(
+                doc_id, user_id
+            ):
+                indexed[chunk_id] = (index, page)
 
-        # Build DocumentChunk objects for bulk upload
-        now = datetime.now(UTC)
-        chunk_metadata = {**(metadata or {}), "total_chunks": len(chunks)}
-
-        if chunks_with_pages:
-            # Use page numbers from chunking
-            document_chunks = [
-                DocumentChunk(
-                    id=f"{doc_id}_chunk_{i}",
-                    document_id=doc_id,
-                    user_id=user_id,
-                    content=chunk_with_page.content,
-                    embedding=embedding,
-                    chunk_index=i,
-                    page_number=chunk_with_page.page_number,
-                    metadata=chunk_metadata,
-                    created_at=now,
-                )
-                for i, (chunk_with_page, embedding) in enumerate(
-                    zip(chunks_with_pages, embeddings, strict=True)
+        shared_fields = chunk_shared_fields(metadata, len(chunks))
+        shared_changed = previous is None or shared_fields != chunk_shared_fields(
+            previous.metadata, previous.chunk_count
+        )
+        new_positions: list[int] = []
+        updates: list[dict[str, Any]] = []
+        for i, chunk_id in enumerate(chunk_ids):
+            if chunk_id not in indexed:
+                new_positions.append(i)
+            elif shared_changed or indexed[chunk_id] != (i, pages[i] or 0):
+                updates.append(
+                    {
+                        "id": chunk_id,
+                        "chunk_index": i,
+                        "page_number": pages[i] or 0,
+                        **shared_fields,
+                    }
                 )
-            ]
-        else:
-            # No page info available
-            document_chunks = [
-                DocumentChunk(
-                    id=f"{doc_id}_chunk_{i}",
-                    document_id=doc_id,
-                    user_id=user_id,
-                    content=chunk,
-                    embedding=embedding,
-                    chunk_index=i,
-                    page_number=None,
-                    metadata=chunk_metadata,
-                    created_at=now,
+        current = set(chunk_ids)
+        removed = [chunk_id for chunk_id in indexed if chunk_id not in current]
+
+        now = datetime.now(UTC)
+        chunk_metadata = {**metadata, "total_chunks": len(chunks)}
+        slice_size = max(1, settings.ingest_upload_batch_size)
+        slices = [
+            new_positions[start : start + slice_size]
+            for start in range(0, len(new_positions), slice_size)
+        ]
+
+        async def embedded_chunks() -> AsyncIterator[DocumentChunk]:
+            # Every slice's embeddings are requested up front and each slice is handed to the
+            # upload as soon as it is ready, so uploading overlaps with embedding.
+            tasks = [
+                asyncio.create_task(
+                    self.generate_embeddings_batch([chunks[i] for i in positions], user_id=user_id)
                 )
-                for i, (chunk, embedding) in enumerate(zip(chunks, embeddings, strict=True))
+                for positions in slices
             ]
+            try:
+                for positions, task in zip(slices, tasks, strict=True):
+                    for i, embedding in zip(positions, await task, strict=True):
+                        yield DocumentChunk(
+                            id=chunk_ids[i],
+                            document_id=doc_id,
+                            user_id=user_id,
+                            content=chunks[i],
+                            embedding=embedding,
+                            chunk_index=i,
+                            page_number=pages[i],
+                            metadata=chunk_metadata,
+                            created_at=now,
+                        )
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Bulk upload chunks to Azure Search (batched at 1000 per request)
-        await self.search_service.bulk_store_chunks(document_chunks)
+        try:
+            async with contextlib.aclosing(embedded_chunks()) as stream:
+                await self.search_service.bulk_store_chunks(stream)
+        except Exception:
+            # Remove whatever was uploaded, leaving the previously indexed version (if any)
+            # intact rather than a mix of both.
+            await self.search_service.delete_chunks(
+                doc_id, user_id, [chunk_ids[i] for i in new_positions]
+            )
+            raise
+        await self.search_service.update_chunk_fields(doc_id, user_id, updates)
+        await self.search_service.delete_chunks(doc_id, user_id, removed)
 
         # Store document metadata in Cosmos DB
         await self.cosmos.save_document_metadata(
             document_id=doc_id,
             user_id=user_id,
-            title=(metadata or {}).get("title") or f"Document {doc_id[:8]}...",
-            filename=(metadata or {}).get("filename"),
-            content_type=(metadata or {}).get("content_type"),
+            title=metadata.get("title") or f"Document {doc_id[:8]}...",
+            filename=metadata.get("filename"),
+            content_type=metadata.get("content_type"),
             chunk_count=len(chunks),
-            pages=(metadata or {}).get("pages"),
+            pages=metadata.get("pages"),
             metadata=metadata,
+            content_hash=content_hash,
         )
 
         document = Document(
             id=doc_id,
             content=content,
             user_id=user_id,
-            metadata=metadata or {},
+            metadata=metadata,
             chunks=chunks,
         )
 
@@ -567,6 +746,10 @@ class EmbeddingService:
             "document_indexed",
             document_id=doc_id,
             chunks_stored=len(chunks),
+            chunks_embedded=len(new_positions),
+            chunks_updated=len(updates),
+            chunks_deleted=len(removed),
+            unchanged=previous is not None and previous.content_hash == content_hash,
         )
 
         return document
@@ -680,3 +863,14 @@ def get_embedding_service() -> EmbeddingService:
     if _embedding_service is None:
         _embedding_service = EmbeddingService()
     return _embedding_service
+
+
+def embedding_stats() -> dict[str, object] | None:
+    """Coalescer and scheduler stats of the global service, or None if it has not been created."""
+    if _embedding_service is None:
+        return None
+    batcher = _embedding_service.batcher
+    return {
+        "batcher": batcher.stats() if batcher is not None else None,
+        "scheduler": _embedding_service.scheduler.stats(),
+    }
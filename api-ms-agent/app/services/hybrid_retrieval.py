@@ -0,0 +1,147 @@
+"""
+Result fusion, local reranking and adaptive cut-off for hybrid document retrieval.
+
+`AzureSearchService.hybrid_search` runs a keyword query and a vector query side by side and
+combines them here:
+
+- `reciprocal_rank_fusion` merges the ranked lists by chunk id, scoring each chunk
+  sum(1 / (k + rank)) over the lists it appears in. Only ranks are used, so BM25 scores and
+  cosine similarities need no calibration against each other.
+- `above_relative_floor` drops keyword hits far below the best one before fusion. BM25
+  scores have no fixed scale, so the floor is relative rather than absolute.
+- `rerank` optionally re-scores the fused candidates with BM25 over the candidates' own text,
+  blended with the fused score. It is cheap (no model, a few dozen short chunks) and favours
+  chunks that contain the query's exact terms, such as statute numbers or form IDs.
+- `adaptive_cutoff` returns fewer than `max_k` results when the scores fall off sharply,
+  so weak tail matches are not added to the prompt. Raw RRF scores sit in a narrow band
+  (1/(k + 1) down to 1/(k + n)), so a relative floor on them almost never cuts; the cut is
+  made on `rerank_score` or on RRF scores rescaled by `min_max_scaled`.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from collections.abc import Sequence
+from typing import Any
+
+# Words and numbers; identifiers such as "FIN-312" or "s. 12(3)" become their parts.
+_TERM = re.compile(r"\w+")
+
+# BM25 parameters (the usual defaults).
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+
+def _terms(text: str) -> list[str]:
+    return _TERM.findall(text.lower())
+
+
+def bm25_scores(query: str, documents: Sequence[str]) -> list[float]:
+    """BM25 score of each document for `query`, with IDF taken over `documents`."""
+    query_terms = set(_terms(query))
+    if not query_terms or not documents:
+        return [0.0] * len(documents)
+    term_counts = [Counter(_terms(document)) for document in documents]
+    lengths = [sum(counts.values()) for counts in term_counts]
+    average_length = (sum(lengths) / len(lengths)) or 1.0
+    n = len(documents)
+    idf = {}
+    for term in query_terms:
+        df = sum(1 for counts in term_counts if term in counts)
+        idf[term] = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+
+    scores = []
+    for counts, length in zip(term_counts, lengths, strict=True):
+        norm = _BM25_K1 * (1.0 - _BM25_B + _BM25_B * length / average_length)
+        score = 0.0
+        for term in query_terms:
+            tf = counts.get(term, 0)
+            if tf:
+                score += idf[term] * tf * (_BM25_K1 + 1.0) / (tf + norm)
+        scores.append(score)
+    return scores
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[dict[str, Any]]], *, k: int = 60
+) -> list[dict[str, Any]]:
+    """Merge ranked result lists by `id`; returns items best first with `rrf_score` set.
+
+    An item found by several lists keeps the fields of its first occurrence, updated with
+    the fields (e.g. `similarity`, `keyword_score`) of the later ones.
+    """
+    fused: dict[str, dict[str, Any]] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            entry = fused.get(item["id"])
+            if entry is None:
+                entry = fused[item["id"]] = {**item, "rrf_score": 0.0}
+            else:
+                entry.update({key: value for key, value in item.items() if key not in entry})
+            entry["rrf_score"] += 1.0 / (k + rank)
+    return sorted(fused.values(), key=lambda item: item["rrf_score"], reverse=True)
+
+
+def _scaled(values: Sequence[float]) -> list[float]:
+    """Scale to [0, 1] by the maximum (all zeros stay zero)."""
+    top = max(values, default=0.0)
+    return [v / top if top > 0 else 0.0 for v in values]
+
+
+def above_relative_floor(
+    items: list[dict[str, Any]], score_key: str, relative_floor: float
+) -> list[dict[str, Any]]:
+    """Items scoring at least `relative_floor` x the best score, in their original order."""
+    if not items or relative_floor <= 0:
+        return items
+    floor = max(item[score_key] for item in items) * relative_floor
+    return [item for item in items if item[score_key] >= floor]
+
+
+def min_max_scaled(values: Sequence[float]) -> list[float]:
+    """Scale to [0, 1] between the minimum and maximum (all equal values become 1)."""
+    if not values:
+        return []
+    low, high = min(values), max(values)
+    if high <= low:
+        return [1.0] * len(values)
+    return [(v - low) / (high - low) for v in values]
+
+
+def rerank(query: str, items: list[dict[str, Any]], *, weight: float = 0.5) -> list[dict[str, Any]]:
+    """Re-order fused items by a blend of their fused score and BM25 over their content.
+
+    Sets `rerank_score` = (1 - weight) * fused + weight * BM25, both scaled by their maximum.
+    """
+    if not items:
+        return items
+    lexical = _scaled(bm25_scores(query, [item.get("content") or "" for item in items]))
+    fused = _scaled([item.get("rrf_score", 0.0) for item in items])
+    for item, f, b in zip(items, fused, lexical, strict=True):
+        item["rerank_score"] = (1.0 - weight) * f + weight * b
+    return sorted(items, key=lambda item: item["rerank_score"], reverse=True)
+
+
+def adaptive_cutoff(
+    items: list[dict[str, Any]],
+    *,
+    score_key: str,
+    max_k: int,
+    min_k: int = 1,
+    relative_floor: float = 0.5,
+) -> list[dict[str, Any]]:
+    """Keep at most `max_k` items, dropping those after `min_k` that score below
+    `relative_floor` x the best score.
+    """
+    items = items[:max_k]
+    if not items:
+        return items
+    floor = items[0][score_key] * relative_floor
+    kept = items[:min_k]
+    for item in items[min_k:]:
+        if item[score_key] < floor:
+            break
+        kept.append(item)
+    return kept
@@ -0,0 +1,574 @@
+"""
+Streaming, memory-bounded document ingestion.
+
+`DocumentIngestionPipeline` indexes a `StreamingAnalysisResult` through four stages:
+
+    parse -> chunk -> embed (in batches) -> upload (in batches)
+
+Parse and chunk run as one producer that pulls text blocks or layout paragraphs on demand;
+embed and upload run as separate tasks. The stages are joined by `asyncio.Queue`s holding at
+most `queue_depth` batches, so a slow stage blocks the stages feeding it and the amount of
+text, chunks and embeddings alive at once is bounded by the batch sizes, not by the size of
+the document. Progress is reported per stage via an optional callback and debug logs.
+
+Chunks are keyed by content hash, and a hash of the parsed text is stored with the document
+metadata. Ingesting with the `document_id` of an existing document re-indexes it in place:
+the indexed chunks are listed from the search index (their keys carry their hashes), only
+chunks with new content are embedded and uploaded, chunks that moved get their fields merged,
+and chunks that are gone are deleted, so an unchanged file only has its metadata saved.
+Without a `document_id` a new document is always created.
+
+Per-chunk bookkeeping (keys, positions, and the indexed chunks being replaced) is written to a
+private temporary SQLite database batch by batch rather than kept in lists, so it does not
+grow memory with the document either.
+
+If any stage fails, or finalizing the index afterwards does, the others are cancelled, chunks
+uploaded by the run are deleted and merged fields are restored, so a failed upload leaves the
+previously indexed version (if any) as it was.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import sqlite3
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from app.config import settings
+from app.logger import get_logger
+from app.services.azure_search_service import DocumentChunk
+from app.services.cosmos_db_service import DocumentMetadata
+from app.services.document_intelligence_service import StreamingAnalysisResult
+from app.services.embedding_service import (
+    ChunkWithPage,
+    EmbeddingService,
+    ParagraphChunker,
+    TextChunker,
+    chunk_hash,
+    chunk_keys,
+    chunk_shared_fields,
+)
+
+logger = get_logger(__name__)
+
+# Marks the end of a stage's output on its queue.
+_END: Any = object()
+
+# What a run does with each chunk it produces: upload it, merge its changed fields, or
+# leave the indexed copy as it is.
+_NEW, _MOVED, _KEPT = 0, 1, 2
+# Rows per ledger read when merging, deleting or restoring chunks.
+_LEDGER_BATCH = 1000
+
+
+class EmptyDocumentError(ValueError):
+    """Raised when a document produced no indexable text."""
+
+
+@dataclass(frozen=True, slots=True)
+class IngestionProgress:
+    """Cumulative progress of one pipeline stage."""
+
+    document_id: str
+    stage: str  # "parse" | "chunk" | "embed" | "upload"
+    items: int  # text blocks / paragraphs for parse, chunks for the other stages
+    done: bool = False
+
+
+ProgressCallback = Callable[[IngestionProgress], None]
+
+
+@dataclass
+class IngestionResult:
+    """Summary of an ingested document."""
+
+    document_id: str
+    chunks: int
+    stored: int
+    pages: int
+    unchanged: bool = False
+
+
+class DocumentIngestionPipeline:
+    """Index documents through bounded parse -> chunk -> embed -> upload stages."""
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        *,
+        embed_batch_size: int | None = None,
+        upload_batch_size: int | None = None,
+        queue_depth: int | None = None,
+    ) -> None:
+        self._embedding = embedding_service
+        self._search = embedding_service.search_service
+        self._cosmos = embedding_service.cosmos
+        self._embed_batch_size = max(1, embed_batch_size or settings.ingest_embed_batch_size)
+        self._upload_batch_size = max(1, upload_batch_size or settings.ingest_upload_batch_size)
+        self._queue_depth = max(1, queue_depth or settings.ingest_queue_depth)
+
+    async def ingest(
+        self,
+        analysis: StreamingAnalysisResult,
+        *,
+        user_id: str,
+        document_id: str | None = None,
+        metadata: dict[str, Any] | None = None,
+        chunk_size: int = EmbeddingService.DEFAULT_CHUNK_SIZE,
+        chunk_overlap: int = EmbeddingService.DEFAULT_CHUNK_OVERLAP,
+        on_progress: ProgressCallback | None = None,
+    ) -> IngestionResult:
+        """
+        Chunk, embed and upload a document, then store its metadata in Cosmos DB.
+
+        Args:
+            analysis: Streaming analysis result providing text blocks or paragraphs
+            user_id: The user identifier
+            document_id: Optional document ID; an existing document with this ID is
+                re-indexed in place, and a new ID is generated when omitted
+            metadata: Optional document metadata (stored on each chunk and in Cosmos DB)
+            chunk_size: Size of each chunk
+            chunk_overlap: Overlap between chunks
+            on_progress: Optional callback receiving per-stage progress events
+
+        Returns:
+            IngestionResult with the number of chunks created and stored
+        """
+        metadata = metadata or {}
+        doc_id = document_id or str(uuid.uuid4())
+        previous = None
+        if document_id is not None:
+            previous = await self._cosmos.get_document_metadata(document_id, user_id)
+        run = _IngestionRun(
+            pipeline=self,
+            analysis=analysis,
+            document_id=doc_id,
+            user_id=user_id,
+            metadata=metadata,
+            previous=previous,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            on_progress=on_progress,
+        )
+
+        logger.info(
+            "ingestion_started",
+            document_id=doc_id,
+            user_id=user_id,
+            reindex=document_id is not None,
+        )
+        try:
+            if document_id is not None:
+                await run.load_indexed()
+            await run.execute()
+            if not run.chunks:
+                raise EmptyDocumentError("Document contains no text to index")
+            await run.finalize()
+            await self._cosmos.save_document_metadata(
+                document_id=doc_id,
+                user_id=user_id,
+                title=metadata.get("title") or f"Document {doc_id[:8]}...",
+                filename=metadata.get("filename"),
+                content_type=metadata.get("content_type"),
+                chunk_count=run.chunks,
+                pages=metadata.get("pages", analysis.pages),
+                metadata=metadata,
+                content_hash=run.content_hash,
+            )
+        except BaseException as error:
+            logger.error(
+                "ingestion_failed",
+                document_id=doc_id,
+                error=str(error),
+                chunks_uploaded=run.stored,
+            )
+            # Leave the previously indexed version (if any) as it was.
+            await run.roll_back()
+            raise
+        else:
+            # Chunks the new version replaced go last: deleting them cannot be undone. Any
+            # left behind by a failure here are still listed, and removed, on the next re-index.
+            removed = await run.delete_removed()
+        finally:
+            run.close()
+
+        unchanged = previous is not None and previous.content_hash == run.content_hash
+        logger.info(
+            "document_indexed",
+            document_id=doc_id,
+            chunks_stored=run.stored,
+            chunks=run.chunks,
+            chunks_updated=run.updated,
+            chunks_deleted=removed,
+            unchanged=unchanged,
+        )
+        return IngestionResult(
+            document_id=doc_id,
+            chunks=run.chunks,
+            stored=run.stored,
+            pages=analysis.pages,
+            unchanged=unchanged,
+        )
+
+
+class _ChunkLedger:
+    """Per-chunk state of one run, kept in a private temporary SQLite database.
+
+    `indexed` holds the document's chunks already in the search index and `chunks` the ones
+    this run produced, so matching, merging and cleanup read them back in batches.
+    """
+
+    def __init__(self) -> None:
+        # An empty name opens a private on-disk database that is deleted when it is closed.
+        self._db = sqlite3.connect("", isolation_level=None)
+        self._db.executescript(
+            """
+            PRAGMA cache_size = -1024;
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            CREATE TABLE indexed (key TEXT PRIMARY KEY, position INTEGER, page INTEGER);
+            CREATE TABLE chunks (
+                position INTEGER PRIMARY KEY,
+                key TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                state INTEGER NOT NULL
+            );
+            CREATE INDEX chunks_key ON chunks (key);
+            CREATE INDEX chunks_hash ON chunks (hash);
+            """
+        )
+
+    def close(self) -> None:
+        self._db.close()
+
+    def add_indexed(self, rows: Sequence[tuple[str, int, int]]) -> None:
+        self._db.executemany("INSERT OR REPLACE INTO indexed VALUES (?, ?, ?)", rows)
+
+    def keys(self, document_id: str, hashes: list[str]) -> list[str]:
+        """Search keys for the next chunks, continuing the occurrence counts of earlier ones."""
+        unique = list(set(hashes))
+        seen = dict(
+            self._db.execute(
+                f"SELECT hash, COUNT(*) FROM chunks WHERE hash IN ({_placeholders(unique)})"
+                " GROUP BY hash",
+                unique,
+            )
+        )
+        return chunk_keys(document_id, hashes, seen)
+
+    def indexed_positions(self, keys: list[str]) -> dict[str, tuple[int, int]]:
+        """(chunk_index, page_number) of those of `keys` that are already indexed."""
+        rows = self._db.execute(
+            f"SELECT key, position, page FROM indexed WHERE key IN ({_placeholders(keys)})", keys
+        )
+        return {key: (position, page) for key, position, page in rows}
+
+    def add_chunks(self, rows: Sequence[tuple[int, str, str, int, int]]) -> None:
+        self._db.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?, ?)", rows)
+
+    def batches(self, query: str, parameters: Sequence[Any] = ()) -> Iterator[list[Any]]:
+        cursor = self._db.execute(query, parameters)
+        while rows := cursor.fetchmany(_LEDGER_BATCH):
+            yield rows
+
+
+def _placeholders(values: Sequence[Any]) -> str:
+    return ", ".join("?" * len(values))
+
+
+class _IngestionRun:
+    """State for one document moving through the pipeline."""
+
+    def __init__(
+        self,
+        *,
+        pipeline: DocumentIngestionPipeline,
+        analysis: StreamingAnalysisResult,
+        document_id: str,
+        user_id: str,
+        metadata: dict[str, Any],
+        previous: DocumentMetadata | None,
+        chunk_size: int,
+        chunk_overlap: int,
+        on_progress: ProgressCallback | None,
+    ) -> None:
+        self._pipeline = pipeline
+        self._analysis = analysis
+        self._document_id = document_id
+        self._user_id = user_id
+        self._metadata = metadata
+        self._chunk_size = chunk_size
+        self._chunk_overlap = chunk_overlap
+        self._on_progress = on_progress
+        self._previous = previous
+        self._ledger = _ChunkLedger()
+        self._indexed = 0  # chunks of the document already in the index
+        # Document-level chunk fields; total_chunks is set once the final count is known.
+        shared_fields = chunk_shared_fields(metadata, 0)
+        self._shared_changed = previous is None or shared_fields != chunk_shared_fields(
+            previous.metadata, 0
+        )
+        shared_fields.pop("total_chunks")
+        self._shared_fields = shared_fields
+        self._merging = False  # whether indexed chunks may have had fields merged
+        self._content_hash = hashlib.sha256()
+        self._embed_queue: asyncio.Queue[list[tuple[int, str, ChunkWithPage]]] = asyncio.Queue(
+            pipeline._queue_depth
+        )
+        self._upload_queue: asyncio.Queue[list[DocumentChunk]] = asyncio.Queue(
+            pipeline._queue_depth
+        )
+        self._created_at = datetime.now(UTC)
+        self.chunks = 0
+        self.updated = 0  # kept chunks that moved or whose document fields changed
+        self.embedded = 0
+        self.submitted = 0  # chunks handed to Azure Search, including failed batches
+        self.stored = 0
+
+    @property
+    def content_hash(self) -> str:
+        return self._content_hash.hexdigest()
+
+    def close(self) -> None:
+        self._ledger.close()
+
+    async def load_indexed(self) -> None:
+        """Record the chunks the index holds for this document, to match new chunks against."""
+        batch: list[tuple[str, int, int]] = []
+        async for position in self._pipeline._search.iter_chunk_positions(
+            self._document_id, self._user_id
+        ):
+            batch.append(position)
+            if len(batch) >= _LEDGER_BATCH:
+                self._ledger.add_indexed(batch)
+                self._indexed += len(batch)
+                batch = []
+        self._ledger.add_indexed(batch)
+        self._indexed += len(batch)
+
+    async def finalize(self) -> None:
+        """Merge the fields of kept chunks that changed and set the final chunk count."""
+        search = self._pipeline._search
+        fields = {**self._shared_fields, "total_chunks": self.chunks}
+        self._merging = True
+        for rows in self._ledger.batches(
+            "SELECT key, position, page FROM chunks WHERE state = ? ORDER BY position", (_MOVED,)
+        ):
+            updates = [
+                {"id": key, "chunk_index": position, "page_number": page, **fields}
+                for key, position, page in rows
+            ]
+            await search.update_chunk_fields(
+                self._document_id, self._user_id, updates, batch_size=len(updates)
+            )
+
+        # The count is only known now; new chunks were uploaded with total_chunks=0.
+        states = [_NEW]
+        if self._previous is None or self._previous.chunk_count != self.chunks:
+            states.append(_KEPT)
+        for rows in self._ledger.batches(
+            f"SELECT key FROM chunks WHERE state IN ({_placeholders(states)}) ORDER BY position",
+            states,
+        ):
+            await search.set_total_chunks([key for (key,) in rows], self.chunks, len(rows))
+
+    async def delete_removed(self) -> int:
+        """Delete the indexed chunks that this run did not produce; returns how many."""
+        deleted = 0
+        try:
+            for rows in self._ledger.batches(
+                "SELECT key FROM indexed WHERE key NOT IN (SELECT key FROM chunks)"
+            ):
+                deleted += await self._pipeline._search.delete_chunks(
+                    self._document_id, self._user_id, [key for (key,) in rows]
+                )
+        except Exception as error:
+            logger.warning(
+                "ingestion_cleanup_failed", document_id=self._document_id, error=str(error)
+            )
+        return deleted
+
+    async def roll_back(self) -> None:
+        """Delete the chunks this run uploaded and restore the fields it merged."""
+        search = self._pipeline._search
+        try:
+            if self.submitted:
+                for rows in self._ledger.batches("SELECT key FROM chunks WHERE state = ?", (_NEW,)):
+                    await search.delete_chunks(
+                        self._document_id, self._user_id, [key for (key,) in rows]
+                    )
+            if self._merging:
+                previous = self._previous
+                fields = (
+                    {}
+                    if previous is None
+                    else chunk_shared_fields(previous.metadata, previous.chunk_count)
+                )
+                for rows in self._ledger.batches(
+                    "SELECT key, indexed.position, indexed.page FROM chunks"
+                    " JOIN indexed USING (key) WHERE state != ?",
+                    (_NEW,),
+                ):
+                    updates = [
+                        {"id": key, "chunk_index": position, "page_number": page, **fields}
+                        for key, position, page in rows
+                    ]
+                    await search.update_chunk_fields(
+                        self._document_id, self._user_id, updates, batch_size=len(updates)
+                    )
+        except Exception as error:
+            logger.warning(
+                "ingestion_cleanup_failed", document_id=self._document_id, error=str(error)
+            )
+
+    async def execute(self) -> None:
+        tasks = [
+            asyncio.create_task(self._produce()),
+            asyncio.create_task(self._embed()),
+            asyncio.create_task(self._upload()),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    def _report(self, stage: str, items: int, *, done: bool = False) -> None:
+        logger.debug(
+            "ingestion_progress",
+            document_id=self._document_id,
+            stage=stage,
+            items=items,
+            done=done,
+        )
+        if self._on_progress is not None:
+            self._on_progress(
+                IngestionProgress(
+                    document_id=self._document_id, stage=stage, items=items, done=done
+                )
+            )
+
+    async def _chunk_batches(self) -> AsyncIterator[list[ChunkWithPage]]:
+        """Parse and chunk stages: pull source units on demand and yield chunk batches."""
+        batch_size = self._pipeline._embed_batch_size
+        batch: list[ChunkWithPage] = []
+        parsed = 0
+
+        if self._analysis.text_blocks is not None:
+            text_chunker = TextChunker(self._chunk_size, self._chunk_overlap)
+            async for block in self._analysis.text_blocks:
+                parsed += 1
+                self._content_hash.update(block.encode("utf-8"))
+                batch.extend(
+                    ChunkWithPage(content=c, page_number=1) for c in text_chunker.feed(block)
+                )
+                self._report("parse", parsed)
+                while len(batch) >= batch_size:
+                    yield batch[:batch_size]
+                    batch = batch[batch_size:]
+            batch.extend(ChunkWithPage(content=c, page_number=1) for c in text_chunker.finish())
+        else:
+            paragraph_chunker = ParagraphChunker(self._chunk_size, self._chunk_overlap)
+            for paragraph in self._analysis.paragraphs or ():
+                parsed += 1
+                self._content_hash.update(f"{paragraph.content}\n".encode())
+                chunk = paragraph_chunker.add(paragraph)
+                if chunk is None:
+                    continue
+                batch.append(chunk)
+                if len(batch) >= batch_size:
+                    self._report("parse", parsed)
+                    yield batch
+                    batch = []
+            batch.extend(paragraph_chunker.finish())
+
+        self._report("parse", parsed, done=True)
+        if batch:
+            yield batch
+
+    async def _produce(self) -> None:
+        async for batch in self._chunk_batches():
+            # Whitespace-only text is never indexed.
+            batch = [c for c in batch if c.content.strip()]
+            if not batch:
+                continue
+            hashes = [chunk_hash(c.content) for c in batch]
+            keys = self._ledger.keys(self._document_id, hashes)
+            indexed = self._ledger.indexed_positions(keys) if self._indexed else {}
+            rows: list[tuple[int, str, str, int, int]] = []
+            new_chunks: list[tuple[int, str, ChunkWithPage]] = []
+            for index, chunk_id, content_hash, chunk in zip(
+                range(self.chunks, self.chunks + len(batch)), keys, hashes, batch, strict=True
+            ):
+                page = chunk.page_number or 0
+                position = indexed.get(chunk_id)
+                if position is None:
+                    state = _NEW
+                    new_chunks.append((index, chunk_id, chunk))
+                elif self._shared_changed or position != (index, page):
+                    state = _MOVED
+                    self.updated += 1
+                else:
+                    state = _KEPT
+                rows.append((index, chunk_id, content_hash, page, state))
+            self._ledger.add_chunks(rows)
+            self.chunks += len(batch)
+            self._report("chunk", self.chunks)
+            # Chunks already indexed with this content are not embedded again.
+            if new_chunks:
+                await self._embed_queue.put(new_chunks)
+        self._report("chunk", self.chunks, done=True)
+        await self._embed_queue.put(_END)
+
+    async def _embed(self) -> None:
+        while (batch := await self._embed_queue.get()) is not _END:
+            embeddings = await self._pipeline._embedding.generate_embeddings_batch(
+                [chunk.content for _, _, chunk in batch], user_id=self._user_id
+            )
+            document_chunks = [
+                DocumentChunk(
+                    id=chunk_id,
+                    document_id=self._document_id,
+                    user_id=self._user_id,
+                    content=chunk.content,
+                    embedding=embedding,
+                    chunk_index=index,
+                    page_number=chunk.page_number,
+                    metadata=self._metadata,
+                    created_at=self._created_at,
+                )
+                for (index, chunk_id, chunk), embedding in zip(batch, embeddings, strict=True)
+            ]
+            self.embedded += len(document_chunks)
+            self._report("embed", self.embedded)
+            await self._upload_queue.put(document_chunks)
+        self._report("embed", self.embedded, done=True)
+        await self._upload_queue.put(_END)
+
+    async def _upload(self) -> None:
+        search = self._pipeline._search
+        batch_size = self._pipeline._upload_batch_size
+        pending: list[DocumentChunk] = []
+
+        async def flush() -> None:
+            nonlocal pending
+            if not pending:
+                return
+            self.submitted += len(pending)
+            self.stored += await search.bulk_store_chunks(pending, batch_size=len(pending))
+            pending = []
+            self._report("upload", self.submitted)
+
+        while (chunks := await self._upload_queue.get()) is not _END:
+            pending.extend(chunks)
+            if len(pending) >= batch_size:
+                await flush()
+        await flush()
+        self._report("upload", self.submitted, done=True)
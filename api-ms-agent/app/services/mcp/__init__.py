@@ -14,6 +14,8 @@ from app.services.mcp.base import MCPTool, MCPToolResult, MCPWrapper
 from app.services.mcp.geocoder_mcp import GeocoderMCP
 from app.services.mcp.orgbook_mcp import OrgBookMCP
 from app.services.mcp.parks_mcp import ParksMCP
+from app.services.mcp.refresh_ahead import RefreshAheadCache
+from app.services.mcp.resilience import CircuitOpenError, circuit_breaker_states
 
 __all__ = [
     "MCPWrapper",
@@ -22,4 +24,7 @@ __all__ = [
     "OrgBookMCP",
     "GeocoderMCP",
     "ParksMCP",
+    "RefreshAheadCache",
+    "CircuitOpenError",
+    "circuit_breaker_states",
 ]
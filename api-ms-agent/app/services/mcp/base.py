@@ -6,6 +6,7 @@ MCP (Model Context Protocol) tool wrappers for external APIs.
 """
 
 import asyncio
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
@@ -16,11 +17,16 @@ import httpx
 from jsonschema import ValidationError as JsonSchemaValidationError
 from jsonschema import validate as jsonschema_validate
 
+from app.config import settings
 from app.http_client import cached_get_json, create_scoped_client
 from app.logger import get_logger
+from app.services.mcp.resilience import CircuitOpenError, LatencyWindow, get_circuit_breaker
 
 logger = get_logger(__name__)
 
+# Cancellation message for the losing attempt of a hedged GET; it is not a breaker failure.
+_HEDGE_LOST = "hedge lost"
+
 
 class ConfidenceLevel(str, Enum):
     """Confidence level for MCP tool results."""
@@ -40,12 +46,15 @@ class MCPToolResult:
         data: The result data from the tool
         error: Error message if execution failed
         source_info: Source attribution for the data
+        cacheable: Whether a successful result may be cached; False for partial results
+            (e.g. a batch with failed items) that a retry could complete
     """
 
     success: bool
     data: Any = None
     error: str | None = None
     source_info: dict[str, Any] | None = None
+    cacheable: bool = True
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -113,6 +122,7 @@ class MCPWrapper(ABC):
         backoff_factor: float = 0.5,
         max_connections: int = 10,
         max_keepalive_connections: int = 5,
+        hedge_requests: bool | None = None,
     ):
         """
         Initialize the MCP wrapper.
@@ -121,6 +131,8 @@ class MCPWrapper(ABC):
             base_url: Base URL for the API
             timeout: Request timeout in seconds
             headers: Optional headers for all requests
+            hedge_requests: Send a second GET when the first is slower than the upstream's
+                recent p95 (defaults to `settings.mcp_hedge_requests_enabled`)
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
@@ -131,6 +143,11 @@ class MCPWrapper(ABC):
         self._client_limits = httpx.Limits(
             max_connections=max_connections, max_keepalive_connections=max_keepalive_connections
         )
+        self._breaker = get_circuit_breaker(self.base_url)
+        self._hedge_requests = (
+            settings.mcp_hedge_requests_enabled if hedge_requests is None else hedge_requests
+        )
+        self._latency = LatencyWindow()
 
     @property
     def name(self) -> str:
@@ -203,6 +220,73 @@ class MCPWrapper(ABC):
         except JsonSchemaValidationError as e:
             return False, str(e)
 
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send one request through the upstream's circuit breaker.
+
+        A request cancelled while in flight (e.g. by the tool timeout) counts as a failure, so a
+        hanging upstream opens the breaker; only the losing attempt of a hedged GET is abandoned.
+
+        Raises:
+            CircuitOpenError: If the circuit is open; nothing is sent
+        """
+        self._breaker.acquire()
+        client = await self._get_client()
+        success: bool | None = None
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            success = response.status_code < 500
+            if success:
+                self._latency.add(time.perf_counter() - start)
+            return response
+        except httpx.HTTPError:
+            success = False
+            raise
+        except asyncio.CancelledError as e:
+            success = None if e.args == (_HEDGE_LOST,) else False
+            raise
+        finally:
+            self._breaker.release(success)
+
+    async def _send_get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a GET, hedged with a second attempt when hedging is enabled.
+
+        The hedge starts once the first attempt has been outstanding for the upstream's recent
+        p95 latency; the first response wins and the other attempt is cancelled.
+        """
+        p95 = self._latency.percentile(95) if self._hedge_requests else None
+        if p95 is None:
+            return await self._send("GET", url, **kwargs)
+
+        delay = max(p95, settings.mcp_hedge_min_delay_ms / 1000.0)
+        primary = asyncio.create_task(self._send("GET", url, **kwargs))
+        pending = {primary}
+        error: BaseException | None = None
+        # Losers are cancelled as abandoned only once another attempt has answered; if this
+        # call is itself cancelled, the outstanding attempts are cancelled as failures.
+        cancel_message: str | None = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            pending.add(asyncio.create_task(self._send("GET", url, **kwargs)))
+            logger.debug(f"{self.name} hedged GET {url} after {delay * 1000:.0f}ms")
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        cancel_message = _HEDGE_LOST
+                        return task.result()
+                    # Prefer the primary's error; a hedge refused by an open circuit says less.
+                    if error is None or task is primary:
+                        error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel(cancel_message)
+
     async def _request(
         self,
         method: str,
@@ -224,19 +308,19 @@ class MCPWrapper(ABC):
 
         Raises:
             httpx.HTTPError: If the request fails
+            CircuitOpenError: If the upstream's circuit is open
         """
-        client = await self._get_client()
-
         if method.upper() == "GET" and json_data is None:
             # Use shared GET caching for idempotent tool calls.
-            return await cached_get_json(client, path, params=params)
+            client = await self._get_client()
+            return await cached_get_json(client, path, params=params, send=self._send_get)
 
         last_exc: Exception | None = None
         for attempt in range(1, self._max_retries + 1):
             try:
-                response = await client.request(
-                    method=method,
-                    url=path,
+                response = await self._send(
+                    method,
+                    path,
                     params=params,
                     json=json_data,
                 )
@@ -272,6 +356,8 @@ class MCPWrapper(ABC):
                         return {"raw_text": response.text}
                 # If not JSON, return text as dict
                 return {"raw_text": response.text}
+            except CircuitOpenError:
+                raise
             except httpx.HTTPError as e:
                 last_exc = e
                 # Last attempt -> re-raise
@@ -340,6 +426,14 @@ class MCPWrapper(ABC):
             logger.warning(f"{self.name} health check failed: {e}")
             return False
 
+    def circuit_state(self) -> dict[str, object]:
+        """Return the state of this upstream's circuit breaker."""
+        return self._breaker.snapshot()
+
+    # Deliberately not abstract: only wrappers with reference data (e.g. BC Parks) override it.
+    async def warm(self) -> None:  # noqa: B027
+        """Prefetch long-lived reference data at startup. No-op by default."""
+
     async def close(self) -> None:
         """Close the HTTP client."""
         if self._client and not self._client.is_closed:
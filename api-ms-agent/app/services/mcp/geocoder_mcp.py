@@ -5,6 +5,7 @@ Provides MCP tools for querying BC Geocoder API for address/location information
 API Documentation: https://www2.gov.bc.ca/gov/content?id=118DD57CD9674D57BDBD511C2E78DC0D
 """
 
+import asyncio
 from typing import Any
 
 from app.config import settings
@@ -15,6 +16,10 @@ logger = get_logger(__name__)
 
 # Geocoder API Base URL
 GEOCODER_BASE_URL = "https://geocoder.api.gov.bc.ca"
+GEOCODER_DOCS_URL = "https://www2.gov.bc.ca/gov/content?id=118DD57CD9674D57BDBD511C2E78DC0D"
+
+# Most addresses accepted by one geocoder_geocode_batch call
+GEOCODE_BATCH_MAX_ADDRESSES = 50
 
 
 class GeocoderMCP(MCPWrapper):
@@ -22,7 +27,7 @@ class GeocoderMCP(MCPWrapper):
     MCP wrapper for BC Geocoder API.
 
     Provides tools for:
-    - Geocoding addresses to coordinates
+    - Geocoding addresses to coordinates, one at a time or in batches
     - Searching for occupants at addresses
     - Finding nearest sites to coordinates
     - Reverse geocoding from coordinates
@@ -66,6 +71,33 @@ class GeocoderMCP(MCPWrapper):
                     "required": ["address"],
                 },
             ),
+            MCPTool(
+                name="geocoder_geocode_batch",
+                description=(
+                    "Convert several BC addresses to geographic coordinates in one call. "
+                    "Returns the best matches with lat/long for each address."
+                ),
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "addresses": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "The addresses or place names to geocode",
+                            "minItems": 1,
+                            "maxItems": GEOCODE_BATCH_MAX_ADDRESSES,
+                        },
+                        "max_results": {
+                            "type": "integer",
+                            "description": "Maximum number of matches to return per address",
+                            "default": 1,
+                            "minimum": 1,
+                            "maximum": 5,
+                        },
+                    },
+                    "required": ["addresses"],
+                },
+            ),
             MCPTool(
                 name="geocoder_occupants",
                 description=(
@@ -154,6 +186,8 @@ class GeocoderMCP(MCPWrapper):
         try:
             if tool_name == "geocoder_geocode":
                 return await self._geocode_address(arguments)
+            elif tool_name == "geocoder_geocode_batch":
+                return await self._geocode_batch(arguments)
             elif tool_name == "geocoder_occupants":
                 return await self._search_occupants(arguments)
             elif tool_name == "geocoder_nearest":
@@ -227,6 +261,72 @@ class GeocoderMCP(MCPWrapper):
             ),
         )
 
+    async def _geocode_batch(self, arguments: dict[str, Any]) -> MCPToolResult:
+        """Geocode several addresses concurrently into one compact result.
+
+        Duplicate addresses are looked up once, and each lookup goes through the cached
+        `/addresses.json` GET, so repeated addresses across calls are served from the cache.
+        A failed address is reported in its own entry instead of failing the whole batch.
+        """
+        addresses = list(
+            dict.fromkeys(a.strip() for a in arguments.get("addresses", []) if a and a.strip())
+        )[:GEOCODE_BATCH_MAX_ADDRESSES]
+        if not addresses:
+            return MCPToolResult(success=False, error="No addresses to geocode")
+        max_results = min(arguments.get("max_results", 1), 5)
+        semaphore = asyncio.Semaphore(max(1, settings.mcp_geocoder_batch_concurrency))
+
+        async def geocode_one(address: str) -> dict[str, Any]:
+            async with semaphore:
+                try:
+                    result = await self._geocode_address(
+                        {"address": address, "max_results": max_results}
+                    )
+                except Exception as e:
+                    logger.warning(f"[GeocoderMCP] Batch geocode failed for '{address}': {e}")
+                    return {"query": address, "error": str(e)}
+            matches = [
+                {
+                    "full_address": match["full_address"],
+                    "score": match["score"],
+                    "latitude": match["coordinates"]["latitude"],
+                    "longitude": match["coordinates"]["longitude"],
+                }
+                for match in (result.data or {}).get("addresses", [])
+            ]
+            return {"query": address, "matches": matches}
+
+        results = await asyncio.gather(*(geocode_one(a) for a in addresses))
+        failed = sum(1 for r in results if "error" in r)
+        if failed == 0:
+            confidence = ConfidenceLevel.HIGH
+        elif failed < len(results):
+            confidence = ConfidenceLevel.MEDIUM
+        else:
+            confidence = ConfidenceLevel.LOW
+
+        return MCPToolResult(
+            success=failed < len(results),
+            data={
+                "results": results,
+                "count": len(results),
+                "failed": failed,
+            },
+            error=results[0]["error"] if results and failed == len(results) else None,
+            # Failed addresses are retried on the next call rather than cached with the batch.
+            cacheable=failed == 0,
+            source_info=self._build_source_info(
+                endpoint="/addresses.json",
+                params={"maxResults": max_results, "outputSRS": 4326},
+                description=(
+                    f"BC Geocoder API - Address lookup for {len(results)} addresses. "
+                    f"{len(results) - failed} geocoded, {failed} failed."
+                ),
+                confidence=confidence,
+                extra={"documentation": GEOCODER_DOCS_URL},
+            ),
+        )
+
     async def _search_occupants(self, arguments: dict[str, Any]) -> MCPToolResult:
         """Search for occupants at addresses."""
         query = arguments.get("query", "")
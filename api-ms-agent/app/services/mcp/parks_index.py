@@ -0,0 +1,267 @@
+"""
+In-memory indexes over the cached BC Parks catalogue.
+
+`ParksMCP` builds a `ParksIndex` each time its cached protected-areas list refreshes, so tool
+calls probe precomputed structures instead of scanning every park:
+
+- an inverted index of lower-case tokens from each park's name, description, location notes
+  and search terms; its sorted vocabulary answers prefix queries with a binary search;
+- a grid of lat/lon cells for radius queries, checked exactly with the haversine distance;
+- a map from activity name to the parks that offer it;
+- name and name-token maps for resolving a park name to its ORCS number.
+
+Lookups return parks in catalogue order (proximity results nearest first), like the scans
+they replace.
+"""
+
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any
+
+EARTH_RADIUS_KM = 6371.0
+
+_KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0
+# Grid cell size for radius queries; BC parks are a few hundred cells of this size.
+_CELL_DEGREES = 0.5
+_LONGITUDE_CELLS = int(360 / _CELL_DEGREES)
+
+_TOKEN = re.compile(r"\w+")
+_HTML_TAG = re.compile(r"<[^>]+>")
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometers."""
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lon = math.radians(lon2 - lon1)
+
+    a = (
+        math.sin(delta_lat / 2) ** 2
+        + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
+    )
+    return EARTH_RADIUS_KM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def park_attributes(park: Any) -> dict[str, Any]:
+    """The Strapi `attributes` of a park record (or the record itself when flat)."""
+    return park.get("attributes", park) if isinstance(park, dict) else {}
+
+
+def activity_name(activity: Any) -> str:
+    """Name of a park activity entry, whether its type is nested or flat."""
+    attrs = park_attributes(activity)
+    act_type = attrs.get("activityType", {})
+    if isinstance(act_type, dict):
+        return act_type.get("activityName", "") or ""
+    return attrs.get("activityName", attrs.get("name", "")) or ""
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _cell(latitude: float, longitude: float) -> tuple[int, int]:
+    return (
+        math.floor(latitude / _CELL_DEGREES),
+        math.floor(longitude / _CELL_DEGREES) % _LONGITUDE_CELLS,
+    )
+
+
+class _TokenIndex:
+    """Token -> park positions, with prefix lookups over the sorted vocabulary."""
+
+    def __init__(self) -> None:
+        self._postings: dict[str, list[int]] = defaultdict(list)
+        self._vocabulary: list[str] = []
+
+    def add(self, text: str, position: int) -> None:
+        for token in _TOKEN.findall(text):
+            postings = self._postings[token]
+            if not postings or postings[-1] != position:
+                postings.append(position)
+
+    def freeze(self) -> None:
+        self._postings = dict(self._postings)
+        self._vocabulary = sorted(self._postings)
+
+    def _prefix_postings(self, prefix: str) -> list[list[int]]:
+        start = end = bisect_left(self._vocabulary, prefix)
+        while end < len(self._vocabulary) and self._vocabulary[end].startswith(prefix):
+            end += 1
+        return [self._postings[token] for token in self._vocabulary[start:end]]
+
+    def candidates(self, text: str) -> list[int] | None:
+        """Sorted positions that may contain every token of `text` as a word prefix.
+
+        Only the token with the fewest prefix matches is looked up; callers verify each
+        candidate against the full text. Returns None when `text` has no tokens.
+        """
+        smallest: list[list[int]] | None = None
+        for term in set(_TOKEN.findall(text)):
+            postings = self._prefix_postings(term)
+            if smallest is None or sum(map(len, postings)) < sum(map(len, smallest)):
+                smallest = postings
+        if smallest is None:
+            return None
+        if len(smallest) == 1:
+            return smallest[0]
+        return sorted(set().union(*smallest))
+
+
+class ParksIndex:
+    """Text, proximity, activity and name indexes over one snapshot of the parks list."""
+
+    def __init__(self, parks: list[dict[str, Any]]) -> None:
+        self.parks = parks
+        self._searchable: list[str] = []
+        self._names: list[str] = []
+        self._text = _TokenIndex()
+        self._name_tokens = _TokenIndex()
+        self._positions_by_name: dict[str, int] = {}
+        self._cells: dict[tuple[int, int], list[int]] = defaultdict(list)
+        self._coordinates: dict[int, tuple[float, float]] = {}
+        self._park_activities: list[list[str]] = []
+        self._activities: dict[str, list[int]] = defaultdict(list)
+
+        for position, park in enumerate(parks):
+            attrs = park_attributes(park)
+            name = _normalize(attrs.get("protectedAreaName") or attrs.get("name") or "")
+            description = _HTML_TAG.sub(" ", attrs.get("description") or "")
+            searchable = _normalize(
+                f"{name} {description} {attrs.get('locationNotes') or ''} "
+                f"{attrs.get('searchTerms') or ''}"
+            )
+            self._searchable.append(searchable)
+            self._text.add(searchable, position)
+            self._names.append(name)
+            self._name_tokens.add(name, position)
+            if name:
+                self._positions_by_name.setdefault(name, position)
+
+            try:
+                coordinates = (float(attrs["latitude"]), float(attrs["longitude"]))
+            except (KeyError, TypeError, ValueError):
+                pass
+            else:
+                self._coordinates[position] = coordinates
+                self._cells[_cell(*coordinates)].append(position)
+
+            names = [activity_name(act).lower() for act in attrs.get("parkActivities") or []]
+            self._park_activities.append(names)
+            for activity in dict.fromkeys(names):
+                self._activities[activity].append(position)
+
+        self._text.freeze()
+        self._name_tokens.freeze()
+
+    def __len__(self) -> int:
+        return len(self.parks)
+
+    def search_text(self, query: str, limit: int) -> list[int]:
+        """Positions of the first `limit` parks whose text contains `query`.
+
+        Each query word must start a word in the park's text; candidates from the inverted
+        index are then checked for the whole query starting at a word, so multi-word queries
+        match as phrases.
+        """
+        query = _normalize(query)
+        candidates = self._text.candidates(query)
+        phrase = re.compile(r"(?<!\w)" + re.escape(query))
+        results = []
+        for position in range(len(self.parks)) if candidates is None else candidates:
+            if phrase.search(self._searchable[position]):
+                results.append(position)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def within_radius(
+        self, latitude: float, longitude: float, radius_km: float
+    ) -> list[tuple[int, float]]:
+        """(position, distance in km) of parks within `radius_km`, nearest first."""
+        lat_span = radius_km / _KM_PER_DEGREE
+        max_abs_lat = abs(latitude) + lat_span
+        # East-west distance per degree shrinks towards the poles; bound it at the
+        # highest latitude the circle reaches.
+        lon_span = math.inf if max_abs_lat >= 90 else lat_span / math.cos(math.radians(max_abs_lat))
+
+        if lon_span >= 180:
+            candidates = sorted(self._coordinates)
+        else:
+            low_row, low_col = _cell(latitude - lat_span, longitude - lon_span)
+            high_row = math.floor((latitude + lat_span) / _CELL_DEGREES)
+            columns = math.floor((longitude + lon_span) / _CELL_DEGREES) - math.floor(
+                (longitude - lon_span) / _CELL_DEGREES
+            )
+            candidates = sorted(
+                position
+                for row in range(low_row, high_row + 1)
+                for column in range(low_col, low_col + columns + 1)
+                for position in self._cells.get((row, column % _LONGITUDE_CELLS), ())
+            )
+
+        results = []
+        for position in candidates:
+            distance = haversine_km(latitude, longitude, *self._coordinates[position])
+            if distance <= radius_km:
+                results.append((position, distance))
+        results.sort(key=lambda item: item[1])
+        return results
+
+    def with_activity(self, activity: str, limit: int) -> list[tuple[int, str]]:
+        """(position, matched activity name) of the first `limit` parks offering an activity
+        whose name contains `activity`."""
+        activity = activity.lower()
+        positions: set[int] = set()
+        for name, parks in self._activities.items():
+            if activity in name:
+                positions.update(parks)
+        results = []
+        for position in sorted(positions)[:limit]:
+            matched = next(n for n in self._park_activities[position] if activity in n)
+            results.append((position, matched))
+        return results
+
+    def resolve(self, park_name: str) -> str | None:
+        """ORCS number (or id) of the park named `park_name`.
+
+        An exact name match wins; otherwise the first park whose name contains, or is
+        contained in, `park_name`.
+        """
+        key = _normalize(park_name)
+        if not key:
+            return None
+        exact = self._positions_by_name.get(key)
+        if exact is not None and (resolved := self._park_id(exact)):
+            return resolved
+
+        # Names containing the key start words with each of its words; names contained in
+        # the key are runs of its words.
+        containing = (
+            position
+            for position in self._name_tokens.candidates(key) or ()
+            if key in self._names[position]
+        )
+        words = key.split()
+        contained = {
+            self._positions_by_name[run]
+            for start in range(len(words))
+            for end in range(start + 1, len(words) + 1)
+            if (run := " ".join(words[start:end])) in self._positions_by_name
+        }
+        for position in heapq.merge(containing, sorted(contained)):
+            if resolved := self._park_id(position):
+                return resolved
+        return None
+
+    def _park_id(self, position: int) -> str | None:
+        park = self.parks[position]
+        orcs = park_attributes(park).get("orcs")
+        if orcs:
+            return str(orcs)
+        # Fall back to the park id if orcs is not available
+        return str(park["id"]) if park.get("id") else None
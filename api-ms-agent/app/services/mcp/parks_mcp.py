@@ -6,19 +6,22 @@ API Base: https://bcparks.api.gov.bc.ca/api
 """
 
 import asyncio
-import math
 import re
-import time
+from pathlib import Path
 from typing import Any
 
 from app.config import settings
 from app.logger import get_logger
 from app.services.mcp.base import ConfidenceLevel, MCPTool, MCPToolResult, MCPWrapper
+from app.services.mcp.parks_index import ParksIndex
+from app.services.mcp.refresh_ahead import RefreshAheadCache
 
 logger = get_logger(__name__)
 
 # BC Parks API Base URL
 PARKS_BASE_URL = "https://bcparks.api.gov.bc.ca/api"
+# Endpoint whose full listing backs search, activity lookups and name resolution
+PARKS_CATALOGUE_ENDPOINT = "/protected-areas"
 
 
 class ParksMCP(MCPWrapper):
@@ -32,14 +35,27 @@ class ParksMCP(MCPWrapper):
     - Getting campsite/reservation information
     """
 
-    def __init__(self, base_url: str | None = None, cache_ttl_seconds: int = 43200):
+    def __init__(
+        self,
+        base_url: str | None = None,
+        cache_ttl_seconds: int = 43200,
+        snapshot_path: str | Path | None = None,
+    ):
         """Initialize the Parks MCP wrapper."""
         configured_base = base_url or getattr(settings, "parks_base_url", None) or PARKS_BASE_URL
         super().__init__(base_url=configured_base)
         self._cache_ttl_seconds = cache_ttl_seconds
-        self._parks_cache: dict[str, Any] = {"timestamp": 0, "parks": []}
-        self._parks_cache_lock = asyncio.Lock()
-        self._parks_cache_refresh_lock = asyncio.Lock()
+        if snapshot_path is None:
+            snapshot_dir = getattr(settings, "mcp_catalogue_snapshot_dir", "")
+            snapshot_path = Path(snapshot_dir) / "parks.json" if snapshot_dir else None
+        self._catalogue: RefreshAheadCache[ParksIndex] = RefreshAheadCache(
+            "parks",
+            self._load_parks_index,
+            ttl_seconds=cache_ttl_seconds,
+            snapshot_path=snapshot_path,
+            to_snapshot=lambda index: index.parks,
+            from_snapshot=ParksIndex,
+        )
         logger.info("ParksMCP initialized")
 
     @property
@@ -244,28 +260,17 @@ class ParksMCP(MCPWrapper):
 
         endpoint = "/protected-areas"
 
-        all_parks = await self._get_all_parks_cached(endpoint=endpoint)
-        logger.info(f"[ParksMCP] Loaded {len(all_parks)} total parks")
+        index = await self._get_parks_index()
+        logger.info(f"[ParksMCP] Searching {len(index)} total parks")
 
         results = []
 
         # If coordinates provided, do proximity search
         if latitude is not None and longitude is not None:
-            for park in all_parks:
-                attrs = park.get("attributes", park)
-                park_lat = attrs.get("latitude")
-                park_lon = attrs.get("longitude")
-
-                if park_lat is not None and park_lon is not None:
-                    distance = self._haversine_distance(latitude, longitude, park_lat, park_lon)
-                    if distance <= radius_km:
-                        park_info = self._extract_park_info_full(park)
-                        park_info["distance_km"] = round(distance, 1)
-                        results.append(park_info)
-
-            # Sort by distance
-            results.sort(key=lambda x: x.get("distance_km", 999))
-            results = results[:limit]
+            for position, distance in index.within_radius(latitude, longitude, radius_km)[:limit]:
+                park_info = self._extract_park_info_full(index.parks[position])
+                park_info["distance_km"] = round(distance, 1)
+                results.append(park_info)
 
             return MCPToolResult(
                 success=True,
@@ -288,22 +293,11 @@ class ParksMCP(MCPWrapper):
                 ),
             )
 
-        # Text-based search across multiple fields
-        for park in all_parks:
-            attrs = park.get("attributes", park)
-            park_name = attrs.get("protectedAreaName", attrs.get("name", ""))
-            description = attrs.get("description", "") or ""
-            location_notes = attrs.get("locationNotes", "") or ""
-            search_terms = attrs.get("searchTerms", "") or ""
-
-            # Search across multiple fields
-            searchable = f"{park_name} {description} {location_notes} {search_terms}".lower()
-
-            if query in searchable:
-                park_info = self._extract_park_info_full(park)
-                results.append(park_info)
-                if len(results) >= limit:
-                    break
+        # Text-based search across name, description, location notes and search terms
+        results = [
+            self._extract_park_info_full(index.parks[position])
+            for position in index.search_text(query, limit)
+        ]
 
         return MCPToolResult(
             success=True,
@@ -327,82 +321,41 @@ class ParksMCP(MCPWrapper):
         """Resolve a park_id to an ORCS number.
 
         The BC Parks API expects /protected-areas/{orcs} where orcs is numeric.
-        If park_id is already numeric, return it. Otherwise, search the cached
-        parks list by name and return the matching ORCS number.
+        If park_id is already numeric, return it. Otherwise, look the name up in the
+        cached parks index and return the matching ORCS number.
         """
         # If it looks like an ORCS number (digits only), use it directly
         if park_id.isdigit():
             return park_id
 
-        # Search the cached parks list for a matching name
-        all_parks = await self._get_all_parks_cached(endpoint="/protected-areas")
-        park_id_lower = park_id.lower().strip()
-
-        for park in all_parks:
-            attrs = park.get("attributes", park) if isinstance(park, dict) else {}
-            name = (attrs.get("protectedAreaName") or attrs.get("name") or "").lower()
-            orcs = attrs.get("orcs")
-
-            # Check for exact match or close match
-            if name == park_id_lower or park_id_lower in name or name in park_id_lower:
-                if orcs:
-                    logger.debug(f"Resolved park name '{park_id}' to ORCS '{orcs}'")
-                    return str(orcs)
-                # Fallback to park id if orcs not available
-                pid = park.get("id")
-                if pid:
-                    logger.debug(f"Resolved park name '{park_id}' to id '{pid}'")
-                    return str(pid)
-
-        # Could not resolve
-        return None
-
-    def _haversine_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Calculate distance between two points in kilometers using Haversine formula."""
-        R = 6371  # Earth's radius in kilometers
-
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
-
-        a = (
-            math.sin(delta_lat / 2) ** 2
-            + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
-        )
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-        return R * c
+        index = await self._get_parks_index()
+        resolved = index.resolve(park_id)
+        if resolved:
+            logger.debug(f"Resolved park name '{park_id}' to '{resolved}'")
+        return resolved
 
-    async def _get_all_parks_cached(self, endpoint: str) -> list[dict[str, Any]]:
-        """Return the full parks list, using a TTL cache.
+    async def _get_parks_index(self) -> ParksIndex:
+        """Return the index over the cached parks list.
 
-        - Concurrency-safe: cache reads/writes are locked.
-        - Thundering-herd safe: only one refresh runs at a time.
+        The list is refreshed in the background ahead of its TTL; while a refresh runs
+        (or after it fails) the previous list is served.
         """
-        now = time.time()
-        async with self._parks_cache_lock:
-            cached_parks = self._parks_cache.get("parks") or []
-            cached_ts = float(self._parks_cache.get("timestamp") or 0)
-            if cached_parks and now - cached_ts < self._cache_ttl_seconds:
-                logger.debug(f"[ParksMCP] Using cached parks list ({len(cached_parks)})")
-                return cached_parks
-
-        async with self._parks_cache_refresh_lock:
-            # Re-check after acquiring refresh lock in case another coroutine refreshed.
-            now = time.time()
-            async with self._parks_cache_lock:
-                cached_parks = self._parks_cache.get("parks") or []
-                cached_ts = float(self._parks_cache.get("timestamp") or 0)
-                if cached_parks and now - cached_ts < self._cache_ttl_seconds:
-                    logger.debug(f"[ParksMCP] Using cached parks list ({len(cached_parks)})")
-                    return cached_parks
-
-            parks = await self._fetch_all_parks_paginated(endpoint=endpoint)
-            async with self._parks_cache_lock:
-                self._parks_cache["parks"] = parks
-                self._parks_cache["timestamp"] = now
-            return parks
+        return await self._catalogue.get()
+
+    async def _load_parks_index(self) -> ParksIndex:
+        """Fetch the full parks list and index it off the event loop."""
+        parks = await self._fetch_all_parks_paginated(endpoint=PARKS_CATALOGUE_ENDPOINT)
+        logger.info(f"[ParksMCP] Fetched {len(parks)} parks")
+        return await asyncio.to_thread(ParksIndex, parks)
+
+    async def warm(self) -> None:
+        """Load the parks catalogue (from the snapshot when configured) and keep it fresh."""
+        await self._catalogue.warm()
+
+    async def close(self) -> None:
+        """Stop catalogue refreshes and close the HTTP client."""
+        await self._catalogue.close()
+        await super().close()
 
     async def _fetch_all_parks_paginated(self, endpoint: str) -> list[dict[str, Any]]:
         """Fetch the full parks list using Strapi pagination.
@@ -701,37 +654,15 @@ class ParksMCP(MCPWrapper):
                 error="activity is required",
             )
 
-        # Get all parks and filter by activity
+        # Look the activity up in the cached parks index
         endpoint = "/protected-areas"
-        try:
-            data = await self._request("GET", endpoint, params={"_limit": 100})
-        except Exception:
-            data = await self._request("GET", endpoint)
-
-        parks_list = data if isinstance(data, list) else data.get("data", [])
+        index = await self._get_parks_index()
 
         matching_parks = []
-        for park in parks_list:
-            attrs = park.get("attributes", park) if isinstance(park, dict) else {}
-            activities = attrs.get("parkActivities", [])
-
-            for act in activities:
-                act_attrs = act.get("attributes", act) if isinstance(act, dict) else {}
-                act_type = act_attrs.get("activityType", {})
-                act_name = (
-                    act_type.get("activityName", "")
-                    if isinstance(act_type, dict)
-                    else act_attrs.get("activityName", "")
-                ).lower()
-
-                if activity in act_name:
-                    park_info = self._extract_park_info_full(park)
-                    park_info["matched_activity"] = act_name
-                    matching_parks.append(park_info)
-                    break
-
-            if len(matching_parks) >= limit:
-                break
+        for position, act_name in index.with_activity(activity, limit):
+            park_info = self._extract_park_info_full(index.parks[position])
+            park_info["matched_activity"] = act_name
+            matching_parks.append(park_info)
 
         return MCPToolResult(
             success=True,
@@ -0,0 +1,214 @@
+"""Refresh-ahead cache for long-lived MCP reference data.
+
+Some wrappers (e.g. BC Parks) serve tools from a whole upstream catalogue that is slow to
+fetch and changes rarely. `RefreshAheadCache` keeps one such value in memory and:
+
+- refreshes it in a background task once it is within `refresh_ahead_seconds` of its TTL,
+  either on access or from the scheduler started by `warm()`;
+- keeps serving the stale value while that refresh runs, or after it fails;
+- optionally writes a JSON snapshot after each refresh and loads it in `warm()`, so a
+  restarted process starts with the last catalogue instead of a cold fetch.
+
+Callers only wait for the upstream on the first load, or when the value is older than
+`ttl_seconds + max_stale_seconds`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SNAPSHOT_VERSION = 1
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+class RefreshAheadCache[T]:
+    """A single value fetched by `fetch`, refreshed ahead of expiry and served stale.
+
+    `to_snapshot` turns the value into JSON-serializable data and `from_snapshot` rebuilds it;
+    `from_snapshot` runs in a worker thread, so it may do CPU-heavy work such as indexing.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[T]],
+        *,
+        ttl_seconds: float,
+        refresh_ahead_seconds: float | None = None,
+        max_stale_seconds: float | None = None,
+        retry_seconds: float = 60.0,
+        snapshot_path: str | Path | None = None,
+        to_snapshot: Callable[[T], Any] = _identity,
+        from_snapshot: Callable[[Any], T] = _identity,
+    ) -> None:
+        self.name = name
+        self._fetch = fetch
+        self._ttl_seconds = max(0.0, ttl_seconds)
+        ahead = self._ttl_seconds * 0.1 if refresh_ahead_seconds is None else refresh_ahead_seconds
+        # Refresh no earlier than half-way through the TTL.
+        self._refresh_after = self._ttl_seconds - min(max(0.0, ahead), self._ttl_seconds / 2)
+        self._max_stale_seconds = max_stale_seconds
+        self._retry_seconds = max(0.0, retry_seconds)
+        self._snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._to_snapshot = to_snapshot
+        self._from_snapshot = from_snapshot
+
+        self._value: T | None = None
+        self._has_value = False
+        self._fetched_at = 0.0
+        self._failed_at = 0.0
+        self._refresh_task: asyncio.Task[T] | None = None
+        self._scheduler: asyncio.Task[None] | None = None
+
+    @property
+    def age_seconds(self) -> float | None:
+        """Seconds since the current value was fetched, or None before the first load."""
+        return time.time() - self._fetched_at if self._has_value else None
+
+    async def get(self) -> T:
+        """Return the current value, starting a background refresh when it is due."""
+        if not self._has_value:
+            return await self.refresh()
+
+        age = time.time() - self._fetched_at
+        if age >= self._refresh_after and time.time() - self._failed_at >= self._retry_seconds:
+            self._start_refresh()
+        if self._max_stale_seconds is not None and (
+            age >= self._ttl_seconds + self._max_stale_seconds
+        ):
+            return await self.refresh()
+        return self._value  # type: ignore[return-value]
+
+    async def refresh(self) -> T:
+        """Fetch a new value now, joining a refresh already in flight, and return it."""
+        # Shielded so a cancelled caller does not cancel a refresh other callers share.
+        return await asyncio.shield(self._start_refresh())
+
+    async def warm(self) -> None:
+        """Load the snapshot (or fetch when there is none) and start the refresh scheduler."""
+        if not self._has_value and self._snapshot_path is not None:
+            await self._load_snapshot()
+        if self._ttl_seconds > 0 and (self._scheduler is None or self._scheduler.done()):
+            self._scheduler = asyncio.create_task(
+                self._schedule(), name=f"refresh-ahead-scheduler:{self.name}"
+            )
+        if not self._has_value:
+            await self.refresh()
+
+    async def close(self) -> None:
+        """Cancel the scheduler and any refresh in flight."""
+        for task in (self._scheduler, self._refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await task
+        self._scheduler = None
+        self._refresh_task = None
+
+    def _start_refresh(self) -> asyncio.Task[T]:
+        if self._refresh_task is None or self._refresh_task.done():
+            task = asyncio.create_task(self._refresh(), name=f"refresh-ahead:{self.name}")
+            # Background failures are logged in _refresh; mark them retrieved.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._refresh_task = task
+        return self._refresh_task
+
+    async def _refresh(self) -> T:
+        start = time.perf_counter()
+        try:
+            value = await self._fetch()
+        except Exception as exc:
+            self._failed_at = time.time()
+            logger.warning(
+                "refresh_ahead_failed",
+                cache=self.name,
+                error=str(exc),
+                serving_stale=self._has_value,
+            )
+            raise
+
+        fetched_at = time.time()
+        self._value, self._has_value, self._fetched_at = value, True, fetched_at
+        logger.info(
+            "refresh_ahead_refreshed",
+            cache=self.name,
+            duration_ms=round((time.perf_counter() - start) * 1000, 2),
+        )
+
+        if self._snapshot_path is not None:
+            try:
+                await asyncio.to_thread(self._write_snapshot, value, fetched_at)
+            except Exception as exc:  # noqa: BLE001 - a snapshot is best-effort
+                logger.warning(
+                    "refresh_ahead_snapshot_write_failed", cache=self.name, error=str(exc)
+                )
+        return value
+
+    async def _schedule(self) -> None:
+        while True:
+            due = self._fetched_at + self._refresh_after if self._has_value else 0.0
+            if self._failed_at > self._fetched_at:
+                due = max(due, self._failed_at + self._retry_seconds)
+            delay = due - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            with contextlib.suppress(Exception):
+                await self.refresh()
+
+    async def _load_snapshot(self) -> None:
+        try:
+            loaded = await asyncio.to_thread(self._read_snapshot)
+        except Exception as exc:  # noqa: BLE001 - fall back to fetching from the upstream
+            logger.warning("refresh_ahead_snapshot_load_failed", cache=self.name, error=str(exc))
+            return
+        # A refresh may have completed while the snapshot was read.
+        if loaded is None or self._has_value:
+            return
+        self._value, self._fetched_at = loaded
+        self._has_value = True
+        logger.info(
+            "refresh_ahead_snapshot_loaded",
+            cache=self.name,
+            age_seconds=round(time.time() - self._fetched_at, 1),
+        )
+
+    def _read_snapshot(self) -> tuple[T, float] | None:
+        assert self._snapshot_path is not None
+        try:
+            with open(self._snapshot_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        if data.get("version") != _SNAPSHOT_VERSION or data.get("name") != self.name:
+            return None
+        return self._from_snapshot(data["value"]), float(data["fetched_at"])
+
+    def _write_snapshot(self, value: T, fetched_at: float) -> None:
+        assert self._snapshot_path is not None
+        self._snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial snapshot.
+        tmp_path = self._snapshot_path.with_name(f"{self._snapshot_path.name}.{os.getpid()}.tmp")
+        payload = {
+            "version": _SNAPSHOT_VERSION,
+            "name": self.name,
+            "fetched_at": fetched_at,
+            "value": self._to_snapshot(value),
+        }
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, self._snapshot_path)
@@ -0,0 +1,175 @@
+"""Circuit breakers and latency tracking for MCP upstreams.
+
+Each upstream base URL has one `CircuitBreaker`, shared by every wrapper instance that
+calls it:
+
+- closed: requests flow; `failure_threshold` consecutive failures (transport errors or
+  5xx responses) open the breaker;
+- open: requests fail fast with `CircuitOpenError` for `reset_seconds`;
+- half-open: one probe request is let through; success closes the breaker, failure
+  opens it again.
+
+`LatencyWindow` keeps recent successful round-trip times so hedged GETs can be sent after
+the upstream's observed p95.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from threading import Lock
+
+import httpx
+
+from app.config import settings
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Raised instead of sending a request to an upstream whose circuit is open."""
+
+    def __init__(self, base_url: str, retry_in_seconds: float) -> None:
+        super().__init__(
+            f"Upstream {base_url} is unavailable (circuit open); "
+            f"retrying in {retry_in_seconds:.0f}s"
+        )
+        self.base_url = base_url
+        self.retry_in_seconds = retry_in_seconds
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one upstream."""
+
+    def __init__(self, base_url: str, *, failure_threshold: int, reset_seconds: float) -> None:
+        self.base_url = base_url
+        self._failure_threshold = max(1, failure_threshold)
+        self._reset_seconds = max(0.0, reset_seconds)
+        self._lock = Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state_locked()
+
+    def _current_state_locked(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self._reset_seconds:
+            self._state = HALF_OPEN
+        return self._state
+
+    def acquire(self) -> None:
+        """Allow a request through, or raise `CircuitOpenError` to fail fast."""
+        with self._lock:
+            state = self._current_state_locked()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self._rejected += 1
+            retry_in = max(0.0, self._opened_at + self._reset_seconds - time.monotonic())
+        raise CircuitOpenError(self.base_url, retry_in)
+
+    def release(self, success: bool | None) -> None:
+        """Record the outcome of an acquired request; None means it was abandoned."""
+        with self._lock:
+            probe = self._state == HALF_OPEN and self._probe_in_flight
+            if probe:
+                self._probe_in_flight = False
+            if success is None:
+                return
+            if success:
+                if self._state != CLOSED:
+                    logger.info("mcp_circuit_closed", base_url=self.base_url)
+                self._state = CLOSED
+                self._consecutive_failures = 0
+                return
+
+            self._consecutive_failures += 1
+            if probe or (
+                self._state == CLOSED and self._consecutive_failures >= self._failure_threshold
+            ):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                logger.warning(
+                    "mcp_circuit_opened",
+                    base_url=self.base_url,
+                    consecutive_failures=self._consecutive_failures,
+                    reset_seconds=self._reset_seconds,
+                )
+
+    def snapshot(self) -> dict[str, object]:
+        """Current state for health reporting."""
+        with self._lock:
+            state = self._current_state_locked()
+            retry_in = (
+                round(max(0.0, self._opened_at + self._reset_seconds - time.monotonic()), 1)
+                if state == OPEN
+                else None
+            )
+            return {
+                "state": state,
+                "consecutive_failures": self._consecutive_failures,
+                "rejected_requests": self._rejected,
+                "retry_in_seconds": retry_in,
+            }
+
+
+class LatencyWindow:
+    """Recent request latencies, for deriving a hedging delay."""
+
+    def __init__(self, *, size: int = 256, min_samples: int = 20) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self._min_samples = min_samples
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float | None:
+        """The `pct` percentile in seconds, or None until `min_samples` are recorded."""
+        if len(self._samples) < self._min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = Lock()
+
+
+def get_circuit_breaker(base_url: str) -> CircuitBreaker:
+    """Return the shared circuit breaker for an upstream base URL."""
+    with _breakers_lock:
+        breaker = _breakers.get(base_url)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                base_url,
+                failure_threshold=settings.mcp_circuit_failure_threshold,
+                reset_seconds=settings.mcp_circuit_reset_seconds,
+            )
+            _breakers[base_url] = breaker
+        return breaker
+
+
+def circuit_breaker_states() -> dict[str, dict[str, object]]:
+    """Return the state of every upstream circuit breaker, keyed by base URL."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.base_url: breaker.snapshot() for breaker in breakers}
+
+
+def reset_circuit_breakers() -> None:
+    """Forget all circuit breakers (test helper)."""
+    with _breakers_lock:
+        _breakers.clear()
@@ -128,6 +128,8 @@ class AzureOpenAIClientFactory:
                 azure_endpoint=config.endpoint,
                 azure_ad_token_provider=token_provider,
                 api_version=config.api_version,
+                # Retries (and 429 handling) are owned by EmbeddingScheduler.
+                max_retries=0,
             )
             logger.info("embedding_client_created", auth="managed_identity")
         else:
@@ -135,6 +137,7 @@ class AzureOpenAIClientFactory:
                 azure_endpoint=config.endpoint,
                 api_key=config.api_key,
                 api_version=config.api_version,
+                max_retries=0,
             )
             logger.info("embedding_client_created", auth="api_key")
 
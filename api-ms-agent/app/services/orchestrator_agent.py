@@ -158,7 +158,7 @@ async def _execute_mcp_tool(
     cache = get_cache("http")
     cache_payload = {"tool": tool_name, "args": arguments or {}}
     cache_key = f"mcp_tool:{hash_text(canonical_json(cache_payload))}"
-    cached = cache.get(cache_key)
+    cached = await cache.aget(cache_key)
     if cached is not None:
         try:
             payload = json.loads(cached.decode("utf-8"))
@@ -178,9 +178,9 @@ async def _execute_mcp_tool(
             timeout=timeout_seconds,
         )
 
-        if isinstance(result, MCPToolResult) and result.success:
+        if isinstance(result, MCPToolResult) and result.success and result.cacheable:
             try:
-                cache.set(
+                await cache.aset(
                     cache_key,
                     canonical_json(result.to_dict()).encode("utf-8"),
                 )
@@ -239,6 +239,11 @@ def _get_parks() -> ParksMCP:
     return _parks_mcp
 
 
+async def warm_mcp_wrappers() -> None:
+    """Prefetch the MCP wrappers' long-lived catalogues (e.g. the BC Parks list) at startup."""
+    await asyncio.gather(_get_orgbook().warm(), _get_geocoder().warm(), _get_parks().warm())
+
+
 async def shutdown_mcp_wrappers() -> None:
     """Close and clear MCP wrapper singletons for clean shutdown / test isolation."""
     global _orgbook_mcp, _geocoder_mcp, _parks_mcp
@@ -293,6 +298,44 @@ async def geocoder_geocode(address: str) -> str:
     return f"Error: {result.error}" if result.error else "No locations found"
 
 
+@ai_function
+async def geocoder_geocode_batch(addresses: list[str]) -> str:
+    """Convert several location names or addresses to coordinates in a single call.
+
+    Use this instead of calling geocoder_geocode repeatedly when you need coordinates
+    for more than one location (e.g. comparing or routing between places).
+
+    Args:
+        addresses: The location names or addresses to geocode (up to 50)
+
+    Returns:
+        Formatted string with the best coordinate match for each address
+    """
+    mcp = _get_geocoder()
+    result = await _execute_mcp_tool(mcp, "geocoder_geocode_batch", {"addresses": addresses})
+
+    if result.success and result.data:
+        lines = []
+        for item in result.data.get("results", []):
+            query = item.get("query")
+            if item.get("error"):
+                lines.append(f"- {query}: Error: {item['error']}")
+                continue
+            match = next(
+                (m for m in item.get("matches", []) if m.get("latitude") and m.get("longitude")),
+                None,
+            )
+            if match:
+                lines.append(
+                    f"- {query} → {match.get('full_address', 'Unknown')}: "
+                    f"latitude={match['latitude']}, longitude={match['longitude']}"
+                )
+            else:
+                lines.append(f"- {query}: No locations found")
+        return "\n".join(lines) if lines else "No locations found"
+    return f"Error: {result.error}" if result.error else "No locations found"
+
+
 @ai_function
 async def geocoder_occupants(query: str, max_results: int = 10) -> str:
     """Search for businesses, services, or occupants at addresses.
@@ -489,6 +532,7 @@ async def orgbook_get_topic(topic_id: str) -> str:
 # All available tools for the ChatAgent
 ORCHESTRATOR_TOOLS = [
     geocoder_geocode,
+    geocoder_geocode_batch,
     geocoder_occupants,
     parks_search,
     parks_get_details,
@@ -504,7 +548,7 @@ with access to official BC government data sources through specialized tools.
 AVAILABLE TOOLS:
 - **BC Parks Tools**: Search parks by name/keyword/location, find parks by activity,
   get detailed park information
-- **BC Geocoder Tools**: Convert addresses/place names to coordinates,
+- **BC Geocoder Tools**: Convert addresses/place names to coordinates (one or many at once),
   search for business occupants
 - **BC OrgBook Tools**: Search registered businesses and organizations,
   get detailed organization information
@@ -522,6 +566,7 @@ REASONING PROCESS (Think Step-by-Step):
    - For specific park details: parks_get_details
    - For business/organization queries: orgbook_search → orgbook_get_topic (if needed)
    - For address/location queries: geocoder_geocode or geocoder_occupants
+   - For several locations at once: geocoder_geocode_batch (one call, not one per address)
 
 3. **Execute Efficiently**:
    - Call tools in logical sequence (e.g., get coordinates before searching nearby parks)
@@ -907,6 +952,19 @@ class OrchestratorAgentService:
                     f"BC Geocoder API - Address lookup for '{args.get('address', 'unknown')}'"
                 ),
             },
+            "geocoder_geocode_batch": {
+                "source_type": "api",
+                "base_url": "https://geocoder.api.gov.bc.ca",
+                "endpoint": "/addresses.json",
+                "param_mapping": lambda args: {
+                    "maxResults": args.get("max_results", 1),
+                    "outputSRS": 4326,
+                },
+                "description_fn": lambda args: (
+                    f"BC Geocoder API - Address lookup for "
+                    f"{len(args.get('addresses') or [])} addresses"
+                ),
+            },
             "geocoder_occupants": {
                 "source_type": "api",
                 "base_url": "https://geocoder.api.gov.bc.ca",
@@ -1053,6 +1111,11 @@ class OrchestratorAgentService:
                 "geocoder_api": "healthy" if geocoder_healthy else "unhealthy",
                 "parks_api": "healthy" if parks_healthy else "unhealthy",
             },
+            "circuits": {
+                "orgbook_api": orgbook_mcp.circuit_state(),
+                "geocoder_api": geocoder_mcp.circuit_state(),
+                "parks_api": parks_mcp.circuit_state(),
+            },
         }
 
     async def close(self) -> None:
@@ -0,0 +1,254 @@
+"""
+In-process hot tier for document-scoped vector search.
+
+Keeps the chunk embeddings of recently used documents in memory as L2-normalized float32
+matrices and answers `vector_search` calls filtered to one (user_id, document_id) with an
+exact matrix-vector product instead of an Azure AI Search round-trip. Documents are a few
+hundred chunks, so exact search is both faster than an ANN graph and has perfect recall.
+
+Whole documents are evicted LRU-first once `max_documents` or `max_bytes` (matrix memory)
+is exceeded, and entries expire after `ttl_seconds` so deletes made by other workers are
+not served for long. Documents that are too large to keep, or have no chunks to load, are
+remembered as skipped for the same TTL so queries go straight to Azure instead of
+re-downloading them.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+
+import numpy as np
+
+# Bound on remembered skipped documents; the oldest are forgotten first.
+_MAX_SKIPPED = 4096
+
+_RESULT_FIELDS = ("id", "document_id", "user_id", "content", "chunk_index", "page_number")
+
+
+@dataclass(slots=True)
+class _DocumentVectors:
+    matrix: np.ndarray  # (chunks, dims), rows L2-normalized
+    rows: list[dict[str, Any]]
+    expires_at_monotonic: float
+
+
+def _normalize_rows(embeddings: Sequence[Sequence[float]]) -> np.ndarray:
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim != 2:
+        raise ValueError("Embeddings must all have the same length")
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def _row_from_record(record: dict[str, Any]) -> dict[str, Any]:
+    row = {name: record.get(name) for name in _RESULT_FIELDS}
+    row["chunk_index"] = row["chunk_index"] or 0
+    row["page_number"] = row["page_number"] or 0
+    row["user_id"] = row["user_id"] or ""
+    row["title"] = record.get("title") or ""
+    row["filename"] = record.get("filename") or ""
+    return row
+
+
+def search_score(cosine: np.ndarray) -> np.ndarray:
+    """Map cosine similarity to Azure AI Search's cosine `@search.score` (1 / (1 + distance))."""
+    return 1.0 / (2.0 - cosine)
+
+
+class SearchHotTier:
+    """LRU of per-document embedding matrices answering exact top-k searches locally."""
+
+    def __init__(
+        self,
+        *,
+        max_documents: int,
+        max_chunks_per_document: int,
+        ttl_seconds: float,
+        max_bytes: int | None = None,
+    ) -> None:
+        if max_documents <= 0:
+            raise ValueError("max_documents must be > 0")
+        self._max_documents = max_documents
+        self._max_bytes = max_bytes
+        self._max_chunks = max_chunks_per_document
+        self._ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        self._documents: OrderedDict[tuple[str, str], _DocumentVectors] = OrderedDict()
+        self._bytes = 0
+        # (user_id, document_id) -> (monotonic expiry, too large) of documents not worth loading.
+        self._skipped: OrderedDict[tuple[str, str], tuple[float, bool]] = OrderedDict()
+
+    @property
+    def max_chunks_per_document(self) -> int:
+        return self._max_chunks
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        with self._lock:
+            return self._live_locked(key, now=time.monotonic()) is not None
+
+    def is_skipped(self, user_id: str, document_id: str) -> bool:
+        """Whether the document was recently found too large or empty to keep resident."""
+        with self._lock:
+            return self._skipped_locked((user_id, document_id)) is not None
+
+    def skip(self, user_id: str, document_id: str, *, too_large: bool) -> None:
+        """Leave a document to the remote index until the TTL passes or it is invalidated.
+
+        An empty document stops being skipped once chunks are added for it; a too-large one
+        stays skipped so later upload batches do not leave a partial copy resident.
+        """
+        with self._lock:
+            self._skip_locked((user_id, document_id), too_large=too_large)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "documents": len(self._documents),
+                "chunks": sum(len(d.rows) for d in self._documents.values()),
+                "bytes": self._bytes,
+            }
+
+    def add_records(self, user_id: str, document_id: str, records: Iterable[dict]) -> None:
+        """Add chunk records (search-index field names plus `embedding`) for one document.
+
+        Chunks are merged into an existing entry by id, so documents uploaded in several
+        batches accumulate. A document that grows past `max_chunks_per_document` is dropped and
+        skipped, so later batches do not leave a partial copy resident.
+        """
+        records = [r for r in records if r.get("embedding")]
+        if not records:
+            return
+        key = (user_id, document_id)
+        matrix = _normalize_rows([r["embedding"] for r in records])
+        rows = [_row_from_record(r) for r in records]
+
+        with self._lock:
+            too_large = self._skipped_locked(key)
+            if too_large:
+                return
+            self._skipped.pop(key, None)
+            existing = self._live_locked(key, now=time.monotonic())
+            if existing is not None:
+                if existing.matrix.shape[1] != matrix.shape[1]:
+                    self._remove_locked(key)
+                    return
+                # Re-uploaded chunk ids replace their previous rows.
+                new_ids = {row["id"] for row in rows}
+                keep = [i for i, row in enumerate(existing.rows) if row["id"] not in new_ids]
+                matrix = np.vstack((existing.matrix[keep], matrix))
+                rows = [existing.rows[i] for i in keep] + rows
+            self._remove_locked(key)
+            if len(rows) > self._max_chunks or (
+                self._max_bytes is not None and matrix.nbytes > self._max_bytes
+            ):
+                self._skip_locked(key, too_large=True)
+                return
+
+            self._documents[key] = _DocumentVectors(
+                matrix=matrix,
+                rows=rows,
+                expires_at_monotonic=time.monotonic() + self._ttl_seconds,
+            )
+            self._bytes += matrix.nbytes
+            while len(self._documents) > self._max_documents or (
+                self._max_bytes is not None and self._bytes > self._max_bytes
+            ):
+                _, evicted = self._documents.popitem(last=False)
+                self._bytes -= evicted.matrix.nbytes
+
+    def invalidate(self, user_id: str, document_id: str) -> None:
+        with self._lock:
+            self._remove_locked((user_id, document_id))
+            self._skipped.pop((user_id, document_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._documents.clear()
+            self._skipped.clear()
+            self._bytes = 0
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        *,
+        user_id: str,
+        document_id: str,
+        top_k: int,
+        min_similarity: float = 0.0,
+    ) -> list[dict[str, Any]] | None:
+        """Exact top-k over one resident document; None when the document is not resident."""
+        with self._lock:
+            entry = self._live_locked((user_id, document_id), now=time.monotonic())
+            if entry is None:
+                return None
+            self._documents.move_to_end((user_id, document_id))
+
+        query = np.asarray(embedding, dtype=np.float32)
+        if query.shape != (entry.matrix.shape[1],):
+            return None
+        norm = float(np.linalg.norm(query))
+        if norm == 0.0 or top_k <= 0:
+            return []
+
+        scores = search_score(entry.matrix @ (query / norm))
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        items: list[dict[str, Any]] = []
+        for index in top.tolist():
+            similarity = float(scores[index])
+            if min_similarity > 0 and similarity < min_similarity:
+                continue
+            row = entry.rows[index]
+            items.append(
+                {
+                    "id": row["id"],
+                    "document_id": row["document_id"],
+                    "user_id": row["user_id"],
+                    "content": row["content"],
+                    "chunk_index": row["chunk_index"],
+                    "page_number": row["page_number"],
+                    "similarity": similarity,
+                    "metadata": {"title": row["title"], "filename": row["filename"]},
+                }
+            )
+        return items
+
+    def _live_locked(self, key: tuple[str, str], *, now: float) -> _DocumentVectors | None:
+        entry = self._documents.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at_monotonic <= now:
+            self._remove_locked(key)
+            return None
+        return entry
+
+    def _skipped_locked(self, key: tuple[str, str]) -> bool | None:
+        """None when not skipped, else whether the document was skipped as too large."""
+        skipped = self._skipped.get(key)
+        if skipped is None:
+            return None
+        expires_at, too_large = skipped
+        if expires_at <= time.monotonic():
+            del self._skipped[key]
+            return None
+        return too_large
+
+    def _skip_locked(self, key: tuple[str, str], *, too_large: bool) -> None:
+        self._skipped.pop(key, None)
+        self._skipped[key] = (time.monotonic() + self._ttl_seconds, too_large)
+        while len(self._skipped) > _MAX_SKIPPED:
+            self._skipped.popitem(last=False)
+
+    def _remove_locked(self, key: tuple[str, str]) -> None:
+        entry = self._documents.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.matrix.nbytes
@@ -0,0 +1,229 @@
+"""
+Offset-based text chunking sized by tokenizer token counts.
+
+`TokenChunker` finds sentence and paragraph boundaries in one linear regex pass over a single
+buffer, counts the tokens of each segment between boundaries, and packs consecutive segments
+into chunks of at most `max_tokens` tokens, repeating up to `overlap_tokens` tokens of trailing
+segments at the start of the next chunk. Chunks are (start, end) offsets into the buffer, so
+the only strings built are the segments handed to the tokenizer and the emitted chunks.
+
+Paragraph input is joined once into one buffer; each chunk takes the page of the paragraph
+its first character falls in.
+
+This chunker exists to produce correctly sized embedding inputs, not to chunk faster: it is
+bound by token counting and runs well below the character chunkers in `embedding_service`,
+which stay the default (`chunking_strategy = "characters"`).
+
+tiktoken may download an encoding on first use, so encodings are loaded in a worker thread
+by `load_tokenizer` (at startup and before token chunking); `get_tokenizer` never blocks and
+returns the regex estimate until the encoding has loaded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import re
+import time
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import Protocol
+
+import tiktoken
+
+from app.logger import get_logger
+from app.services.document_intelligence_service import ParagraphWithPage
+
+logger = get_logger(__name__)
+
+# A boundary follows sentence-ending punctuation, or precedes a paragraph break. Cutting before
+# the whitespace keeps it with the next segment, where BPE tokenizers attach it anyway, so
+# segment token counts add up to the count of the whole text.
+_BOUNDARY = re.compile(r"[.!?](?=\s)|\n\n+")
+
+# Approximates BPE pre-tokenization: words and number groups with their leading space,
+# punctuation runs, and whitespace runs.
+_PRE_TOKEN = re.compile(r" ?[^\W\d_]+| ?\d{1,3}| ?[^\w\s]+|_+|\s+")
+
+# Segments are tokenized in groups to bound the memory held by token lists.
+_COUNT_GROUP = 512
+
+# Seconds before loading an encoding is retried after a failure.
+_LOAD_RETRY_SECONDS = 300.0
+
+
+class Tokenizer(Protocol):
+    name: str
+
+    def count(self, texts: list[str]) -> list[int]:
+        """Return the number of tokens in each text."""
+        ...
+
+    def offsets(self, text: str) -> list[int]:
+        """Return the start index in `text` of each of its tokens."""
+        ...
+
+
+class TiktokenTokenizer:
+    """Exact token counts from a tiktoken encoding."""
+
+    def __init__(self, encoding: tiktoken.Encoding) -> None:
+        self._encoding = encoding
+        self.name = encoding.name
+
+    def count(self, texts: list[str]) -> list[int]:
+        return [len(tokens) for tokens in self._encoding.encode_ordinary_batch(texts)]
+
+    def offsets(self, text: str) -> list[int]:
+        tokens = self._encoding.encode_ordinary(text)
+        _, offsets = self._encoding.decode_with_offsets(tokens)
+        return offsets
+
+
+class RegexTokenizer:
+    """Token estimate from a regex approximating BPE pre-tokenization.
+
+    Used when no encoding can be loaded. Long or rare words are one estimated token where a
+    BPE tokenizer splits them, so counts run somewhat low.
+    """
+
+    name = "regex-estimate"
+
+    def count(self, texts: list[str]) -> list[int]:
+        # subn counts matches without building a list of them.
+        return [_PRE_TOKEN.subn("", text)[1] for text in texts]
+
+    def offsets(self, text: str) -> list[int]:
+        return [m.start() for m in _PRE_TOKEN.finditer(text)]
+
+
+_loaded: dict[str, Tokenizer] = {}
+_failed_at: dict[str, float] = {}
+
+
+def get_tokenizer(encoding: str = "cl100k_base") -> Tokenizer:
+    """Return the loaded tokenizer for `encoding`, or the regex estimate until it has loaded."""
+    return _loaded.get(encoding) or RegexTokenizer()
+
+
+async def load_tokenizer(encoding: str = "cl100k_base") -> Tokenizer:
+    """Load `encoding` in a worker thread and return it, or the regex estimate on failure.
+
+    tiktoken downloads encodings on first use (cached under TIKTOKEN_CACHE_DIR), which fails
+    on hosts without access to its public blob storage. Failures are not cached: loading is
+    retried once `_LOAD_RETRY_SECONDS` have passed.
+    """
+    if encoding in _loaded:
+        return _loaded[encoding]
+    failed_at = _failed_at.get(encoding)
+    if failed_at is not None and time.monotonic() - failed_at < _LOAD_RETRY_SECONDS:
+        return RegexTokenizer()
+    try:
+        tokenizer = TiktokenTokenizer(await asyncio.to_thread(tiktoken.get_encoding, encoding))
+    except Exception as exc:
+        _failed_at[encoding] = time.monotonic()
+        logger.warning("tokenizer_unavailable", encoding=encoding, error=str(exc))
+        return RegexTokenizer()
+    _failed_at.pop(encoding, None)
+    _loaded[encoding] = tokenizer
+    logger.info("tokenizer_loaded", encoding=encoding)
+    return tokenizer
+
+
+class TokenChunker:
+    """Sentence-aware chunker that sizes chunks by token count."""
+
+    def __init__(
+        self, max_tokens: int, overlap_tokens: int = 0, *, tokenizer: Tokenizer | None = None
+    ) -> None:
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be > 0")
+        self._max_tokens = max_tokens
+        self._overlap_tokens = max(0, min(overlap_tokens, max_tokens - 1))
+        self._tokenizer = tokenizer or get_tokenizer()
+
+    @property
+    def tokenizer(self) -> Tokenizer:
+        return self._tokenizer
+
+    def chunk_text(self, text: str) -> list[str]:
+        """Split `text` into stripped, non-empty chunks of at most `max_tokens` tokens."""
+        return [text[start:end] for start, end in self.spans(text)]
+
+    def chunk_paragraphs(self, paragraphs: Iterable[ParagraphWithPage]) -> list[tuple[str, int]]:
+        """Chunk paragraphs joined by blank lines; returns (chunk, page number) pairs."""
+        contents: list[str] = []
+        starts = array("q")
+        pages: list[int] = []
+        position = 0
+        for paragraph in paragraphs:
+            if not paragraph.content:
+                continue
+            contents.append(paragraph.content)
+            starts.append(position)
+            pages.append(paragraph.page_number)
+            position += len(paragraph.content) + 2
+        text = "\n\n".join(contents)
+        return [
+            (text[start:end], pages[bisect.bisect_right(starts, start) - 1])
+            for start, end in self.spans(text)
+        ]
+
+    def spans(self, text: str) -> Iterator[tuple[int, int]]:
+        """Yield (start, end) offsets of the chunks of `text`, with whitespace trimmed."""
+        starts, ends, tokens = self._segments(text)
+        n = len(starts)
+        i = 0
+        while i < n:
+            j = i + 1
+            total = tokens[i]
+            while j < n and total + tokens[j] <= self._max_tokens:
+                total += tokens[j]
+                j += 1
+
+            start, end = starts[i], ends[j - 1]
+            while start < end and text[start].isspace():
+                start += 1
+            while end > start and text[end - 1].isspace():
+                end -= 1
+            if start < end:
+                yield start, end
+            if j >= n:
+                return
+
+            # Step back over trailing segments for the overlap, always moving forward.
+            k, overlap = j, 0
+            while k - 1 > i and overlap + tokens[k - 1] <= self._overlap_tokens:
+                k -= 1
+                overlap += tokens[k]
+            i = k
+
+    def _segments(self, text: str) -> tuple[array, array, array]:
+        """Split `text` at boundaries into (starts, ends, token counts) of segments.
+
+        Segments longer than `max_tokens` are cut at token offsets into pieces that fit.
+        """
+        cuts = array("q", [0])
+        cuts.extend(
+            m.start() if text[m.start()] == "\n" else m.end() for m in _BOUNDARY.finditer(text)
+        )
+        cuts.append(len(text))
+
+        starts, ends, tokens = array("q"), array("q"), array("q")
+        count = self._tokenizer.count
+        for group in range(0, len(cuts) - 1, _COUNT_GROUP):
+            bounds = cuts[group : group + _COUNT_GROUP + 1]
+            pieces = [(a, b) for a, b in zip(bounds, bounds[1:], strict=False) if b > a]
+            for (a, b), n_tokens in zip(pieces, count([text[a:b] for a, b in pieces]), strict=True):
+                if n_tokens <= self._max_tokens:
+                    starts.append(a)
+                    ends.append(b)
+                    tokens.append(n_tokens)
+                    continue
+                offsets = self._tokenizer.offsets(text[a:b])
+                for t in range(0, len(offsets), self._max_tokens):
+                    starts.append(a + offsets[t] if t else a)
+                    stop = t + self._max_tokens
+                    ends.append(a + offsets[stop] if stop < len(offsets) else b)
+                    tokens.append(min(self._max_tokens, len(offsets) - t))
+        return starts, ends, tokens
@@ -0,0 +1,98 @@
+"""Micro-benchmark `MemoryCacheBackend.set()` latency as the cache grows.
+
+Each size is pre-filled to capacity with mixed TTLs, then timed while new writes force both
+expiry and LRU eviction: the backend runs on a fake clock that advances one second per write,
+and the most recently filled entries expire one every other second, so alternate writes find
+an expired entry to purge and the rest evict the least recently used one. With the expiry
+heap, per-set latency should stay flat from 1k to 1M entries (the previous full scan grew
+linearly with size).
+
+Example:
+    uv run python -m scripts.bench_cache_memory --sizes 1000,10000,100000,1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from app.core.cache import memory_backend
+from app.core.cache.memory_backend import MemoryCacheBackend
+
+_VALUE = b"x" * 64
+
+
+def _percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values_sorted = sorted(values)
+    k = int(round((p / 100.0) * (len(values_sorted) - 1)))
+    return float(values_sorted[max(0, min(k, len(values_sorted) - 1))])
+
+
+def bench_set_latency(*, size: int, ops: int) -> dict[str, Any]:
+    clock = SimpleNamespace(now=0.0)
+    real_time = memory_backend.time
+    memory_backend.time = SimpleNamespace(monotonic=lambda: clock.now)  # type: ignore[assignment]
+    try:
+        backend = MemoryCacheBackend(max_entries=size)
+
+        # Long, mixed TTLs so the expiry index is non-trivial; these outlive the timed phase
+        # and leave by LRU eviction.
+        expiring = min(size, ops) // 2
+        long_lived = size - expiring
+        for bucket, ttl in enumerate((4, 5, 6, 7)):
+            keys = range(bucket * long_lived // 4, (bucket + 1) * long_lived // 4)
+            backend.set_many({f"fill-{i}": _VALUE for i in keys}, ttl_seconds=ttl * ops)
+        # Filled last (most recently used), so they leave by expiry, not eviction.
+        for i in range(expiring):
+            backend.set(f"expiring-{i}", _VALUE, ttl_seconds=2 * (i + 1))
+
+        durations_us: list[float] = []
+        for i in range(ops):
+            clock.now += 1.0
+            start = time.perf_counter()
+            backend.set(f"op-{i}", _VALUE, ttl_seconds=2 * ops + (i % 600))
+            durations_us.append((time.perf_counter() - start) * 1_000_000.0)
+
+        expired = sum(backend.get(f"expiring-{i}") is None for i in range(expiring))
+    finally:
+        memory_backend.time = real_time
+
+    return {
+        "size": size,
+        "ops": ops,
+        "expired": expired,
+        "evicted": ops - expired,
+        "mean_us": round(sum(durations_us) / len(durations_us), 3),
+        "p50_us": round(_percentile(durations_us, 50), 3),
+        "p99_us": round(_percentile(durations_us, 99), 3),
+    }
+
+
+def run_benchmark(*, sizes: list[int], ops: int) -> dict[str, Any]:
+    results = [bench_set_latency(size=size, ops=ops) for size in sizes]
+    return {"version": 1, "benchmark": "memory_cache_set", "results": results}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark in-memory cache set() latency")
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000,100000,1000000",
+        help="Comma-separated cache sizes (entries)",
+    )
+    parser.add_argument("--ops", type=int, default=5000, help="Timed set() calls per size")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    data = run_benchmark(sizes=sizes, ops=args.ops)
+    print(json.dumps(data, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
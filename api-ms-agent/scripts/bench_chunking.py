@@ -0,0 +1,157 @@
+"""Benchmark the character chunkers against the offset-based `TokenChunker`.
+
+A synthetic corpus of sentences, paragraphs and pages (50 MB by default) is chunked by:
+
+- `text_chars`: `TextChunker`, as `EmbeddingService._chunk_text` uses it (1000/200 chars).
+- `paragraph_chars`: `ParagraphChunker` over the corpus' paragraphs (1000/200 chars).
+- `text_tokens` / `paragraph_tokens`: `TokenChunker` (256/50 tokens) on the same inputs.
+
+Reported per chunker: seconds, MB/s and chunk count, plus the token sizes of the chunks it
+produced (p50/max and the fraction over the token limit), measured with the same tokenizer.
+The tokenizer is tiktoken's `cl100k_base` when it can be loaded, otherwise the regex estimate;
+the report names the one used.
+
+Example:
+    uv run python -m scripts.bench_chunking --size-mb 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Any
+
+import structlog
+
+from app.services.document_intelligence_service import ParagraphWithPage
+from app.services.embedding_service import ParagraphChunker, TextChunker
+from app.services.token_chunker import TokenChunker, Tokenizer, load_tokenizer
+
+_WORDS = (
+    "the of and to in is for on that by with as permit land water forest road "
+    "application approved section schedule ministry district regional authority "
+    "environmental assessment licence holder compliance inspection 2024 2025 42 7 "
+    "British Columbia government policy procedure requirement shall may must"
+).split()
+
+
+def _corpus(size_bytes: int, seed: int) -> list[ParagraphWithPage]:
+    rng = random.Random(seed)
+    paragraphs: list[ParagraphWithPage] = []
+    total = 0
+    page = 1
+    while total < size_bytes:
+        sentences = []
+        for _ in range(rng.randint(1, 8)):
+            words = rng.choices(_WORDS, k=rng.randint(4, 30))
+            sentences.append(" ".join(words).capitalize() + rng.choice(".....!?"))
+        content = " ".join(sentences)
+        paragraphs.append(ParagraphWithPage(content=content, page_number=page))
+        total += len(content) + 2
+        if rng.random() < 0.15:
+            page += 1
+    return paragraphs
+
+
+def _token_sizes(chunks: list[str], tokenizer: Tokenizer, limit: int) -> dict[str, Any]:
+    sizes = sorted(tokenizer.count(chunks))
+    return {
+        "p50": sizes[len(sizes) // 2] if sizes else 0,
+        "max": sizes[-1] if sizes else 0,
+        "over_limit_fraction": round(sum(1 for s in sizes if s > limit) / max(1, len(sizes)), 4),
+    }
+
+
+def _timed(fn) -> tuple[list[str], float]:
+    start = time.perf_counter()
+    chunks = fn()
+    return chunks, time.perf_counter() - start
+
+
+def run_benchmark(
+    *,
+    size_mb: float = 50.0,
+    chunk_chars: int = 1000,
+    overlap_chars: int = 200,
+    max_tokens: int = 256,
+    overlap_tokens: int = 50,
+    seed: int = 0,
+) -> dict[str, Any]:
+    paragraphs = _corpus(int(size_mb * 1024 * 1024), seed)
+    text = "\n\n".join(p.content for p in paragraphs)
+    tokenizer = asyncio.run(load_tokenizer())
+    token_chunker = TokenChunker(max_tokens, overlap_tokens, tokenizer=tokenizer)
+
+    def text_chars() -> list[str]:
+        chunker = TextChunker(chunk_chars, overlap_chars)
+        return chunker.feed(text) + chunker.finish()
+
+    def paragraph_chars() -> list[str]:
+        chunker = ParagraphChunker(chunk_chars, overlap_chars)
+        chunks = [c for p in paragraphs if (c := chunker.add(p)) is not None]
+        return [c.content for c in chunks + chunker.finish()]
+
+    def text_tokens() -> list[str]:
+        return token_chunker.chunk_text(text)
+
+    def paragraph_tokens() -> list[str]:
+        return [chunk for chunk, _ in token_chunker.chunk_paragraphs(paragraphs)]
+
+    megabytes = len(text.encode("utf-8")) / (1024 * 1024)
+    results: dict[str, Any] = {}
+    for name, fn in [
+        ("text_chars", text_chars),
+        ("paragraph_chars", paragraph_chars),
+        ("text_tokens", text_tokens),
+        ("paragraph_tokens", paragraph_tokens),
+    ]:
+        chunks, seconds = _timed(fn)
+        results[name] = {
+            "seconds": round(seconds, 3),
+            "mb_per_second": round(megabytes / seconds, 2) if seconds else None,
+            "chunks": len(chunks),
+            "tokens": _token_sizes(chunks, tokenizer, max_tokens),
+        }
+
+    return {
+        "version": 1,
+        "benchmark": "chunking",
+        "config": {
+            "megabytes": round(megabytes, 2),
+            "paragraphs": len(paragraphs),
+            "chunk_chars": chunk_chars,
+            "overlap_chars": overlap_chars,
+            "max_tokens": max_tokens,
+            "overlap_tokens": overlap_tokens,
+            "tokenizer": tokenizer.name,
+        },
+        "chunkers": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark document chunkers")
+    parser.add_argument("--size-mb", type=float, default=50.0)
+    parser.add_argument("--max-tokens", type=int, default=256)
+    parser.add_argument("--overlap-tokens", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # A tokenizer download warning would interleave with the JSON report.
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+    data = run_benchmark(
+        size_mb=args.size_mb,
+        max_tokens=args.max_tokens,
+        overlap_tokens=args.overlap_tokens,
+        seed=args.seed,
+    )
+    print(json.dumps(data, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,270 @@
+"""Benchmark BC Parks lookups: `ParksIndex` probes vs linear scans of the parks list.
+
+Builds a synthetic catalogue shaped like the BC Parks `/protected-areas` response (names,
+HTML descriptions, coordinates inside BC, activities) and times each lookup `ParksMCP`
+makes against it, both as the index probe and as the per-call scan it replaced:
+
+- `text`: one- and two-word queries over name, description, location notes and terms;
+- `radius`: parks within `--radius-km` of a random point in BC, nearest first;
+- `activity`: parks offering an activity;
+- `resolve`: park name -> ORCS number.
+
+Reported per lookup: p50/p95 latency in microseconds for both, the speed-up at p50, and
+whether the index returned the same parks as the scan. Index build time is reported once.
+
+Example:
+    uv run python -m scripts.bench_parks_index --parks 1100 --queries 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.services.mcp.parks_index import ParksIndex, activity_name, haversine_km
+
+_COMMON_WORDS = (
+    "lake river creek mountain provincial marine beach forest canyon falls valley ridge "
+    "island bay inlet meadow glacier cedar spruce salmon eagle bear wolf elk moose trail "
+    "camping hiking fishing paddling swimming wildlife viewing picnic boat launch"
+).split()
+_SYLLABLES = "ka lo mi na pe ri sa tu ve wo ya zi cha qua nit sho mac ber".split()
+_ACTIVITIES = [
+    "Camping",
+    "Hiking",
+    "Fishing",
+    "Canoeing",
+    "Kayaking",
+    "Swimming",
+    "Wildlife viewing",
+    "Cycling",
+    "Horseback riding",
+    "Skiing",
+    "Snowshoeing",
+    "Hunting",
+    "Scuba diving",
+    "Windsurfing",
+    "Caving",
+]
+
+
+def _vocabulary(size: int, rng: random.Random) -> tuple[list[str], list[float]]:
+    """Common park words plus place-name-like words, with Zipf-like frequencies."""
+    words = list(_COMMON_WORDS)
+    seen = set(words)
+    while len(words) < size:
+        word = "".join(rng.choices(_SYLLABLES, k=rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words, [1.0 / (rank + 1) for rank in range(len(words))]
+
+
+def _catalogue(
+    size: int, words: list[str], weights: list[float], rng: random.Random
+) -> list[dict[str, Any]]:
+    def text(k: int) -> str:
+        return " ".join(rng.choices(words, weights, k=k))
+
+    parks = []
+    for i in range(size):
+        # Names are unique, like the real catalogue's.
+        name = f"{rng.choice(words[200:]).title()} {rng.choice(_COMMON_WORDS).title()} Park {i}"
+        description = "<p>" + text(120) + "</p>"
+        activities = rng.sample(_ACTIVITIES, rng.randint(0, 6))
+        parks.append(
+            {
+                "id": i,
+                "attributes": {
+                    "orcs": 1000 + i,
+                    "protectedAreaName": name,
+                    "description": description,
+                    "locationNotes": text(15),
+                    "searchTerms": text(3),
+                    "latitude": rng.uniform(48.3, 59.9),
+                    "longitude": rng.uniform(-139.0, -114.1),
+                    "parkActivities": [
+                        {"activityType": {"activityName": activity}} for activity in activities
+                    ],
+                },
+            }
+        )
+    return parks
+
+
+# Per-call linear scans, as ParksMCP ran them, with the index's matching rules: queries
+# match at the start of a word, and description HTML is ignored.
+
+
+def _at_word_start(part: str, text: str, *, whole_words: bool = False) -> bool:
+    pattern = r"(?<!\w)" + re.escape(part) + (r"(?!\w)" if whole_words else "")
+    return re.search(pattern, text) is not None
+
+
+def _scan_text(parks: list[dict[str, Any]], query: str, limit: int) -> list[int]:
+    results = []
+    for position, park in enumerate(parks):
+        attrs = park["attributes"]
+        description = re.sub(r"<[^>]+>", " ", attrs["description"])
+        searchable = " ".join(
+            f"{attrs['protectedAreaName']} {description} "
+            f"{attrs['locationNotes']} {attrs['searchTerms']}".lower().split()
+        )
+        if _at_word_start(query, searchable):
+            results.append(position)
+            if len(results) >= limit:
+                break
+    return results
+
+
+def _scan_radius(
+    parks: list[dict[str, Any]], latitude: float, longitude: float, radius_km: float
+) -> list[int]:
+    results = []
+    for position, park in enumerate(parks):
+        attrs = park["attributes"]
+        distance = haversine_km(latitude, longitude, attrs["latitude"], attrs["longitude"])
+        if distance <= radius_km:
+            results.append((distance, position))
+    results.sort(key=lambda item: item[0])
+    return [position for _, position in results]
+
+
+def _scan_activity(parks: list[dict[str, Any]], activity: str, limit: int) -> list[int]:
+    results = []
+    for position, park in enumerate(parks):
+        if any(
+            activity in activity_name(act).lower() for act in park["attributes"]["parkActivities"]
+        ):
+            results.append(position)
+            if len(results) >= limit:
+                break
+    return results
+
+
+def _scan_resolve(parks: list[dict[str, Any]], name: str) -> str | None:
+    key = name.lower().strip()
+    names = [park["attributes"]["protectedAreaName"].lower() for park in parks]
+    for position, park_name in enumerate(names):
+        if park_name == key:
+            return str(parks[position]["attributes"]["orcs"])
+    for position, park_name in enumerate(names):
+        if _at_word_start(key, park_name) or _at_word_start(park_name, key, whole_words=True):
+            return str(parks[position]["attributes"]["orcs"])
+    return None
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else 0.0
+
+
+def _time(fn: Callable[[Any], Any], value: Any) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn(value)
+    return result, (time.perf_counter() - start) * 1e6
+
+
+def run_benchmark(
+    *,
+    parks: int = 1100,
+    queries: int = 500,
+    vocabulary: int = 5000,
+    radius_km: float = 100.0,
+    limit: int = 15,
+    seed: int = 0,
+) -> dict[str, Any]:
+    rng = random.Random(seed)
+    words, weights = _vocabulary(vocabulary, rng)
+    catalogue = _catalogue(parks, words, weights, rng)
+    start = time.perf_counter()
+    index = ParksIndex(catalogue)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    names = [p["attributes"]["protectedAreaName"] for p in catalogue]
+    lookups: dict[str, tuple[Callable[[Any], Any], Callable[[Any], Any], list[Any]]] = {
+        "text": (
+            lambda q: index.search_text(q, limit),
+            lambda q: _scan_text(catalogue, q, limit),
+            [" ".join(rng.choices(words, weights, k=rng.choice((1, 2)))) for _ in range(queries)],
+        ),
+        "radius": (
+            lambda c: [position for position, _ in index.within_radius(*c, radius_km)],
+            lambda c: _scan_radius(catalogue, *c, radius_km),
+            [(rng.uniform(48.3, 59.9), rng.uniform(-139.0, -114.1)) for _ in range(queries)],
+        ),
+        "activity": (
+            lambda a: [position for position, _ in index.with_activity(a, limit)],
+            lambda a: _scan_activity(catalogue, a, limit),
+            [rng.choice(_ACTIVITIES).lower() for _ in range(queries)],
+        ),
+        "resolve": (
+            index.resolve,
+            lambda n: _scan_resolve(catalogue, n),
+            # Full names and a word of each (prefix matches)
+            [rng.choice(names).rsplit(" ", rng.choice((0, 3)))[0] for _ in range(queries)],
+        ),
+    }
+
+    results: dict[str, Any] = {}
+    for name, (probe, scan, inputs) in lookups.items():
+        index_us, scan_us, same = [], [], True
+        for value in inputs:
+            found, elapsed = _time(probe, value)
+            index_us.append(elapsed)
+            expected, elapsed = _time(scan, value)
+            scan_us.append(elapsed)
+            same = same and found == expected
+        index_p50, scan_p50 = _percentile(index_us, 0.5), _percentile(scan_us, 0.5)
+        results[name] = {
+            "index_us": {"p50": round(index_p50, 1), "p95": round(_percentile(index_us, 0.95), 1)},
+            "scan_us": {"p50": round(scan_p50, 1), "p95": round(_percentile(scan_us, 0.95), 1)},
+            "speedup_p50": round(scan_p50 / index_p50, 1) if index_p50 else None,
+            "matches_scan": same,
+        }
+
+    return {
+        "version": 1,
+        "benchmark": "parks_index",
+        "config": {
+            "parks": parks,
+            "queries": queries,
+            "vocabulary": vocabulary,
+            "radius_km": radius_km,
+            "limit": limit,
+            "seed": seed,
+        },
+        "build_ms": round(build_ms, 2),
+        "lookups": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark BC Parks index lookups vs scans")
+    parser.add_argument("--parks", type=int, default=1100)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--vocabulary", type=int, default=5000)
+    parser.add_argument("--radius-km", type=float, default=100.0)
+    parser.add_argument("--limit", type=int, default=15)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    data = run_benchmark(
+        parks=args.parks,
+        queries=args.queries,
+        vocabulary=args.vocabulary,
+        radius_km=args.radius_km,
+        limit=args.limit,
+        seed=args.seed,
+    )
+    print(json.dumps(data, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,245 @@
+"""Benchmark document-scoped `vector_search` with and without the in-process hot tier.
+
+The remote path goes through `AzureSearchService.vector_search` against a simulated Azure AI
+Search client that adds a fixed round-trip and returns exact results. The hot-tier path uses
+the same service with `SearchHotTier` enabled, so the first query per document pays one load
+round-trip and later queries are answered locally. Recall@k is measured against a float64
+exact reference for both paths.
+
+Example:
+    uv run python -m scripts.bench_search_hot_tier --documents 20 --chunks 400 --queries 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+from typing import Any
+
+import numpy as np
+import structlog
+
+from app.services.azure_search_service import AzureSearchService, VectorSearchOptions
+from app.services.search_hot_tier import SearchHotTier
+
+_DOCUMENT_RE = re.compile(r"document_id eq '([^']+)'")
+_USER_RE = re.compile(r"user_id eq '([^']+)'")
+
+
+def _percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values_sorted = sorted(values)
+    k = int(round((p / 100.0) * (len(values_sorted) - 1)))
+    return float(values_sorted[max(0, min(k, len(values_sorted) - 1))])
+
+
+class _AsyncResults:
+    def __init__(self, items: list[dict[str, Any]]) -> None:
+        self._items = items
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for item in self._items:
+            yield item
+
+
+class _SimulatedSearchClient:
+    """Exact-search stand-in for the async SearchClient with a fixed network round-trip."""
+
+    def __init__(self, records: dict[tuple[str, str], list[dict[str, Any]]], rtt_ms: float):
+        self._records = records
+        self._rtt_seconds = rtt_ms / 1000.0
+        self._matrices = {
+            key: np.asarray([r["embedding"] for r in rows], dtype=np.float64)
+            for key, rows in records.items()
+        }
+        self.calls = 0
+
+    async def search(self, **kwargs: Any) -> _AsyncResults:
+        self.calls += 1
+        await asyncio.sleep(self._rtt_seconds)
+        document_match = _DOCUMENT_RE.search(kwargs.get("filter") or "")
+        user_match = _USER_RE.search(kwargs.get("filter") or "")
+        if document_match is None or user_match is None:
+            return _AsyncResults([])
+        user_id, document_id = user_match.group(1), document_match.group(1)
+        rows = self._records[(user_id, document_id)]
+        vector_queries = kwargs.get("vector_queries")
+        if not vector_queries:
+            return _AsyncResults(rows[: kwargs.get("top", len(rows))])
+
+        query = vector_queries[0]
+        order, cosine = _exact_top_k(
+            self._matrices[(user_id, document_id)], query.vector, query.k_nearest_neighbors
+        )
+        return _AsyncResults(
+            [
+                {**rows[i], "@search.score": 1.0 / (2.0 - c)}
+                for i, c in zip(order, cosine, strict=True)
+            ]
+        )
+
+
+def _exact_top_k(matrix: np.ndarray, query: list[float], k: int) -> tuple[list[int], list[float]]:
+    q = np.asarray(query, dtype=np.float64)
+    cosine = (matrix @ q) / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(q))
+    order = np.argsort(-cosine, kind="stable")[:k]
+    return order.tolist(), cosine[order].tolist()
+
+
+def _build_corpus(
+    *, documents: int, chunks: int, dims: int, seed: int
+) -> dict[tuple[str, str], list[dict[str, Any]]]:
+    rng = np.random.default_rng(seed)
+    corpus: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for d in range(documents):
+        user_id, document_id = f"user-{d % 4}", f"doc-{d}"
+        vectors = rng.standard_normal((chunks, dims), dtype=np.float32)
+        corpus[(user_id, document_id)] = [
+            {
+                "id": f"{document_id}_chunk_{i}",
+                "document_id": document_id,
+                "user_id": user_id,
+                "content": f"chunk {i} of {document_id}",
+                "chunk_index": i,
+                "page_number": i // 4 + 1,
+                "title": document_id,
+                "filename": f"{document_id}.pdf",
+                "embedding": vectors[i].tolist(),
+            }
+            for i in range(chunks)
+        ]
+    return corpus
+
+
+def _service(client: _SimulatedSearchClient, hot_tier: SearchHotTier | None) -> AzureSearchService:
+    service = AzureSearchService()
+    service._search_client = client  # type: ignore[assignment]
+    service._initialized = True
+    service._hot_tier = hot_tier
+    return service
+
+
+async def _run_path(
+    service: AzureSearchService,
+    corpus: dict[tuple[str, str], list[dict[str, Any]]],
+    queries: list[tuple[tuple[str, str], list[float]]],
+    top_k: int,
+) -> dict[str, Any]:
+    matrices = {
+        key: np.asarray([r["embedding"] for r in rows], dtype=np.float64)
+        for key, rows in corpus.items()
+    }
+    durations_ms: list[float] = []
+    hits = 0
+    for (user_id, document_id), query in queries:
+        options = VectorSearchOptions(user_id=user_id, document_id=document_id, top_k=top_k)
+        start = time.perf_counter()
+        results = await service.vector_search(query, options)
+        durations_ms.append((time.perf_counter() - start) * 1000.0)
+
+        expected, _ = _exact_top_k(matrices[(user_id, document_id)], query, top_k)
+        expected_ids = {corpus[(user_id, document_id)][i]["id"] for i in expected}
+        hits += len(expected_ids & {r["id"] for r in results})
+
+    return {
+        "queries": len(queries),
+        f"recall_at_{top_k}": round(hits / (len(queries) * top_k), 4),
+        "mean_ms": round(sum(durations_ms) / len(durations_ms), 3),
+        "p50_ms": round(_percentile(durations_ms, 50), 3),
+        "p99_ms": round(_percentile(durations_ms, 99), 3),
+    }
+
+
+async def run_benchmark_async(
+    *,
+    documents: int,
+    chunks: int,
+    dims: int,
+    queries: int,
+    top_k: int,
+    remote_rtt_ms: float,
+    seed: int = 0,
+) -> dict[str, Any]:
+    corpus = _build_corpus(documents=documents, chunks=chunks, dims=dims, seed=seed)
+    rng = random.Random(seed)
+    keys = list(corpus.keys())
+    workload: list[tuple[tuple[str, str], list[float]]] = []
+    for _ in range(queries):
+        key = rng.choice(keys)
+        base = np.asarray(rng.choice(corpus[key])["embedding"], dtype=np.float32)
+        noise = np.asarray([rng.gauss(0.0, 0.5) for _ in range(dims)], dtype=np.float32)
+        workload.append((key, (base + noise).tolist()))
+
+    remote_client = _SimulatedSearchClient(corpus, remote_rtt_ms)
+    remote = await _run_path(_service(remote_client, None), corpus, workload, top_k)
+    remote["round_trips"] = remote_client.calls
+
+    hot_tier = SearchHotTier(
+        max_documents=documents,
+        max_chunks_per_document=chunks,
+        ttl_seconds=3600.0,
+    )
+    hot_client = _SimulatedSearchClient(corpus, remote_rtt_ms)
+    hot = await _run_path(_service(hot_client, hot_tier), corpus, workload, top_k)
+    hot["round_trips"] = hot_client.calls
+    hot["resident"] = hot_tier.stats()
+
+    return {
+        "version": 1,
+        "benchmark": "search_hot_tier",
+        "config": {
+            "documents": documents,
+            "chunks_per_document": chunks,
+            "dims": dims,
+            "top_k": top_k,
+            "remote_rtt_ms": remote_rtt_ms,
+        },
+        "remote": remote,
+        "hot_tier": hot,
+    }
+
+
+def run_benchmark(**kwargs: Any) -> dict[str, Any]:
+    return asyncio.run(run_benchmark_async(**kwargs))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the vector search hot tier")
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--chunks", type=int, default=400, help="Chunks per document")
+    parser.add_argument("--dims", type=int, default=3072)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument(
+        "--remote-rtt-ms",
+        type=float,
+        default=30.0,
+        help="Simulated Azure AI Search round-trip per request",
+    )
+    args = parser.parse_args()
+
+    # Per-query service logs would interleave with the JSON report.
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    data = run_benchmark(
+        documents=args.documents,
+        chunks=args.chunks,
+        dims=args.dims,
+        queries=args.queries,
+        top_k=args.top_k,
+        remote_rtt_ms=args.remote_rtt_ms,
+    )
+    print(json.dumps(data, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,238 @@
+"""Replay a query log against the exact and semantic LLM response caches.
+
+Each query is looked up the way `AzureOpenAIChatService` does it: the exact tier matches the
+raw prompt, and on a miss the semantic tier embeds `normalize_prompt(prompt)` and searches the
+scope's vector set. Misses store the answer for the query's intent. A semantic hit that returns
+another intent's answer is counted as a false hit.
+
+The default log is synthetic: users asking paraphrased questions about a few topics and places,
+with skewed popularity. `--log` replays a JSONL file of {"user", "prompt", "intent"} records.
+
+The default `hashed` embedder (word + character-trigram feature hashing) runs offline, but its
+similarity scale differs from Azure OpenAI's. Use `--embedder azure` to replay with the
+configured embedding deployment when tuning `cache_llm_semantic_threshold`.
+
+Example:
+    uv run python -m scripts.bench_semantic_cache --queries 5000 --thresholds 0.8,0.85,0.9,0.95
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import random
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import numpy as np
+import structlog
+
+from app.core.cache.semantic import SemanticCache
+from app.services.azure_openai_chat_service import normalize_prompt
+
+_TOPICS: dict[str, list[str]] = {
+    "parks": [
+        "parks near {place}",
+        "Parks close to {place}?",
+        "what parks are near {place}",
+        "show me provincial parks near {place}",
+        "any parks around {place}",
+    ],
+    "camping": [
+        "campgrounds near {place}",
+        "where can I camp near {place}?",
+        "camping close to {place}",
+        "list campsites around {place}",
+    ],
+    "wildfire": [
+        "wildfire status near {place}",
+        "are there wildfires near {place}?",
+        "current wildfires around {place}",
+        "Wildfire situation close to {place}",
+    ],
+    "weather": [
+        "weather in {place}",
+        "what's the weather in {place}?",
+        "{place} weather today",
+        "current weather for {place}",
+    ],
+}
+_PLACES = ["Victoria", "Vancouver", "Kelowna", "Nanaimo", "Prince George", "Kamloops"]
+_PREFIXES = ["", "", "hey, ", "can you tell me ", "quick question: ", "I'd like to know "]
+_SUFFIXES = ["", "", " please", " thanks!", " right now", " this weekend"]
+
+Embedder = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+def _synthetic_log(*, queries: int, users: int, seed: int) -> list[dict[str, str]]:
+    rng = random.Random(seed)
+    intents = [(topic, place) for topic in _TOPICS for place in _PLACES]
+    # Zipf-like popularity: a few intents dominate, as in real usage.
+    weights = [1.0 / (rank + 1) for rank in range(len(intents))]
+    rng.shuffle(intents)
+    log = []
+    for _ in range(queries):
+        topic, place = rng.choices(intents, weights=weights)[0]
+        prompt = rng.choice(_TOPICS[topic]).format(place=place)
+        prompt = f"{rng.choice(_PREFIXES)}{prompt}{rng.choice(_SUFFIXES)}"
+        if rng.random() < 0.3:
+            prompt = prompt.lower()
+        log.append(
+            {
+                "user": f"user-{rng.randrange(users)}",
+                "prompt": prompt,
+                "intent": f"{topic}:{place}",
+            }
+        )
+    return log
+
+
+def _hashed_embedding(text: str, dims: int) -> list[float]:
+    vector = np.zeros(dims, dtype=np.float32)
+    words = text.split()
+    padded = f"  {text}  "
+    features = words + [padded[i : i + 3] for i in range(len(padded) - 2)]
+    for feature in features:
+        digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+        index = int.from_bytes(digest[:4], "little") % dims
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+    return vector.tolist()
+
+
+def _hashed_embedder(dims: int) -> Embedder:
+    async def embed(texts: list[str]) -> list[list[float]]:
+        return [_hashed_embedding(text, dims) for text in texts]
+
+    return embed
+
+
+def _azure_embedder() -> Embedder:
+    from app.services.embedding_service import get_embedding_service
+
+    async def embed(texts: list[str]) -> list[list[float]]:
+        return await get_embedding_service().generate_embeddings_batch(texts)
+
+    return embed
+
+
+async def run_benchmark_async(
+    *,
+    log: list[dict[str, str]],
+    thresholds: list[float],
+    embedder: Embedder,
+    scope: str = "user",
+    max_entries_per_scope: int = 256,
+) -> dict[str, Any]:
+    prompts = sorted({normalize_prompt(q["prompt"]) for q in log})
+    embeddings = dict(zip(prompts, await embedder(prompts), strict=True))
+
+    def owner(query: dict[str, str]) -> str:
+        return "*" if scope == "shared" else query["user"]
+
+    exact: set[tuple[str, str]] = set()
+    exact_hits = 0
+    for query in log:
+        key = (owner(query), query["prompt"])
+        exact_hits += key in exact
+        exact.add(key)
+
+    results = []
+    for threshold in thresholds:
+        cache = SemanticCache(
+            namespace="bench_semantic",
+            threshold=threshold,
+            ttl_seconds=3600,
+            max_entries_per_scope=max_entries_per_scope,
+            max_bytes=1 << 40,
+        )
+        exact_seen: set[tuple[str, str]] = set()
+        hits = false_hits = 0
+        for query in log:
+            key = (owner(query), query["prompt"])
+            if key in exact_seen:
+                hits += 1
+                continue
+            exact_seen.add(key)
+            embedding = embeddings[normalize_prompt(query["prompt"])]
+            hit = cache.get(owner(query), embedding)
+            if hit is None:
+                cache.set(owner(query), embedding, query["intent"].encode())
+                continue
+            hits += 1
+            false_hits += hit[0].decode() != query["intent"]
+
+        results.append(
+            {
+                "threshold": threshold,
+                "hit_rate": round(hits / len(log), 4),
+                "false_hit_rate": round(false_hits / len(log), 4),
+                "entries": cache.stats()["entries"],
+            }
+        )
+
+    return {
+        "version": 1,
+        "benchmark": "semantic_llm_cache",
+        "config": {"queries": len(log), "distinct_prompts": len(prompts), "scope": scope},
+        "exact_hit_rate": round(exact_hits / len(log), 4),
+        "semantic": results,
+    }
+
+
+def run_benchmark(
+    *,
+    queries: int = 2000,
+    users: int = 50,
+    thresholds: list[float] | None = None,
+    scope: str = "user",
+    dims: int = 256,
+    seed: int = 0,
+    log: list[dict[str, str]] | None = None,
+    embedder: Embedder | None = None,
+) -> dict[str, Any]:
+    return asyncio.run(
+        run_benchmark_async(
+            log=log or _synthetic_log(queries=queries, users=users, seed=seed),
+            thresholds=thresholds or [0.8, 0.85, 0.9, 0.95],
+            embedder=embedder or _hashed_embedder(dims),
+            scope=scope,
+        )
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay a query log against the LLM caches")
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--thresholds", default="0.8,0.85,0.9,0.95")
+    parser.add_argument("--scope", choices=["user", "shared"], default="user")
+    parser.add_argument("--embedder", choices=["hashed", "azure"], default="hashed")
+    parser.add_argument("--dims", type=int, default=256, help="Hashed embedder dimensions")
+    parser.add_argument("--log", help="JSONL file of {user, prompt, intent} records")
+    args = parser.parse_args()
+
+    # Per-lookup cache events would interleave with the JSON report.
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    log = None
+    if args.log:
+        with open(args.log, encoding="utf-8") as fh:
+            log = [json.loads(line) for line in fh if line.strip()]
+
+    data = run_benchmark(
+        queries=args.queries,
+        users=args.users,
+        thresholds=[float(t) for t in args.thresholds.split(",")],
+        scope=args.scope,
+        dims=args.dims,
+        log=log,
+        embedder=_azure_embedder() if args.embedder == "azure" else None,
+    )
+    print(json.dumps(data, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
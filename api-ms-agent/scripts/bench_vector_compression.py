@@ -0,0 +1,201 @@
+"""Offline recall-vs-size benchmark for truncated and quantized embeddings.
+
+Simulates the vector storage options of the search index (`embedding_dimensions`,
+`azure_search_vector_compression`, `azure_search_vector_rescore`) on a local corpus and
+measures recall@k against exact float32 cosine search over full-size vectors:
+
+- truncation keeps the first `d` dimensions and re-normalizes, as text-embedding-3 does for
+  its `dimensions` parameter;
+- scalar quantization maps each dimension's corpus range to 256 int8 levels;
+- binary quantization keeps one sign bit per dimension (ranked by Hamming distance);
+- rescoring takes `oversampling` x k candidates from the compressed vectors and re-ranks them
+  with the truncated float32 vectors, like the service's rerank_with_original_vectors.
+
+Reported per option: recall@k, bytes per vector as searched (float32 / int8 / bits), the
+corpus' total vector bytes, and the estimated JSON upload bytes per chunk.
+
+The default corpus is synthetic: clustered vectors whose per-dimension variance decays with
+the dimension index, so leading dimensions carry most of the signal as in Matryoshka-trained
+models. Absolute recall depends on that assumption; pass `--vectors` with a .npy matrix of
+real embeddings (rows = chunks) for numbers representative of a deployment.
+
+Example:
+    uv run python -m scripts.bench_vector_compression --corpus 20000 --queries 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from typing import Any
+
+import numpy as np
+
+# Matches the upload size estimate in AzureSearchService.
+_JSON_BYTES_PER_FLOAT = 22
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def _synthetic_corpus(
+    size: int, dims: int, queries: int, rng: np.random.Generator
+) -> tuple[np.ndarray, np.ndarray]:
+    scale = (1.0 + np.arange(dims, dtype=np.float32)) ** -0.5
+    topics = rng.standard_normal((max(8, size // 100), dims), dtype=np.float32) * scale
+    assignment = rng.integers(0, len(topics), size)
+    corpus = topics[assignment] + 0.6 * rng.standard_normal((size, dims), dtype=np.float32) * scale
+    # Queries paraphrase a random chunk: the chunk's vector plus noise.
+    picks = rng.integers(0, size, queries)
+    noise = 0.4 * rng.standard_normal((queries, dims), dtype=np.float32) * scale
+    return _normalize(corpus), _normalize(corpus[picks] + noise)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores per row, best first."""
+    k = min(k, scores.shape[1])
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+
+def _scalar_quantize(corpus: np.ndarray, queries: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """int8 codes per corpus dimension range, returned dequantized for scoring."""
+    low, high = corpus.min(axis=0), corpus.max(axis=0)
+    step = np.where(high > low, (high - low) / 255.0, 1.0)
+
+    def roundtrip(matrix: np.ndarray) -> np.ndarray:
+        codes = np.clip(np.rint((matrix - low) / step), 0, 255)
+        return (codes * step + low).astype(np.float32)
+
+    return roundtrip(corpus), queries
+
+
+def _binary_quantize(corpus: np.ndarray, queries: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sign bits as +/-1; their dot product ranks like negative Hamming distance."""
+    return np.where(corpus >= 0, 1.0, -1.0).astype(np.float32), np.where(
+        queries >= 0, 1.0, -1.0
+    ).astype(np.float32)
+
+
+def _recall(found: np.ndarray, truth: np.ndarray) -> float:
+    k = truth.shape[1]
+    hits = sum(len(set(f[:k]) & set(t)) for f, t in zip(found, truth, strict=True))
+    return hits / truth.size
+
+
+def run_benchmark(
+    *,
+    corpus_size: int = 20_000,
+    queries: int = 200,
+    dims: int = 3072,
+    k: int = 10,
+    oversampling: float = 4.0,
+    truncations: tuple[int, ...] = (3072, 1536, 1024, 512, 256),
+    vectors: np.ndarray | None = None,
+    seed: int = 0,
+) -> dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    if vectors is None:
+        corpus, query_vectors = _synthetic_corpus(corpus_size, dims, queries, rng)
+        source = "synthetic"
+    else:
+        corpus = _normalize(vectors)
+        picks = rng.choice(len(corpus), size=min(queries, len(corpus)), replace=False)
+        # Held-out queries: each is removed from the corpus it searches.
+        query_vectors = corpus[picks]
+        corpus = np.delete(corpus, picks, axis=0)
+        source = "file"
+    dims = corpus.shape[1]
+    truth = _top_k(query_vectors @ corpus.T, k)
+    candidates = max(k, int(round(k * oversampling)))
+
+    results = []
+    for d in sorted({t for t in truncations if t <= dims}, reverse=True):
+        base, queries_d = _normalize(corpus[:, :d]), _normalize(query_vectors[:, :d])
+        for compression, quantize, bits in [
+            ("none", None, 32),
+            ("scalar", _scalar_quantize, 8),
+            ("binary", _binary_quantize, 1),
+        ]:
+            if quantize is None:
+                searched, searched_queries = base, queries_d
+            else:
+                searched, searched_queries = quantize(base, queries_d)
+            scores = searched_queries @ searched.T
+            rescore_options = [False] if quantize is None else [False, True]
+            for rescore in rescore_options:
+                if rescore:
+                    shortlist = _top_k(scores, candidates)
+                    exact = np.einsum("qd,qcd->qc", queries_d, base[shortlist])
+                    found = np.take_along_axis(shortlist, _top_k(exact, k), axis=1)
+                else:
+                    found = _top_k(scores, k)
+                bytes_per_vector = (d * bits + 7) // 8
+                results.append(
+                    {
+                        "dimensions": d,
+                        "compression": compression,
+                        "rescore": rescore,
+                        f"recall_at_{k}": round(_recall(found, truth), 4),
+                        "bytes_per_vector": bytes_per_vector,
+                        "corpus_vector_megabytes": round(
+                            bytes_per_vector * len(corpus) / (1024 * 1024), 2
+                        ),
+                        "size_vs_baseline": round(bytes_per_vector / (dims * 4), 4),
+                        "upload_json_bytes_per_vector": _JSON_BYTES_PER_FLOAT * d,
+                    }
+                )
+
+    return {
+        "version": 1,
+        "benchmark": "vector_compression",
+        "config": {
+            "source": source,
+            "corpus": len(corpus),
+            "queries": len(query_vectors),
+            "dimensions": dims,
+            "k": k,
+            "oversampling": oversampling,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark vector truncation and quantization")
+    parser.add_argument("--corpus", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dims", type=int, default=3072)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--oversampling", type=float, default=4.0)
+    parser.add_argument(
+        "--truncations", type=lambda v: tuple(int(x) for x in v.split(",")), default=None
+    )
+    parser.add_argument("--vectors", help=".npy file of real embeddings, one row per chunk")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    options: dict[str, Any] = {}
+    if args.truncations:
+        options["truncations"] = args.truncations
+    data = run_benchmark(
+        corpus_size=args.corpus,
+        queries=args.queries,
+        dims=args.dims,
+        k=args.k,
+        oversampling=args.oversampling,
+        vectors=np.load(args.vectors) if args.vectors else None,
+        seed=args.seed,
+        **options,
+    )
+    print(json.dumps(data, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
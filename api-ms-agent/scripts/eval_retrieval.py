@@ -0,0 +1,293 @@
+"""Offline evaluation of document chat retrieval modes: recall@k and latency.
+
+Runs `AzureSearchService.vector_search`, `keyword_search` and `hybrid_search` (with and
+without local reranking and adaptive top_k) against an in-memory stand-in for the search
+index that answers vector queries by exact cosine similarity and keyword queries by BM25,
+with an optional simulated round-trip time per request.
+
+The corpus is synthetic: documents whose chunks mix topic vocabulary with identifiers such
+as "FIN-312" or "section 41(2)". Embeddings are hashed bags of words that, like dense
+embedding models, carry little signal for rare identifiers. Two query sets are scored,
+each query scoped to its document like document chat:
+
+- `topical`: a reworded subset of one chunk's words; the chunk is the answer.
+- `exact`: a question naming one chunk's identifier; the chunk is the answer.
+
+Reported per mode and query set: recall@k (fraction of queries whose answer is in the top
+k) for k in 1, 3 and 5, the mean number of results returned, and latency p50/p95 in ms.
+
+Example:
+    uv run python -m scripts.eval_retrieval --documents 20 --chunks 200 --rtt-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from typing import Any
+
+import numpy as np
+import structlog
+
+from app.config import settings
+from app.services.azure_search_service import AzureSearchService, VectorSearchOptions
+from app.services.hybrid_retrieval import bm25_scores
+from app.services.search_hot_tier import search_score
+
+_TOPICS = [
+    "water licence groundwater aquifer well drilling permit extraction".split(),
+    "forest harvest cutblock timber stumpage silviculture reforestation".split(),
+    "land tenure crown lease survey boundary title easement".split(),
+    "mining claim exploration reclamation bond tailings inspection".split(),
+    "wildlife habitat species permit hunting trapping conservation".split(),
+]
+_COMMON = "the applicant must submit a request to the ministry under this regulation".split()
+_FORM_PREFIXES = ["FIN", "LND", "WTR", "FOR", "MIN"]
+
+# (mode name, retrieval settings overrides)
+_MODES: list[tuple[str, dict[str, Any]]] = [
+    ("vector", {}),
+    ("keyword", {}),
+    ("hybrid", {"retrieval_rerank_enabled": False, "retrieval_adaptive_top_k": False}),
+    ("hybrid_rerank", {"retrieval_rerank_enabled": True, "retrieval_adaptive_top_k": False}),
+    (
+        "hybrid_rerank_adaptive",
+        {"retrieval_rerank_enabled": True, "retrieval_adaptive_top_k": True},
+    ),
+]
+
+
+def _embed(text: str, dims: int) -> list[float]:
+    """Hashed bag of alphabetic words: identifiers' digits carry no signal."""
+    vector = np.zeros(dims, dtype=np.float32)
+    for word in text.lower().split():
+        word = "".join(c for c in word if c.isalpha())
+        if len(word) > 2:
+            digest = hashlib.blake2b(word.encode(), digest_size=8).digest()
+            vector[int.from_bytes(digest[:4], "little") % dims] += 1.0 if digest[4] & 1 else -1.0
+    norm = float(np.linalg.norm(vector)) or 1.0
+    return (vector / norm).tolist()
+
+
+def _corpus(documents: int, chunks: int, rng: random.Random) -> list[dict[str, Any]]:
+    records = []
+    for d in range(documents):
+        topic = _TOPICS[d % len(_TOPICS)]
+        for c in range(chunks):
+            words = rng.choices(topic, k=25) + rng.choices(_COMMON, k=15)
+            rng.shuffle(words)
+            identifier = (
+                f"form {rng.choice(_FORM_PREFIXES)}-{rng.randint(100, 999)}"
+                if c % 2
+                else f"section {rng.randint(1, 99)}({rng.randint(1, 9)})"
+            )
+            position = rng.randint(0, len(words))
+            content = " ".join(words[:position] + [identifier] + words[position:]) + "."
+            records.append(
+                {
+                    "id": f"doc{d}_chunk_{c}",
+                    "document_id": f"doc{d}",
+                    "user_id": "u1",
+                    "content": content,
+                    "chunk_index": c,
+                    "page_number": 1 + c // 4,
+                    "title": f"Document {d}",
+                    "filename": f"doc{d}.pdf",
+                    "identifier": identifier,
+                    "words": words,
+                }
+            )
+    return records
+
+
+def _queries(
+    records: list[dict[str, Any]], count: int, rng: random.Random
+) -> dict[str, list[tuple[str, dict[str, Any]]]]:
+    picks = rng.sample(records, min(count, len(records)))
+    topical = [(" ".join(rng.sample(r["words"], 8)), r) for r in picks]
+    exact = [(f"What does {r['identifier']} require?", r) for r in picks]
+    return {"topical": topical, "exact": exact}
+
+
+class _LocalSearchClient:
+    """In-memory search index: exact cosine for vector queries, BM25 for keyword queries."""
+
+    def __init__(self, records: list[dict[str, Any]], *, rtt_ms: float) -> None:
+        self._rtt = rtt_ms / 1000
+        self._by_document: dict[str, list[dict[str, Any]]] = {}
+        for record in records:
+            self._by_document.setdefault(record["document_id"], []).append(record)
+        self._matrices = {
+            document_id: np.asarray([r["embedding"] for r in rows], dtype=np.float32)
+            for document_id, rows in self._by_document.items()
+        }
+
+    async def search(self, *, search_text, filter, top, vector_queries=None, **kwargs):
+        await asyncio.sleep(self._rtt)
+        document_id = filter.split("document_id eq '")[1].rstrip("'")
+        rows = self._by_document[document_id]
+        if vector_queries:
+            query = np.asarray(vector_queries[0].vector, dtype=np.float32)
+            scores = search_score(self._matrices[document_id] @ query).tolist()
+        else:
+            scores = bm25_scores(search_text, [r["content"] for r in rows])
+        ranked = sorted(
+            (i for i, s in enumerate(scores) if vector_queries or s > 0),
+            key=lambda i: scores[i],
+            reverse=True,
+        )[:top]
+        return _AsyncResults([{**rows[i], "@search.score": scores[i]} for i in ranked])
+
+
+class _AsyncResults:
+    def __init__(self, items: list[dict[str, Any]]) -> None:
+        self._items = iter(items)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._items)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+@contextmanager
+def _settings(**overrides: Any):
+    previous = {name: getattr(settings, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(settings, name, value)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else 0.0
+
+
+async def _evaluate(
+    service: AzureSearchService,
+    mode: str,
+    queries: list[tuple[str, dict[str, Any]]],
+    *,
+    dims: int,
+    top_k: int,
+) -> dict[str, Any]:
+    hits = dict.fromkeys((1, 3, 5), 0)
+    returned = 0
+    latencies = []
+    for text, answer in queries:
+        options = VectorSearchOptions(user_id="u1", document_id=answer["document_id"], top_k=top_k)
+        embedding = _embed(text, dims)
+        start = time.perf_counter()
+        if mode == "vector":
+            items = await service.vector_search(embedding, options)
+        elif mode == "keyword":
+            items = await service.keyword_search(text, options)
+        else:
+            items = await service.hybrid_search(text, embedding, options)
+        latencies.append((time.perf_counter() - start) * 1000)
+        ids = [item["id"] for item in items]
+        returned += len(ids)
+        for k in hits:
+            hits[k] += answer["id"] in ids[:k]
+    n = max(1, len(queries))
+    return {
+        **{f"recall_at_{k}": round(v / n, 4) for k, v in hits.items()},
+        "mean_results": round(returned / n, 2),
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 0.5), 3),
+            "p95": round(_percentile(latencies, 0.95), 3),
+        },
+    }
+
+
+def run_benchmark(
+    *,
+    documents: int = 20,
+    chunks: int = 200,
+    queries: int = 200,
+    dims: int = 256,
+    top_k: int = 5,
+    rtt_ms: float = 0.0,
+    seed: int = 0,
+) -> dict[str, Any]:
+    rng = random.Random(seed)
+    records = _corpus(documents, chunks, rng)
+    for record in records:
+        record["embedding"] = _embed(record["content"], dims)
+    query_sets = _queries(records, queries, rng)
+
+    service = AzureSearchService()
+    service._search_client = _LocalSearchClient(records, rtt_ms=rtt_ms)
+    service._initialized = True
+    service._hot_tier = None
+
+    async def evaluate_all() -> dict[str, Any]:
+        results: dict[str, Any] = {}
+        for mode, overrides in _MODES:
+            with _settings(**overrides):
+                results[mode] = {
+                    name: await _evaluate(service, mode, qs, dims=dims, top_k=top_k)
+                    for name, qs in query_sets.items()
+                }
+        return results
+
+    with _settings(retrieval_mode="hybrid"):
+        results = asyncio.run(evaluate_all())
+
+    return {
+        "version": 1,
+        "benchmark": "retrieval",
+        "config": {
+            "documents": documents,
+            "chunks_per_document": chunks,
+            "queries_per_set": len(query_sets["topical"]),
+            "dims": dims,
+            "top_k": top_k,
+            "rtt_ms": rtt_ms,
+            "candidates": settings.retrieval_candidates,
+            "rrf_k": settings.retrieval_rrf_k,
+            "seed": seed,
+        },
+        "modes": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Evaluate document retrieval modes")
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--chunks", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--rtt-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Per-query search logs would interleave with the JSON report.
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+    data = run_benchmark(
+        documents=args.documents,
+        chunks=args.chunks,
+        queries=args.queries,
+        top_k=args.top_k,
+        rtt_ms=args.rtt_ms,
+        seed=args.seed,
+    )
+    print(json.dumps(data, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,9 @@
 import time
 
+from app.core.cache import memory_backend
+from app.core.cache import stats as cache_stats
 from app.core.cache.memory_backend import MemoryCacheBackend
+from scripts.bench_cache_memory import run_benchmark
 
 
 def test_memory_cache_ttl_expiry() -> None:
@@ -27,3 +30,106 @@ def test_memory_cache_lru_eviction() -> None:
     assert cache.get("b") is None
     assert cache.get("a") == b"1"
     assert cache.get("c") == b"3"
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def test_memory_cache_expiry_index_purges_due_entries(monkeypatch) -> None:
+    clock = _FakeClock()
+    monkeypatch.setattr(memory_backend.time, "monotonic", clock.monotonic)
+    cache = MemoryCacheBackend(max_entries=100)
+
+    cache.set_many({f"short{i}": b"v" for i in range(10)}, ttl_seconds=5)
+    cache.set_many({f"long{i}": b"v" for i in range(10)}, ttl_seconds=60)
+
+    clock.now += 10
+    assert cache.purge_expired() == 10
+    assert len(cache._entries) == 10
+    assert cache.get("long0") == b"v"
+
+    # Writes purge due entries too, without a full scan.
+    clock.now += 60
+    cache.set("fresh", b"v", ttl_seconds=60)
+    assert list(cache._entries) == ["fresh"]
+
+
+def test_memory_cache_expiry_index_ignores_overwritten_entries(monkeypatch) -> None:
+    clock = _FakeClock()
+    monkeypatch.setattr(memory_backend.time, "monotonic", clock.monotonic)
+    cache = MemoryCacheBackend(max_entries=10)
+
+    cache.set("k", b"old", ttl_seconds=5)
+    cache.set("k", b"new", ttl_seconds=60)
+
+    clock.now += 10
+    assert cache.purge_expired() == 0
+    assert cache.get("k") == b"new"
+
+
+def test_memory_cache_expiry_index_stays_bounded() -> None:
+    cache = MemoryCacheBackend(max_entries=10)
+
+    for i in range(10_000):
+        cache.set(f"k{i % 20}", b"v", ttl_seconds=60)
+
+    assert len(cache._entries) == 10
+    assert len(cache._expiry_heap) <= 2 * 10 + 64
+
+
+def test_memory_cache_set_latency_benchmark_smoke() -> None:
+    data = run_benchmark(sizes=[1000, 10_000], ops=200)
+
+    assert [r["size"] for r in data["results"]] == [1000, 10_000]
+    assert all(r["mean_us"] > 0 for r in data["results"])
+    # The timed phase exercises both expiry and LRU eviction.
+    assert all(r["expired"] == 100 and r["evicted"] == 100 for r in data["results"])
+
+
+def test_memory_cache_byte_budget_evicts_lru_until_within_budget() -> None:
+    cache = MemoryCacheBackend(max_entries=100, max_bytes=100)
+
+    for i in range(5):
+        cache.set(f"s{i}", b"x" * 8, ttl_seconds=60)  # 10 bytes each
+    assert cache.current_bytes == 50
+
+    # Touch s0 so it survives; one large entry must displace several small LRU ones.
+    assert cache.get("s0") == b"x" * 8
+    cache.set("big", b"y" * 77, ttl_seconds=60)  # 80 bytes
+
+    assert cache.current_bytes <= 100
+    assert cache.get("big") == b"y" * 77
+    assert cache.get("s0") == b"x" * 8
+    assert cache.get("s1") is None
+
+
+def test_memory_cache_rejects_values_larger_than_budget() -> None:
+    cache = MemoryCacheBackend(max_entries=10, max_bytes=16)
+    cache.set("a", b"1", ttl_seconds=60)
+
+    cache.set("huge", b"z" * 64, ttl_seconds=60)
+
+    assert cache.get("huge") is None
+    assert cache.get("a") == b"1"
+    assert cache.current_bytes == 2
+
+
+def test_memory_cache_publishes_byte_usage() -> None:
+    cache_stats.reset()
+    cache = MemoryCacheBackend(max_entries=10, max_bytes=1000, namespace="usage")
+
+    cache.set_many({"a": b"12345", "b": b"123"}, ttl_seconds=60)
+    assert cache_stats.usage_snapshot()["usage"] == {
+        "entries": 2,
+        "bytes": 10,
+        "max_entries": 10,
+        "max_bytes": 1000,
+    }
+
+    cache.delete("a")
+    assert cache_stats.usage_snapshot()["usage"]["bytes"] == 4
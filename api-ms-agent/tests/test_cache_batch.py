@@ -0,0 +1,119 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.cache import stats as cache_stats
+from app.core.cache.async_adapter import SyncBackendAdapter
+from app.core.cache.cache import Cache
+from app.core.cache.memory_backend import MemoryCacheBackend
+from app.core.cache.singleflight import SingleFlight
+from app.core.cache.types import CachePolicy
+from app.services import embedding_service as embedding_module
+from app.services.embedding_service import EmbeddingService
+
+
+class _CountingAsyncBackend(SyncBackendAdapter):
+    def __init__(self, backend: MemoryCacheBackend) -> None:
+        super().__init__(backend)
+        self.calls: dict[str, int] = {}
+
+    def _count(self, op: str) -> None:
+        self.calls[op] = self.calls.get(op, 0) + 1
+
+    async def get(self, key):
+        self._count("get")
+        return await super().get(key)
+
+    async def set(self, key, value, *, ttl_seconds):
+        self._count("set")
+        await super().set(key, value, ttl_seconds=ttl_seconds)
+
+    async def get_many(self, keys):
+        self._count("get_many")
+        return await super().get_many(keys)
+
+    async def set_many(self, items, *, ttl_seconds):
+        self._count("set_many")
+        await super().set_many(items, ttl_seconds=ttl_seconds)
+
+
+def _make_cache(namespace: str = "batch") -> tuple[Cache, _CountingAsyncBackend]:
+    backend = MemoryCacheBackend(max_entries=10_000)
+    async_backend = _CountingAsyncBackend(backend)
+    policy = CachePolicy(namespace=namespace, default_ttl_seconds=60, max_entries=10_000)
+    cache = Cache(
+        backend=backend,
+        policy=policy,
+        _singleflight=SingleFlight(),
+        async_backend=async_backend,
+    )
+    return cache, async_backend
+
+
+@pytest.mark.asyncio
+async def test_cache_batch_operations_log_one_event_per_call() -> None:
+    cache, async_backend = _make_cache()
+    before = cache_stats.snapshot()
+
+    await cache.set_many({"a": b"1", "b": b"2"})
+    found = await cache.get_many(["a", "b", "c"])
+    await cache.delete_many(["a"])
+
+    assert found == {"a": b"1", "b": b"2"}
+    assert await cache.aget("a") is None
+    assert cache.get("b") == b"2"
+    assert async_backend.calls["get_many"] == 1
+    assert async_backend.calls["set_many"] == 1
+
+    delta = cache_stats.diff(before, cache_stats.snapshot())["batch"]
+    assert delta["set"] == 2
+    assert delta["hit"] == 3  # two from get_many, one from get("b")
+    assert delta["miss"] == 2  # "c" from get_many and "a" from aget
+    assert delta["delete"] == 1
+
+
+def test_memory_backend_batch_operations_respect_ttl_and_capacity() -> None:
+    backend = MemoryCacheBackend(max_entries=2)
+
+    backend.set_many({"a": b"1", "b": b"2", "c": b"3"}, ttl_seconds=60)
+    assert backend.get_many(["a", "b", "c"]) == {"b": b"2", "c": b"3"}
+
+    backend.set_many({"b": b"x"}, ttl_seconds=0)
+    assert backend.get_many(["b", "c"]) == {"c": b"3"}
+
+    backend.delete_many(["c"])
+    assert backend.get_many(["c"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_embeddings_batch_uses_single_cache_round_trip(monkeypatch) -> None:
+    cache, async_backend = _make_cache("embed")
+    monkeypatch.setattr(embedding_module, "get_cache", lambda namespace: cache)
+
+    embedded: list[list[str]] = []
+
+    async def _create(*, model, input):
+        embedded.append(list(input))
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=i, embedding=[float(len(text))])
+                for i, text in enumerate(input)
+            ]
+        )
+
+    client = SimpleNamespace(embeddings=SimpleNamespace(create=_create))
+
+    async def _get_client():
+        return client
+
+    monkeypatch.setattr(embedding_module, "get_embedding_client", _get_client)
+
+    service = EmbeddingService(search_service=object(), cosmos_service=object())
+    texts = [f"chunk {i}" for i in range(2000)]
+
+    first = await service.generate_embeddings_batch(texts, user_id="u1")
+    second = await service.generate_embeddings_batch(texts, user_id="u1")
+
+    assert first == second
+    assert len(embedded) == 1  # second call served entirely from cache
+    assert async_backend.calls == {"get_many": 2, "set_many": 1}
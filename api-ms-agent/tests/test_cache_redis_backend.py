@@ -0,0 +1,217 @@
+import socket
+import socketserver
+import threading
+import time
+
+import pytest
+
+from app.config import settings
+from app.core.cache import provider as cache_provider
+from app.core.cache import stats as cache_stats
+from app.core.cache.memory_backend import MemoryCacheBackend
+from app.core.cache.redis_backend import AsyncRedisCacheBackend, RedisCacheBackend
+
+
+class _FakeRedisHandler(socketserver.StreamRequestHandler):
+    """Minimal RESP2 server supporting the commands used by RedisCacheBackend."""
+
+    def handle(self) -> None:
+        while True:
+            command = self._read_command()
+            if command is None:
+                return
+            self.wfile.write(self.server.execute(command))  # type: ignore[attr-defined]
+
+    def _read_command(self) -> list[bytes] | None:
+        header = self.rfile.readline()
+        if not header:
+            return None
+        count = int(header[1:].strip())
+        parts: list[bytes] = []
+        for _ in range(count):
+            length = int(self.rfile.readline()[1:].strip())
+            parts.append(self.rfile.read(length + 2)[:-2])
+        return parts
+
+
+class _FakeRedisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _FakeRedisHandler)
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.commands: list[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address
+        return f"redis://{host}:{port}/0"
+
+    def _lookup(self, key: bytes) -> bytes | None:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key, None)
+            return None
+        return value
+
+    @staticmethod
+    def _bulk(value: bytes | None) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def execute(self, command: list[bytes]) -> bytes:
+        name = command[0].upper().decode()
+        args = command[1:]
+        with self._lock:
+            self.commands.append(name)
+            if name == "PING":
+                return b"+PONG\r\n"
+            if name == "GET":
+                return self._bulk(self._lookup(args[0]))
+            if name == "MGET":
+                return b"*%d\r\n" % len(args) + b"".join(self._bulk(self._lookup(k)) for k in args)
+            if name == "SET":
+                expires_at = None
+                if len(args) >= 4 and args[2].upper() == b"EX":
+                    expires_at = time.monotonic() + int(args[3])
+                self.data[args[0]] = (args[1], expires_at)
+                return b"+OK\r\n"
+            if name == "DEL":
+                removed = sum(1 for k in args if self.data.pop(k, None) is not None)
+                return b":%d\r\n" % removed
+            return b"-ERR unknown command '%s'\r\n" % name.encode()
+
+
+@pytest.fixture
+def fake_redis():
+    server = _FakeRedisServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_redis_backend_is_shared_between_workers(fake_redis) -> None:
+    worker_a = RedisCacheBackend(url=fake_redis.url, namespace="embed", key_prefix="t")
+    worker_b = RedisCacheBackend(url=fake_redis.url, namespace="embed", key_prefix="t")
+
+    worker_a.set("k", b"v", ttl_seconds=60)
+    assert worker_b.get("k") == b"v"
+    assert b"t:embed:k" in fake_redis.data
+
+    worker_b.delete("k")
+    assert worker_a.get("k") is None
+
+    worker_a.close()
+    worker_b.close()
+
+
+def test_redis_backend_ttl_expiry(fake_redis) -> None:
+    backend = RedisCacheBackend(url=fake_redis.url, namespace="http")
+    backend.set("k", b"v", ttl_seconds=1)
+    assert backend.get("k") == b"v"
+
+    time.sleep(1.05)
+    assert backend.get("k") is None
+
+    # Non-positive TTL behaves like the memory backend: no entry is kept.
+    backend.set("k", b"v", ttl_seconds=0)
+    assert backend.get("k") is None
+    backend.close()
+
+
+def test_redis_backend_bulk_get_and_set_use_single_round_trips(fake_redis) -> None:
+    backend = RedisCacheBackend(url=fake_redis.url, namespace="embed")
+    items = {f"k{i}": f"v{i}".encode() for i in range(100)}
+
+    backend.set_many(items, ttl_seconds=60)
+    assert fake_redis.commands.count("SET") == 100
+
+    fake_redis.commands.clear()
+    found = backend.get_many([*items.keys(), "missing"])
+
+    assert found == items
+    assert fake_redis.commands == ["MGET"]
+    backend.close()
+
+
+@pytest.mark.asyncio
+async def test_async_redis_backend_batches_round_trips(fake_redis) -> None:
+    backend = AsyncRedisCacheBackend(url=fake_redis.url, namespace="embed", key_prefix="t")
+    sync_view = RedisCacheBackend(url=fake_redis.url, namespace="embed", key_prefix="t")
+    items = {f"k{i}": f"v{i}".encode() for i in range(2000)}
+
+    await backend.set_many(items, ttl_seconds=60)
+    assert sync_view.get("k1999") == b"v1999"
+
+    fake_redis.commands.clear()
+    found = await backend.get_many(list(items.keys()))
+    assert found == items
+    assert fake_redis.commands == ["MGET"]
+
+    await backend.delete_many(["k0", "k1"])
+    assert await backend.get("k0") is None
+    assert await backend.get("k2") == b"v2"
+
+    await backend.close()
+    sync_view.close()
+
+
+def test_redis_backend_unavailable_is_treated_as_miss() -> None:
+    cache_stats.reset()
+    backend = RedisCacheBackend(
+        url=f"redis://127.0.0.1:{_unused_port()}/0",
+        namespace="embed",
+        socket_timeout_seconds=0.2,
+    )
+
+    backend.set("k", b"v", ttl_seconds=60)
+    assert backend.get("k") is None
+    assert backend.get_many(["k"]) == {}
+
+    assert cache_stats.snapshot()["embed"]["error"] >= 3
+
+
+@pytest.mark.asyncio
+async def test_provider_selects_backend_per_namespace(fake_redis, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "cache_enabled", True, raising=False)
+    monkeypatch.setattr(settings, "cache_embed_backend", "redis", raising=False)
+    monkeypatch.setattr(settings, "cache_redis_url", fake_redis.url, raising=False)
+    cache_provider._caches.clear()  # type: ignore[attr-defined]
+
+    try:
+        embed = cache_provider.get_cache("embed")
+        db = cache_provider.get_cache("db")
+
+        assert isinstance(embed.backend, RedisCacheBackend)
+        assert isinstance(embed.async_backend, AsyncRedisCacheBackend)
+        assert embed.policy.backend == "redis"
+        assert isinstance(db.backend, MemoryCacheBackend)
+    finally:
+        await cache_provider.close_caches()
+
+
+@pytest.mark.asyncio
+async def test_provider_falls_back_to_memory_without_redis_url(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "cache_enabled", True, raising=False)
+    monkeypatch.setattr(settings, "cache_embed_backend", "redis", raising=False)
+    monkeypatch.setattr(settings, "cache_redis_url", "", raising=False)
+    cache_provider._caches.clear()  # type: ignore[attr-defined]
+
+    try:
+        assert isinstance(cache_provider.get_cache("embed").backend, MemoryCacheBackend)
+    finally:
+        await cache_provider.close_caches()
@@ -0,0 +1,172 @@
+import asyncio
+import time
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from pypdf import PdfReader, PdfWriter
+from pypdf.errors import PdfReadError
+
+from app.config import settings
+from app.services.document_intelligence_service import DocumentIntelligenceService
+
+_SECONDS_PER_PAGE = 0.01
+
+
+def _pdf(pages: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=72, height=72)
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+class _Poller:
+    """LRO stand-in whose result takes longer for more pages, like the layout model."""
+
+    def __init__(self, pages: int, delay: float) -> None:
+        self._pages = pages
+        self._delay = delay
+
+    def status(self) -> str:
+        return "running"
+
+    async def result(self):
+        await asyncio.sleep(self._delay)
+        return SimpleNamespace(
+            content="\n".join(f"page {i}" for i in range(1, self._pages + 1)),
+            pages=[SimpleNamespace(page_number=i) for i in range(1, self._pages + 1)],
+            paragraphs=[
+                SimpleNamespace(
+                    content=f"paragraph on page {i}",
+                    bounding_regions=[SimpleNamespace(page_number=i)],
+                )
+                for i in range(1, self._pages + 1)
+            ],
+            tables=[],
+        )
+
+
+class _Client:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def begin_analyze_document(self, *, model_id, body, content_type, polling=True):
+        try:
+            pages = len(PdfReader(body).pages)
+        except PdfReadError:
+            pages = 1
+        self.calls.append({"pages": pages, "polling": polling})
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        poller = _Poller(pages, pages * _SECONDS_PER_PAGE)
+        original = poller.result
+
+        async def result():
+            try:
+                return await original()
+            finally:
+                self.in_flight -= 1
+
+        poller.result = result
+        return poller
+
+
+@pytest.fixture
+def service(monkeypatch) -> tuple[DocumentIntelligenceService, _Client]:
+    monkeypatch.setattr(
+        settings, "azure_document_intelligence_endpoint", "https://di.cognitiveservices.azure.com"
+    )
+    monkeypatch.setattr(settings, "document_intelligence_parallel_enabled", True)
+    monkeypatch.setattr(settings, "document_intelligence_pages_per_range", 10)
+    monkeypatch.setattr(settings, "document_intelligence_max_concurrent_ranges", 4)
+    client = _Client()
+    svc = DocumentIntelligenceService()
+
+    async def _get_client():
+        return client
+
+    monkeypatch.setattr(svc, "_get_client", _get_client)
+    return svc, client
+
+
+async def test_page_ranges_are_merged_with_page_offsets(service) -> None:
+    svc, client = service
+
+    result = await svc.analyze_document(_pdf(35), "report.pdf")
+
+    assert sorted(c["pages"] for c in client.calls) == [5, 10, 10, 10]
+    assert client.peak == 4
+    assert result.pages == 35
+    assert [p.page_number for p in result.paragraphs_with_pages] == list(range(1, 36))
+    assert result.content.splitlines()[:12] == [f"page {i}" for i in range(1, 11)] + [
+        "page 1",
+        "page 2",
+    ]
+
+
+async def test_stream_analysis_uses_the_same_fan_out(service) -> None:
+    svc, client = service
+
+    analysis = await svc.analyze_document_stream(BytesIO(_pdf(25)), "report.pdf")
+
+    assert analysis.pages == 25
+    assert [p.page_number for p in analysis.paragraphs] == list(range(1, 26))
+    assert len(client.calls) == 3
+
+
+async def test_short_or_invalid_pdfs_are_sent_whole(service) -> None:
+    svc, client = service
+    source = BytesIO(_pdf(10))
+
+    await svc.analyze_document_stream(source, "short.pdf")
+    # The whole file was sent from the start, despite being read to count pages.
+    assert client.calls[-1]["pages"] == 10
+
+    garbage = BytesIO(b"%PDF-1.7 not really a pdf")
+    parts = await svc._analyze_layout_parts(
+        garbage, filename="bad.pdf", content_type="application/pdf", content_length=0
+    )
+    assert len(parts) == 1
+    assert garbage.tell() == 0
+
+
+async def test_wall_clock_shrinks_with_parallelism(service, monkeypatch) -> None:
+    svc, _ = service
+    content = _pdf(80)
+
+    async def timed(max_concurrent: int) -> float:
+        monkeypatch.setattr(settings, "document_intelligence_max_concurrent_ranges", max_concurrent)
+        start = time.perf_counter()
+        result = await svc.analyze_document(content, "long.pdf")
+        assert result.pages == 80
+        return time.perf_counter() - start
+
+    serial = await timed(1)
+    parallel = await timed(8)
+
+    # 8 ranges of 10 pages: ~0.8 s one at a time, ~0.1 s plus splitting when concurrent.
+    assert serial >= 8 * 10 * _SECONDS_PER_PAGE
+    assert parallel < serial * 0.5
+
+
+async def test_polling_interval_replaces_service_retry_after(service, monkeypatch) -> None:
+    svc, client = service
+    monkeypatch.setattr(settings, "document_intelligence_polling_interval_seconds", 0.25)
+
+    await svc.analyze_document(_pdf(1), "one.pdf")
+    polling = client.calls[-1]["polling"]
+    # A Retry-After on the status response is ignored in favour of the configured interval.
+    polling._pipeline_response = SimpleNamespace(
+        http_response=SimpleNamespace(headers={"Retry-After": "10"})
+    )
+    assert polling._extract_delay() == 0.25
+
+    monkeypatch.setattr(settings, "azure_document_intelligence_endpoint", "https://proxy.example")
+    await svc.analyze_document(_pdf(1), "one.pdf")
+    proxy_polling = client.calls[-1]["polling"]
+    assert proxy_polling is not polling
+    assert proxy_polling._extract_delay() == 0.25
@@ -180,6 +180,7 @@ class TestDocumentsEndpoints:
         mock_doc_intel = MagicMock()
         mock_doc_intel.is_supported_format = MagicMock(return_value=True)
         mock_doc_intel.analyze_document = AsyncMock()
+        mock_doc_intel.analyze_document_stream = AsyncMock()
         app.dependency_overrides[get_document_intelligence_service] = lambda: mock_doc_intel
 
         try:
@@ -191,6 +192,7 @@ class TestDocumentsEndpoints:
             assert response.status_code == 413
             # Ensure downstream services were not called
             mock_doc_intel.analyze_document.assert_not_called()
+            mock_doc_intel.analyze_document_stream.assert_not_called()
             mock_embedding.index_document.assert_not_called()
         finally:
             app.dependency_overrides.clear()
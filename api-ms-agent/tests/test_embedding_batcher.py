@@ -0,0 +1,191 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import app.services.embedding_service as embedding_module
+from app.config import settings
+from app.core.cache import stats as cache_stats
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_service import EmbeddingService
+
+
+class _FakeEmbeddings:
+    def __init__(self, *, delay: float = 0.01, reject: str | None = None) -> None:
+        self.delay = delay
+        self.reject = reject
+        self.calls: list[list[str]] = []
+
+    async def create(self, *, model, input):
+        texts = [input] if isinstance(input, str) else list(input)
+        self.calls.append(texts)
+        await asyncio.sleep(self.delay)
+        if self.reject in texts:
+            raise ValueError("400 invalid input")
+        # Return out of order to check the service sorts by index.
+        data = [
+            SimpleNamespace(index=i, embedding=[float(len(t)), float(i)])
+            for i, t in enumerate(texts)
+        ]
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+def _service(monkeypatch, embeddings: _FakeEmbeddings) -> EmbeddingService:
+    async def aget(key):
+        return None
+
+    async def aset(key, value, *, ttl_seconds=None):
+        return None
+
+    cache = SimpleNamespace(aget=aget, aset=aset)
+    monkeypatch.setattr(embedding_module, "get_cache", lambda namespace: cache)
+
+    async def _get_client():
+        return SimpleNamespace(embeddings=embeddings)
+
+    monkeypatch.setattr(embedding_module, "get_embedding_client", _get_client)
+    monkeypatch.setattr(settings, "embedding_coalesce_enabled", True)
+    monkeypatch.setattr(settings, "embedding_coalesce_window_ms", 5.0)
+    monkeypatch.setattr(settings, "embedding_max_retries", 0)
+    return EmbeddingService(search_service=object(), cosmos_service=object())
+
+
+async def test_identical_concurrent_texts_share_one_call(monkeypatch) -> None:
+    embeddings = _FakeEmbeddings()
+    service = _service(monkeypatch, embeddings)
+
+    question = "what is this document about?"
+
+    results = await asyncio.gather(
+        *(service.generate_embedding(question, user_id=f"u{i}") for i in range(30))
+    )
+
+    assert embeddings.calls == [[question]]
+    assert all(r == results[0] for r in results)
+    stats = service.batcher.stats()
+    assert stats["requests"] == 30
+    assert stats["coalesced"] == 29
+    assert stats["windows"] == 1
+
+
+async def test_distinct_texts_within_window_are_batched(monkeypatch) -> None:
+    embeddings = _FakeEmbeddings()
+    service = _service(monkeypatch, embeddings)
+    texts = [f"question {i}" + "!" * i for i in range(10)]
+
+    results = await asyncio.gather(*(service.generate_embedding(t) for t in texts))
+
+    assert len(embeddings.calls) == 1
+    assert sorted(embeddings.calls[0]) == sorted(texts)
+    # Each caller gets its own vector back, not a neighbour's.
+    assert [r[0] for r in results] == [float(len(t)) for t in texts]
+    assert service.batcher.stats()["batch_size"]["max"] == 10
+
+
+async def test_text_in_flight_is_not_sent_again(monkeypatch) -> None:
+    embeddings = _FakeEmbeddings(delay=0.05)
+    service = _service(monkeypatch, embeddings)
+
+    first = asyncio.create_task(service.generate_embedding("same"))
+    await asyncio.sleep(0.02)  # window flushed, call in flight
+    second = await service.generate_embedding("same")
+
+    assert await first == second
+    assert embeddings.calls == [["same"]]
+
+
+async def test_max_batch_size_flushes_early() -> None:
+    calls: list[list[str]] = []
+
+    async def create_batch(texts):
+        calls.append(texts)
+        return [[float(len(t))] for t in texts]
+
+    batcher = EmbeddingBatcher(create_batch, window_seconds=10.0, max_batch_size=4)
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.embed("x" * i) for i in range(1, 9))), timeout=1.0
+    )
+
+    assert [len(c) for c in calls] == [4, 4]
+    assert results == [[float(i)] for i in range(1, 9)]
+
+
+async def test_errors_reach_every_waiter(monkeypatch) -> None:
+    embeddings = _FakeEmbeddings(reject="boom")
+    service = _service(monkeypatch, embeddings)
+    monkeypatch.setattr(
+        EmbeddingService, "_is_retryable_embedding_error", staticmethod(lambda exc: True)
+    )
+
+    results = await asyncio.gather(
+        *(service.generate_embedding(t) for t in ["boom", "boom", "fine"]),
+        return_exceptions=True,
+    )
+
+    assert len(embeddings.calls) == 1
+    assert all(isinstance(r, ValueError) for r in results)
+    assert service.batcher.stats()["failed_windows"] == 1
+
+
+async def test_rejected_input_only_fails_its_own_callers(monkeypatch) -> None:
+    embeddings = _FakeEmbeddings(reject="bad")
+    service = _service(monkeypatch, embeddings)
+
+    results = await asyncio.gather(
+        *(service.generate_embedding(t) for t in ["good", "bad", "also good"]),
+        return_exceptions=True,
+    )
+
+    assert results[0] == [4.0, 0.0]
+    assert isinstance(results[1], ValueError)
+    assert results[2] == [9.0, 0.0]
+    # One batched attempt, then one call per text.
+    assert [len(c) for c in embeddings.calls] == [3, 1, 1, 1]
+
+
+async def test_cancelled_caller_does_not_cancel_shared_call() -> None:
+    started = asyncio.Event()
+
+    async def create_batch(texts):
+        started.set()
+        await asyncio.sleep(0.02)
+        return [[1.0] for _ in texts]
+
+    batcher = EmbeddingBatcher(create_batch, window_seconds=0.0, max_batch_size=8)
+    first = asyncio.create_task(batcher.embed("t"))
+    second = asyncio.create_task(batcher.embed("t"))
+    await started.wait()
+    first.cancel()
+
+    assert await second == [1.0]
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_window_stats_are_exported_as_cache_counters() -> None:
+    cache_stats.reset()
+
+    async def create_batch(texts):
+        return [[0.0] for _ in texts]
+
+    batcher = EmbeddingBatcher(create_batch, window_seconds=0.001, max_batch_size=8)
+    await asyncio.gather(batcher.embed("a"), batcher.embed("a"), batcher.embed("b"))
+
+    counters = cache_stats.snapshot()["embed_batch"]
+    assert counters == {"coalesced": 1, "window": 1, "texts": 2}
+    stats = batcher.stats()
+    assert stats["batch_size"]["p50"] == 2
+    assert stats["window_wait_ms"]["p50"] >= 0.0
+    assert stats["pending"] == stats["in_flight"] == 0
+
+
+async def test_coalescing_can_be_disabled(monkeypatch) -> None:
+    embeddings = _FakeEmbeddings()
+    _service(monkeypatch, embeddings)
+    monkeypatch.setattr(settings, "embedding_coalesce_enabled", False)
+    service = EmbeddingService(search_service=object(), cosmos_service=object())
+
+    await asyncio.gather(service.generate_embedding("a"), service.generate_embedding("a"))
+
+    assert service.batcher is None
+    assert embeddings.calls == [["a"], ["a"]]
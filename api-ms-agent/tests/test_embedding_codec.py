@@ -0,0 +1,95 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from app.config import Settings, settings
+from app.core.cache.embedding_codec import decode_embedding, encode_embedding
+from app.core.cache.keys import canonical_json
+from app.services import embedding_service as embedding_module
+from app.services.embedding_service import EmbeddingService, _embedding_cache_key
+
+
+def _vector(dims: int = 3072) -> list[float]:
+    rng = random.Random(42)
+    return [rng.uniform(-0.1, 0.1) for _ in range(dims)]
+
+
+def test_float32_round_trip_is_zero_copy_and_compact() -> None:
+    vector = _vector()
+    raw = encode_embedding(vector, deployment="text-embedding-3-large")
+
+    decoded = decode_embedding(raw, deployment="text-embedding-3-large")
+
+    assert isinstance(decoded, memoryview)
+    assert decoded.obj is raw
+    assert len(decoded) == 3072
+    assert decoded.tolist() == pytest.approx(vector, rel=1e-6)
+    assert len(raw) * 4 < len(canonical_json(vector).encode("utf-8"))
+
+
+def test_float16_round_trip_halves_size() -> None:
+    vector = _vector()
+    raw32 = encode_embedding(vector, deployment="d")
+    raw16 = encode_embedding(vector, deployment="d", dtype="float16")
+
+    decoded = decode_embedding(raw16, deployment="d")
+
+    assert len(raw16) < len(raw32) * 0.51
+    assert list(decoded) == pytest.approx(vector, abs=1e-4)
+
+
+def test_decode_rejects_other_deployment_and_corrupt_entries() -> None:
+    raw = encode_embedding([0.1, 0.2], deployment="a")
+
+    assert decode_embedding(raw, deployment="b") is None
+    assert decode_embedding(raw[:-1], deployment="a") is None
+    assert decode_embedding(b"not json", deployment="a") is None
+
+
+def test_unknown_codec_is_rejected_at_startup() -> None:
+    with pytest.raises(ValidationError):
+        Settings(cache_embed_codec="float8")
+
+
+def test_decode_reads_legacy_json_entries() -> None:
+    raw = canonical_json([0.5, -0.25]).encode("utf-8")
+
+    assert decode_embedding(raw, deployment="a") == [0.5, -0.25]
+
+
+@pytest.mark.asyncio
+async def test_embedding_service_reads_legacy_and_writes_binary(monkeypatch) -> None:
+    cache = SimpleNamespace(store={})
+
+    async def aget(key):
+        return cache.store.get(key)
+
+    async def aset(key, value, *, ttl_seconds=None):
+        cache.store[key] = value
+
+    cache.aget = aget
+    cache.aset = aset
+    monkeypatch.setattr(embedding_module, "get_cache", lambda namespace: cache)
+    monkeypatch.setattr(settings, "cache_embed_codec", "float32", raising=False)
+
+    deployment = settings.azure_openai_embedding_deployment
+    legacy_key = _embedding_cache_key(deployment=deployment, user_id="u1", text="legacy")
+    cache.store[legacy_key] = canonical_json([0.5, 0.25]).encode("utf-8")
+
+    async def _create(*, model, input):
+        return SimpleNamespace(data=[SimpleNamespace(index=0, embedding=[0.125, -0.5])])
+
+    async def _get_client():
+        return SimpleNamespace(embeddings=SimpleNamespace(create=_create))
+
+    monkeypatch.setattr(embedding_module, "get_embedding_client", _get_client)
+    service = EmbeddingService(search_service=object(), cosmos_service=object())
+
+    assert await service.generate_embedding("legacy", user_id="u1") == [0.5, 0.25]
+    assert await service.generate_embedding("fresh", user_id="u1") == [0.125, -0.5]
+
+    fresh_key = _embedding_cache_key(deployment=deployment, user_id="u1", text="fresh")
+    assert cache.store[fresh_key].startswith(b"EMBV")
+    assert await service.generate_embedding("fresh", user_id="u1") == [0.125, -0.5]
@@ -0,0 +1,232 @@
+import asyncio
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+
+import app.services.embedding_service as embedding_module
+from app.config import settings
+from app.services.embedding_scheduler import (
+    EmbeddingScheduler,
+    is_rate_limit_error,
+    retry_after_seconds,
+)
+from app.services.embedding_service import EmbeddingService
+from scripts.bench_embedding_scheduler import run_benchmark
+
+
+class _RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, headers: dict[str, str] | None = None) -> None:
+        super().__init__("429 Too Many Requests")
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+class _Deployment:
+    """Fake embeddings endpoint that throttles after `capacity` concurrent requests."""
+
+    def __init__(self, *, capacity: int = 100, retry_after_ms: int = 20) -> None:
+        self.capacity = capacity
+        self.retry_after_ms = retry_after_ms
+        self.in_flight = 0
+        self.peak = 0
+        self.calls: list[list[str]] = []
+        self.throttled = 0
+
+    async def send(self, texts: list[str]) -> tuple[list[list[float]], int | None]:
+        self.calls.append(texts)
+        if self.in_flight >= self.capacity:
+            self.throttled += 1
+            raise _RateLimited({"retry-after-ms": str(self.retry_after_ms)})
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.005)
+        finally:
+            self.in_flight -= 1
+        return [[float(len(t))] for t in texts], sum(len(t) for t in texts) // 2
+
+
+def _scheduler(send, **kwargs) -> EmbeddingScheduler:
+    kwargs.setdefault("is_retryable", lambda exc: False)
+    kwargs.setdefault("retry_base_seconds", 0.001)
+    return EmbeddingScheduler(send, **kwargs)
+
+
+def test_pack_respects_item_and_token_limits() -> None:
+    scheduler = _scheduler(None, max_batch_items=3, max_batch_tokens=10)
+    texts = ["a" * 8, "b" * 8, "c" * 20, "d" * 60, "e", "f", "g", "h"]
+
+    batches = scheduler.pack(texts)
+
+    # 4 chars per token: 2 + 2 + 5 tokens, then a 15-token text alone, then item-limited.
+    assert [b.texts for b in batches] == [
+        ["a" * 8, "b" * 8, "c" * 20],
+        ["d" * 60],
+        ["e", "f", "g"],
+        ["h"],
+    ]
+    assert [t for b in batches for t in b.texts] == texts
+    assert [len(b.texts) for b in scheduler.pack(texts, max_batch_items=2)] == [2, 1, 1, 2, 2]
+
+
+def test_retry_after_headers() -> None:
+    assert retry_after_seconds(_RateLimited({"retry-after-ms": "250"})) == 0.25
+    assert retry_after_seconds(_RateLimited({"retry-after": "3"})) == 3.0
+    in_two_minutes = formatdate(time.time() + 120, usegmt=True)
+    assert 100 < retry_after_seconds(_RateLimited({"retry-after": in_two_minutes})) <= 120
+    assert retry_after_seconds(_RateLimited({"retry-after": "soon"})) is None
+    assert retry_after_seconds(RuntimeError("boom")) is None
+    assert is_rate_limit_error(_RateLimited())
+    assert not is_rate_limit_error(RuntimeError("429"))
+
+
+async def test_concurrency_grows_additively_on_success() -> None:
+    deployment = _Deployment()
+    scheduler = _scheduler(
+        deployment.send, max_batch_items=1, initial_concurrency=2, max_concurrency=6
+    )
+
+    results = await scheduler.embed([f"text {i}" for i in range(60)])
+
+    assert results == [[float(len(f"text {i}"))] for i in range(60)]
+    assert scheduler.concurrency_limit == 6
+    assert deployment.peak == 6
+    assert scheduler.stats()["rate_limited"] == 0
+
+
+async def test_rate_limit_cuts_limits_and_pauses_all_senders() -> None:
+    deployment = _Deployment(capacity=3, retry_after_ms=30)
+    scheduler = _scheduler(
+        deployment.send,
+        max_batch_items=1,
+        initial_concurrency=8,
+        max_concurrency=8,
+        burst_seconds=0.05,
+    )
+
+    start = time.monotonic()
+    results = await scheduler.embed([f"text {i}" for i in range(8)])
+    elapsed = time.monotonic() - start
+
+    assert len(results) == 8
+    stats = scheduler.stats()
+    assert stats["rate_limited"] == deployment.throttled > 0
+    assert stats["last_retry_after_seconds"] == 0.03
+    assert elapsed >= 0.03
+    # Concurrent 429s from one burst halve concurrency (8 -> 4) once and start pacing; the
+    # retries' successes then add to it again.
+    assert scheduler.concurrency_limit <= 5
+    assert stats["rate_tokens_per_minute"] is not None
+    # No retry storm: 5 of the first 8 requests were throttled, and few retries were.
+    assert deployment.throttled <= 7
+
+
+async def test_tokens_per_minute_paces_requests() -> None:
+    deployment = _Deployment()
+    # 60k TPM = 1000 tokens/s with a 10k-token bucket; each text is 2500 tokens.
+    scheduler = _scheduler(
+        deployment.send, max_batch_items=1, tokens_per_minute=60_000, burst_seconds=10.0
+    )
+
+    start = time.monotonic()
+    await scheduler.embed(["x" * 10_000] * 4)
+    first_four = time.monotonic() - start
+    scheduler._bucket = 0.0  # drain the bucket: the next request must wait ~0.2 s
+    await scheduler.embed(["y" * 800])
+    paced = time.monotonic() - start - first_four
+
+    assert first_four < 0.2
+    assert paced >= 0.15
+
+
+async def test_transient_errors_are_retried_and_others_raise() -> None:
+    attempts = 0
+
+    async def flaky(texts):
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise TimeoutError("timed out")
+        return [[1.0] for _ in texts], None
+
+    scheduler = _scheduler(flaky, is_retryable=lambda exc: isinstance(exc, TimeoutError))
+    assert await scheduler.embed(["a"]) == [[1.0]]
+    assert scheduler.stats()["retries"] == 2
+
+    async def rejected(texts):
+        raise ValueError("400 bad input")
+
+    scheduler = _scheduler(rejected)
+    with pytest.raises(ValueError):
+        await scheduler.embed(["a"])
+    stats = scheduler.stats()
+    assert stats["failures"] == 1
+    assert stats["in_flight"] == 0
+
+
+async def test_stats_report_throughput_queue_and_calibration() -> None:
+    deployment = _Deployment()
+    scheduler = _scheduler(
+        deployment.send, max_batch_items=2, initial_concurrency=1, max_concurrency=1
+    )
+
+    task = asyncio.create_task(scheduler.embed(["abcd"] * 10))
+    await asyncio.sleep(0.001)
+    queued = scheduler.stats()
+    await task
+    stats = scheduler.stats()
+
+    assert queued["in_flight"] == 1
+    assert queued["queue_batches"] == 4
+    assert queued["queue_texts"] == 8
+    # The fake deployment bills one token per two characters.
+    assert stats["tokens_per_minute"] == 20
+    assert stats["texts_per_minute"] == 10
+    assert stats["chars_per_token"] < 4.0
+
+
+async def test_service_batches_go_through_the_scheduler(monkeypatch) -> None:
+    calls: list[int] = []
+
+    async def create(*, model, input):
+        calls.append(len(input))
+        if len(calls) == 1:
+            raise _RateLimited({"retry-after-ms": "1"})
+        return SimpleNamespace(
+            data=[SimpleNamespace(index=i, embedding=[float(i)]) for i in range(len(input))],
+            usage=SimpleNamespace(prompt_tokens=len(input)),
+        )
+
+    async def _get_client():
+        return SimpleNamespace(embeddings=SimpleNamespace(create=create))
+
+    async def get_many(keys):
+        return {}
+
+    async def set_many(items, *, ttl_seconds=None):
+        return None
+
+    cache = SimpleNamespace(get_many=get_many, set_many=set_many)
+    monkeypatch.setattr(embedding_module, "get_cache", lambda namespace: cache)
+    monkeypatch.setattr(embedding_module, "get_embedding_client", _get_client)
+    monkeypatch.setattr(settings, "embedding_batch_max_tokens", 100)
+    monkeypatch.setattr(settings, "embedding_rate_window_seconds", 0.05)
+    service = EmbeddingService(search_service=object(), cosmos_service=object())
+
+    texts = ["x" * 40] * 25  # 10 estimated tokens each: 10 per request
+    results = await service.generate_embeddings_batch(texts, user_id="u1")
+
+    assert len(results) == 25
+    assert sorted(calls) == [5, 10, 10, 10]  # one request throttled, then retried
+    assert service.scheduler.stats()["rate_limited"] == 1
+
+
+def test_benchmark_smoke() -> None:
+    data = run_benchmark(documents=3, chunks=24, quota_tpm=600_000, modes=["adaptive"])
+
+    adaptive = data["modes"]["adaptive"]
+    assert adaptive["failed_documents"] == 0
+    assert adaptive["embedded_chunks"] == 3 * 24
@@ -0,0 +1,141 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.core.cache import provider as cache_provider
+from app.services.mcp import resilience
+from app.services.mcp.base import ConfidenceLevel
+from app.services.mcp.geocoder_mcp import GeocoderMCP
+from app.services.orchestrator_agent import _execute_mcp_tool
+
+
+class _GeocoderTransport(httpx.AsyncBaseTransport):
+    """Answers /addresses.json with one match per address; 'bad' ones get a 500 while `failing`."""
+
+    def __init__(self) -> None:
+        self.failing = True
+        self.queries: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        address = request.url.params["addressString"]
+        self.queries.append(address)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if self.failing and address.startswith("bad"):
+            return httpx.Response(500, request=request)
+        feature = {
+            "properties": {"fullAddress": f"{address}, BC", "score": 95},
+            "geometry": {"coordinates": [-123.36, 48.42]},
+        }
+        return httpx.Response(200, json={"features": [feature]}, request=request)
+
+
+@pytest.fixture(autouse=True)
+def _isolate(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "cache_enabled", True, raising=False)
+    monkeypatch.setattr(settings, "mcp_geocoder_batch_concurrency", 3, raising=False)
+    monkeypatch.setattr(settings, "mcp_circuit_failure_threshold", 100, raising=False)
+    cache_provider._caches.clear()  # type: ignore[attr-defined]
+    resilience.reset_circuit_breakers()
+    yield
+    cache_provider._caches.clear()  # type: ignore[attr-defined]
+    resilience.reset_circuit_breakers()
+
+
+@pytest.fixture
+def geocoder():
+    transport = _GeocoderTransport()
+    mcp = GeocoderMCP(base_url="https://geocoder.example")
+    mcp._backoff_factor = 0.0
+    mcp._client = httpx.AsyncClient(base_url=mcp.base_url, transport=transport)
+    return mcp, transport
+
+
+async def test_batch_geocodes_each_unique_address_with_bounded_concurrency(geocoder) -> None:
+    mcp, transport = geocoder
+    addresses = [f"{i} Main St" for i in range(10)] + ["0 Main St", "  1 Main St "]
+
+    result = await mcp.execute_tool("geocoder_geocode_batch", {"addresses": addresses})
+
+    assert result.success is True
+    assert result.data["count"] == 10
+    assert result.data["failed"] == 0
+    assert result.data["results"][0] == {
+        "query": "0 Main St",
+        "matches": [
+            {"full_address": "0 Main St, BC", "score": 95, "latitude": 48.42, "longitude": -123.36}
+        ],
+    }
+    assert sorted(transport.queries) == sorted(f"{i} Main St" for i in range(10))
+    assert transport.max_in_flight == 3
+    assert result.source_info["confidence"] == ConfidenceLevel.HIGH.value
+    await mcp.close()
+
+
+async def test_batch_reuses_cached_lookups(geocoder) -> None:
+    mcp, transport = geocoder
+    await mcp.execute_tool("geocoder_geocode", {"address": "Victoria", "max_results": 1})
+
+    await mcp.execute_tool("geocoder_geocode_batch", {"addresses": ["Victoria", "Nanaimo"]})
+
+    assert transport.queries == ["Victoria", "Nanaimo"]
+    await mcp.close()
+
+
+async def test_failed_addresses_do_not_fail_the_batch(geocoder) -> None:
+    mcp, _ = geocoder
+
+    result = await mcp.execute_tool(
+        "geocoder_geocode_batch", {"addresses": ["Victoria", "bad address"]}
+    )
+
+    assert result.success is True
+    assert result.data["failed"] == 1
+    assert "error" in result.data["results"][1]
+    assert result.source_info["confidence"] == ConfidenceLevel.MEDIUM.value
+
+    all_failed = await mcp.execute_tool("geocoder_geocode_batch", {"addresses": ["bad one"]})
+    assert all_failed.success is False
+    assert all_failed.error
+    await mcp.close()
+
+
+async def test_partially_failed_batch_is_not_cached_so_failures_are_retried(geocoder) -> None:
+    mcp, transport = geocoder
+    arguments = {"addresses": ["Victoria", "bad address"]}
+
+    first = await _execute_mcp_tool(mcp, "geocoder_geocode_batch", arguments)
+    transport.failing = False
+    second = await _execute_mcp_tool(mcp, "geocoder_geocode_batch", arguments)
+    queries_after_second = len(transport.queries)
+    third = await _execute_mcp_tool(mcp, "geocoder_geocode_batch", arguments)
+
+    assert first.data["failed"] == 1
+    assert first.cacheable is False
+    assert second.data["failed"] == 0
+    assert "matches" in second.data["results"][1]
+    # Only the failed address was looked up again; the complete batch is then cached.
+    assert transport.queries.count("Victoria") == 1
+    assert third.data == second.data
+    assert len(transport.queries) == queries_after_second
+    await mcp.close()
+
+
+async def test_batch_rejects_empty_and_oversized_input(geocoder) -> None:
+    mcp, transport = geocoder
+
+    empty = await mcp.execute_tool("geocoder_geocode_batch", {"addresses": []})
+    blank = await mcp.execute_tool("geocoder_geocode_batch", {"addresses": ["  "]})
+    too_many = await mcp.execute_tool(
+        "geocoder_geocode_batch", {"addresses": [str(i) for i in range(51)]}
+    )
+
+    assert empty.success is blank.success is too_many.success is False
+    assert transport.queries == []
+    await mcp.close()
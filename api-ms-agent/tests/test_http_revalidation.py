@@ -0,0 +1,121 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app import http_client
+from app.config import settings
+from app.core.cache import provider as cache_provider
+from app.core.cache import stats as cache_stats
+from app.http_client import cached_get_json, upstream_cache_stats
+
+
+class _ValidatingTransport(httpx.AsyncBaseTransport):
+    """Serves a versioned JSON body with an ETag and answers matching conditionals with 304."""
+
+    def __init__(self, *, cache_control: str | None = None) -> None:
+        self.version = 1
+        self.cache_control = cache_control
+        self.requests: list[httpx.Request] = []
+
+    @property
+    def etag(self) -> str:
+        return f'"v{self.version}"'
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        headers = {"ETag": self.etag, "Last-Modified": "Mon, 05 Oct 2026 10:00:00 GMT"}
+        if self.cache_control:
+            headers["Cache-Control"] = self.cache_control
+        if request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304, headers=headers, request=request)
+        return httpx.Response(200, headers=headers, json={"version": self.version}, request=request)
+
+
+@pytest.fixture(autouse=True)
+def _isolate_cache(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "cache_enabled", True, raising=False)
+    monkeypatch.setattr(settings, "cache_http_ttl_seconds", 900, raising=False)
+    monkeypatch.setattr(settings, "cache_http_revalidate_ttl_seconds", 3600, raising=False)
+    cache_provider._caches.clear()  # type: ignore[attr-defined]
+    cache_stats.reset()
+    yield
+    cache_provider._caches.clear()  # type: ignore[attr-defined]
+    cache_stats.reset()
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch):
+    """Wall clock used for freshness; advance it with `clock.now += seconds`.
+
+    Only `app.http_client`'s reference to `time` is replaced; patching `time.time` itself
+    would move the wall clock of every other module for the duration of the test.
+    """
+
+    class _Clock:
+        now = 1_000_000.0
+
+    monkeypatch.setattr(http_client, "time", SimpleNamespace(time=lambda: _Clock.now))
+    return _Clock
+
+
+async def test_stale_entry_is_revalidated_and_304_renews_it(clock) -> None:
+    transport = _ValidatingTransport()
+    async with httpx.AsyncClient(base_url="https://geo.example", transport=transport) as client:
+        first = await cached_get_json(client, "/sites", params={"q": "x"})
+        await cached_get_json(client, "/sites", params={"q": "x"})
+
+        clock.now += 901
+        second = await cached_get_json(client, "/sites", params={"q": "x"})
+        # The 304 made the entry fresh again.
+        await cached_get_json(client, "/sites", params={"q": "x"})
+
+    assert first == second == {"version": 1}
+    assert len(transport.requests) == 2
+    conditional = transport.requests[1].headers
+    assert conditional["If-None-Match"] == '"v1"'
+    assert conditional["If-Modified-Since"] == "Mon, 05 Oct 2026 10:00:00 GMT"
+    assert upstream_cache_stats() == {"geo.example": {"hit": 2, "revalidated": 1, "miss": 1}}
+
+
+async def test_changed_resource_is_refetched_in_full(clock) -> None:
+    transport = _ValidatingTransport()
+    async with httpx.AsyncClient(base_url="https://geo.example", transport=transport) as client:
+        await cached_get_json(client, "/sites")
+        transport.version = 2
+        clock.now += 901
+        changed = await cached_get_json(client, "/sites")
+
+    assert changed == {"version": 2}
+    assert upstream_cache_stats()["geo.example"] == {"miss": 2}
+
+
+async def test_cache_control_max_age_sets_freshness(clock) -> None:
+    transport = _ValidatingTransport(cache_control="public, max-age=60")
+    async with httpx.AsyncClient(base_url="https://parks.example", transport=transport) as client:
+        await cached_get_json(client, "/parks")
+        clock.now += 30
+        await cached_get_json(client, "/parks")
+        clock.now += 31
+        await cached_get_json(client, "/parks")
+
+    assert len(transport.requests) == 2
+    assert "If-None-Match" in transport.requests[1].headers
+
+
+@pytest.mark.parametrize(
+    ("cache_control", "expected_requests"),
+    [("no-store", 2), ("no-cache", 2), ("private, max-age=60", 2)],
+)
+async def test_cache_control_directives_limit_reuse(
+    clock, cache_control: str, expected_requests: int
+) -> None:
+    transport = _ValidatingTransport(cache_control=cache_control)
+    async with httpx.AsyncClient(base_url="https://org.example", transport=transport) as client:
+        await cached_get_json(client, "/topics")
+        await cached_get_json(client, "/topics")
+
+    assert len(transport.requests) == expected_requests
+    # no-cache responses are stored, but every use is a conditional request.
+    conditional = "If-None-Match" in transport.requests[1].headers
+    assert conditional == (cache_control == "no-cache")
@@ -0,0 +1,209 @@
+import pytest
+from pydantic import ValidationError
+
+from app.config import Settings, settings
+from app.services.azure_search_service import AzureSearchService, VectorSearchOptions
+from app.services.hybrid_retrieval import (
+    above_relative_floor,
+    adaptive_cutoff,
+    bm25_scores,
+    min_max_scaled,
+    reciprocal_rank_fusion,
+    rerank,
+)
+from scripts.eval_retrieval import run_benchmark
+
+
+def _item(id: str, content: str = "", **scores) -> dict:
+    return {"id": id, "document_id": "doc", "content": content, **scores}
+
+
+def test_bm25_prefers_rarer_and_more_frequent_terms() -> None:
+    scores = bm25_scores(
+        "form FIN-312",
+        [
+            "submit form FIN-312 to the ministry",
+            "submit form LND-100 to the ministry",
+            "no match here",
+        ],
+    )
+
+    assert scores[0] > scores[1] > scores[2] == 0.0
+    assert bm25_scores("", ["anything"]) == [0.0]
+
+
+def test_rrf_merges_by_id_and_keeps_both_scores() -> None:
+    vector = [_item("a", similarity=0.9), _item("b", similarity=0.8)]
+    keyword = [_item("b", keyword_score=7.0), _item("c", keyword_score=3.0)]
+
+    fused = reciprocal_rank_fusion([vector, keyword], k=60)
+
+    assert [item["id"] for item in fused] == ["b", "a", "c"]
+    assert fused[0]["rrf_score"] == pytest.approx(1 / 62 + 1 / 61)
+    assert fused[0]["similarity"] == 0.8
+    assert fused[0]["keyword_score"] == 7.0
+    assert "similarity" not in fused[2]
+
+
+def test_rerank_promotes_exact_term_matches() -> None:
+    items = [
+        _item("a", "general permit conditions", rrf_score=0.03),
+        _item("b", "section 41(2) permit conditions", rrf_score=0.02),
+    ]
+
+    reranked = rerank("what does section 41(2) say", items, weight=0.7)
+
+    assert [item["id"] for item in reranked] == ["b", "a"]
+    assert all("rerank_score" in item for item in reranked)
+
+
+def test_adaptive_cutoff_drops_weak_tail_but_keeps_min_k() -> None:
+    items = [_item(str(i), score=s) for i, s in enumerate([1.0, 0.8, 0.3, 0.9, 0.2])]
+
+    assert [i["id"] for i in adaptive_cutoff(items, score_key="score", max_k=5)] == ["0", "1"]
+    kept = adaptive_cutoff(items, score_key="score", max_k=5, min_k=3)
+    assert [i["id"] for i in kept] == ["0", "1", "2", "3"]
+    assert len(adaptive_cutoff(items, score_key="score", max_k=1)) == 1
+    assert adaptive_cutoff([], score_key="score", max_k=5) == []
+
+
+def test_relative_floor_and_min_max_scaling() -> None:
+    items = [_item("a", score=2.0), _item("b", score=10.0), _item("c", score=1.0)]
+
+    assert [i["id"] for i in above_relative_floor(items, "score", 0.2)] == ["a", "b"]
+    assert above_relative_floor(items, "score", 0.0) == items
+    assert min_max_scaled([3.0, 1.0, 2.0]) == [1.0, 0.0, 0.5]
+    assert min_max_scaled([0.5, 0.5]) == [1.0, 1.0]
+    assert min_max_scaled([]) == []
+
+
+def test_unknown_retrieval_mode_is_rejected() -> None:
+    with pytest.raises(ValidationError):
+        Settings(retrieval_mode="hybird")
+
+
+class _Results:
+    def __init__(self, items: list[dict]) -> None:
+        self._items = iter(items)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._items)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+class _Client:
+    """Search client stand-in answering vector and keyword queries from fixed lists."""
+
+    def __init__(self, vector: list[dict], keyword: list[dict]) -> None:
+        self.vector = vector
+        self.keyword = keyword
+        self.calls: list[dict] = []
+
+    async def search(self, **kwargs):
+        self.calls.append(kwargs)
+        rows = self.vector if kwargs.get("vector_queries") else self.keyword
+        return _Results(rows[: kwargs["top"]])
+
+
+def _service(client: _Client) -> AzureSearchService:
+    service = AzureSearchService()
+    service._search_client = client  # type: ignore[assignment]
+    service._initialized = True
+    service._hot_tier = None
+    return service
+
+
+def _row(id: str, content: str, score: float) -> dict:
+    return {"id": id, "document_id": "doc", "content": content, "@search.score": score}
+
+
+async def test_hybrid_search_fuses_candidates_and_returns_top_k(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "retrieval_candidates", 10)
+    monkeypatch.setattr(settings, "retrieval_rerank_enabled", False)
+    monkeypatch.setattr(settings, "retrieval_adaptive_top_k", False)
+    client = _Client(
+        vector=[_row(f"v{i}", "permit text", 0.9 - i * 0.01) for i in range(10)],
+        keyword=[_row("k0", "form FIN-312", 9.0), _row("v3", "permit text", 2.0)],
+    )
+    options = VectorSearchOptions(user_id="u1", document_id="doc", top_k=3)
+
+    items = await _service(client).hybrid_search("form FIN-312", [0.1, 0.2], options)
+
+    # Found by both searches, v3 ranks first; both searches ran candidates deep.
+    assert [item["id"] for item in items] == ["v3", "v0", "k0"]
+    assert items[0]["similarity"] == pytest.approx(0.87)
+    assert items[0]["keyword_score"] == 2.0
+    assert [call["top"] for call in client.calls] == [10, 10]
+    keyword_call = next(call for call in client.calls if call["search_text"])
+    assert keyword_call["search_fields"] == ["content"]
+    assert keyword_call["filter"] == "user_id eq 'u1' and document_id eq 'doc'"
+
+
+async def test_hybrid_search_rerank_and_adaptive_cutoff(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "retrieval_rerank_enabled", True)
+    monkeypatch.setattr(settings, "retrieval_rerank_weight", 0.8)
+    monkeypatch.setattr(settings, "retrieval_adaptive_top_k", True)
+    monkeypatch.setattr(settings, "retrieval_min_k", 1)
+    monkeypatch.setattr(settings, "retrieval_relative_floor", 0.5)
+    client = _Client(
+        vector=[_row(f"v{i}", "general permit text", 0.9) for i in range(5)],
+        keyword=[_row("k0", "form FIN-312 permit", 9.0)],
+    )
+    options = VectorSearchOptions(document_id="doc", top_k=5)
+
+    items = await _service(client).hybrid_search("form FIN-312", [0.1], options)
+
+    assert [item["id"] for item in items] == ["k0"]
+    assert items[0]["rerank_score"] == pytest.approx(1.0)
+
+
+async def test_hybrid_search_drops_keyword_hits_far_below_the_best(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "retrieval_keyword_relative_floor", 0.2)
+    monkeypatch.setattr(settings, "retrieval_rerank_enabled", False)
+    monkeypatch.setattr(settings, "retrieval_adaptive_top_k", False)
+    client = _Client(
+        vector=[_row("v0", "permit text", 0.9)],
+        keyword=[_row("k0", "form FIN-312", 9.0), _row("k1", "form", 1.0)],
+    )
+    options = VectorSearchOptions(document_id="doc", top_k=5, min_similarity=0.4)
+
+    items = await _service(client).hybrid_search("form FIN-312", [0.1], options)
+
+    assert sorted(item["id"] for item in items) == ["k0", "v0"]
+
+
+async def test_hybrid_search_adaptive_cutoff_without_rerank_uses_scaled_rrf(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "retrieval_rerank_enabled", False)
+    monkeypatch.setattr(settings, "retrieval_adaptive_top_k", True)
+    monkeypatch.setattr(settings, "retrieval_min_k", 1)
+    monkeypatch.setattr(settings, "retrieval_relative_floor", 0.5)
+    client = _Client(vector=[_row(f"v{i}", "permit text", 0.9) for i in range(5)], keyword=[])
+    options = VectorSearchOptions(document_id="doc", top_k=5)
+
+    items = await _service(client).hybrid_search("permit", [0.1], options)
+
+    # Raw RRF scores 1/61 .. 1/65 are all within 7% of the best; rescaled, the tail is cut.
+    assert [item["id"] for item in items] == ["v0", "v1"]
+    assert items[0]["fused_score"] == pytest.approx(1.0)
+
+
+def test_benchmark_smoke() -> None:
+    data = run_benchmark(documents=2, chunks=30, queries=10, dims=64)
+
+    modes = data["modes"]
+    assert set(modes) == {
+        "vector",
+        "keyword",
+        "hybrid",
+        "hybrid_rerank",
+        "hybrid_rerank_adaptive",
+    }
+    # Exact identifiers are what keyword search adds over (digit-blind) embeddings.
+    assert modes["hybrid_rerank"]["exact"]["recall_at_5"] > modes["vector"]["exact"]["recall_at_5"]
+    assert modes["hybrid_rerank_adaptive"]["topical"]["mean_results"] <= 5
+    assert set(modes["hybrid"]["topical"]["latency_ms"]) == {"p50", "p95"}
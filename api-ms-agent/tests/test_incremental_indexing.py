@@ -0,0 +1,239 @@
+import threading
+
+import pytest
+
+from app.config import settings
+from app.services.cosmos_db_service import DocumentMetadata
+from app.services.document_intelligence_service import ParagraphWithPage
+from app.services.embedding_service import EmbeddingService
+from app.services.token_chunker import RegexTokenizer
+
+
+class _FakeSearch:
+    """In-memory index keyed by chunk id."""
+
+    def __init__(self) -> None:
+        self.index: dict[str, dict] = {}
+        self.uploaded = 0
+        self.merged = 0
+        self.deleted = 0
+
+    async def bulk_store_chunks(self, chunks, batch_size=1000):
+        stored = 0
+        async for chunk in chunks:
+            self.uploaded += 1
+            stored += 1
+            self.index[chunk.id] = {
+                "content": chunk.content,
+                "chunk_index": chunk.chunk_index,
+                "page_number": chunk.page_number or 0,
+                "title": chunk.metadata.get("title", ""),
+                "total_chunks": chunk.metadata.get("total_chunks", 0),
+            }
+        return stored
+
+    async def iter_chunk_positions(self, document_id, user_id):
+        for chunk_id, chunk in list(self.index.items()):
+            yield chunk_id, chunk["chunk_index"], chunk.get("page_number", 0)
+
+    async def update_chunk_fields(self, document_id, user_id, updates, batch_size=1000):
+        self.merged += len(updates)
+        for update in updates:
+            self.index[update["id"]].update({k: v for k, v in update.items() if k != "id"})
+        return len(updates)
+
+    async def delete_chunks(self, document_id, user_id, chunk_ids, batch_size=1000):
+        self.deleted += len(chunk_ids)
+        for chunk_id in chunk_ids:
+            self.index.pop(chunk_id, None)
+        return len(chunk_ids)
+
+    async def delete_document_chunks(self, document_id, user_id):
+        count = len(self.index)
+        self.index.clear()
+        return count
+
+    def ordered_contents(self) -> list[str]:
+        return [c["content"] for c in sorted(self.index.values(), key=lambda c: c["chunk_index"])]
+
+
+class _FakeCosmos:
+    def __init__(self) -> None:
+        self.documents: dict[tuple[str, str], DocumentMetadata] = {}
+
+    async def get_document_metadata(self, document_id, user_id):
+        return self.documents.get((document_id, user_id))
+
+    async def save_document_metadata(self, *, document_id, user_id, **fields):
+        fields.pop("pages", None)
+        self.documents[(document_id, user_id)] = DocumentMetadata(
+            id=f"doc_{document_id}",
+            document_id=document_id,
+            user_id=user_id,
+            title=fields.pop("title"),
+            filename=fields.pop("filename"),
+            content_type=fields.pop("content_type"),
+            chunk_count=fields.pop("chunk_count"),
+            metadata=fields.pop("metadata") or {},
+            content_hash=fields.pop("content_hash", None),
+        )
+        assert not fields, f"unexpected metadata fields: {sorted(fields)}"
+
+
+def _service() -> tuple[EmbeddingService, _FakeSearch, list[str]]:
+    search = _FakeSearch()
+    service = EmbeddingService(search_service=search, cosmos_service=_FakeCosmos())
+    embedded: list[str] = []
+
+    async def generate_embeddings_batch(texts, *, user_id=None):
+        embedded.extend(texts)
+        return [[float(len(t))] for t in texts]
+
+    service.generate_embeddings_batch = generate_embeddings_batch
+    return service, search, embedded
+
+
+def _paragraphs(texts: list[str]) -> list[ParagraphWithPage]:
+    return [ParagraphWithPage(content=t, page_number=i + 1) for i, t in enumerate(texts)]
+
+
+async def _index(service: EmbeddingService, texts: list[str], **kwargs):
+    return await service.index_document(
+        "\n\n".join(texts),
+        user_id="u1",
+        document_id="doc1",
+        metadata={"title": "Report"},
+        chunk_size=40,
+        chunk_overlap=0,
+        paragraphs_with_pages=_paragraphs(texts),
+        **kwargs,
+    )
+
+
+def _section(name: str) -> str:
+    return f"Section {name} " + "x" * 20
+
+
+async def test_identical_reupload_is_metadata_only() -> None:
+    service, search, embedded = _service()
+    texts = [_section(n) for n in "ABCD"]
+
+    await _index(service, texts)
+    embedded.clear()
+    search.uploaded = 0
+    await _index(service, texts)
+
+    assert embedded == []
+    assert (search.uploaded, search.merged, search.deleted) == (0, 0, 0)
+    assert search.ordered_contents() == texts
+    metadata = service.cosmos.documents[("doc1", "u1")]
+    assert metadata.chunk_count == 4
+    assert metadata.content_hash is not None
+
+
+async def test_only_changed_chunks_are_embedded() -> None:
+    service, search, embedded = _service()
+    await _index(service, [_section(n) for n in "ABCD"])
+    embedded.clear()
+
+    # B edited, E inserted before C, D removed: C moves from index 2 to 3 and page 3 to 4.
+    texts = [_section("A"), _section("B2"), _section("E"), _section("C")]
+    document = await _index(service, texts)
+
+    assert embedded == [_section("B2"), _section("E")]
+    assert search.deleted == 2  # old B and D
+    assert search.ordered_contents() == texts == document.chunks
+    moved = next(c for c in search.index.values() if c["content"] == _section("C"))
+    assert (moved["chunk_index"], moved["page_number"]) == (3, 4)
+    # A kept its position and the chunk count is unchanged, so it needed no update.
+    assert search.merged == 1
+
+
+async def test_metadata_change_updates_fields_without_embedding() -> None:
+    service, search, embedded = _service()
+    texts = [_section(n) for n in "AB"]
+    await _index(service, texts)
+    embedded.clear()
+
+    await service.index_document(
+        "\n\n".join(texts),
+        user_id="u1",
+        document_id="doc1",
+        metadata={"title": "Renamed"},
+        chunk_size=40,
+        chunk_overlap=0,
+        paragraphs_with_pages=_paragraphs(texts),
+    )
+
+    assert embedded == []
+    assert {c["title"] for c in search.index.values()} == {"Renamed"}
+
+
+async def test_repeated_chunks_get_distinct_ids() -> None:
+    service, search, _ = _service()
+    texts = [_section("A"), _section("A"), _section("B")]
+
+    await _index(service, texts)
+
+    assert len(search.index) == 3
+    assert search.ordered_contents() == texts
+
+
+async def test_documents_indexed_without_hashes_are_replaced() -> None:
+    service, search, embedded = _service()
+    search.index["doc1_chunk_0"] = {"content": "old", "chunk_index": 0}
+    service.cosmos.documents[("doc1", "u1")] = DocumentMetadata(
+        id="doc_doc1", document_id="doc1", user_id="u1", title="Report", chunk_count=1
+    )
+
+    await _index(service, [_section("A")])
+
+    assert embedded == [_section("A")]
+    assert search.ordered_contents() == [_section("A")]
+
+
+async def test_failed_embedding_removes_uploaded_chunks(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "ingest_upload_batch_size", 2)
+    service, search, _ = _service()
+    embed = service.generate_embeddings_batch
+
+    async def generate_embeddings_batch(texts, *, user_id=None):
+        if _section("D") in texts:
+            raise RuntimeError("embedding failed")
+        return await embed(texts, user_id=user_id)
+
+    service.generate_embeddings_batch = generate_embeddings_batch
+
+    with pytest.raises(RuntimeError, match="embedding failed"):
+        await _index(service, [_section(n) for n in "ABCD"])
+
+    # The first slice was uploaded before the second failed, then removed again.
+    assert search.uploaded == 2
+    assert search.index == {}
+
+
+async def test_token_chunking_runs_off_the_event_loop(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "chunking_strategy", "tokens")
+    monkeypatch.setattr(settings, "chunk_max_tokens", 40)
+    monkeypatch.setattr(settings, "chunk_overlap_tokens", 0)
+    tokenizer = RegexTokenizer()
+
+    async def load_tokenizer(encoding):
+        return tokenizer
+
+    monkeypatch.setattr("app.services.embedding_service.load_tokenizer", load_tokenizer)
+    monkeypatch.setattr("app.services.embedding_service.get_tokenizer", lambda encoding: tokenizer)
+    service, search, _ = _service()
+    chunk_paragraphs = service._chunk_paragraphs_with_pages
+    threads: list[threading.Thread] = []
+
+    def record_thread(*args):
+        threads.append(threading.current_thread())
+        return chunk_paragraphs(*args)
+
+    service._chunk_paragraphs_with_pages = record_thread
+
+    await _index(service, [_section(n) for n in "AB"])
+
+    assert threads and threads[0] is not threading.main_thread()
+    assert search.ordered_contents()
@@ -0,0 +1,488 @@
+import asyncio
+import io
+import random
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.main import app
+from app.services.cosmos_db_service import DocumentMetadata
+from app.services.document_intelligence_service import (
+    DocumentIntelligenceService,
+    ParagraphWithPage,
+    StreamingAnalysisResult,
+    get_document_intelligence_service,
+)
+from app.services.embedding_service import (
+    EmbeddingService,
+    TextChunker,
+    chunk_hash,
+    get_embedding_service,
+)
+from app.services.ingestion_pipeline import (
+    DocumentIngestionPipeline,
+    EmptyDocumentError,
+    IngestionProgress,
+)
+
+
+def _reference_chunk_text(text: str, chunk_size: int, overlap: int) -> list[str]:
+    """The original one-shot chunking algorithm."""
+    if len(text) <= chunk_size:
+        return [text]
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + chunk_size
+        if end < len(text):
+            for sep in [". ", ".\n", "! ", "? ", "\n\n"]:
+                last_sep = text[start:end].rfind(sep)
+                if last_sep > chunk_size // 2:
+                    end = start + last_sep + len(sep)
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end - overlap
+    return chunks
+
+
+def _text(words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    vocab = ["alpha", "beta.", "gamma!", "delta?", "\n\n", "eps.\n", "zeta"]
+    return " ".join(rng.choice(vocab) for _ in range(words))
+
+
+class _FakeSearch:
+    """Records calls; with `keep`, also indexes chunk positions and titles by id."""
+
+    def __init__(
+        self,
+        *,
+        delay: float = 0.0,
+        fail_on_batch: int | None = None,
+        keep: bool = True,
+        fail_totals: bool = False,
+    ) -> None:
+        self.delay = delay
+        self.keep = keep
+        self.fail_on_batch = fail_on_batch
+        self.fail_totals = fail_totals
+        self.stored: list = []
+        self.index: dict[str, dict] = {}
+        self.batches = 0
+        self.totals: tuple[int, int] | None = None
+        self.updated: list[dict] = []
+        self.deleted: list[str] = []
+
+    async def bulk_store_chunks(self, chunks, batch_size=1000):
+        self.batches += 1
+        await asyncio.sleep(self.delay)
+        if self.batches == self.fail_on_batch:
+            raise RuntimeError("upload failed")
+        if self.keep:
+            self.stored.extend(chunks)
+            for chunk in chunks:
+                self.index[chunk.id] = {
+                    "chunk_index": chunk.chunk_index,
+                    "page_number": chunk.page_number or 0,
+                    "title": chunk.metadata.get("title", ""),
+                }
+        return len(chunks)
+
+    async def iter_chunk_positions(self, document_id, user_id):
+        for chunk_id, fields in list(self.index.items()):
+            yield chunk_id, fields["chunk_index"], fields["page_number"]
+
+    async def set_total_chunks(self, chunk_ids, total_chunks, batch_size=1000):
+        if self.fail_totals:
+            raise RuntimeError("merge failed")
+        counted = self.totals[0] if self.totals else 0
+        self.totals = (counted + len(chunk_ids), total_chunks)
+        return len(chunk_ids)
+
+    async def update_chunk_fields(self, document_id, user_id, updates, batch_size=1000):
+        self.updated.extend(updates)
+        for update in updates:
+            fields = self.index.get(update["id"], {})
+            fields.update({k: v for k, v in update.items() if k in fields})
+        return len(updates)
+
+    async def delete_chunks(self, document_id, user_id, chunk_ids, batch_size=1000):
+        self.deleted.extend(chunk_ids)
+        for chunk_id in chunk_ids:
+            self.index.pop(chunk_id, None)
+        return len(chunk_ids)
+
+
+class _FakeCosmos:
+    """Document metadata keyed by (document_id, user_id)."""
+
+    def __init__(self) -> None:
+        self.documents: dict[tuple[str, str], DocumentMetadata] = {}
+        self.save_document_metadata = AsyncMock(side_effect=self._save)
+
+    async def _save(self, *, document_id, user_id, title, **fields):
+        self.documents[(document_id, user_id)] = DocumentMetadata(
+            id=f"doc_{document_id}", document_id=document_id, user_id=user_id, title=title, **fields
+        )
+
+    async def get_document_metadata(self, document_id, user_id):
+        return self.documents.get((document_id, user_id))
+
+
+def _embedding_service(search: _FakeSearch) -> SimpleNamespace:
+    """Fake embeddings; the embedded texts are recorded unless `search` discards chunks."""
+    embedded: list[str] = []
+
+    async def generate_embeddings_batch(texts, *, user_id=None):
+        await asyncio.sleep(0)
+        if search.keep:
+            embedded.extend(texts)
+        return [[float(len(t)), 1.0] for t in texts]
+
+    return SimpleNamespace(
+        search_service=search,
+        cosmos=_FakeCosmos(),
+        generate_embeddings_batch=generate_embeddings_batch,
+        embedded=embedded,
+    )
+
+
+async def _blocks(text: str, size: int):
+    for i in range(0, len(text), size):
+        yield text[i : i + size]
+
+
+def test_text_chunker_matches_one_shot_chunking_for_any_block_split() -> None:
+    rng = random.Random(1)
+    for trial in range(200):
+        text = _text(rng.randint(0, 600), seed=trial)
+        chunk_size = rng.choice([100, 150, 300, 1000])
+        overlap = rng.choice([0, 10, 40])
+        chunker = TextChunker(chunk_size, overlap)
+        chunks: list[str] = []
+        i = 0
+        while i < len(text):
+            step = rng.randint(1, 400)
+            chunks.extend(chunker.feed(text[i : i + step]))
+            i += step
+        chunks.extend(chunker.finish())
+
+        assert chunks == _reference_chunk_text(text, chunk_size, overlap)
+        assert EmbeddingService._chunk_text(None, text, chunk_size, overlap) == chunks
+
+
+async def test_pipeline_uploads_all_chunks_and_reports_progress() -> None:
+    search = _FakeSearch()
+    service = _embedding_service(search)
+    text = _text(5000)
+    events: list[IngestionProgress] = []
+    pipeline = DocumentIngestionPipeline(service, embed_batch_size=8, upload_batch_size=20)
+
+    result = await pipeline.ingest(
+        StreamingAnalysisResult(pages=1, text_blocks=_blocks(text, 1000)),
+        user_id="u1",
+        document_id="doc",
+        metadata={"title": "Doc"},
+        chunk_size=300,
+        chunk_overlap=50,
+        on_progress=events.append,
+    )
+
+    expected = _reference_chunk_text(text, 300, 50)
+    assert result.chunks == result.stored == len(expected)
+    assert [c.content for c in search.stored] == expected
+    assert [c.chunk_index for c in search.stored] == list(range(len(expected)))
+    assert search.stored[0].id == f"doc_chunk_{chunk_hash(expected[0])}"
+    assert search.totals == (len(expected), len(expected))
+    assert {e.stage for e in events if e.done} == {"parse", "chunk", "embed", "upload"}
+    assert [e.items for e in events if e.done and e.stage != "parse"] == [len(expected)] * 3
+    service.cosmos.save_document_metadata.assert_awaited_once()
+    saved = service.cosmos.save_document_metadata.await_args.kwargs
+    assert saved["chunk_count"] == len(expected)
+    # Chunk hashes live in the chunks' search keys, not in the metadata item.
+    assert "chunk_hashes" not in saved
+    assert saved["content_hash"] is not None
+
+
+async def test_pipeline_keeps_paragraph_page_numbers() -> None:
+    search = _FakeSearch()
+    paragraphs = [
+        ParagraphWithPage(content=f"para {i} " * 20, page_number=i // 3 + 1) for i in range(30)
+    ]
+    analysis = StreamingAnalysisResult(pages=10, paragraphs=iter(paragraphs))
+
+    result = await DocumentIngestionPipeline(_embedding_service(search)).ingest(
+        analysis, user_id="u1", chunk_size=400, chunk_overlap=0
+    )
+
+    expected = EmbeddingService._chunk_paragraphs_with_pages(None, paragraphs, 400, 0)
+    assert result.pages == 10
+    assert [(c.content, c.page_number) for c in search.stored] == [
+        (c.content, c.page_number) for c in expected
+    ]
+
+
+async def test_slow_upload_applies_backpressure_to_parsing() -> None:
+    search = _FakeSearch(delay=0.01)
+    lag: list[int] = []
+    latest = {"chunk": 0, "upload": 0}
+
+    def on_progress(event: IngestionProgress) -> None:
+        if event.stage in latest:
+            latest[event.stage] = event.items
+            lag.append(latest["chunk"] - latest["upload"])
+
+    pipeline = DocumentIngestionPipeline(
+        _embedding_service(search), embed_batch_size=4, upload_batch_size=8, queue_depth=1
+    )
+    result = await pipeline.ingest(
+        StreamingAnalysisResult(pages=1, text_blocks=_blocks(_text(20000), 500)),
+        user_id="u1",
+        chunk_size=200,
+        chunk_overlap=0,
+        on_progress=on_progress,
+    )
+
+    assert result.chunks > 200
+    # Chunks alive between the chunker and the index: one batch per queue slot, one being
+    # embedded, one being produced, plus the upload buffer.
+    assert max(lag) <= 4 * 4 + 8
+
+
+async def test_failed_upload_cancels_stages_and_removes_partial_document() -> None:
+    search = _FakeSearch(fail_on_batch=2)
+    service = _embedding_service(search)
+    pipeline = DocumentIngestionPipeline(service, embed_batch_size=4, upload_batch_size=4)
+
+    with pytest.raises(RuntimeError, match="upload failed"):
+        await pipeline.ingest(
+            StreamingAnalysisResult(pages=1, text_blocks=_blocks(_text(5000), 200)),
+            user_id="u1",
+            document_id="doc",
+            chunk_size=200,
+            chunk_overlap=0,
+        )
+
+    assert search.stored
+    assert {c.id for c in search.stored} <= set(search.deleted)
+    service.cosmos.save_document_metadata.assert_not_called()
+
+
+async def test_empty_document_is_rejected() -> None:
+    search = _FakeSearch()
+    pipeline = DocumentIngestionPipeline(_embedding_service(search))
+
+    with pytest.raises(EmptyDocumentError):
+        await pipeline.ingest(
+            StreamingAnalysisResult(pages=1, text_blocks=_blocks("  \n ", 10)), user_id="u1"
+        )
+    assert search.deleted == []
+
+
+async def test_reingest_only_embeds_new_chunks_and_removes_old_ones() -> None:
+    search = _FakeSearch()
+    service = _embedding_service(search)
+    pipeline = DocumentIngestionPipeline(service, embed_batch_size=3)
+    texts = [f"paragraph {i}" + " words" * 20 for i in range(10)]
+    closing = "a new closing paragraph" * 3
+
+    async def ingest(paragraph_texts: list[str], title: str = "Doc", document_id=None):
+        paragraphs = [ParagraphWithPage(content=t, page_number=1) for t in paragraph_texts]
+        return await pipeline.ingest(
+            StreamingAnalysisResult(pages=1, paragraphs=iter(paragraphs)),
+            user_id="u1",
+            document_id=document_id,
+            metadata={"title": title, "filename": "doc.pdf"},
+            chunk_size=50,
+            chunk_overlap=0,
+        )
+
+    first = await ingest(texts)
+    service.embedded.clear()
+    search.totals = None
+    stored_before = len(search.stored)
+
+    # Drop paragraph 2 and add one at the end.
+    second = await ingest(texts[:2] + texts[3:] + [closing], document_id=first.document_id)
+
+    assert second.document_id == first.document_id
+    assert second.chunks == 10
+    assert service.embedded == [closing]
+    assert [c.chunk_index for c in search.stored[stored_before:]] == [9]
+    assert search.deleted == [f"{first.document_id}_chunk_{chunk_hash(texts[2])}"]
+    assert [u["chunk_index"] for u in search.updated] == list(range(2, 9))
+    assert search.totals == (1, 10)
+
+    search.updated.clear()
+    renamed = await ingest(texts, title="Renamed", document_id=first.document_id)
+    assert service.embedded[-1] == texts[2]
+    assert len(search.updated) == 9
+    assert {u["title"] for u in search.updated} == {"Renamed"}
+    assert renamed.unchanged is False
+
+
+async def test_failure_after_upload_restores_the_previous_version() -> None:
+    search = _FakeSearch()
+    service = _embedding_service(search)
+    pipeline = DocumentIngestionPipeline(service, embed_batch_size=3)
+    texts = [f"paragraph {i}" + " words" * 20 for i in range(6)]
+
+    async def ingest(paragraph_texts: list[str], title: str, document_id=None):
+        paragraphs = [ParagraphWithPage(content=t, page_number=1) for t in paragraph_texts]
+        return await pipeline.ingest(
+            StreamingAnalysisResult(pages=1, paragraphs=iter(paragraphs)),
+            user_id="u1",
+            document_id=document_id,
+            metadata={"title": title},
+            chunk_size=50,
+            chunk_overlap=0,
+        )
+
+    first = await ingest(texts, "Doc")
+    indexed = {chunk_id: dict(fields) for chunk_id, fields in search.index.items()}
+    search.fail_totals = True
+
+    with pytest.raises(RuntimeError, match="merge failed"):
+        await ingest(["a new opening paragraph" * 3, *texts[1:]], "Renamed", first.document_id)
+
+    # The new chunk is gone, moved and renamed chunks are restored, nothing old was deleted.
+    assert search.index == indexed
+    assert service.cosmos.save_document_metadata.await_count == 1
+
+
+async def test_peak_memory_is_independent_of_document_size() -> None:
+    source = io.BytesIO(_text(1_500_000).encode())  # ~9 MB
+    analysis = await DocumentIntelligenceService().analyze_document_stream(
+        source, "big.txt", block_size=64 * 1024
+    )
+    search = _FakeSearch(keep=False)
+
+    tracemalloc.start()
+    try:
+        result = await DocumentIngestionPipeline(_embedding_service(search)).ingest(
+            analysis, user_id="u1"
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert result.chunks > 10_000
+    # Neither the text nor per-chunk state is held in full.
+    assert peak < len(source.getvalue()) / 4
+
+
+def test_upload_endpoint_streams_text_documents(client, auth_headers) -> None:
+    search = _FakeSearch()
+    service = _embedding_service(search)
+    app.dependency_overrides[get_embedding_service] = lambda: service
+    app.dependency_overrides[get_document_intelligence_service] = lambda: (
+        DocumentIntelligenceService()
+    )
+    body = _text(3000).encode()
+
+    try:
+        response = client.post(
+            "/api/v1/documents/upload",
+            headers=auth_headers,
+            files={"file": ("notes.txt", body, "text/plain")},
+        )
+        empty = client.post(
+            "/api/v1/documents/upload",
+            headers=auth_headers,
+            files={"file": ("empty.txt", b"   ", "text/plain")},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["total_chunks"] == len(_reference_chunk_text(body.decode(), 1000, 200))
+    assert data["total_chunks"] == len(search.stored)
+    assert search.stored[0].metadata["filename"] == "notes.txt"
+    assert empty.status_code == 400
+    assert "Could not extract text" in empty.json()["detail"]
+
+
+def test_reupload_of_identical_file_only_saves_metadata(client, auth_headers) -> None:
+    search = _FakeSearch()
+    service = _embedding_service(search)
+    app.dependency_overrides[get_embedding_service] = lambda: service
+    app.dependency_overrides[get_document_intelligence_service] = lambda: (
+        DocumentIntelligenceService()
+    )
+    body = _text(3000).encode()
+
+    def upload(data: bytes, document_id: str | None = None):
+        return client.post(
+            "/api/v1/documents/upload",
+            headers=auth_headers,
+            files={"file": ("notes.txt", data, "text/plain")},
+            data={"document_id": document_id} if document_id else None,
+        )
+
+    try:
+        first = upload(body)
+        document_id = first.json()["id"]
+        embedded, stored = len(service.embedded), len(search.stored)
+        again = upload(body, document_id)
+        after_again = (len(service.embedded), len(search.stored))
+        extended = upload(body + b" omega.", document_id)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.status_code == again.status_code == extended.status_code == 201
+    assert again.json()["id"] == first.json()["id"] == extended.json()["id"]
+    assert again.json()["total_chunks"] == first.json()["total_chunks"]
+    assert after_again == (embedded, stored)
+    assert search.updated == [] and search.deleted != []
+    assert service.cosmos.save_document_metadata.await_count == 3
+    # Appending text only re-embeds the final chunk.
+    assert len(service.embedded) == embedded + 1
+    assert len(service.cosmos.documents) == 1
+
+
+def test_upload_with_same_filename_creates_a_new_document(client, auth_headers) -> None:
+    search = _FakeSearch()
+    service = _embedding_service(search)
+    app.dependency_overrides[get_embedding_service] = lambda: service
+    app.dependency_overrides[get_document_intelligence_service] = lambda: (
+        DocumentIntelligenceService()
+    )
+
+    def upload(data: bytes, **form):
+        return client.post(
+            "/api/v1/documents/upload",
+            headers=auth_headers,
+            files={"file": ("notes.txt", data, "text/plain")},
+            data=form or None,
+        )
+
+    try:
+        first = upload(_text(3000).encode())
+        second = upload(_text(3000, seed=1).encode())
+        unknown = upload(_text(3000).encode(), document_id="not-mine")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.status_code == second.status_code == 201
+    assert first.json()["id"] != second.json()["id"]
+    assert search.deleted == []
+    assert len(service.cosmos.documents) == 2
+    assert unknown.status_code == 404
+
+
+def test_upload_size_limit_without_declared_size() -> None:
+    from app.routers.documents import _upload_file_size_limited
+
+    upload = MagicMock()
+    upload.size = None
+    data = io.BytesIO(b"x" * (3 * 1024 * 1024))
+    upload.read = AsyncMock(side_effect=lambda n: data.read(n))
+    upload.seek = AsyncMock(side_effect=lambda pos: data.seek(pos))
+
+    assert asyncio.run(_upload_file_size_limited(upload, max_bytes=0)) == 3 * 1024 * 1024
+    upload.seek.assert_awaited_with(0)
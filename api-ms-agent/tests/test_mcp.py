@@ -109,6 +109,7 @@ class TestGeocoderMCP:
         assert len(tools) >= 4
         tool_names = [t.name for t in tools]
         assert "geocoder_geocode" in tool_names
+        assert "geocoder_geocode_batch" in tool_names
         assert "geocoder_occupants" in tool_names
         assert "geocoder_nearest" in tool_names
         assert "geocoder_intersections" in tool_names
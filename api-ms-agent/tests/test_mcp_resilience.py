@@ -0,0 +1,192 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.core.cache import provider as cache_provider
+from app.services.mcp import resilience
+from app.services.mcp.base import MCPWrapper
+from app.services.mcp.resilience import CircuitBreaker, CircuitOpenError, circuit_breaker_states
+
+
+class _Transport(httpx.AsyncBaseTransport):
+    def __init__(self, status_code: int = 200, delays: list[float] | None = None) -> None:
+        self.status_code = status_code
+        self.delays = list(delays or [])
+        self.calls = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.delays:
+            await asyncio.sleep(self.delays.pop(0))
+        return httpx.Response(
+            self.status_code,
+            headers={"Content-Type": "application/json"},
+            json={"call": self.calls},
+            request=request,
+        )
+
+
+class _HangingTransport(httpx.AsyncBaseTransport):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await asyncio.Event().wait()
+        raise AssertionError("unreachable")
+
+
+class _TestWrapper(MCPWrapper):
+    def __init__(self, transport: httpx.AsyncBaseTransport, **kwargs) -> None:
+        super().__init__(base_url="https://upstream.example", backoff_factor=0.0, **kwargs)
+        self._client = httpx.AsyncClient(base_url=self.base_url, transport=transport)
+
+    @property
+    def tools(self):
+        return []
+
+    async def execute_tool(self, tool_name: str, arguments: dict):
+        raise NotImplementedError
+
+
+@pytest.fixture(autouse=True)
+def _isolate(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "cache_enabled", True, raising=False)
+    monkeypatch.setattr(settings, "mcp_circuit_failure_threshold", 2, raising=False)
+    monkeypatch.setattr(settings, "mcp_circuit_reset_seconds", 30.0, raising=False)
+    cache_provider._caches.clear()  # type: ignore[attr-defined]
+    resilience.reset_circuit_breakers()
+    yield
+    cache_provider._caches.clear()  # type: ignore[attr-defined]
+    resilience.reset_circuit_breakers()
+
+
+def test_breaker_opens_then_half_opens_for_one_probe(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr(resilience, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    breaker = CircuitBreaker("https://x", failure_threshold=2, reset_seconds=10)
+
+    for _ in range(2):
+        breaker.acquire()
+        breaker.release(False)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+    now[0] += 10
+    breaker.acquire()  # the probe
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+    breaker.release(False)
+    assert breaker.state == "open"
+
+    now[0] += 10
+    breaker.acquire()
+    breaker.release(True)
+    assert breaker.snapshot() == {
+        "state": "closed",
+        "consecutive_failures": 0,
+        "rejected_requests": 2,
+        "retry_in_seconds": None,
+    }
+
+
+def test_abandoned_probe_lets_the_next_request_probe(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr(resilience, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    breaker = CircuitBreaker("https://x", failure_threshold=1, reset_seconds=5)
+    breaker.acquire()
+    breaker.release(False)
+
+    now[0] += 5
+    breaker.acquire()
+    breaker.release(None)
+    breaker.acquire()
+    assert breaker.state == "half_open"
+
+
+async def test_open_circuit_fails_fast_instead_of_retrying() -> None:
+    transport = _Transport(status_code=503)
+    wrapper = _TestWrapper(transport)
+
+    with pytest.raises(CircuitOpenError):
+        await wrapper._request("POST", "/search", json_data={"q": "a"})
+    assert transport.calls == 2
+
+    start = time.perf_counter()
+    with pytest.raises(CircuitOpenError):
+        await wrapper._request("GET", "/search", params={"q": "b"})
+    assert time.perf_counter() - start < 0.1
+    assert transport.calls == 2
+    assert circuit_breaker_states()["https://upstream.example"]["state"] == "open"
+    await wrapper.close()
+
+
+async def test_cached_get_is_served_while_circuit_is_open() -> None:
+    transport = _Transport()
+    wrapper = _TestWrapper(transport)
+    cached = await wrapper._request("GET", "/topics", params={"q": "a"})
+
+    transport.status_code = 503
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await wrapper._request("GET", "/topics", params={"q": "new"})
+
+    assert wrapper.circuit_state()["state"] == "open"
+    assert await wrapper._request("GET", "/topics", params={"q": "a"}) == cached
+    await wrapper.close()
+
+
+async def test_hedged_get_returns_first_response(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "mcp_hedge_min_delay_ms", 10.0, raising=False)
+    transport = _Transport(delays=[0.0] * 20 + [1.0, 0.0])
+    wrapper = _TestWrapper(transport, hedge_requests=True)
+    for i in range(20):
+        await wrapper._request("GET", f"/warm/{i}")
+
+    start = time.perf_counter()
+    data = await wrapper._request("GET", "/slow")
+
+    assert time.perf_counter() - start < 0.5
+    assert data == {"call": 22}
+    assert transport.calls == 22
+    await asyncio.sleep(0)
+    # The slow primary lost to the hedge; that is not an upstream failure.
+    assert wrapper.circuit_state()["consecutive_failures"] == 0
+    await wrapper.close()
+
+
+@pytest.mark.parametrize("hedge_requests", [False, True])
+async def test_timed_out_requests_to_a_hanging_upstream_open_the_breaker(
+    monkeypatch: pytest.MonkeyPatch, hedge_requests: bool
+) -> None:
+    monkeypatch.setattr(settings, "mcp_hedge_min_delay_ms", 10.0, raising=False)
+    transport = _HangingTransport()
+    wrapper = _TestWrapper(transport, hedge_requests=hedge_requests)
+    wrapper._latency = resilience.LatencyWindow(min_samples=0)
+    wrapper._latency.add(0.001)
+
+    for path in ("/a", "/b"):
+        # A hedged call cancels two attempts, so it may open the breaker on its own.
+        with pytest.raises((TimeoutError, CircuitOpenError)):
+            await asyncio.wait_for(wrapper._request("GET", path), timeout=0.05)
+    await asyncio.sleep(0)
+
+    assert wrapper.circuit_state()["state"] == "open"
+    with pytest.raises(CircuitOpenError):
+        await wrapper._request("POST", "/c", json_data={})
+    await wrapper.close()
+
+
+async def test_hedging_is_off_by_default() -> None:
+    transport = _Transport(delays=[0.0] * 20 + [0.2])
+    wrapper = _TestWrapper(transport)
+    for i in range(21):
+        await wrapper._request("GET", f"/item/{i}")
+
+    assert transport.calls == 21
+    await wrapper.close()
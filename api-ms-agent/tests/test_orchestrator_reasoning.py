@@ -61,6 +61,7 @@ class TestOrchestratorTools:
 
         # Geocoder tools
         assert "geocoder_geocode" in tool_names
+        assert "geocoder_geocode_batch" in tool_names
         assert "geocoder_occupants" in tool_names
 
         # Parks tools
@@ -74,7 +75,7 @@ class TestOrchestratorTools:
 
     def test_tool_count(self):
         """Verify expected number of tools are registered."""
-        assert len(ORCHESTRATOR_TOOLS) == 7
+        assert len(ORCHESTRATOR_TOOLS) == 8
 
 
 class TestOrchestratorService:
@@ -0,0 +1,114 @@
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.mcp import ParksMCP
+from app.services.mcp.parks_index import ParksIndex, haversine_km
+from scripts.bench_parks_index import run_benchmark
+
+
+def _park(
+    orcs: int | None,
+    name: str,
+    *,
+    latitude: float | None = None,
+    longitude: float | None = None,
+    description: str = "",
+    activities: tuple[str, ...] = (),
+    park_id: int | None = None,
+) -> dict[str, Any]:
+    return {
+        "id": park_id if park_id is not None else orcs,
+        "attributes": {
+            "orcs": orcs,
+            "protectedAreaName": name,
+            "description": description,
+            "locationNotes": "",
+            "searchTerms": "",
+            "latitude": latitude,
+            "longitude": longitude,
+            "parkActivities": [
+                {"activityType": {"activityName": activity}} for activity in activities
+            ],
+        },
+    }
+
+
+PARKS = [
+    _park(
+        1,
+        "Garibaldi Park",
+        latitude=49.93,
+        longitude=-122.75,
+        description="<p>Alpine <b>meadows</b> and glaciers</p>",
+        activities=("Hiking", "Camping"),
+    ),
+    _park(2, "Golden Ears Park", latitude=49.38, longitude=-122.46, activities=("Canoeing",)),
+    _park(3, "Mount Robson Park", latitude=53.03, longitude=-119.23, activities=("Hiking",)),
+    _park(None, "Cultus Lake Park", latitude=49.05, longitude=-121.98, park_id=77),
+    _park(5, "Tribune Bay Park", description="Sandy beach on Hornby Island"),
+]
+
+
+def test_search_text_matches_word_prefixes_in_catalogue_order() -> None:
+    index = ParksIndex(PARKS)
+
+    assert index.search_text("park", limit=10) == [0, 1, 2, 3, 4]
+    assert index.search_text("park", limit=2) == [0, 1]
+    assert index.search_text("GLAC", limit=10) == [0]
+    assert index.search_text("sandy beach", limit=10) == [4]
+    # Description HTML is not searchable and matches must start at a word.
+    assert index.search_text("meadows and", limit=10) == [0]
+    assert index.search_text("b", limit=10) == [4]
+    assert index.search_text("ears", limit=10) == [1]
+    assert index.search_text("ars", limit=10) == []
+    assert index.search_text("beach sandy", limit=10) == []
+
+
+def test_within_radius_returns_exact_distances_nearest_first() -> None:
+    index = ParksIndex(PARKS)
+
+    found = index.within_radius(49.28, -123.12, 120)
+
+    assert [position for position, _ in found] == [1, 0, 3]
+    assert found[0][1] == pytest.approx(haversine_km(49.28, -123.12, 49.38, -122.46))
+    assert index.within_radius(49.28, -123.12, 1) == []
+    # Parks without coordinates are never returned, even for huge radii.
+    assert sorted(position for position, _ in index.within_radius(0, 0, 20000)) == [0, 1, 2, 3]
+
+
+def test_with_activity_and_resolve() -> None:
+    index = ParksIndex(PARKS)
+
+    assert index.with_activity("hik", limit=10) == [(0, "hiking"), (2, "hiking")]
+    assert index.with_activity("hik", limit=1) == [(0, "hiking")]
+    assert index.with_activity("diving", limit=10) == []
+
+    assert index.resolve("Mount Robson Park") == "3"
+    assert index.resolve("  golden ears  ") == "2"
+    assert index.resolve("Cultus Lake Park campground") == "77"
+    assert index.resolve("Nowhere") is None
+    assert index.resolve("") is None
+
+
+@pytest.mark.asyncio
+async def test_parks_mcp_serves_index_of_refreshed_catalogue() -> None:
+    mcp = ParksMCP(cache_ttl_seconds=3600)
+    mcp._fetch_all_parks_paginated = AsyncMock(side_effect=[PARKS[:2], PARKS])
+
+    first = await mcp.execute_tool("parks_by_activity", {"activity": "hiking"})
+    await mcp._catalogue.refresh()
+    second = await mcp.execute_tool("parks_by_activity", {"activity": "hiking"})
+
+    assert [park["matched_activity"] for park in first.data["parks"]] == ["hiking"]
+    assert second.data["count"] == 2
+    await mcp.close()
+
+
+def test_benchmark_index_matches_scan() -> None:
+    data = run_benchmark(parks=200, queries=40, vocabulary=800)
+
+    assert data["benchmark"] == "parks_index"
+    assert set(data["lookups"]) == {"text", "radius", "activity", "resolve"}
+    assert all(lookup["matches_scan"] for lookup in data["lookups"].values())
@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services.mcp.refresh_ahead import RefreshAheadCache
+
+
+class _Upstream:
+    def __init__(self, *, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+
+    async def fetch(self) -> list[int]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return [self.calls]
+
+
+async def test_first_load_is_shared_by_concurrent_callers() -> None:
+    upstream = _Upstream(delay=0.01)
+    cache = RefreshAheadCache("t", upstream.fetch, ttl_seconds=60)
+
+    results = await asyncio.gather(*(cache.get() for _ in range(10)))
+
+    assert upstream.calls == 1
+    assert results == [[1]] * 10
+
+
+async def test_stale_value_is_served_while_refreshing_in_background() -> None:
+    upstream = _Upstream(delay=0.05)
+    cache = RefreshAheadCache("t", upstream.fetch, ttl_seconds=60)
+    assert await cache.get() == [1]
+
+    cache._fetched_at -= 59  # inside the refresh-ahead window
+    assert await cache.get() == [1]
+    assert await cache.get() == [1]
+    await cache._refresh_task
+
+    assert upstream.calls == 2
+    assert await cache.get() == [2]
+
+
+async def test_failed_refresh_keeps_stale_value_and_backs_off() -> None:
+    upstream = _Upstream()
+    cache = RefreshAheadCache("t", upstream.fetch, ttl_seconds=60, retry_seconds=30)
+    await cache.get()
+    cache._fetched_at -= 120
+    upstream.fail = True
+
+    assert await cache.get() == [1]
+    with pytest.raises(RuntimeError):
+        await cache._refresh_task
+    assert await cache.get() == [1]
+    assert upstream.calls == 2
+
+
+async def test_value_past_max_stale_is_refetched_inline() -> None:
+    upstream = _Upstream()
+    cache = RefreshAheadCache("t", upstream.fetch, ttl_seconds=60, max_stale_seconds=10)
+    await cache.get()
+    cache._fetched_at -= 71
+
+    assert await cache.get() == [2]
+
+
+async def test_warm_loads_snapshot_and_refreshes_it_in_background(tmp_path) -> None:
+    path = tmp_path / "catalogue.json"
+    upstream = _Upstream()
+    writer = RefreshAheadCache(
+        "t", upstream.fetch, ttl_seconds=60, snapshot_path=path, to_snapshot=lambda v: v * 2
+    )
+    await writer.get()
+    assert json.loads(path.read_text())["value"] == [1, 1]
+
+    restarted = _Upstream(delay=0.05)
+    cache = RefreshAheadCache(
+        "t",
+        restarted.fetch,
+        ttl_seconds=60,
+        snapshot_path=path,
+        from_snapshot=lambda v: v[:1],
+    )
+    await cache.warm()
+    assert await cache.get() == [1]
+    assert restarted.calls == 0
+
+    # A snapshot older than the refresh-ahead point is refreshed by the scheduler.
+    cache._fetched_at -= 3600
+    await cache.close()
+    await cache.warm()
+    await asyncio.sleep(0.1)
+    assert restarted.calls == 1
+    assert await cache.get() == [1]
+    assert cache.age_seconds < 1
+    await cache.close()
+
+
+async def test_warm_without_snapshot_fetches(tmp_path) -> None:
+    upstream = _Upstream()
+    cache = RefreshAheadCache("t", upstream.fetch, ttl_seconds=60, snapshot_path=tmp_path / "x")
+
+    await cache.warm()
+
+    assert upstream.calls == 1
+    assert cache.age_seconds is not None
+    await cache.close()
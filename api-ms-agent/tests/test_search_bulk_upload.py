@@ -0,0 +1,136 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.services.azure_search_service import AzureSearchService, DocumentChunk
+
+
+def _chunks(count: int, dims: int = 3072) -> list[DocumentChunk]:
+    return [
+        DocumentChunk(
+            id=f"doc_chunk_{i}",
+            document_id="doc",
+            user_id="u1",
+            content=f"chunk {i}",
+            embedding=[0.1] * dims,
+            chunk_index=i,
+        )
+        for i in range(count)
+    ]
+
+
+class _Client:
+    """Search client stand-in that rejects chosen keys a number of times."""
+
+    def __init__(self, *, delay: float = 0.0, failures: dict[str, tuple[int, int]] | None = None):
+        self.delay = delay
+        self.failures = dict(failures or {})  # key -> (status code, times to fail)
+        self.batches: list[list[str]] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def upload_documents(self, documents):
+        self.batches.append([d["id"] for d in documents])
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        results = []
+        for document in documents:
+            status, times = self.failures.get(document["id"], (201, 0))
+            if times:
+                self.failures[document["id"]] = (status, times - 1)
+            else:
+                status = 201
+            results.append(
+                SimpleNamespace(
+                    key=document["id"],
+                    succeeded=status == 201,
+                    status_code=status,
+                    error_message=None if status == 201 else "rejected",
+                )
+            )
+        return results
+
+
+@pytest.fixture
+def upload_settings(monkeypatch):
+    monkeypatch.setattr(settings, "azure_search_upload_concurrency", 3)
+    monkeypatch.setattr(settings, "azure_search_upload_max_batch_bytes", 8 * 1024 * 1024)
+    monkeypatch.setattr(settings, "azure_search_upload_max_retries", 3)
+    monkeypatch.setattr(settings, "azure_search_upload_retry_base_seconds", 0.001)
+
+
+def _service(client: _Client) -> AzureSearchService:
+    service = AzureSearchService()
+    service._search_client = client  # type: ignore[assignment]
+    service._initialized = True
+    return service
+
+
+async def test_batches_are_sized_by_bytes_and_sent_in_parallel(upload_settings) -> None:
+    client = _Client(delay=0.02)
+
+    stored = await _service(client).bulk_store_chunks(_chunks(500))
+
+    assert stored == 500
+    # Up to ~68 KB of JSON per 3072-dimension chunk: 8 MB holds 123, far below 1000 documents.
+    assert [len(b) for b in client.batches] == [123, 123, 123, 123, 8]
+    assert client.peak == 3
+    assert [k for b in client.batches for k in b] == [f"doc_chunk_{i}" for i in range(500)]
+
+
+async def test_only_failed_keys_are_retried(upload_settings) -> None:
+    client = _Client(failures={"doc_chunk_1": (503, 2), "doc_chunk_2": (400, 1)})
+
+    stored = await _service(client).bulk_store_chunks(_chunks(5, dims=8))
+
+    # The 400 is not transient; the 503 succeeds on its third attempt.
+    assert stored == 4
+    assert client.batches == [
+        [f"doc_chunk_{i}" for i in range(5)],
+        ["doc_chunk_1"],
+        ["doc_chunk_1"],
+    ]
+
+
+async def test_retries_stop_after_max_retries(upload_settings, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "azure_search_upload_max_retries", 1)
+    client = _Client(failures={"doc_chunk_0": (409, 5)})
+
+    stored = await _service(client).bulk_store_chunks(_chunks(2, dims=8))
+
+    assert stored == 1
+    assert len(client.batches) == 2
+
+
+async def test_async_iterator_is_uploaded_while_it_is_produced(upload_settings) -> None:
+    client = _Client()
+    chunks = _chunks(20, dims=8)
+    uploaded_before_last: list[int] = []
+
+    async def produce():
+        for i, chunk in enumerate(chunks):
+            if i == len(chunks) - 1:
+                await asyncio.sleep(0.01)
+                uploaded_before_last.append(sum(len(b) for b in client.batches))
+            yield chunk
+
+    stored = await _service(client).bulk_store_chunks(produce(), batch_size=5)
+
+    assert stored == 20
+    assert uploaded_before_last == [15]
+    assert [len(b) for b in client.batches] == [5, 5, 5, 5]
+
+
+async def test_upload_error_is_raised_unwrapped(upload_settings) -> None:
+    class _FailingClient(_Client):
+        async def upload_documents(self, documents):
+            raise RuntimeError("service unavailable")
+
+    with pytest.raises(RuntimeError, match="service unavailable"):
+        await _service(_FailingClient()).bulk_store_chunks(_chunks(3, dims=8))
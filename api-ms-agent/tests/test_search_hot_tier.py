@@ -0,0 +1,181 @@
+import time
+
+import numpy as np
+import pytest
+
+from app.services.azure_search_service import AzureSearchService, VectorSearchOptions
+from app.services.search_hot_tier import SearchHotTier, search_score
+from scripts.bench_search_hot_tier import _build_corpus, _SimulatedSearchClient, run_benchmark
+
+
+def _records(document_id: str, count: int, dims: int = 8, seed: int = 0) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "id": f"{document_id}_chunk_{i}",
+            "document_id": document_id,
+            "user_id": "u1",
+            "content": f"chunk {i}",
+            "chunk_index": i,
+            "page_number": 1,
+            "title": "T",
+            "filename": "t.pdf",
+            "embedding": rng.standard_normal(dims).tolist(),
+        }
+        for i in range(count)
+    ]
+
+
+def test_search_returns_exact_top_k_with_remote_scores() -> None:
+    tier = SearchHotTier(max_documents=4, max_chunks_per_document=100, ttl_seconds=60)
+    records = _records("d1", 50)
+    tier.add_records("u1", "d1", records)
+    query = records[7]["embedding"]
+
+    items = tier.search(query, user_id="u1", document_id="d1", top_k=3)
+
+    matrix = np.asarray([r["embedding"] for r in records])
+    cosine = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+    expected = np.argsort(-cosine)[:3]
+    assert [item["id"] for item in items] == [records[i]["id"] for i in expected]
+    assert items[0]["similarity"] == pytest.approx(1.0, abs=1e-5)
+    assert items[1]["similarity"] == pytest.approx(search_score(cosine[expected[1]]), abs=1e-5)
+    assert items[0]["metadata"] == {"title": "T", "filename": "t.pdf"}
+
+    threshold = items[1]["similarity"] + 1e-6
+    filtered = tier.search(query, user_id="u1", document_id="d1", top_k=3, min_similarity=threshold)
+    assert [item["id"] for item in filtered] == [items[0]["id"]]
+
+
+def test_unknown_document_and_other_user_are_not_resident() -> None:
+    tier = SearchHotTier(max_documents=4, max_chunks_per_document=100, ttl_seconds=60)
+    tier.add_records("u1", "d1", _records("d1", 5))
+
+    assert tier.search([0.1] * 8, user_id="u2", document_id="d1", top_k=3) is None
+    assert tier.search([0.1] * 8, user_id="u1", document_id="d2", top_k=3) is None
+    assert tier.search([0.1] * 4, user_id="u1", document_id="d1", top_k=3) is None
+
+
+def test_batches_merge_by_chunk_id_and_oversized_documents_are_dropped() -> None:
+    tier = SearchHotTier(max_documents=4, max_chunks_per_document=10, ttl_seconds=60)
+    records = _records("d1", 10)
+    tier.add_records("u1", "d1", records[:6])
+    tier.add_records("u1", "d1", records[4:])
+    assert tier.stats()["chunks"] == 10
+
+    tier.add_records("u1", "d1", _records("d1-extra", 1))
+    assert ("u1", "d1") not in tier
+    assert tier.stats() == {"documents": 0, "chunks": 0, "bytes": 0}
+
+
+def test_skipped_documents_stay_remote_until_invalidated_or_expired() -> None:
+    tier = SearchHotTier(max_documents=4, max_chunks_per_document=10, ttl_seconds=0.05)
+    records = _records("d1", 12)
+    tier.add_records("u1", "d1", records[:8])
+    tier.add_records("u1", "d1", records[8:])
+    assert tier.is_skipped("u1", "d1")
+
+    # A later upload batch must not leave a partial copy resident.
+    tier.add_records("u1", "d1", _records("d1-more", 2))
+    assert ("u1", "d1") not in tier
+
+    tier.invalidate("u1", "d1")
+    assert not tier.is_skipped("u1", "d1")
+
+    tier.skip("u1", "d2", too_large=True)
+    time.sleep(0.06)
+    assert not tier.is_skipped("u1", "d2")
+
+    # An empty document becomes loadable again once chunks are uploaded for it.
+    tier.skip("u1", "d3", too_large=False)
+    tier.add_records("u1", "d3", _records("d3", 2))
+    assert ("u1", "d3") in tier
+    assert not tier.is_skipped("u1", "d3")
+
+
+def test_lru_eviction_by_document_count_and_bytes() -> None:
+    tier = SearchHotTier(max_documents=2, max_chunks_per_document=100, ttl_seconds=60)
+    for name in ("a", "b"):
+        tier.add_records("u1", name, _records(name, 4))
+    tier.search([0.1] * 8, user_id="u1", document_id="a", top_k=1)
+    tier.add_records("u1", "c", _records("c", 4))
+    assert ("u1", "a") in tier
+    assert ("u1", "b") not in tier
+
+    one_document = 4 * 8 * 4
+    tier = SearchHotTier(
+        max_documents=10, max_chunks_per_document=100, ttl_seconds=60, max_bytes=2 * one_document
+    )
+    for name in ("a", "b", "c"):
+        tier.add_records("u1", name, _records(name, 4))
+    assert tier.stats()["documents"] == 2
+    assert tier.stats()["bytes"] == 2 * one_document
+    assert ("u1", "a") not in tier
+
+
+def test_entries_expire_after_ttl() -> None:
+    tier = SearchHotTier(max_documents=2, max_chunks_per_document=100, ttl_seconds=0.05)
+    tier.add_records("u1", "d1", _records("d1", 3))
+    time.sleep(0.06)
+
+    assert tier.search([0.1] * 8, user_id="u1", document_id="d1", top_k=1) is None
+    assert tier.stats()["bytes"] == 0
+
+
+async def test_vector_search_loads_document_once_then_answers_locally() -> None:
+    corpus = _build_corpus(documents=2, chunks=20, dims=16, seed=3)
+    client = _SimulatedSearchClient(corpus, rtt_ms=0)
+    service = AzureSearchService()
+    service._search_client = client  # type: ignore[assignment]
+    service._initialized = True
+    service._hot_tier = SearchHotTier(max_documents=4, max_chunks_per_document=100, ttl_seconds=60)
+    (user_id, document_id), rows = next(iter(corpus.items()))
+    options = VectorSearchOptions(user_id=user_id, document_id=document_id, top_k=3)
+
+    remote_client = _SimulatedSearchClient(corpus, rtt_ms=0)
+    remote = AzureSearchService()
+    remote._search_client = remote_client  # type: ignore[assignment]
+    remote._initialized = True
+    remote._hot_tier = None
+
+    for row in rows[:5]:
+        local_items = await service.vector_search(row["embedding"], options)
+        remote_items = await remote.vector_search(row["embedding"], options)
+        assert [i["id"] for i in local_items] == [i["id"] for i in remote_items]
+        assert local_items[1]["similarity"] == pytest.approx(remote_items[1]["similarity"], 1e-5)
+
+    assert client.calls == 1
+    assert remote_client.calls == 5
+
+    # Unscoped searches still go to Azure.
+    await service.vector_search(rows[0]["embedding"], VectorSearchOptions(user_id=user_id))
+    assert client.calls == 2
+
+
+async def test_vector_search_does_not_reload_oversized_documents() -> None:
+    corpus = _build_corpus(documents=1, chunks=20, dims=16, seed=3)
+    client = _SimulatedSearchClient(corpus, rtt_ms=0)
+    service = AzureSearchService()
+    service._search_client = client  # type: ignore[assignment]
+    service._initialized = True
+    service._hot_tier = SearchHotTier(max_documents=4, max_chunks_per_document=10, ttl_seconds=60)
+    (user_id, document_id), rows = next(iter(corpus.items()))
+    options = VectorSearchOptions(user_id=user_id, document_id=document_id, top_k=3)
+
+    for row in rows[:3]:
+        assert await service.vector_search(row["embedding"], options)
+
+    # One attempted load, then every query goes straight to Azure.
+    assert client.calls == 4
+
+    service._hot_tier.invalidate(user_id, document_id)
+    await service.vector_search(rows[0]["embedding"], options)
+    assert client.calls == 6
+
+
+def test_benchmark_smoke() -> None:
+    data = run_benchmark(documents=3, chunks=30, dims=16, queries=20, top_k=3, remote_rtt_ms=0)
+
+    assert data["hot_tier"]["recall_at_3"] == 1.0
+    assert data["hot_tier"]["round_trips"] == 3
+    assert data["remote"]["round_trips"] == 20
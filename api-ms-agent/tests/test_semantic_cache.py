@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+import pytest
+
+from app.config import settings
+from app.core.cache import provider as cache_provider
+from app.core.cache import stats as cache_stats
+from app.core.cache.semantic import SemanticCache
+from app.services import azure_openai_chat_service as chat_module
+from app.services.azure_openai_chat_service import AzureOpenAIChatService, normalize_prompt
+from scripts.bench_semantic_cache import run_benchmark
+
+
+def _cache(**overrides) -> SemanticCache:
+    options = {
+        "namespace": "llm_semantic_test",
+        "threshold": 0.9,
+        "ttl_seconds": 60,
+        "max_entries_per_scope": 8,
+        "max_bytes": 1 << 20,
+    }
+    options.update(overrides)
+    return SemanticCache(**options)
+
+
+def test_lookup_returns_closest_entry_above_threshold() -> None:
+    cache = _cache()
+    cache.set("s", [1.0, 0.0, 0.0], b"x")
+    cache.set("s", [0.0, 1.0, 0.0], b"y")
+
+    value, similarity = cache.get("s", [0.99, 0.1, 0.0])
+    assert value == b"x"
+    assert similarity == pytest.approx(0.995, abs=1e-3)
+    assert cache.get("s", [0.7, 0.7, 0.0]) is None
+    assert cache.get("other", [1.0, 0.0, 0.0]) is None
+    assert cache.get("s", [1.0, 0.0]) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 3
+
+
+def test_entries_expire() -> None:
+    cache = _cache(ttl_seconds=0.05)
+    cache.set("s", [1.0, 0.0], b"x")
+    time.sleep(0.06)
+
+    assert cache.get("s", [1.0, 0.0]) is None
+
+
+def test_full_scope_replaces_least_recently_used_entry() -> None:
+    cache = _cache(max_entries_per_scope=2)
+    cache.set("s", [1.0, 0.0, 0.0], b"a")
+    cache.set("s", [0.0, 1.0, 0.0], b"b")
+    cache.get("s", [1.0, 0.0, 0.0])
+    cache.set("s", [0.0, 0.0, 1.0], b"c")
+
+    assert cache.get("s", [1.0, 0.0, 0.0])[0] == b"a"
+    assert cache.get("s", [0.0, 1.0, 0.0]) is None
+    assert cache.get("s", [0.0, 0.0, 1.0])[0] == b"c"
+    assert cache.stats()["entries"] == 2
+
+
+def test_byte_budget_evicts_least_recently_used_scopes() -> None:
+    one_scope = 4 * 4 + 1  # one float32 row of 4 dims plus a 1-byte value
+    cache = _cache(max_bytes=2 * one_scope)
+    for name in ("a", "b", "c"):
+        cache.set(name, [1.0, 0.0, 0.0, 0.0], name.encode())
+
+    assert cache.stats()["scopes"] == 2
+    assert cache.stats()["bytes"] <= 2 * one_scope
+    assert cache.get("a", [1.0, 0.0, 0.0, 0.0]) is None
+    assert cache.get("c", [1.0, 0.0, 0.0, 0.0])[0] == b"c"
+    assert cache_stats.usage_snapshot()["llm_semantic_test"]["entries"] == 2
+
+
+def test_normalize_prompt() -> None:
+    assert normalize_prompt("  Parks near   Victoria?! ") == "parks near victoria"
+
+
+@dataclass
+class _Message:
+    content: str
+
+
+@dataclass
+class _Choice:
+    message: _Message
+
+
+@dataclass
+class _Response:
+    choices: list[_Choice]
+
+
+class _FakeClient:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.chat = self
+        self.completions = self
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        return _Response(choices=[_Choice(message=_Message(content=f"resp-{self.calls}"))])
+
+
+# Paraphrases share a direction; unrelated prompts are orthogonal.
+_VECTORS = {
+    "parks near victoria": [1.0, 0.0, 0.0],
+    "parks close to victoria": [0.98, 0.2, 0.0],
+    "weather in victoria": [0.0, 0.0, 1.0],
+}
+
+
+@pytest.fixture(autouse=True)
+def _semantic_settings(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "cache_enabled", True, raising=False)
+    monkeypatch.setattr(settings, "cache_llm_semantic_enabled", True, raising=False)
+    monkeypatch.setattr(settings, "cache_llm_semantic_threshold", 0.95, raising=False)
+    monkeypatch.setattr(settings, "cache_llm_semantic_scope", "user", raising=False)
+    monkeypatch.setattr(chat_module, "_semantic_cache", None)
+    cache_provider._caches.clear()  # type: ignore[attr-defined]
+    yield
+    cache_provider._caches.clear()  # type: ignore[attr-defined]
+
+
+def _service() -> tuple[AzureOpenAIChatService, _FakeClient, list[tuple[str, str | None]]]:
+    client = _FakeClient()
+    embedded: list[tuple[str, str | None]] = []
+
+    async def embed(text: str, user: str | None) -> list[float]:
+        embedded.append((text, user))
+        return _VECTORS[text]
+
+    return AzureOpenAIChatService(client, embedder=embed), client, embedded  # type: ignore[arg-type]
+
+
+async def _ask(svc, prompt: str, *, user: str | None = "u1", system: str = "sys", temperature=0):
+    return await svc.create_chat_completion_content(
+        deployment="dep",
+        messages=[{"role": "system", "content": system}, {"role": "user", "content": prompt}],
+        user=user,
+        temperature=temperature,
+    )
+
+
+async def test_near_duplicate_prompt_reuses_answer() -> None:
+    svc, client, embedded = _service()
+
+    first = await _ask(svc, "Parks near Victoria?")
+    second = await _ask(svc, "parks close to Victoria")
+    unrelated = await _ask(svc, "Weather in Victoria")
+
+    assert first == second == "resp-1"
+    assert unrelated == "resp-2"
+    assert client.calls == 2
+    assert embedded[0] == ("parks near victoria", "u1")
+    assert chat_module.get_semantic_llm_cache().stats()["hits"] == 1
+
+
+async def test_context_user_and_temperature_isolate_entries() -> None:
+    svc, client, _ = _service()
+
+    await _ask(svc, "parks near victoria")
+    await _ask(svc, "parks near victoria", system="other system prompt")
+    await _ask(svc, "parks near victoria", user="u2")
+    await _ask(svc, "parks near victoria", user=None)
+    await _ask(svc, "parks near victoria", temperature=0.5)
+
+    assert client.calls == 5
+
+
+async def test_shared_scope_reuses_answers_across_users(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "cache_llm_semantic_scope", "shared", raising=False)
+    svc, client, embedded = _service()
+
+    await _ask(svc, "parks near victoria", user="u1")
+    answer = await _ask(svc, "parks close to victoria", user="u2")
+
+    assert answer == "resp-1"
+    assert client.calls == 1
+    assert {user for _, user in embedded} == {None}
+
+
+async def test_embedding_failure_falls_back_to_model() -> None:
+    client = _FakeClient()
+
+    async def failing_embed(text: str, user: str | None) -> list[float]:
+        raise RuntimeError("embedding down")
+
+    svc = AzureOpenAIChatService(client, embedder=failing_embed)  # type: ignore[arg-type]
+
+    assert await _ask(svc, "parks near victoria") == "resp-1"
+    assert await _ask(svc, "parks near victoria") == "resp-2"
+
+
+async def test_exact_tier_is_checked_before_semantic(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "cache_llm_ttl_seconds", 60, raising=False)
+    svc, client, embedded = _service()
+
+    await _ask(svc, "parks near victoria")
+    await _ask(svc, "parks near victoria")
+    await _ask(svc, "parks close to victoria")
+
+    assert client.calls == 1
+    assert len(embedded) == 2
+
+
+def test_benchmark_smoke() -> None:
+    data = run_benchmark(queries=300, users=5, thresholds=[0.9, 0.99])
+
+    assert data["config"]["queries"] == 300
+    low, high = data["semantic"]
+    assert low["hit_rate"] >= high["hit_rate"] >= data["exact_hit_rate"]
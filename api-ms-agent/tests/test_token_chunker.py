@@ -0,0 +1,139 @@
+import re
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+import app.services.token_chunker as token_chunker_module
+from app.config import Settings, settings
+from app.services.document_intelligence_service import ParagraphWithPage
+from app.services.embedding_service import EmbeddingService
+from app.services.token_chunker import (
+    RegexTokenizer,
+    TokenChunker,
+    get_tokenizer,
+    load_tokenizer,
+)
+from scripts.bench_chunking import run_benchmark
+
+_TOKENIZER = RegexTokenizer()
+
+
+def _sentences(n: int) -> list[str]:
+    return [f"Sentence number {i} talks about permits and land." for i in range(n)]
+
+
+def _words(text: str) -> list[str]:
+    return re.findall(r"\S+", text)
+
+
+def test_chunks_respect_token_limit_and_cover_text() -> None:
+    text = " ".join(_sentences(40))
+    chunker = TokenChunker(40, 0, tokenizer=_TOKENIZER)
+
+    chunks = chunker.chunk_text(text)
+
+    assert len(chunks) > 1
+    assert all(n <= 40 for n in _TOKENIZER.count(chunks))
+    # Without overlap the chunks are consecutive slices of the text.
+    assert _words(" ".join(chunks)) == _words(text)
+    # Chunks end at sentence boundaries.
+    assert all(chunk.endswith(".") for chunk in chunks)
+
+
+def test_overlap_repeats_trailing_sentences() -> None:
+    sentences = _sentences(12)
+    chunker = TokenChunker(40, 12, tokenizer=_TOKENIZER)
+
+    chunks = chunker.chunk_text(" ".join(sentences))
+
+    for previous, current in zip(chunks, chunks[1:], strict=False):
+        last_sentence = previous[previous.rstrip(".").rfind(".") + 1 :].strip()
+        assert current.startswith(last_sentence)
+
+
+def test_long_sentence_is_split_at_token_offsets() -> None:
+    text = "word " * 100 + "end."
+    chunker = TokenChunker(30, 0, tokenizer=_TOKENIZER)
+
+    chunks = chunker.chunk_text(text)
+
+    assert [len(_words(c)) for c in chunks] == [30, 30, 30, 11]
+    assert _words(" ".join(chunks)) == _words(text)
+
+
+def test_paragraph_chunks_keep_first_page() -> None:
+    paragraphs = [
+        ParagraphWithPage(content=sentence, page_number=1 + i // 4)
+        for i, sentence in enumerate(_sentences(12))
+    ]
+    chunker = TokenChunker(25, 0, tokenizer=_TOKENIZER)
+
+    chunks = chunker.chunk_paragraphs(paragraphs)
+
+    assert len(chunks) == 6
+    assert [page for _, page in chunks] == [1, 1, 2, 2, 3, 3]
+    assert all("\n\n" in chunk for chunk, _ in chunks)
+
+
+def test_short_text_is_one_chunk() -> None:
+    chunker = TokenChunker(100, 10, tokenizer=_TOKENIZER)
+
+    assert chunker.chunk_text("  Hello world.  ") == ["Hello world."]
+    assert chunker.chunk_text("   ") == []
+
+
+async def test_tokenizer_falls_back_to_estimate_and_retries_loading(monkeypatch) -> None:
+    calls: list[str] = []
+
+    def unavailable(name):
+        calls.append(name)
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(token_chunker_module.tiktoken, "get_encoding", unavailable)
+    monkeypatch.setattr(token_chunker_module, "_loaded", {})
+    monkeypatch.setattr(token_chunker_module, "_failed_at", {})
+
+    assert (await load_tokenizer("cl100k_base")).name == "regex-estimate"
+    assert (await load_tokenizer("cl100k_base")).name == "regex-estimate"
+    assert get_tokenizer("cl100k_base").name == "regex-estimate"
+    assert calls == ["cl100k_base"]
+
+    # The failure is not pinned: loading is retried once the back-off has passed.
+    token_chunker_module._failed_at["cl100k_base"] -= 301
+    encoding = SimpleNamespace(name="cl100k_base")
+    monkeypatch.setattr(token_chunker_module.tiktoken, "get_encoding", lambda name: encoding)
+    loaded = await load_tokenizer("cl100k_base")
+
+    assert loaded.name == "cl100k_base"
+    assert get_tokenizer("cl100k_base") is loaded
+
+
+def test_unknown_chunking_strategy_is_rejected() -> None:
+    with pytest.raises(ValidationError):
+        Settings(chunking_strategy="token")
+
+
+def test_service_chunks_by_tokens_when_configured(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "chunking_strategy", "tokens")
+    monkeypatch.setattr(settings, "chunk_max_tokens", 40)
+    monkeypatch.setattr(settings, "chunk_overlap_tokens", 0)
+    monkeypatch.setattr("app.services.embedding_service.get_tokenizer", lambda encoding: _TOKENIZER)
+    service = EmbeddingService(search_service=object(), cosmos_service=object())
+
+    chunks = service._chunk_text(" ".join(_sentences(20)))
+    with_pages = service._chunk_paragraphs_with_pages(
+        [ParagraphWithPage(content=s, page_number=7) for s in _sentences(5)]
+    )
+
+    assert all(n <= 40 for n in _TOKENIZER.count(chunks))
+    assert {c.page_number for c in with_pages} == {7}
+
+
+def test_benchmark_smoke() -> None:
+    data = run_benchmark(size_mb=0.05)
+
+    chunkers = data["chunkers"]
+    assert set(chunkers) == {"text_chars", "paragraph_chars", "text_tokens", "paragraph_tokens"}
+    assert chunkers["text_tokens"]["tokens"]["max"] <= data["config"]["max_tokens"]
+    assert chunkers["text_tokens"]["chunks"] > 0
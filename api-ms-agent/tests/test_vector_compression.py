@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+
+import pytest
+
+import app.services.embedding_service as embedding_module
+from app.config import settings
+from app.services.azure_search_service import AzureSearchService
+from app.services.embedding_service import EmbeddingService, _embedding_cache_key
+from scripts.bench_vector_compression import run_benchmark
+
+
+class _IndexClient:
+    def __init__(self) -> None:
+        self.index = None
+
+    async def create_or_update_index(self, index):
+        self.index = index
+
+
+async def _index(monkeypatch, **overrides):
+    for name, value in overrides.items():
+        monkeypatch.setattr(settings, name, value)
+    service = AzureSearchService()
+    client = _IndexClient()
+    service._index_client = client  # type: ignore[assignment]
+    await service._ensure_index_exists()
+    return client.index
+
+
+def _embedding_field(index):
+    return next(f for f in index.fields if f.name == "embedding")
+
+
+async def test_default_index_is_uncompressed_at_native_dimensions(monkeypatch) -> None:
+    index = await _index(monkeypatch)
+
+    assert _embedding_field(index).vector_search_dimensions == 3072
+    assert not index.vector_search.compressions
+    assert index.vector_search.profiles[0].compression_name is None
+    assert AzureSearchService._query_oversampling() is None
+
+
+@pytest.mark.parametrize("kind", ["scalar", "binary"])
+async def test_compressed_index_uses_truncated_dimensions(monkeypatch, kind) -> None:
+    index = await _index(
+        monkeypatch,
+        embedding_dimensions=1024,
+        azure_search_vector_compression=kind,
+        azure_search_vector_oversampling=8.0,
+    )
+
+    (compression,) = index.vector_search.compressions
+    assert _embedding_field(index).vector_search_dimensions == 1024
+    assert compression.kind == f"{kind}Quantization"
+    assert compression.rerank_with_original_vectors is True
+    assert compression.default_oversampling == 8.0
+    assert index.vector_search.profiles[0].compression_name == compression.compression_name
+    assert AzureSearchService._query_oversampling() == 8.0
+
+    monkeypatch.setattr(settings, "azure_search_vector_rescore", False)
+    assert AzureSearchService._query_oversampling() is None
+
+
+async def test_unknown_compression_is_rejected(monkeypatch) -> None:
+    with pytest.raises(ValueError, match="Unknown vector compression"):
+        await _index(monkeypatch, azure_search_vector_compression="pq")
+
+
+async def test_embeddings_are_requested_and_cached_at_configured_dimensions(monkeypatch) -> None:
+    requests: list[dict] = []
+
+    async def _create(**kwargs):
+        requests.append(kwargs)
+        return SimpleNamespace(data=[SimpleNamespace(index=0, embedding=[0.6, 0.8])])
+
+    async def _get_client():
+        return SimpleNamespace(embeddings=SimpleNamespace(create=_create))
+
+    monkeypatch.setattr(embedding_module, "get_embedding_client", _get_client)
+    service = EmbeddingService(search_service=object(), cosmos_service=object())
+    deployment = settings.azure_openai_embedding_deployment
+    full_key = _embedding_cache_key(deployment=deployment, user_id=None, text="t")
+
+    await service._send_embeddings(["t"])
+    monkeypatch.setattr(settings, "embedding_dimensions", 256)
+    await service._send_embeddings(["t"])
+
+    assert "dimensions" not in requests[0]
+    assert requests[1]["dimensions"] == 256
+    assert _embedding_cache_key(deployment=deployment, user_id=None, text="t") != full_key
+
+
+def test_benchmark_smoke() -> None:
+    data = run_benchmark(corpus_size=500, queries=20, dims=64, truncations=(64, 32))
+
+    results = {(r["dimensions"], r["compression"], r["rescore"]): r for r in data["results"]}
+    assert len(results) == 10
+    assert results[(64, "none", False)]["recall_at_10"] == 1.0
+    assert results[(64, "scalar", False)]["bytes_per_vector"] == 64
+    assert results[(32, "binary", True)]["bytes_per_vector"] == 4
+    binary = results[(64, "binary", False)]["recall_at_10"]
+    assert results[(64, "binary", True)]["recall_at_10"] >= binary
@@ -47,6 +47,11 @@ class LRUCache:
                     self.cache.popitem(last=False)
             self.cache[key] = value
 
+    async def delete(self, key: str) -> None:
+        """Remove a single entry if present."""
+        async with self._lock:
+            self.cache.pop(key, None)
+
     async def clear(self) -> None:
         """Clear all cache entries."""
         async with self._lock:
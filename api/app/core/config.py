@@ -43,11 +43,23 @@ class Settings(BaseSettings):
     COSMOS_DB_KEY: str | None = Field(default=None, alias="COSMOS_DB_KEY")
     COSMOS_DB_DATABASE_NAME: str = Field(default="azure-ai-poc", alias="COSMOS_DB_DATABASE_NAME")
     COSMOS_DB_CONTAINER_NAME: str = Field(default="documents", alias="COSMOS_DB_CONTAINER_NAME")
+    # Upper bound on concurrent Cosmos DB calls (worker threads and pooled connections)
+    COSMOS_DB_MAX_CONCURRENCY: int = Field(default=32, alias="COSMOS_DB_MAX_CONCURRENCY")
 
     # Azure AI Search Configuration
     AZURE_SEARCH_ENDPOINT: str | None = Field(default=None, alias="AZURE_SEARCH_ENDPOINT")
     AZURE_SEARCH_API_KEY: str | None = Field(default=None, alias="AZURE_SEARCH_API_KEY")
     AZURE_SEARCH_INDEX_NAME: str = Field(default="documents-index", alias="AZURE_SEARCH_INDEX_NAME")
+    # Chunk upload batches sent to Azure Search in parallel
+    AZURE_SEARCH_UPLOAD_CONCURRENCY: int = Field(default=4, alias="AZURE_SEARCH_UPLOAD_CONCURRENCY")
+
+    # Document text extraction (PDF/HTML parsing in worker processes; 0 workers uses a thread)
+    EXTRACTION_PROCESS_WORKERS: int = Field(default=2, alias="EXTRACTION_PROCESS_WORKERS")
+    # PDF pages per worker task (raised so a document is split into at most one task per worker)
+    EXTRACTION_PAGES_PER_TASK: int = Field(default=8, alias="EXTRACTION_PAGES_PER_TASK")
+    EXTRACTION_TIMEOUT_SECONDS: float = Field(default=120.0, alias="EXTRACTION_TIMEOUT_SECONDS")
+    # Address-space limit per worker process in MB (0 disables the limit)
+    EXTRACTION_WORKER_MEMORY_MB: int = Field(default=1024, alias="EXTRACTION_WORKER_MEMORY_MB")
 
     # Keycloak Configuration
     KEYCLOAK_URL: str | None = Field(default=None, alias="KEYCLOAK_URL")
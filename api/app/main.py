@@ -21,8 +21,12 @@ from app.middleware.rate_limit_middleware import limiter
 from app.middleware.security_middleware import SecurityMiddleware
 from app.routers import api_router
 from app.services.azure_openai_service import get_azure_openai_service
-from app.services.azure_search_service import get_azure_search_service
+from app.services.azure_search_service import (
+    close_async_azure_search_service,
+    get_azure_search_service,
+)
 from app.services.cosmos_db_service import get_cosmos_db_service
+from app.services.text_extraction import close_text_extraction_pool
 
 logger = get_logger(__name__)
 
@@ -112,6 +116,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         if hasattr(azure_openai_service, "cleanup"):
             await azure_openai_service.cleanup()
 
+        await close_async_azure_search_service()
+        close_text_extraction_pool()
+
         logger.info("Application shutdown completed")
     except Exception as e:
         logger.error("Error during shutdown", error=str(e))
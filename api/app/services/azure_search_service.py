@@ -5,6 +5,7 @@ Provides:
 - Document (chunk + metadata) upload
 - Vector similarity search
 - CRUD helpers for document metadata and chunks
+- AsyncAzureSearchService: the same operations on azure.search.documents.aio
 
 We consolidate document metadata and chunks into a single index using a hierarchical modeling approach.
 Each stored record has a 'recordType' field: either 'document' or 'chunk'.
@@ -15,6 +16,7 @@ Partition (multi-tenant) segregation achieved via 'partitionKey' field which is
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from dataclasses import dataclass
@@ -22,8 +24,11 @@ from typing import Any
 
 from azure.core.credentials import AzureKeyCredential
 from azure.identity import DefaultAzureCredential
+from azure.identity.aio import DefaultAzureCredential as AsyncDefaultAzureCredential
 from azure.search.documents import SearchClient
+from azure.search.documents.aio import SearchClient as AsyncSearchClient
 from azure.search.documents.indexes import SearchIndexClient
+from azure.search.documents.indexes.aio import SearchIndexClient as AsyncSearchIndexClient
 from azure.search.documents.indexes.models import (
     HnswAlgorithmConfiguration,
     SearchField,
@@ -47,6 +52,207 @@ class VectorSearchRequest:
     document_id: str | None = None
 
 
+def _build_index(index_name: str) -> SearchIndex:
+    """Index definition shared by the sync and async services."""
+    # Create vector search configuration with algorithm and profile
+    # Required for vector fields in Azure Search 11.5+
+    algo_name = "hnsw-algo"
+    profile_name = "default-profile"
+
+    try:
+        algorithm = HnswAlgorithmConfiguration(name=algo_name)
+        profile = VectorSearchProfile(name=profile_name, algorithm_configuration_name=algo_name)
+        vector_search = VectorSearch(algorithms=[algorithm], profiles=[profile])
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Failed to create vector search config: %s", e)
+        # Fallback to basic VectorSearch if configuration fails
+        try:
+            vector_search = VectorSearch()
+            profile_name = None  # No profile available
+        except Exception:  # noqa: BLE001
+            vector_search = None  # type: ignore
+            profile_name = None
+
+    fields: list[SearchField] = [
+        SimpleField(name="id", type=SearchFieldDataType.String, key=True, filterable=True),
+        SimpleField(
+            name="recordType",
+            type=SearchFieldDataType.String,
+            filterable=True,
+            facetable=True,
+        ),
+        SimpleField(name="documentId", type=SearchFieldDataType.String, filterable=True),
+        SimpleField(
+            name="filename",
+            type=SearchFieldDataType.String,
+            filterable=True,
+            searchable=True,
+        ),
+        SimpleField(name="partitionKey", type=SearchFieldDataType.String, filterable=True),
+        SimpleField(name="userId", type=SearchFieldDataType.String, filterable=True),
+        SimpleField(
+            name="uploadedAt",
+            type=SearchFieldDataType.String,
+            filterable=True,
+            sortable=True,
+        ),
+        SimpleField(
+            name="chunkIndex",
+            type=SearchFieldDataType.Int32,
+            filterable=True,
+            sortable=True,
+        ),
+        SearchField(name="content", type=SearchFieldDataType.String, searchable=True),
+        SearchField(
+            name="embedding",
+            type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
+            searchable=True,
+            vector_search_dimensions=3072,
+            vector_search_profile_name=profile_name,
+        ),
+        SearchField(
+            name="metadataJson",
+            type=SearchFieldDataType.String,
+            searchable=False,
+            filterable=False,
+            facetable=False,
+            sortable=False,
+        ),
+    ]
+
+    if vector_search:
+        return SearchIndex(name=index_name, fields=fields, vector_search=vector_search)
+    return SearchIndex(name=index_name, fields=fields)  # pragma: no cover - fallback path
+
+
+def _chunk_record(c: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": c["id"],
+        "recordType": "chunk",
+        "documentId": c["document_id"],
+        "filename": c["metadata"].get("filename"),
+        "partitionKey": c["partition_key"],
+        "userId": c.get("user_id"),
+        "uploadedAt": c["metadata"].get("uploadedAt"),
+        "chunkIndex": c["metadata"].get("chunkIndex"),
+        "content": c["content"],
+        "embedding": c.get("embedding"),
+        "metadataJson": json.dumps(c.get("metadata", {})),
+    }
+
+
+def _document_record(doc: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": doc["id"],
+        "recordType": "document",
+        "documentId": doc["id"],
+        "filename": doc["filename"],
+        "partitionKey": doc["partition_key"],
+        "userId": doc.get("user_id"),
+        "uploadedAt": doc["uploaded_at"],
+        "content": "",  # metadata only
+        "chunkIndex": -1,
+        "metadataJson": json.dumps({"chunkIds": doc.get("chunk_ids", [])}),
+    }
+
+
+def _chunk_filter(partition_key: str | None, document_id: str | None) -> str:
+    filters = ["recordType eq 'chunk'"]
+    if partition_key:
+        filters.append(f"partitionKey eq '{partition_key}'")
+    if document_id:
+        filters.append(f"documentId eq '{document_id}'")
+    return " and ".join(filters)
+
+
+def _get_document_kwargs(document_id: str, partition_key: str) -> dict[str, Any]:
+    filter_expr = (
+        f"partitionKey eq '{partition_key}' and id eq '{document_id}' and recordType eq 'document'"
+    )
+    return {"search_text": "*", "filter": filter_expr, "top": 1}
+
+
+def _list_documents_kwargs(partition_key: str) -> dict[str, Any]:
+    filter_expr = f"partitionKey eq '{partition_key}' and recordType eq 'document'"
+    return {
+        "search_text": "*",
+        "filter": filter_expr,
+        "top": 1000,
+        "order_by": ["uploadedAt desc"],
+    }
+
+
+def _list_chunks_kwargs(document_id: str, partition_key: str) -> dict[str, Any]:
+    filter_expr = (
+        f"partitionKey eq '{partition_key}' and recordType eq 'chunk' "
+        f"and documentId eq '{document_id}'"
+    )
+    return {
+        "search_text": "*",
+        "filter": filter_expr,
+        "top": 1000,
+        "order_by": ["chunkIndex asc"],
+    }
+
+
+def _document_tree_kwargs(document_id: str, partition_key: str) -> dict[str, Any]:
+    # Document metadata record plus all of its chunks.
+    filter_expr = f"partitionKey eq '{partition_key}' and documentId eq '{document_id}'"
+    return {"search_text": "*", "filter": filter_expr, "top": 2000}
+
+
+def _vector_search_kwargs(request: VectorSearchRequest) -> dict[str, Any]:
+    vector_query = {
+        "kind": "vector",
+        "vector": request.embedding,
+        "k": request.top_k,
+        "fields": "embedding",
+    }
+    return {
+        "search_text": "*",
+        "vector_queries": [vector_query],
+        "filter": _chunk_filter(request.partition_key, request.document_id),
+        "top": request.top_k,
+        "select": ["id", "documentId", "content", "filename", "chunkIndex", "partitionKey"],
+    }
+
+
+_TEXT_SEARCH_SELECT = [
+    "id",
+    "documentId",
+    "content",
+    "filename",
+    "chunkIndex",
+    "partitionKey",
+    "metadataJson",
+]
+
+
+def _format_search_result(result: dict[str, Any]) -> dict[str, Any]:
+    # Parse metadata to get document info
+    metadata = {}
+    if result.get("metadataJson"):
+        try:
+            metadata = json.loads(result["metadataJson"])
+        except Exception:
+            metadata = {}
+
+    # Extract title and page info
+    title = metadata.get("title") or result.get("filename", "Unknown Document")
+    page_number = metadata.get("page_number") or result.get("chunkIndex", "Unknown")
+
+    return {
+        "content": result.get("content", ""),
+        "title": title,
+        "page_number": str(page_number),
+        "document_id": result.get("documentId", ""),
+        "filename": result.get("filename", ""),
+        "chunk_index": result.get("chunkIndex", 0),
+        "partition_key": result.get("partitionKey", ""),
+        "@search.score": result.get("@search.score", 0.0),
+    }
+
+
 class AzureSearchService:
     def __init__(self) -> None:
         self.settings = settings
@@ -81,77 +287,7 @@ class AzureSearchService:
         if self.index_name in existing:
             return
 
-        # Create vector search configuration with algorithm and profile
-        # Required for vector fields in Azure Search 11.5+
-        algo_name = "hnsw-algo"
-        profile_name = "default-profile"
-
-        try:
-            algorithm = HnswAlgorithmConfiguration(name=algo_name)
-            profile = VectorSearchProfile(name=profile_name, algorithm_configuration_name=algo_name)
-            vector_search = VectorSearch(algorithms=[algorithm], profiles=[profile])
-        except Exception as e:  # noqa: BLE001
-            logger.warning("Failed to create vector search config: %s", e)
-            # Fallback to basic VectorSearch if configuration fails
-            try:
-                vector_search = VectorSearch()
-                profile_name = None  # No profile available
-            except Exception:  # noqa: BLE001
-                vector_search = None  # type: ignore
-                profile_name = None
-
-        fields: list[SearchField] = [
-            SimpleField(name="id", type=SearchFieldDataType.String, key=True, filterable=True),
-            SimpleField(
-                name="recordType",
-                type=SearchFieldDataType.String,
-                filterable=True,
-                facetable=True,
-            ),
-            SimpleField(name="documentId", type=SearchFieldDataType.String, filterable=True),
-            SimpleField(
-                name="filename",
-                type=SearchFieldDataType.String,
-                filterable=True,
-                searchable=True,
-            ),
-            SimpleField(name="partitionKey", type=SearchFieldDataType.String, filterable=True),
-            SimpleField(name="userId", type=SearchFieldDataType.String, filterable=True),
-            SimpleField(
-                name="uploadedAt",
-                type=SearchFieldDataType.String,
-                filterable=True,
-                sortable=True,
-            ),
-            SimpleField(
-                name="chunkIndex",
-                type=SearchFieldDataType.Int32,
-                filterable=True,
-                sortable=True,
-            ),
-            SearchField(name="content", type=SearchFieldDataType.String, searchable=True),
-            SearchField(
-                name="embedding",
-                type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
-                searchable=True,
-                vector_search_dimensions=3072,
-                vector_search_profile_name=profile_name,
-            ),
-            SearchField(
-                name="metadataJson",
-                type=SearchFieldDataType.String,
-                searchable=False,
-                filterable=False,
-                facetable=False,
-                sortable=False,
-            ),
-        ]
-
-        if vector_search:
-            index = SearchIndex(name=self.index_name, fields=fields, vector_search=vector_search)
-        else:  # pragma: no cover - fallback path
-            index = SearchIndex(name=self.index_name, fields=fields)
-        self._index_client.create_index(index)
+        self._index_client.create_index(_build_index(self.index_name))
         logger.info("Created Azure AI Search index '%s'", self.index_name)
 
     @property
@@ -164,23 +300,7 @@ class AzureSearchService:
         # Azure Search upsert documents.
         if not chunks:
             return
-        batch = []
-        for c in chunks:
-            batch.append(
-                {
-                    "id": c["id"],
-                    "recordType": "chunk",
-                    "documentId": c["document_id"],
-                    "filename": c["metadata"].get("filename"),
-                    "partitionKey": c["partition_key"],
-                    "userId": c.get("user_id"),
-                    "uploadedAt": c["metadata"].get("uploadedAt"),
-                    "chunkIndex": c["metadata"].get("chunkIndex"),
-                    "content": c["content"],
-                    "embedding": c.get("embedding"),
-                    "metadataJson": json.dumps(c.get("metadata", {})),
-                }
-            )
+        batch = [_chunk_record(c) for c in chunks]
         self.search_client.upload_documents(documents=batch)
         logger.info("Uploaded %d chunks to Azure Search", len(batch))
 
@@ -199,85 +319,34 @@ class AzureSearchService:
         logger.info(f"Uploading {total_chunks} chunks in batches of {batch_size}")
 
         for i in range(0, total_chunks, batch_size):
-            batch_chunks = chunks[i : i + batch_size]
-            batch = []
-
-            for c in batch_chunks:
-                batch.append(
-                    {
-                        "id": c["id"],
-                        "recordType": "chunk",
-                        "documentId": c["document_id"],
-                        "filename": c["metadata"].get("filename"),
-                        "partitionKey": c["partition_key"],
-                        "userId": c.get("user_id"),
-                        "uploadedAt": c["metadata"].get("uploadedAt"),
-                        "chunkIndex": c["metadata"].get("chunkIndex"),
-                        "content": c["content"],
-                        "embedding": c.get("embedding"),
-                        "metadataJson": json.dumps(c.get("metadata", {})),
-                    }
-                )
-
+            batch = [_chunk_record(c) for c in chunks[i : i + batch_size]]
             self.search_client.upload_documents(documents=batch)
             logger.info(f"Uploaded batch {i // batch_size + 1}: {len(batch)} chunks")
 
         logger.info(f"Successfully uploaded all {total_chunks} chunks to Azure Search")
 
     def upload_document_metadata(self, doc: dict[str, Any]) -> None:
-        self.search_client.upload_documents(
-            documents=[
-                {
-                    "id": doc["id"],
-                    "recordType": "document",
-                    "documentId": doc["id"],
-                    "filename": doc["filename"],
-                    "partitionKey": doc["partition_key"],
-                    "userId": doc.get("user_id"),
-                    "uploadedAt": doc["uploaded_at"],
-                    "content": "",  # metadata only
-                    "chunkIndex": -1,
-                    "metadataJson": json.dumps({"chunkIds": doc.get("chunk_ids", [])}),
-                }
-            ]
-        )
+        self.search_client.upload_documents(documents=[_document_record(doc)])
         logger.info("Uploaded document metadata %s", doc["id"])
 
     def get_document(self, document_id: str, partition_key: str) -> dict[str, Any] | None:
-        filter_expr = (
-            f"partitionKey eq '{partition_key}' and id eq '{document_id}' "
-            "and recordType eq 'document'"
-        )
-        results = self.search_client.search(search_text="*", filter=filter_expr, top=1)
+        results = self.search_client.search(**_get_document_kwargs(document_id, partition_key))
         for r in results:
             return r
         return None
 
     def list_documents(self, partition_key: str) -> list[dict[str, Any]]:
-        filter_expr = f"partitionKey eq '{partition_key}' and recordType eq 'document'"
-        results = self.search_client.search(
-            search_text="*",
-            filter=filter_expr,
-            top=1000,
-            order_by=["uploadedAt desc"],
-        )
+        results = self.search_client.search(**_list_documents_kwargs(partition_key))
         return list(results)
 
     def list_chunks(self, document_id: str, partition_key: str) -> list[dict[str, Any]]:
-        filter_expr = (
-            f"partitionKey eq '{partition_key}' and recordType eq 'chunk' "
-            f"and documentId eq '{document_id}'"
-        )
-        results = self.search_client.search(
-            search_text="*", filter=filter_expr, top=1000, order_by=["chunkIndex asc"]
-        )
+        results = self.search_client.search(**_list_chunks_kwargs(document_id, partition_key))
         return list(results)
 
     def delete_document_and_chunks(self, document_id: str, partition_key: str) -> None:
         # Delete document metadata and all chunks by issuing delete with ids.
         # Need to query first to collect ids.
-        filter_expr = f"partitionKey eq '{partition_key}' and documentId eq '{document_id}'"
-        results = self.search_client.search(search_text="*", filter=filter_expr, top=2000)
+        results = self.search_client.search(**_document_tree_kwargs(document_id, partition_key))
         ids = [r["id"] for r in results]
         if not ids:
             return
@@ -286,27 +355,7 @@ class AzureSearchService:
 
     # ----------------- Vector Search -----------------
     def vector_search(self, request: VectorSearchRequest) -> list[dict[str, Any]]:
-        # Build filter
-        filters = ["recordType eq 'chunk'"]
-        if request.partition_key:
-            filters.append(f"partitionKey eq '{request.partition_key}'")
-        if request.document_id:
-            filters.append(f"documentId eq '{request.document_id}'")
-        filter_expr = " and ".join(filters)
-
-        vector_query = {
-            "kind": "vector",
-            "vector": request.embedding,
-            "k": request.top_k,
-            "fields": "embedding",
-        }
-        results = self.search_client.search(
-            search_text="*",
-            vector_queries=[vector_query],
-            filter=filter_expr,
-            top=request.top_k,
-            select=["id", "documentId", "content", "filename", "chunkIndex", "partitionKey"],
-        )
+        results = self.search_client.search(**_vector_search_kwargs(request))
         # Azure Search returns no explicit score for pure vector query yet; we keep order.
         return list(results)
 
@@ -329,61 +378,15 @@ class AzureSearchService:
         Returns:
             List of search results with content, metadata, and scores
         """
-        # Build filter for chunks only
-        filters = ["recordType eq 'chunk'"]
-        if partition_key:
-            filters.append(f"partitionKey eq '{partition_key}'")
-        if document_id:
-            filters.append(f"documentId eq '{document_id}'")
-        filter_expr = " and ".join(filters)
-
         try:
             results = self.search_client.search(
                 search_text=query,
-                filter=filter_expr,
+                filter=_chunk_filter(partition_key, document_id),
                 top=top,
-                select=[
-                    "id",
-                    "documentId",
-                    "content",
-                    "filename",
-                    "chunkIndex",
-                    "partitionKey",
-                    "metadataJson",
-                ],
+                select=_TEXT_SEARCH_SELECT,
                 include_total_count=True,
             )
-
-            # Process results to extract metadata and format response
-            formatted_results = []
-            for result in results:
-                # Parse metadata to get document info
-                metadata = {}
-                if result.get("metadataJson"):
-                    try:
-                        import json
-
-                        metadata = json.loads(result["metadataJson"])
-                    except Exception:
-                        metadata = {}
-
-                # Extract title and page info
-                title = metadata.get("title") or result.get("filename", "Unknown Document")
-                page_number = metadata.get("page_number") or result.get("chunkIndex", "Unknown")
-
-                formatted_result = {
-                    "content": result.get("content", ""),
-                    "title": title,
-                    "page_number": str(page_number),
-                    "document_id": result.get("documentId", ""),
-                    "filename": result.get("filename", ""),
-                    "chunk_index": result.get("chunkIndex", 0),
-                    "partition_key": result.get("partitionKey", ""),
-                    "@search.score": result.get("@search.score", 0.0),
-                }
-                formatted_results.append(formatted_result)
-
-            return formatted_results
+            return [_format_search_result(result) for result in results]
 
         except Exception as e:
             logger.error("Search failed: %s", str(e))
@@ -399,3 +402,187 @@ def get_azure_search_service() -> AzureSearchService:
     if _azure_search_service is None:
         _azure_search_service = AzureSearchService()
     return _azure_search_service
+
+
+class AsyncAzureSearchService:
+    """Non-blocking counterpart of AzureSearchService built on azure.search.documents.aio.
+
+    Exposes the same operations as coroutines. Clients are created on first use so the
+    index check runs on the event loop instead of blocking construction, and chunk uploads
+    send their batches with bounded parallelism.
+    """
+
+    def __init__(self) -> None:
+        self.settings = settings
+        self.index_name = self.settings.AZURE_SEARCH_INDEX_NAME
+        self.endpoint = self.settings.AZURE_SEARCH_ENDPOINT
+        self.api_key = self.settings.AZURE_SEARCH_API_KEY
+        self.upload_concurrency = max(1, self.settings.AZURE_SEARCH_UPLOAD_CONCURRENCY)
+        self._search_client: AsyncSearchClient | None = None
+        self._index_client: AsyncSearchIndexClient | None = None
+        self._credential: AsyncDefaultAzureCredential | None = None
+        self._init_lock = asyncio.Lock()
+        if not self.endpoint:
+            raise ValueError("AZURE_SEARCH_ENDPOINT not configured")
+
+    def _make_credential(self) -> AzureKeyCredential | AsyncDefaultAzureCredential:
+        if self.api_key:
+            return AzureKeyCredential(self.api_key)
+        self._credential = AsyncDefaultAzureCredential()
+        return self._credential
+
+    async def _client(self) -> AsyncSearchClient:
+        if self._search_client is not None:
+            return self._search_client
+        async with self._init_lock:
+            if self._search_client is None:
+                cred = self._make_credential()
+                self._index_client = AsyncSearchIndexClient(self.endpoint, cred)  # type: ignore[arg-type]
+                await self._create_index_if_not_exists()
+                self._search_client = AsyncSearchClient(self.endpoint, self.index_name, cred)  # type: ignore[arg-type]
+                logger.info("AsyncAzureSearchService initialized: index=%s", self.index_name)
+        return self._search_client
+
+    async def _create_index_if_not_exists(self) -> None:
+        assert self._index_client is not None
+        async for name in self._index_client.list_index_names():
+            if name == self.index_name:
+                return
+
+        await self._index_client.create_index(_build_index(self.index_name))
+        logger.info("Created Azure AI Search index '%s'", self.index_name)
+
+    async def close(self) -> None:
+        """Close the underlying HTTP sessions."""
+        if self._search_client is not None:
+            await self._search_client.close()
+        if self._index_client is not None:
+            await self._index_client.close()
+        if self._credential is not None:
+            await self._credential.close()
+        self._search_client = None
+        self._index_client = None
+        self._credential = None
+
+    # ----------------- Document & Chunk Operations -----------------
+    async def upload_chunks(self, chunks: list[dict[str, Any]]) -> None:
+        if not chunks:
+            return
+        client = await self._client()
+        batch = [_chunk_record(c) for c in chunks]
+        await client.upload_documents(documents=batch)
+        logger.info("Uploaded %d chunks to Azure Search", len(batch))
+
+    async def upload_chunks_batch(
+        self, chunks: list[dict[str, Any]], batch_size: int = 1000
+    ) -> None:
+        """
+        Upload chunks to Azure Search, sending up to `upload_concurrency` batches at once.
+
+        Args:
+            chunks: List of chunk dictionaries to upload
+            batch_size: Maximum number of chunks per batch (Azure Search recommends ~1000)
+        """
+        if not chunks:
+            return
+
+        client = await self._client()
+        total_chunks = len(chunks)
+        semaphore = asyncio.Semaphore(self.upload_concurrency)
+        logger.info(
+            "Uploading %d chunks in batches of %d (concurrency=%d)",
+            total_chunks,
+            batch_size,
+            self.upload_concurrency,
+        )
+
+        async def upload(batch_number: int, start: int) -> None:
+            async with semaphore:
+                batch = [_chunk_record(c) for c in chunks[start : start + batch_size]]
+                await client.upload_documents(documents=batch)
+            logger.info("Uploaded batch %d: %d chunks", batch_number, len(batch))
+
+        await asyncio.gather(
+            *(
+                upload(batch_number, start)
+                for batch_number, start in enumerate(range(0, total_chunks, batch_size), 1)
+            )
+        )
+        logger.info("Successfully uploaded all %d chunks to Azure Search", total_chunks)
+
+    async def upload_document_metadata(self, doc: dict[str, Any]) -> None:
+        client = await self._client()
+        await client.upload_documents(documents=[_document_record(doc)])
+        logger.info("Uploaded document metadata %s", doc["id"])
+
+    async def get_document(self, document_id: str, partition_key: str) -> dict[str, Any] | None:
+        client = await self._client()
+        results = await client.search(**_get_document_kwargs(document_id, partition_key))
+        async for r in results:
+            return r
+        return None
+
+    async def list_documents(self, partition_key: str) -> list[dict[str, Any]]:
+        client = await self._client()
+        results = await client.search(**_list_documents_kwargs(partition_key))
+        return [r async for r in results]
+
+    async def list_chunks(self, document_id: str, partition_key: str) -> list[dict[str, Any]]:
+        client = await self._client()
+        results = await client.search(**_list_chunks_kwargs(document_id, partition_key))
+        return [r async for r in results]
+
+    async def delete_document_and_chunks(self, document_id: str, partition_key: str) -> None:
+        client = await self._client()
+        results = await client.search(**_document_tree_kwargs(document_id, partition_key))
+        ids = [r["id"] async for r in results]
+        if not ids:
+            return
+        await client.delete_documents(documents=[{"id": i} for i in ids])
+        logger.info("Deleted document %s and %d related records", document_id, len(ids))
+
+    # ----------------- Vector Search -----------------
+    async def vector_search(self, request: VectorSearchRequest) -> list[dict[str, Any]]:
+        client = await self._client()
+        results = await client.search(**_vector_search_kwargs(request))
+        return [r async for r in results]
+
+    async def search_documents(
+        self,
+        query: str,
+        partition_key: str | None = None,
+        document_id: str | None = None,
+        top: int = 10,
+    ) -> list[dict[str, Any]]:
+        """Async variant of AzureSearchService.search_documents."""
+        try:
+            client = await self._client()
+            results = await client.search(
+                search_text=query,
+                filter=_chunk_filter(partition_key, document_id),
+                top=top,
+                select=_TEXT_SEARCH_SELECT,
+                include_total_count=True,
+            )
+            return [_format_search_result(result) async for result in results]
+
+        except Exception as e:
+            logger.error("Search failed: %s", str(e))
+            return []
+
+
+_async_azure_search_service: AsyncAzureSearchService | None = None
+
+
+def get_async_azure_search_service() -> AsyncAzureSearchService:
+    global _async_azure_search_service
+    if _async_azure_search_service is None:
+        _async_azure_search_service = AsyncAzureSearchService()
+    return _async_azure_search_service
+
+
+async def close_async_azure_search_service() -> None:
+    global _async_azure_search_service
+    if _async_azure_search_service is not None:
+        await _async_azure_search_service.close()
+        _async_azure_search_service = None
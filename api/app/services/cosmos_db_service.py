@@ -9,19 +9,29 @@ This service provides comprehensive Cosmos DB operations including:
 - Health checks and monitoring
 """
 
+import asyncio
+import functools
 import json
 import logging
 import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from typing import Any
+from typing import Any, TypeVar
 
+import requests
+from azure.core.pipeline.transport import RequestsTransport
 from azure.cosmos import ContainerProxy, CosmosClient, DatabaseProxy, PartitionKey
 from azure.cosmos.exceptions import CosmosHttpResponseError, CosmosResourceNotFoundError
 from azure.identity import DefaultAzureCredential
 from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.core.config import settings
 
+T = TypeVar("T")
+
 
 class QueryOptions(BaseModel):
     """Options for Cosmos DB queries."""
@@ -60,8 +70,38 @@ class CosmosDbService:
         self.client: CosmosClient | None = None
         self.database: DatabaseProxy | None = None
         self.container: ContainerProxy | None = None
+        # The azure.cosmos client is synchronous; every SDK call runs on this bounded pool so
+        # a Cosmos round-trip never blocks the event loop. The pool size also caps in-flight
+        # requests, and the HTTP connection pool below is sized to match.
+        self._max_concurrency = max(1, self.settings.COSMOS_DB_MAX_CONCURRENCY)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_concurrency, thread_name_prefix="cosmos-db"
+        )
+        self._transport: RequestsTransport | None = None
         self._initialize_client()
 
+    async def _run(self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Run a blocking Cosmos SDK call on the service's executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def _build_transport(self) -> RequestsTransport:
+        """Create an HTTP transport whose keep-alive pool fits the executor.
+
+        requests keeps at most 10 pooled connections per host by default; with more worker
+        threads than that, extra connections are discarded after every call and the next
+        request pays a fresh TLS handshake.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=self._max_concurrency,
+            max_retries=Retry(total=False, redirect=False, raise_on_status=False),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return RequestsTransport(session=session, session_owner=True)
+
     def _initialize_client(self) -> None:
         """Initialize the Cosmos DB client with managed identity or key authentication."""
         endpoint = self.settings.COSMOS_DB_ENDPOINT
@@ -78,6 +118,7 @@ class CosmosDbService:
             # Connection configuration for better performance
             # Using direct parameters instead of connection_policy dict
             connection_timeout = 30  # 30 second timeout
+            self._transport = self._build_transport()
 
             # Use managed identity for production, key for local development
             if self.settings.ENVIRONMENT == "local" and self.settings.COSMOS_DB_KEY:
@@ -86,6 +127,7 @@ class CosmosDbService:
                     credential=self.settings.COSMOS_DB_KEY,
                     enable_endpoint_discovery=False,
                     connection_timeout=connection_timeout,
+                    transport=self._transport,
                 )
                 self.logger.info("Cosmos DB client initialized with key authentication")
             else:
@@ -95,6 +137,7 @@ class CosmosDbService:
                     credential=credential,
                     enable_endpoint_discovery=True,
                     connection_timeout=connection_timeout,
+                    transport=self._transport,
                 )
                 self.logger.info("Cosmos DB client initialized with managed identity")
 
@@ -126,6 +169,21 @@ class CosmosDbService:
 
         return self.database.get_container_client(container_name)
 
+    def _query_all(
+        self,
+        query_spec: str | dict[str, Any],
+        *,
+        limit: int | None = None,
+        **query_kwargs: Any,
+    ) -> list[dict[str, Any]]:
+        """Run a query and drain its pages; called on the executor, never the event loop."""
+        items: list[dict[str, Any]] = []
+        for item in self.container.query_items(query=query_spec, **query_kwargs):
+            items.append(item)
+            if limit is not None and len(items) >= limit:
+                break
+        return items
+
     async def create_container(
         self,
         container_name: str,
@@ -142,7 +200,8 @@ class CosmosDbService:
             if container_properties:
                 indexing_policy = container_properties.get("indexingPolicy")
 
-            container = self.database.create_container_if_not_exists(
+            container = await self._run(
+                self.database.create_container_if_not_exists,
                 id=container_name,
                 partition_key=partition_key,
                 indexing_policy=indexing_policy,
@@ -161,7 +220,7 @@ class CosmosDbService:
             raise ValueError("Database not initialized")
 
         try:
-            self.database.delete_container(container_name)
+            await self._run(self.database.delete_container, container_name)
             self.logger.info("Cosmos DB container deleted", container_name=container_name)
         except CosmosResourceNotFoundError:
             self.logger.warning(
@@ -199,7 +258,7 @@ class CosmosDbService:
 
             self.logger.debug(f"Creating item with size: {item_size_bytes // 1024}KB")
 
-            response = self.container.create_item(body=item)
+            response = await self._run(self.container.create_item, body=item)
             return response
 
         except CosmosHttpResponseError as error:
@@ -231,7 +290,9 @@ class CosmosDbService:
             The item if found, None otherwise
         """
         try:
-            response = self.container.read_item(item=item_id, partition_key=partition_key)
+            response = await self._run(
+                self.container.read_item, item=item_id, partition_key=partition_key
+            )
             return response
         except CosmosResourceNotFoundError:
             return None
@@ -254,7 +315,7 @@ class CosmosDbService:
             The updated item response
         """
         try:
-            response = self.container.replace_item(item=item_id, body=item)
+            response = await self._run(self.container.replace_item, item=item_id, body=item)
             return response
         except Exception as error:
             self.logger.error(f"Error updating item in Cosmos DB: {error}")
@@ -272,7 +333,9 @@ class CosmosDbService:
             The delete response
         """
         try:
-            response = self.container.delete_item(item=item_id, partition_key=partition_key)
+            response = await self._run(
+                self.container.delete_item, item=item_id, partition_key=partition_key
+            )
             return response
         except Exception as error:
             self.logger.error(f"Error deleting item from Cosmos DB: {error}")
@@ -304,7 +367,7 @@ class CosmosDbService:
             if options.partition_key and not options.enable_cross_partition_query:
                 query_kwargs["partition_key"] = options.partition_key
 
-            items = list(self.container.query_items(query=query_spec, **query_kwargs))
+            items = await self._run(self._query_all, query_spec, **query_kwargs)
 
             return items
 
@@ -335,12 +398,11 @@ class CosmosDbService:
                 if limit_param:
                     max_items = limit_param.get("value", 100)
 
-            items = list(
-                self.container.query_items(
-                    query=query_spec,
-                    enable_cross_partition_query=True,
-                    max_item_count=max_items,
-                )
+            items = await self._run(
+                self._query_all,
+                query_spec,
+                enable_cross_partition_query=True,
+                max_item_count=max_items,
             )
 
             return items
@@ -377,14 +439,8 @@ class CosmosDbService:
                 # This is a simplified implementation
                 pass
 
-            # Get iterator for pagination
-            query_iterator = self.container.query_items(query=query_spec, **query_kwargs)
-
-            items = []
-            for item in query_iterator:
-                items.append(item)
-                if len(items) >= page_size:
-                    break
+            # Drain at most one page on the executor
+            items = await self._run(self._query_all, query_spec, limit=page_size, **query_kwargs)
 
             # In the Python SDK, continuation token handling is different
             # This is a simplified implementation
@@ -460,11 +516,9 @@ class CosmosDbService:
             if options.partition_key and not options.enable_cross_partition_query:
                 query_kwargs["partition_key"] = options.partition_key
 
-            import time
-
             start_time = time.time()
 
-            items = list(self.container.query_items(query=query_spec, **query_kwargs))
+            items = await self._run(self._query_all, query_spec, **query_kwargs)
 
             query_time = (time.time() - start_time) * 1000
             self.logger.debug(
@@ -542,16 +596,13 @@ class CosmosDbService:
                 "parameters": parameters,
             }
 
-            import time
-
             start_time = time.time()
 
-            items = list(
-                self.container.query_items(
-                    query=query_spec,
-                    enable_cross_partition_query=True,
-                    max_item_count=options.top_k,
-                )
+            items = await self._run(
+                self._query_all,
+                query_spec,
+                enable_cross_partition_query=True,
+                max_item_count=options.top_k,
             )
 
             query_time = (time.time() - start_time) * 1000
@@ -581,7 +632,7 @@ class CosmosDbService:
             # Try to read the container properties to verify connection
             # This is a lightweight operation that validates connectivity
             if self.container:
-                self.container.read()  # This reads container metadata
+                await self._run(self.container.read)  # This reads container metadata
             else:
                 raise ValueError("Container not initialized")
 
@@ -612,8 +663,16 @@ class CosmosDbService:
                 },
             }
 
+    async def cleanup(self) -> None:
+        """Release the client and executor on application shutdown."""
+        self.dispose()
+
     def dispose(self) -> None:
         """Dispose of the Cosmos DB client."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
         if self.client:
             # The Python SDK doesn't have an explicit dispose method
             # but we can clear references
@@ -16,17 +16,49 @@ import re
 import time
 from collections.abc import AsyncGenerator
 from datetime import UTC, datetime
-from io import BytesIO
 from typing import Any
 
-import pypdf
-from bs4 import BeautifulSoup
-from markdownify import markdownify
+import numpy as np
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.core.cache import LRUCache
 from app.core.config import settings
-from app.services.azure_search_service import VectorSearchRequest, get_azure_search_service
+from app.services.azure_search_service import (
+    VectorSearchRequest,
+    get_async_azure_search_service,
+)
 from app.services.optimized_embedding_service import get_optimized_embedding_service
+from app.services.text_extraction import get_text_extraction_pool
+
+# Stacked chunk-embedding matrices kept for follow-up questions. A 500-chunk document with
+# 3072-dim embeddings is ~6MB as float32, so keep this small.
+EMBEDDING_MATRIX_CACHE_SIZE = 16
+
+
+def _normalized_embedding_matrix(embeddings: list[list[float]]) -> np.ndarray:
+    """Stack embeddings into an L2-normalized float32 matrix (one row per chunk)."""
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim != 2:
+        raise ValueError("Embeddings must all have the same length")
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0  # zero vectors score 0, as in _cosine_similarity
+    matrix /= norms
+    return matrix
+
+
+def _top_k_rows(matrix: np.ndarray, query: list[float], top_k: int) -> list[int]:
+    """Return row indices of the top_k cosine matches, best first."""
+    vector = np.asarray(query, dtype=np.float32)
+    if vector.shape != (matrix.shape[1],):
+        raise ValueError("Vectors must have the same length")
+    norm = np.linalg.norm(vector)
+    scores = matrix @ (vector / norm) if norm else np.zeros(len(matrix), dtype=np.float32)
+
+    k = min(top_k, len(scores))
+    if k <= 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")].tolist()
 
 
 class DocumentChunk(BaseModel):
@@ -109,6 +141,8 @@ class DocumentService:
         """Initialize the document service."""
         self.logger = logging.getLogger(__name__)
         self.settings = settings
+        # (chunk ids, normalized matrix) per document for the client-side similarity fallback
+        self._embedding_matrices = LRUCache(max_size=EMBEDDING_MATRIX_CACHE_SIZE)
 
         self.logger.info("DocumentService initialized with lazy dependency loading")
 
@@ -121,8 +155,8 @@ class DocumentService:
 
     @property
     def azure_search_service(self):
-        """Get Azure AI Search service (lazy loaded)."""
-        return get_azure_search_service()
+        """Get the non-blocking Azure AI Search service (lazy loaded)."""
+        return get_async_azure_search_service()
 
     async def get_all_documents(self, user_id: str | None = None) -> list[ProcessedDocument]:
         """Retrieve all processed documents for a user (partition).
@@ -135,7 +169,7 @@ class DocumentService:
 
         try:
             start_time = time.time()
-            results = self.azure_search_service.list_documents(partition_key)
+            results = await self.azure_search_service.list_documents(partition_key)
             duration_ms = (time.time() - start_time) * 1000
             self.logger.debug(
                 "Fetched %d documents for partition '%s' via Azure Search in %.2fms",
@@ -245,7 +279,7 @@ class DocumentService:
 
             # Upload all chunks in a single batch operation
             try:
-                self.azure_search_service.upload_chunks_batch(chunk_dicts)
+                await self.azure_search_service.upload_chunks_batch(chunk_dicts)
                 self.logger.info(f"Batch uploaded {len(chunk_dicts)} chunks to Azure Search")
             except Exception as upload_err:  # noqa: BLE001
                 self.logger.error("Failed to batch upload chunks to Azure Search: %s", upload_err)
@@ -266,7 +300,7 @@ class DocumentService:
             # Store document metadata
             doc_dict = processed_doc.model_dump()
             try:
-                self.azure_search_service.upload_document_metadata(doc_dict)
+                await self.azure_search_service.upload_document_metadata(doc_dict)
             except Exception as upload_doc_err:  # noqa: BLE001
                 self.logger.error(
                     "Failed to upload document metadata %s to Azure Search: %s",
@@ -318,16 +352,11 @@ class DocumentService:
     async def _extract_pdf_text(self, content: bytes) -> dict[str, Any]:
         """Extract text from PDF content."""
         try:
-            pdf_file = BytesIO(content)
-            pdf_reader = pypdf.PdfReader(pdf_file)
-
-            text_parts = []
-            for page in pdf_reader.pages:
-                text_parts.append(page.extract_text())
+            text_parts = await get_text_extraction_pool().extract_pdf(content)
 
             return {
                 "text": "\n\n".join(text_parts),
-                "total_pages": len(pdf_reader.pages),
+                "total_pages": len(text_parts),
             }
         except Exception as error:
             raise ValueError(f"Failed to extract text from PDF: {error}") from error
@@ -336,9 +365,7 @@ class DocumentService:
         """Extract text from Markdown content."""
         try:
             markdown_text = content.decode("utf-8")
-            # Convert markdown to HTML, then extract text
-            html_content = markdownify(markdown_text)
-            plain_text = self._strip_html_tags(html_content)
+            plain_text = await get_text_extraction_pool().markdown_to_text(markdown_text)
 
             return {"text": plain_text, "total_pages": None}
         except Exception as error:
@@ -348,42 +375,12 @@ class DocumentService:
         """Extract text from HTML content."""
         try:
             html_text = content.decode("utf-8")
-            plain_text = self._strip_html_tags(html_text)
+            plain_text = await get_text_extraction_pool().strip_html(html_text)
 
             return {"text": plain_text, "total_pages": None}
         except Exception as error:
             raise ValueError(f"Failed to extract text from HTML: {error}") from error
 
-    def _strip_html_tags(self, html: str) -> str:
-        """Strip HTML tags and extract clean text content."""
-        try:
-            soup = BeautifulSoup(html, "html.parser")
-
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-
-            # Get text content
-            text = soup.get_text()
-
-            # Clean up whitespace
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = " ".join(chunk for chunk in chunks if chunk)
-
-            return text
-
-        except Exception as error:
-            self.logger.error(
-                f"Failed to parse HTML with BeautifulSoup: {error}. "
-                "Refusing to use unsafe regex fallback for security reasons."
-            )
-            # Security: Do NOT use regex-based HTML parsing as it cannot handle
-            # malformed HTML correctly and is vulnerable to XSS attacks.
-            # See: https://codeql.github.com/codeql-query-help/python/py-bad-tag-filter/
-            # If BeautifulSoup fails, return empty text rather than risk security issue.
-            return ""
-
     async def answer_question(
         self, document_id: str, question: str, user_id: str | None = None
     ) -> str:
@@ -402,7 +399,7 @@ class DocumentService:
 
         # Get document
         # Retrieve metadata from Azure Search
-        document = self.azure_search_service.get_document(document_id, partition_key)
+        document = await self.azure_search_service.get_document(document_id, partition_key)
         if not document:
             raise ValueError("Document not found")
 
@@ -455,7 +452,7 @@ class DocumentService:
         partition_key = user_id or "default"
 
         # Get document
-        document = self.azure_search_service.get_document(document_id, partition_key)
+        document = await self.azure_search_service.get_document(document_id, partition_key)
         if not document:
             raise ValueError("Document not found")
 
@@ -505,7 +502,7 @@ class DocumentService:
             List of document chunks
         """
         start_time = time.time()
-        results = self.azure_search_service.list_chunks(document_id, partition_key)
+        results = await self.azure_search_service.list_chunks(document_id, partition_key)
         query_time = (time.time() - start_time) * 1000
         self.logger.debug(
             "Retrieved %d chunks for document %s from Azure Search in %.2fms",
@@ -567,7 +564,7 @@ class DocumentService:
                         "Performing Azure AI Search vector search over %d embedded chunks",
                         len(chunks_with_embeddings),
                     )
-                    vector_results = self.azure_search_service.vector_search(
+                    vector_results = await self.azure_search_service.vector_search(
                         VectorSearchRequest(
                             embedding=question_embedding,
                             top_k=top_k,
@@ -591,25 +588,36 @@ class DocumentService:
             # Fallback to client-side cosine similarity
             self.logger.info("Using client-side similarity calculation as fallback")
 
-            similarities = []
-            for chunk in chunks_with_embeddings:
-                if chunk.get("embedding"):
-                    similarity = self._cosine_similarity(question_embedding, chunk["embedding"])
-                    similarities.append({"chunk": chunk, "similarity": similarity})
-
-            # Sort by similarity and get top k
-            similarities.sort(key=lambda x: x["similarity"], reverse=True)
-            top_chunks = similarities[:top_k]
+            matrix = await self._get_embedding_matrix(chunks_with_embeddings)
+            top_chunks = [
+                chunks_with_embeddings[i] for i in _top_k_rows(matrix, question_embedding, top_k)
+            ]
 
             self.logger.info(f"Client-side search found {len(top_chunks)} relevant chunks")
 
-            return "\n\n".join(item["chunk"].get("content", "") for item in top_chunks)
+            return "\n\n".join(chunk.get("content", "") for chunk in top_chunks)
 
         except Exception as error:
             self.logger.error(f"Error in semantic search: {error}")
             # Ultimate fallback to simple chunk retrieval
             return "\n\n".join(chunk.get("content", "") for chunk in chunks[:top_k])
 
+    async def _get_embedding_matrix(self, chunks: list[dict[str, Any]]) -> np.ndarray:
+        """Return the normalized embedding matrix for a document's chunks.
+
+        Cached per document and reused while the chunk ids are unchanged, so follow-up
+        questions only pay for one matrix-vector product.
+        """
+        key = f"{chunks[0].get('partitionKey')}:{chunks[0].get('documentId')}"
+        chunk_ids = tuple(chunk["id"] for chunk in chunks)
+        cached = await self._embedding_matrices.get(key)
+        if cached is not None and cached[0] == chunk_ids:
+            return cached[1]
+
+        matrix = _normalized_embedding_matrix([chunk["embedding"] for chunk in chunks])
+        await self._embedding_matrices.set(key, (chunk_ids, matrix))
+        return matrix
+
     def _cosine_similarity(self, vec_a: list[float], vec_b: list[float]) -> float:
         """Calculate cosine similarity between two vectors."""
         if len(vec_a) != len(vec_b):
@@ -638,7 +646,7 @@ class DocumentService:
             Document or None if not found
         """
         partition_key = user_id or "default"
-        result = self.azure_search_service.get_document(document_id, partition_key)
+        result = await self.azure_search_service.get_document(document_id, partition_key)
         if not result:
             return None
         metadata = result.get("metadataJson")
@@ -675,7 +683,8 @@ class DocumentService:
             partition_key = user_id or "default"
 
             # Azure Search: delete doc + chunks
-            self.azure_search_service.delete_document_and_chunks(document_id, partition_key)
+            await self.azure_search_service.delete_document_and_chunks(document_id, partition_key)
+            await self._embedding_matrices.delete(f"{partition_key}:{document_id}")
             self.logger.info(
                 "Deleted document %s and associated chunks from Azure Search", document_id
             )
@@ -0,0 +1,242 @@
+"""CPU-bound text extraction run off the event loop.
+
+PDF parsing (pypdf) and HTML parsing (BeautifulSoup) are pure-Python and hold the GIL, so
+running them inside a coroutine, or on a thread, stalls every other request for as long as a
+document takes to parse. `TextExtractionPool` runs them in worker processes instead:
+
+- PDFs are split into page ranges that are extracted in parallel, one range per task.
+- Every extraction has a deadline; workers still busy when it passes are killed.
+- Each worker caps its address space, so a pathological document fails with MemoryError
+  inside the worker instead of growing the API process.
+
+The worker functions are module-level so they can be pickled to a spawned interpreter; they
+only depend on the parsing libraries.
+"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Any, TypeVar
+
+import pypdf
+from bs4 import BeautifulSoup
+from markdownify import markdownify
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+def _limit_worker_memory(memory_limit_mb: int) -> None:
+    """Process pool initializer: cap the worker's address space (Unix only)."""
+    if memory_limit_mb <= 0:
+        return
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def pdf_page_count(content: bytes) -> int:
+    """Return the number of pages in a PDF."""
+    return len(pypdf.PdfReader(BytesIO(content)).pages)
+
+
+def extract_pdf_pages(content: bytes, start: int, end: int) -> list[str]:
+    """Extract the text of pages [start, end) of a PDF."""
+    reader = pypdf.PdfReader(BytesIO(content))
+    return [reader.pages[i].extract_text() for i in range(start, min(end, len(reader.pages)))]
+
+
+def extract_pdf_text(content: bytes) -> list[str]:
+    """Extract the text of every page of a PDF."""
+    return [page.extract_text() for page in pypdf.PdfReader(BytesIO(content)).pages]
+
+
+def strip_html_tags(html: str) -> str:
+    """Strip HTML tags and extract clean text content."""
+    try:
+        soup = BeautifulSoup(html, "html.parser")
+
+        # Remove script and style elements
+        for script in soup(["script", "style"]):
+            script.decompose()
+
+        # Get text content
+        text = soup.get_text()
+
+        # Clean up whitespace
+        lines = (line.strip() for line in text.splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        text = " ".join(chunk for chunk in chunks if chunk)
+
+        return text
+
+    except Exception as error:
+        logger.error(
+            f"Failed to parse HTML with BeautifulSoup: {error}. "
+            "Refusing to use unsafe regex fallback for security reasons."
+        )
+        # Security: Do NOT use regex-based HTML parsing as it cannot handle
+        # malformed HTML correctly and is vulnerable to XSS attacks.
+        # See: https://codeql.github.com/codeql-query-help/python/py-bad-tag-filter/
+        # If BeautifulSoup fails, return empty text rather than risk security issue.
+        return ""
+
+
+def markdown_to_text(markdown_text: str) -> str:
+    """Extract plain text from Markdown content."""
+    return strip_html_tags(markdownify(markdown_text))
+
+
+class TextExtractionPool:
+    """Runs text extraction in a lazily started pool of worker processes.
+
+    With `workers=0` extraction runs on a thread instead: the event loop stays free to schedule
+    other coroutines, but the GIL is still held while parsing and timed-out work cannot be
+    stopped, so this is meant for local development and tests.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int,
+        pages_per_task: int,
+        timeout_seconds: float,
+        memory_limit_mb: int,
+    ):
+        self.workers = max(0, workers)
+        self.pages_per_task = max(1, pages_per_task)
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit_mb = memory_limit_mb
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn rather than fork: the API process runs threads (Cosmos executor, telemetry)
+            # whose locks a forked child could inherit in a held state.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_limit_worker_memory,
+                initargs=(self.memory_limit_mb,),
+            )
+            logger.info(f"Started text extraction pool with {self.workers} worker processes")
+        return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Kill the workers of `executor` and stop using it.
+
+        ProcessPoolExecutor cannot cancel a task that is already running, so a timed-out
+        extraction would otherwise keep its worker busy. Killing the workers fails every
+        other task still on this pool with BrokenProcessPool; `_submit` reruns those on a
+        fresh pool.
+        """
+        if self._executor is executor:
+            self._executor = None
+        # _processes is the only handle on the workers before Python 3.14's kill_workers().
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit(self, func: Callable[..., T], /, *args: Any) -> T:
+        """Run `func(*args)` in a worker process."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            if executor is self._executor:
+                # This task's own worker died (e.g. killed for exceeding its memory limit).
+                self._discard_executor(executor)
+                raise
+            # The pool was torn down by another document's timeout; run again on a new one.
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    async def _run(self, work: Callable[[], Any]) -> Any:
+        """Await `work()` within the extraction deadline."""
+        try:
+            async with asyncio.timeout(self.timeout_seconds):
+                return await work()
+        except TimeoutError:
+            if self._executor is not None:
+                self._discard_executor(self._executor)
+            raise TimeoutError(
+                f"Text extraction exceeded {self.timeout_seconds:g}s and was stopped"
+            ) from None
+
+    async def extract_pdf(self, content: bytes) -> list[str]:
+        """Return the text of each page of a PDF, extracting page ranges in parallel."""
+        if not self.workers:
+            return await self._run(lambda: asyncio.to_thread(extract_pdf_text, content))
+
+        async def work() -> list[str]:
+            total_pages = await self._submit(pdf_page_count, content)
+            # Each task receives its own copy of the file, so ranges are widened until there
+            # are no more of them than workers.
+            size = max(self.pages_per_task, math.ceil(total_pages / self.workers))
+            ranges = await asyncio.gather(
+                *(
+                    self._submit(extract_pdf_pages, content, start, start + size)
+                    for start in range(0, total_pages, size)
+                )
+            )
+            return [text for pages in ranges for text in pages]
+
+        return await self._run(work)
+
+    async def strip_html(self, html: str) -> str:
+        """Return the text content of an HTML document."""
+        return await self._offload(strip_html_tags, html)
+
+    async def markdown_to_text(self, markdown_text: str) -> str:
+        """Return the text content of a Markdown document."""
+        return await self._offload(markdown_to_text, markdown_text)
+
+    async def _offload(self, func: Callable[[str], str], text: str) -> str:
+        if not self.workers:
+            return await self._run(lambda: asyncio.to_thread(func, text))
+        return await self._run(lambda: self._submit(func, text))
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global pool instance
+_text_extraction_pool: TextExtractionPool | None = None
+
+
+def get_text_extraction_pool() -> TextExtractionPool:
+    """Get the global text extraction pool."""
+    global _text_extraction_pool
+    if _text_extraction_pool is None:
+        _text_extraction_pool = TextExtractionPool(
+            workers=settings.EXTRACTION_PROCESS_WORKERS,
+            pages_per_task=settings.EXTRACTION_PAGES_PER_TASK,
+            timeout_seconds=settings.EXTRACTION_TIMEOUT_SECONDS,
+            memory_limit_mb=settings.EXTRACTION_WORKER_MEMORY_MB,
+        )
+    return _text_extraction_pool
+
+
+def close_text_extraction_pool() -> None:
+    """Stop the global text extraction pool's workers."""
+    global _text_extraction_pool
+    if _text_extraction_pool is not None:
+        _text_extraction_pool.shutdown()
+        _text_extraction_pool = None
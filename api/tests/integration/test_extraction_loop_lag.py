@@ -0,0 +1,128 @@
+"""
+Event-loop lag benchmark for document text extraction.
+
+Ingests text-heavy PDFs while a probe coroutine sleeps in short intervals and records how late
+it wakes up. Compares extraction inside the coroutine (previous behaviour), on a thread
+(EXTRACTION_PROCESS_WORKERS=0) and in the worker process pool.
+"""
+
+import asyncio
+import statistics
+import time
+from io import BytesIO
+
+import pypdf
+import pytest
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from app.services.text_extraction import TextExtractionPool, extract_pdf_text
+
+DOCUMENTS = 3
+PAGES_PER_DOCUMENT = 100
+PROBE_INTERVAL_SECONDS = 0.005
+
+
+def _text_pdf(pages: int, lines: int = 60) -> bytes:
+    """A PDF whose pages hold `lines` lines of Helvetica text each."""
+    writer = pypdf.PdfWriter()
+    font = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+            }
+        )
+    )
+    for p in range(pages):
+        page = writer.add_blank_page(width=612, height=792)
+        ops = ["BT /F1 9 Tf 10 TL 36 760 Td"]
+        ops += [f"(Page {p} line {i}: permit application for land use) Tj T*" for i in range(lines)]
+        ops.append("ET")
+        stream = DecodedStreamObject()
+        stream.set_data("\n".join(ops).encode())
+        page[NameObject("/Contents")] = writer._add_object(stream)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+async def _measure_lag(ingest) -> dict[str, float]:
+    """Run `ingest()` while probing the event loop; returns seconds and lag percentiles in ms."""
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+            lags.append((time.perf_counter() - start - PROBE_INTERVAL_SECONDS) * 1000)
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    try:
+        await ingest()
+    finally:
+        seconds = time.perf_counter() - start
+        done.set()
+        await probe_task
+
+    lags.sort()
+    return {
+        "seconds": seconds,
+        "p50_ms": statistics.median(lags),
+        "p99_ms": lags[int(len(lags) * 0.99)],
+        "max_ms": lags[-1],
+    }
+
+
+class TestExtractionLoopLag:
+    """Event-loop responsiveness while PDFs are ingested."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.slow
+    async def test_event_loop_lag_during_pdf_ingestion(self):
+        documents = [_text_pdf(PAGES_PER_DOCUMENT) for _ in range(DOCUMENTS)]
+
+        async def inline():
+            for content in documents:
+                extract_pdf_text(content)
+
+        thread_pool = TextExtractionPool(
+            workers=0, pages_per_task=8, timeout_seconds=120, memory_limit_mb=0
+        )
+        process_pool = TextExtractionPool(
+            workers=2, pages_per_task=8, timeout_seconds=120, memory_limit_mb=1024
+        )
+        try:
+            # Start the worker processes outside the measurement.
+            await process_pool.extract_pdf(_text_pdf(1))
+            results = {"inline": await _measure_lag(inline)}
+            for name, pool in [("thread", thread_pool), ("process", process_pool)]:
+                pages = []
+
+                async def ingest(pool=pool, pages=pages):
+                    for text in await asyncio.gather(*(pool.extract_pdf(d) for d in documents)):
+                        pages.extend(text)
+
+                results[name] = await _measure_lag(ingest)
+                assert len(pages) == DOCUMENTS * PAGES_PER_DOCUMENT
+                assert "Page 99 line 59" in pages[-1]
+        finally:
+            process_pool.shutdown()
+
+        print(f"\nEvent-loop lag ingesting {DOCUMENTS} x {PAGES_PER_DOCUMENT}-page PDFs:")
+        for name, r in results.items():
+            print(
+                f"  {name:8} {r['seconds']:.2f}s  p50={r['p50_ms']:.1f}ms "
+                f"p99={r['p99_ms']:.1f}ms max={r['max_ms']:.1f}ms"
+            )
+
+        # Inline extraction holds the loop for a whole document (hundreds of ms); in worker
+        # processes the loop only waits on pickling the file and the page texts.
+        assert results["inline"]["max_ms"] > 100
+        assert results["process"]["max_ms"] < results["inline"]["max_ms"] / 5
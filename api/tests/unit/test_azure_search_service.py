@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services.azure_search_service import AsyncAzureSearchService, VectorSearchRequest
+
+
+class _AsyncResults:
+    def __init__(self, items):
+        self._items = list(items)
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for item in self._items:
+            yield item
+
+
+class _FakeAsyncSearchClient:
+    """Stand-in for azure.search.documents.aio.SearchClient."""
+
+    def __init__(self, latency: float = 0.02):
+        self.latency = latency
+        self.uploaded: list[dict] = []
+        self.deleted: list[dict] = []
+        self.search_calls: list[dict] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def upload_documents(self, documents):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+        self.uploaded.extend(documents)
+        return []
+
+    async def delete_documents(self, documents):
+        self.deleted.extend(documents)
+        return []
+
+    async def search(self, **kwargs):
+        self.search_calls.append(kwargs)
+        return _AsyncResults(
+            [{"id": "doc-1", "documentId": "doc-1"}, {"id": "c-1", "documentId": "doc-1"}]
+        )
+
+
+def _chunk(i: int) -> dict:
+    return {
+        "id": f"c-{i}",
+        "document_id": "doc-1",
+        "partition_key": "user-1",
+        "content": f"chunk {i}",
+        "embedding": [0.1, 0.2],
+        "metadata": {"filename": "a.pdf", "chunkIndex": i},
+    }
+
+
+@pytest.fixture(name="service")
+def async_search_service(monkeypatch) -> AsyncAzureSearchService:
+    monkeypatch.setattr(settings, "AZURE_SEARCH_ENDPOINT", "https://search.local")
+    monkeypatch.setattr(settings, "AZURE_SEARCH_UPLOAD_CONCURRENCY", 3)
+    svc = AsyncAzureSearchService()
+    svc._search_client = _FakeAsyncSearchClient()
+    return svc
+
+
+@pytest.mark.asyncio
+async def test_upload_chunks_batch_uses_bounded_parallelism(service: AsyncAzureSearchService):
+    client = service._search_client
+    chunks = [_chunk(i) for i in range(1000)]
+
+    await service.upload_chunks_batch(chunks, batch_size=100)
+
+    assert len(client.uploaded) == 1000
+    assert {r["id"] for r in client.uploaded} == {c["id"] for c in chunks}
+    assert client.uploaded[0]["recordType"] == "chunk"
+    assert 1 < client.max_in_flight <= 3
+
+
+@pytest.mark.asyncio
+async def test_upload_does_not_block_event_loop(service: AsyncAzureSearchService):
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    beat = asyncio.create_task(heartbeat())
+    try:
+        await service.upload_chunks_batch([_chunk(i) for i in range(500)], batch_size=50)
+    finally:
+        beat.cancel()
+
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_queries_match_sync_service_api(service: AsyncAzureSearchService):
+    client = service._search_client
+
+    document = await service.get_document("doc-1", "user-1")
+    chunks = await service.list_chunks("doc-1", "user-1")
+    results = await service.vector_search(
+        VectorSearchRequest(embedding=[0.1, 0.2], top_k=2, partition_key="user-1")
+    )
+    await service.delete_document_and_chunks("doc-1", "user-1")
+
+    assert document == {"id": "doc-1", "documentId": "doc-1"}
+    assert len(chunks) == 2
+    assert len(results) == 2
+    assert client.search_calls[1]["order_by"] == ["chunkIndex asc"]
+    assert client.search_calls[2]["vector_queries"][0]["k"] == 2
+    assert client.deleted == [{"id": "doc-1"}, {"id": "c-1"}]
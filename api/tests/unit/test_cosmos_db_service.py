@@ -1,8 +1,12 @@
+import asyncio
+import threading
+import time
 from types import SimpleNamespace
 
 import pytest
 from azure.cosmos.exceptions import CosmosHttpResponseError, CosmosResourceNotFoundError
 
+from app.core.config import settings
 from app.services.cosmos_db_service import CosmosDbService
 
 
@@ -103,3 +107,78 @@ async def test_delete_container_ignores_missing(service: CosmosDbService):
         indexing_policy=None,
     )
     await service.delete_container("existing")
+
+
+class _BlockingContainer:
+    """Container stand-in whose calls block the calling thread like the sync SDK."""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _block(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+
+    def read_item(self, item, partition_key):
+        self._block()
+        return {"id": item, "partitionKey": partition_key}
+
+    def query_items(self, query, **kwargs):
+        self._block()
+        return iter([{"id": str(i)} for i in range(5)])
+
+
+@pytest.mark.asyncio
+async def test_sdk_calls_do_not_block_event_loop(service: CosmosDbService):
+    service.container = _BlockingContainer(latency=0.1)
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    beat = asyncio.create_task(heartbeat())
+    try:
+        item = await service.get_item("doc-1", partition_key="pk")
+    finally:
+        beat.cancel()
+
+    assert item == {"id": "doc-1", "partitionKey": "pk"}
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_are_bounded_by_executor(monkeypatch):
+    monkeypatch.setattr(CosmosDbService, "_initialize_client", lambda self: None)
+    monkeypatch.setattr(settings, "COSMOS_DB_MAX_CONCURRENCY", 4)
+    service = CosmosDbService()
+    service.logger = _NullLogger()
+    container = _BlockingContainer(latency=0.02)
+    service.container = container
+
+    try:
+        results = await asyncio.gather(*[service.query_items("SELECT * FROM c") for _ in range(20)])
+    finally:
+        service.dispose()
+
+    assert all(len(items) == 5 for items in results)
+    assert 1 < container.max_in_flight <= 4
+
+
+@pytest.mark.asyncio
+async def test_paginated_query_stops_at_page_size(service: CosmosDbService):
+    service.container = _BlockingContainer(latency=0)
+
+    result = await service.query_items_cross_partition_with_pagination("SELECT * FROM c", 3)
+
+    assert [item["id"] for item in result.resources] == ["0", "1", "2"]
+    assert result.has_more
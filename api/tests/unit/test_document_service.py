@@ -0,0 +1,85 @@
+import random
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services import document_service as document_module
+from app.services.document_service import (
+    DocumentService,
+    _normalized_embedding_matrix,
+    _top_k_rows,
+)
+
+
+def _chunks(count: int, dims: int = 64, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"c-{i}",
+            "documentId": "doc-1",
+            "partitionKey": "user-1",
+            "content": f"chunk {i}",
+            "embedding": [rng.uniform(-1, 1) for _ in range(dims)],
+        }
+        for i in range(count)
+    ]
+
+
+def test_vectorized_top_k_matches_pure_python_ranking():
+    service = DocumentService()
+    chunks = _chunks(200)
+    query = _chunks(1, seed=99)[0]["embedding"]
+
+    expected = sorted(
+        range(len(chunks)),
+        key=lambda i: service._cosine_similarity(query, chunks[i]["embedding"]),
+        reverse=True,
+    )[:5]
+    matrix = _normalized_embedding_matrix([c["embedding"] for c in chunks])
+
+    assert _top_k_rows(matrix, query, 5) == expected
+    assert _top_k_rows(matrix, query, 500)[:5] == expected
+
+
+def test_zero_vectors_and_dimension_mismatch():
+    matrix = _normalized_embedding_matrix([[0.0, 0.0], [1.0, 0.0]])
+
+    assert _top_k_rows(matrix, [1.0, 0.0], 1) == [1]
+    assert len(_top_k_rows(matrix, [0.0, 0.0], 2)) == 2
+    with pytest.raises(ValueError):
+        _top_k_rows(matrix, [1.0, 0.0, 0.0], 1)
+    with pytest.raises(ValueError):
+        _normalized_embedding_matrix([[1.0, 0.0], [1.0]])
+
+
+@pytest.mark.asyncio
+async def test_client_side_fallback_reuses_cached_matrix(monkeypatch):
+    chunks = _chunks(50)
+    query = chunks[10]["embedding"]
+    langchain = SimpleNamespace(generate_embeddings=AsyncMock(return_value=query))
+    search = SimpleNamespace(vector_search=AsyncMock(return_value=[]))
+    monkeypatch.setattr(DocumentService, "langchain_service", property(lambda self: langchain))
+    monkeypatch.setattr(DocumentService, "azure_search_service", property(lambda self: search))
+
+    builds = 0
+    build_matrix = document_module._normalized_embedding_matrix
+
+    def counting_build(embeddings):
+        nonlocal builds
+        builds += 1
+        return build_matrix(embeddings)
+
+    monkeypatch.setattr(document_module, "_normalized_embedding_matrix", counting_build)
+    service = DocumentService()
+
+    first = await service._find_relevant_context("q1", chunks, top_k=3)
+    second = await service._find_relevant_context("q2", chunks, top_k=3)
+
+    assert first.split("\n\n")[0] == "chunk 10"
+    assert first == second
+    assert builds == 1
+
+    # A re-chunked document with different chunk ids rebuilds the matrix.
+    await service._find_relevant_context("q3", chunks[:40], top_k=3)
+    assert builds == 2
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from io import BytesIO
+
+import pypdf
+import pytest
+
+from app.services import text_extraction
+from app.services.document_service import DocumentService, UploadedFile
+from app.services.text_extraction import TextExtractionPool
+
+
+def _pdf(pages: int) -> bytes:
+    writer = pypdf.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=72, height=72)
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def _sleep_then_return(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.fixture
+def pool():
+    pool = TextExtractionPool(workers=2, pages_per_task=4, timeout_seconds=30, memory_limit_mb=1024)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pdf_pages_are_extracted_in_ranges(pool, monkeypatch):
+    calls = []
+
+    async def submit(func, /, *args):
+        calls.append((func.__name__, args[1:]))
+        return func(*args)
+
+    monkeypatch.setattr(pool, "_submit", submit)
+
+    pages = await pool.extract_pdf(_pdf(10))
+
+    assert pages == [""] * 10
+    # 10 pages over 2 workers: ranges widen from 4 pages to 5 so there is one per worker.
+    assert calls == [
+        ("pdf_page_count", ()),
+        ("extract_pdf_pages", (0, 5)),
+        ("extract_pdf_pages", (5, 10)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_worker_processes_extract_pdf_and_html(pool):
+    assert await pool.extract_pdf(_pdf(3)) == ["", "", ""]
+    html = "<html><script>x()</script><body><p>Hello</p>  <p>world</p></body></html>"
+    assert await pool.strip_html(html) == "Hello world"
+    assert await pool.markdown_to_text("# Title\n\nSome text") == "# Title Some text"
+
+
+@pytest.mark.asyncio
+async def test_timeout_kills_busy_workers(pool):
+    pool.timeout_seconds = 0.5
+    await pool._submit(_sleep_then_return, 0)  # start the workers
+    executor = pool._executor
+    processes = list(executor._processes.values())
+
+    with pytest.raises(TimeoutError, match="exceeded 0.5s"):
+        await pool._run(lambda: pool._submit(_sleep_then_return, 30))
+
+    assert pool._executor is None
+    for process in processes:
+        process.join(timeout=5)
+        assert not process.is_alive()
+    # The next extraction starts a fresh pool.
+    assert await pool._submit(_sleep_then_return, 0) == 0
+
+
+@pytest.mark.asyncio
+async def test_thread_fallback_when_no_workers():
+    pool = TextExtractionPool(workers=0, pages_per_task=4, timeout_seconds=5, memory_limit_mb=0)
+
+    assert await pool.extract_pdf(_pdf(2)) == ["", ""]
+    assert await pool.strip_html("<b>bold</b>") == "bold"
+    assert pool._executor is None
+
+
+@pytest.mark.asyncio
+async def test_document_service_uses_the_extraction_pool(monkeypatch):
+    pool = TextExtractionPool(workers=0, pages_per_task=4, timeout_seconds=5, memory_limit_mb=0)
+    monkeypatch.setattr(text_extraction, "_text_extraction_pool", pool)
+    service = DocumentService()
+
+    pdf = await service._extract_text_from_file(
+        UploadedFile(filename="a.pdf", content=_pdf(3), content_type="application/pdf", size=0)
+    )
+    html = await service._extract_text_from_file(
+        UploadedFile(filename="a.html", content=b"<p>Hi</p>", content_type="text/html", size=0)
+    )
+
+    assert pdf == {"text": "\n\n\n\n", "total_pages": 3}
+    assert html == {"text": "Hi", "total_pages": None}
+
+    async def stuck(content):
+        await asyncio.sleep(10)
+
+    pool.timeout_seconds = 0.05
+    monkeypatch.setattr(pool, "extract_pdf", lambda content: pool._run(lambda: stuck(content)))
+    with pytest.raises(ValueError, match="Failed to extract text from PDF: .*exceeded"):
+        await service._extract_pdf_text(b"%PDF")